@@ -24,6 +24,58 @@ void ccl_angular_cls_limber(ccl_cosmology *cosmo,
        int nl_out, double *l_out, double *cl_out,
        ccl_integration_t integration_method,
        int *status);
+/**
+ * Computes Limber power spectra for several pairs of tracers sharing the
+ * same power spectrum and multipoles (e.g. the members of a stack of tracers
+ * built from different realisations of a redshift distribution).
+ * With spline integration, the wavenumber grid, the scale factors and the
+ * power spectrum are evaluated once per multipole and shared by all pairs.
+ * @param cosmo Cosmological parameters
+ * @param n_pairs number of pairs of tracers.
+ * @param trc1 array of n_pairs ccl_cl_tracer_collection_t (first tracer of each pair).
+ * @param trc2 array of n_pairs ccl_cl_tracer_collection_t (second tracer of each pair).
+ * @param psp the p2d_t object representing the 3D power spectrum to integrate over.
+ * @param nl_out number of multipoles on which the power spectra will be calculated.
+ * @param l_out multipole values on which the power spectra will be calculated.
+ * @param cl_out will hold the calculated power spectra, with shape (n_pairs, nl_out).
+ * @param integration_method method for integration over k (spline or QAG/QUAD).
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ * For specific cases see documentation for ccl_error.c
+ */
+void ccl_angular_cls_limber_multi(ccl_cosmology *cosmo,
+       int n_pairs,
+       ccl_cl_tracer_collection_t **trc1,
+       ccl_cl_tracer_collection_t **trc2,
+       ccl_f2d_t *psp,
+       int nl_out, double *l_out, double *cl_out,
+       ccl_integration_t integration_method,
+       int *status);
+/**
+ * Computes Limber power spectrum templates for the amplitudes of two
+ * tracer collections. Each contribution of each collection is given an
+ * amplitude z^p for p = 0, ..., n_coeffs-1 (ignoring its current amplitude),
+ * so that the power spectrum for amplitudes A_i(z) = sum_p c_ip z^p is
+ * C_l = sum_{ipjq} c1_ip c2_jq T_{ipjq}(l).
+ * @param cosmo Cosmological parameters
+ * @param trc1 a ccl_cl_tracer_collection_t containing a bunch of individual contributions.
+ * @param trc2 a ccl_cl_tracer_collection_t containing a bunch of individual contributions.
+ * @param n_coeffs number of polynomial coefficients of the amplitudes.
+ * @param psp the p2d_t object representing the 3D power spectrum to integrate over.
+ * @param nl_out number of multipoles on which the templates will be calculated.
+ * @param l_out multipole values on which the templates will be calculated.
+ * @param cl_out will hold the templates, with shape (n1, n_coeffs, n2, n_coeffs, nl_out), where n1 and n2 are the number of tracers in each collection.
+ * @param integration_method method for integration over k (spline or QAG/QUAD).
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ * For specific cases see documentation for ccl_error.c
+ */
+void ccl_angular_cls_limber_templates(ccl_cosmology *cosmo,
+       ccl_cl_tracer_collection_t *trc1,
+       ccl_cl_tracer_collection_t *trc2,
+       int n_coeffs,
+       ccl_f2d_t *psp,
+       int nl_out, double *l_out, double *cl_out,
+       ccl_integration_t integration_method,
+       int *status);
 /**
  * Computes non-Limber power spectrum for two different tracers at a given ell.
  * @param cosmo Cosmological parameters
@@ -175,6 +175,7 @@ typedef struct ccl_gsl_params {
   // Flags for using spline integration
   bool NZ_NORM_SPLINE_INTEGRATION;
   bool LENSING_KERNEL_SPLINE_INTEGRATION;
+  bool LENSING_KERNEL_CUMULATIVE_INTEGRATION;
 } ccl_gsl_params;
 
 extern ccl_gsl_params ccl_user_gsl_params;
@@ -41,6 +41,107 @@ void ccl_correlation(ccl_cosmology *cosmo,
 		     int corr_type,int do_taper_cl,double *taper_cl_limits,int flag_method,
 		     int *status);
 
+/**
+ * Computes the correlation functions of several angular power spectra
+ * sampled at the same multipoles. The transform set-up (FFTLog sampling,
+ * Legendre polynomials) is shared by all spectra.
+ * @param cosmo :Cosmological parameters
+ * @param n_ell : number of multipoles in the input power spectra
+ * @param ell : multipoles at which the power spectra are evaluated
+ * @param n_cl : number of power spectra
+ * @param cls : input power spectra, stored as a row-major (n_cl, n_ell) array
+ * @param corr_types : type of correlation function of each power spectrum (see ccl_correlation)
+ * @param n_theta : number of output values of the separation angle (theta)
+ * @param theta : values of the separation angle in degrees.
+ * @param wtheta : output row-major (n_cl, n_theta) array, which should be pre-allocated
+ * @param do_taper_cl :
+ * @param taper_cl_limits
+ * @param flag_method : method to compute the correlation function (see ccl_correlation)
+ */
+void ccl_correlation_multi(ccl_cosmology *cosmo,
+                           int n_ell,double *ell,
+                           int n_cl,double *cls,int *corr_types,
+                           int n_theta,double *theta,double *wtheta,
+                           int do_taper_cl,double *taper_cl_limits,int flag_method,
+                           int *status);
+
+/**
+ * Tabulates the kernels of the Legendre-polynomial sum used by the
+ * CCL_CORR_LGNDRE method, so that they can be reused by
+ * ccl_correlation_tabulated for any power spectrum.
+ * @param corr_type : type of correlation function (CCL_CORR_GG or CCL_CORR_GL)
+ * @param n_theta : number of values of the separation angle (theta)
+ * @param theta : values of the separation angle in degrees.
+ * @param ell_max : maximum multipole of the sum
+ * @param table : output row-major (n_theta, ell_max+1) array, which should be pre-allocated
+ */
+void ccl_correlation_legendre_table(int corr_type,
+                                    int n_theta,double *theta,
+                                    int ell_max,double *table,
+                                    int *status);
+
+/**
+ * Computes the correlation functions of several angular power spectra,
+ * averaged over angular bins (weighted by solid angle). The CCL_CORR_LGNDRE
+ * method uses analytical bin-averaged kernels, and CCL_CORR_FFTLOG integrates
+ * the FFTLog output over each bin. CCL_CORR_BESSEL is not supported.
+ * @param cosmo :Cosmological parameters
+ * @param n_ell : number of multipoles in the input power spectra
+ * @param ell : multipoles at which the power spectra are evaluated
+ * @param n_cl : number of power spectra
+ * @param cls : input power spectra, stored as a row-major (n_cl, n_ell) array
+ * @param corr_types : type of correlation function of each power spectrum (see ccl_correlation)
+ * @param n_bins : number of angular bins
+ * @param theta_edges : n_bins+1 bin edges in degrees.
+ * @param wtheta : output row-major (n_cl, n_bins) array, which should be pre-allocated
+ * @param do_taper_cl :
+ * @param taper_cl_limits
+ * @param flag_method : method to compute the correlation function (see ccl_correlation)
+ */
+void ccl_correlation_multi_binned(ccl_cosmology *cosmo,
+                                  int n_ell,double *ell,
+                                  int n_cl,double *cls,int *corr_types,
+                                  int n_bins,double *theta_edges,double *wtheta,
+                                  int do_taper_cl,double *taper_cl_limits,int flag_method,
+                                  int *status);
+
+/**
+ * Tabulates the kernels of ccl_correlation_legendre_table averaged over
+ * angular bins (weighted by solid angle).
+ * @param corr_type : type of correlation function (CCL_CORR_GG or CCL_CORR_GL)
+ * @param n_bins : number of angular bins
+ * @param theta_edges : n_bins+1 bin edges in degrees.
+ * @param ell_max : maximum multipole of the sum
+ * @param table : output row-major (n_bins, ell_max+1) array, which should be pre-allocated
+ */
+void ccl_correlation_legendre_table_binned(int corr_type,
+                                           int n_bins,double *theta_edges,
+                                           int ell_max,double *table,
+                                           int *status);
+
+/**
+ * Computes the correlation functions of several angular power spectra
+ * from a table of kernels computed with ccl_correlation_legendre_table.
+ * @param cosmo :Cosmological parameters
+ * @param n_ell : number of multipoles in the input power spectra
+ * @param ell : multipoles at which the power spectra are evaluated
+ * @param n_cl : number of power spectra
+ * @param cls : input power spectra, stored as a row-major (n_cl, n_ell) array
+ * @param n_theta : number of rows of the table
+ * @param ell_max : maximum multipole of the table
+ * @param table : row-major (n_theta, ell_max+1) table of kernels
+ * @param wtheta : output row-major (n_cl, n_theta) array, which should be pre-allocated
+ * @param do_taper_cl :
+ * @param taper_cl_limits
+ */
+void ccl_correlation_tabulated(ccl_cosmology *cosmo,
+                               int n_ell,double *ell,
+                               int n_cl,double *cls,
+                               int n_theta,int ell_max,double *table,
+                               double *wtheta,
+                               int do_taper_cl,double *taper_cl_limits,
+                               int *status);
+
 /**
  * Computes the 3dcorrelation function (wrapper)
  * @param cosmo :Cosmological parameters
@@ -57,6 +158,28 @@ void ccl_correlation_3d(ccl_cosmology *cosmo,ccl_f2d_t *psp,
                         int do_taper_pk,double *taper_pk_limits,
                         int *status);
 
+/**
+ * Computes the Hankel transforms of the power spectrum
+ *   xi_l(r) = 1/(2 pi^2) \int dk k^2 P(k,a) j_l(kr)
+ * for several scale factors and orders, with one FFTLog call per order.
+ * Note that, unlike ccl_correlation_multipole, the redshift-space
+ * prefactors (including the sign i^l) are not included.
+ * @param cosmo :Cosmological parameters
+ * @param psp: power spectrum
+ * @param n_a : number of scale factors
+ * @param a : scale factors
+ * @param n_l : number of orders
+ * @param ls : orders l of the spherical Bessel functions
+ * @param n_r : number of output values of distance r
+ * @param r : values of the distance in Mpc
+ * @param xi : output row-major (n_a, n_l, n_r) array, which should be pre-allocated
+ */
+void ccl_correlation_multipoles_multi(ccl_cosmology *cosmo,ccl_f2d_t *psp,
+                                      int n_a,double *a,
+                                      int n_l,int *ls,
+                                      int n_r,double *r,double *xi,
+                                      int *status);
+
 void ccl_correlation_multipole(ccl_cosmology *cosmo,ccl_f2d_t *psp,
                                double a,double beta,
                                int l,int n_s,double *s,double *xi,
@@ -23,10 +23,61 @@ typedef enum ccl_f2d_interp_t
   ccl_f2d_3 = 303, //Bicubic interpolation
 } ccl_f2d_interp_t;
 
+//f2d arithmetic expression types
+typedef enum ccl_f2d_expr_t
+{
+  ccl_f2d_expr_none = 500, //Not an expression
+  ccl_f2d_expr_add = 501, //f(k,a) = f_x(k,a) + f_y(k,a) (or + c)
+  ccl_f2d_expr_mul = 502, //f(k,a) = f_x(k,a) * f_y(k,a) (or * c)
+  ccl_f2d_expr_pow = 503, //f(k,a) = f_x(k,a)^c
+} ccl_f2d_expr_t;
+
 /**
- * Struct containing a 2D power spectrum
+ * Bicubic interpolator over arrays owned by the caller (e.g. a block of
+ * memory shared by several processes). Given the derivatives at the nodes
+ * computed by ccl_bicubic_derivs, it reproduces GSL's bicubic spline.
  */
 typedef struct {
+  int nx; /**< Number of x values */
+  int ny; /**< Number of y values */
+  double *x; /**< Array of x values */
+  double *y; /**< Array of y values */
+  double *z; /**< Array of size nx*ny with z[ix+nx*iy] = f(x[ix],y[iy]) */
+  double *dz; /**< Array of size 3*nx*ny holding df/dx, df/dy and d2f/dxdy at the nodes, with the same ordering as z */
+} ccl_bicubic_t;
+
+/**
+ * Compute the derivatives at the nodes needed by a ccl_bicubic_t
+ * interpolator, using natural cubic splines along each direction as in
+ * GSL's bicubic interpolation.
+ * @param nx number of elements of x.
+ * @param x array of x values. The array should be ordered.
+ * @param ny number of elements of y.
+ * @param y array of y values. The array should be ordered.
+ * @param z array of size nx*ny with z[ix+nx*iy] = f(x[ix],y[iy]).
+ * @param dz output array of size 3*nx*ny.
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ */
+void ccl_bicubic_derivs(int nx, double *x, int ny, double *y,
+                        double *z, double *dz, int *status);
+
+/**
+ * Evaluate a ccl_bicubic_t interpolator or its derivatives.
+ * @param bc ccl_bicubic_t interpolator.
+ * @param x x value. Must be within the range of bc->x.
+ * @param y y value. Must be within the range of bc->y.
+ * @param nderiv_x order of the derivative with respect to x (0, 1 or 2).
+ * @param nderiv_y order of the derivative with respect to y (0 or 1).
+ * @param f output value.
+ * @return 0 if there are no errors, nonzero if (x,y) is out of range.
+ */
+int ccl_bicubic_eval_e(ccl_bicubic_t *bc, double x, double y,
+                       int nderiv_x, int nderiv_y, double *f);
+
+/**
+ * Struct containing a 2D power spectrum
+ */
+typedef struct ccl_f2d_t {
   double lkmin,lkmax; /**< Edges in log(k)*/
   double amin,amax; /**< Edges in a*/
   int is_factorizable; /**< Is this factorizable into k- and a-dependent functions? */
@@ -41,6 +92,13 @@ typedef struct {
   gsl_spline *fk; /**< Spline holding the values of the k-dependent factor*/
   gsl_spline *fa; /**< Spline holding the values of the a-dependent factor*/
   gsl_spline2d *fka; /**< Spline holding the values of f(k,a)*/
+  ccl_bicubic_t *fka_ext; /**< If not NULL, interpolator of f(k,a) over arrays not owned by this structure (used instead of fka).*/
+  struct ccl_f2d_t *fka_base; /**< If not NULL, f(k,a) = fka_base(k,a)*fka_boost(k,a). Not owned by this structure.*/
+  struct ccl_f2d_t *fka_boost; /**< Multiplicative boost applied to fka_base. Not owned by this structure.*/
+  ccl_f2d_expr_t expr_op; /**< If not ccl_f2d_expr_none, f(k,a) is the expression expr_op(fka_x, fka_y or expr_c).*/
+  struct ccl_f2d_t *fka_x; /**< First operand of the expression. Not owned by this structure.*/
+  struct ccl_f2d_t *fka_y; /**< Second operand of the expression, or NULL if it is the constant expr_c. Not owned by this structure.*/
+  double expr_c; /**< Constant second operand of the expression.*/
 } ccl_f2d_t;
 
 /**
@@ -77,6 +135,81 @@ ccl_f2d_t *ccl_f2d_t_new(int na,double *a_arr,
 			 ccl_f2d_interp_t interp_type,
 			 int *status);
 
+/**
+ * Create a ccl_f2d_t structure representing the product of a base
+ * function and a multiplicative boost, f(k,a) = f_base(k,a)*B(k,a),
+ * evaluated on the fly without tabulating the product.
+ * The new structure does not own `fka_base` or `fka_boost`: the caller
+ * must keep both alive for as long as the new structure is used, and
+ * ccl_f2d_t_free will not free them.
+ * The interpolation range, extrapolation orders and extrapolation in a
+ * are those of `fka_base`. The boost is evaluated at the scale factor
+ * closest to `a` within its own interpolation range.
+ * @param fka_base ccl_f2d_t structure holding the base function.
+ * @param fka_boost ccl_f2d_t structure holding the multiplicative boost.
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ */
+ccl_f2d_t *ccl_f2d_t_new_boosted(ccl_f2d_t *fka_base,
+                                 ccl_f2d_t *fka_boost,
+                                 int *status);
+
+/**
+ * Create a ccl_f2d_t structure representing an arithmetic expression of
+ * other ccl_f2d_t structures, f(k,a) = f_x(k,a) op f_y(k,a), evaluated on
+ * the fly at every (k,a) without tabulating it.
+ * The new structure does not own `fka_x` or `fka_y`: the caller must keep
+ * both alive for as long as the new structure is used, and ccl_f2d_t_free
+ * will not free them.
+ * The interpolation range in a and the extrapolation orders are those of
+ * `fka_x`. Both operands are evaluated at the scale factor closest to `a`
+ * within their own interpolation range, and the expression is
+ * extrapolated in a as a power spectrum built with
+ * set_pk2d_new_from_arrays (i.e. with the square of the growth factor).
+ * Outside their ranges in k, the operands are extrapolated individually.
+ * @param expr_op operation (ccl_f2d_expr_add, ccl_f2d_expr_mul or ccl_f2d_expr_pow).
+ * @param fka_x ccl_f2d_t structure holding the first operand.
+ * @param fka_y ccl_f2d_t structure holding the second operand. If NULL, the constant `c` is used instead. Must be NULL for ccl_f2d_expr_pow.
+ * @param c constant second operand (or exponent, for ccl_f2d_expr_pow).
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ */
+ccl_f2d_t *ccl_f2d_t_new_expr(ccl_f2d_expr_t expr_op,
+                              ccl_f2d_t *fka_x,
+                              ccl_f2d_t *fka_y,
+                              double c,
+                              int *status);
+
+/**
+ * Create a ccl_f2d_t structure interpolating arrays owned by the caller,
+ * without copying them. The caller must keep all the arrays alive and
+ * unchanged for as long as the new structure is used, and ccl_f2d_t_free
+ * will not free them. The interpolation is bicubic, and is the same as
+ * that of ccl_f2d_t_new with interp_type = ccl_f2d_3.
+ * @param na number of elements in a_arr.
+ * @param a_arr array of scale factor values at which the function is defined. The array should be ordered.
+ * @param nk number of elements of lk_arr.
+ * @param lk_arr array of logarithmic wavenumbers at which the function is defined. The array should be ordered.
+ * @param fka_arr array of size na * nk containing the 2D function, with the same ordering as in ccl_f2d_t_new.
+ * @param dfka_arr array of size 3 * na * nk containing the derivatives of fka_arr at the nodes, as computed by ccl_bicubic_derivs(nk, lk_arr, na, a_arr, fka_arr, dfka_arr, status).
+ * @param extrap_order_lok see ccl_f2d_t_new.
+ * @param extrap_order_hik see ccl_f2d_t_new.
+ * @param extrap_linear_growth: see ccl_f2d_t_new.
+ * @param is_fka_log: if not zero, `fka_arr` contains ln(f(k,a)) instead of f(k,a).
+ * @param growth_factor_0: see ccl_f2d_t_new.
+ * @param growth_exponent: see ccl_f2d_t_new.
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ */
+ccl_f2d_t *ccl_f2d_t_new_external(int na,double *a_arr,
+                                  int nk,double *lk_arr,
+                                  double *fka_arr,
+                                  double *dfka_arr,
+                                  int extrap_order_lok,
+                                  int extrap_order_hik,
+                                  ccl_f2d_extrap_growth_t extrap_linear_growth,
+                                  int is_fka_log,
+                                  double growth_factor_0,
+                                  int growth_exponent,
+                                  int *status);
+
 /**
  * Evaluate 2D function of k and a defined by ccl_f2d_t structure.
  * @param fka ccl_f2d_t structure defining f(k,a).
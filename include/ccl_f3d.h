@@ -59,6 +59,10 @@ typedef struct {
   ccl_f2d_t *fka_1; /**< If is_product=True, then this holds the first factor f(k,a) */
   ccl_f2d_t *fka_2; /**< If is_product=True, then this holds the second factor g(k,a) */
   gsl_spline2d **tkka; /**< Array of 2D (k1,k2) splines (one for each value of a). */
+  int rank; /**< If positive, f(k1,k2,a) is held as a sum of `rank` products u_i(k1)*v_i(k2) at each value of a */
+  gsl_spline **tkka_u; /**< If rank>0, array of na*rank 1D splines holding the k1 factors, such that tkka_u[i+rank*ia] = u_i(k1) at a_arr[ia] */
+  gsl_spline **tkka_v; /**< Same as tkka_u for the k2 factors */
+  ccl_bicubic_t *tkka_ext; /**< If not NULL, array of na (k1,k2) interpolators over arrays not owned by this structure (used instead of tkka). */
 } ccl_f3d_t;
 
 /**
@@ -95,6 +99,79 @@ ccl_f3d_t *ccl_f3d_t_new(int na,double *a_arr,
 			 ccl_f2d_interp_t interp_type,
 			 int *status);
 
+/**
+ * Create a ccl_f3d_t structure holding a low-rank (e.g. truncated singular value) expansion of a 3D function, such that, at each scale factor, f(k1,k2,a) = sum_i u_i(k1,a)*v_i(k2,a).
+ * The factors are interpolated with 1D cubic splines in ln(k). Linear interpolation is used between values of the scale factor.
+ * @param na number of elements in a_arr.
+ * @param a_arr array of scale factor values at which the function is defined. The array should be ordered.
+ * @param nk number of elements of lk_arr.
+ * @param lk_arr array of logarithmic wavenumbers at which the factors are defined (i.e. this array contains ln(k), NOT k). The array should be ordered.
+ * @param rank number of terms in the expansion.
+ * @param u_arr array of size na * rank * nk containing the k1 factors, such that u_arr[ik+nk*(ir+rank*ia)] = u_ir(k=exp(lk_arr[ik]),a=a_arr[ia]).
+ * @param v_arr same as u_arr for the k2 factors.
+ * @param extrap_order_lok Order of the polynomial that extrapolates on wavenumbers smaller than the minimum of lk_arr (0 or 1).
+ * @param extrap_order_hik Order of the polynomial that extrapolates on wavenumbers larger than the maximum of lk_arr (0 or 1).
+ * @param extrap_linear_growth: ccl_f2d_extrap_growth_t value defining how the function with scale factors below the interpolation range. See ccl_f3d_t_new.
+ * @param is_tkka_log: if not zero, the expansion describes ln(f(k1,k2,a)) instead of f(k1,k2,a).
+ * @param growth_factor_0: growth factor outside the range of scale factors held by a_arr. Irrelevant if extrap_linear_growth!=ccl_f2d_constantgrowth.
+ * @param growth_exponent: power to which the extrapolating growth factor should be exponentiated when extrapolating.
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ */
+ccl_f3d_t *ccl_f3d_t_new_lowrank(int na,double *a_arr,
+                                 int nk,double *lk_arr,
+                                 int rank,
+                                 double *u_arr,
+                                 double *v_arr,
+                                 int extrap_order_lok,
+                                 int extrap_order_hik,
+                                 ccl_f2d_extrap_growth_t extrap_linear_growth,
+                                 int is_tkka_log,
+                                 double growth_factor_0,
+                                 int growth_exponent,
+                                 int *status);
+
+/**
+ * Create a ccl_f3d_t structure interpolating arrays owned by the caller,
+ * without copying them. The caller must keep all the arrays alive and
+ * unchanged for as long as the new structure is used, and ccl_f3d_t_free
+ * will not free them. The interpolation is the same as that of
+ * ccl_f3d_t_new with interp_type = ccl_f2d_3.
+ * @param na number of elements in a_arr.
+ * @param a_arr array of scale factor values at which the function is defined. The array should be ordered.
+ * @param nk number of elements of lk_arr.
+ * @param lk_arr array of logarithmic wavenumbers at which the function is defined. The array should be ordered.
+ * @param tkka_arr array of size na * nk * nk containing the 3D function, with the same ordering as in ccl_f3d_t_new. Only relevant if is_product is 0.
+ * @param dtkka_arr array of size na * 3 * nk * nk containing the derivatives of tkka_arr at the nodes, such that dtkka_arr[3*nk*nk*ia:3*nk*nk*(ia+1)] is computed by ccl_bicubic_derivs(nk, lk_arr, nk, lk_arr, &(tkka_arr[nk*nk*ia]), &(dtkka_arr[3*nk*nk*ia]), status).
+ * @param fka1_arr array of size nk * na containing the first factor of a factorizable function, as in ccl_f3d_t_new. Only relevant if is_product is not 0.
+ * @param dfka1_arr array of size 3 * nk * na containing the derivatives of fka1_arr, as described in ccl_f2d_t_new_external.
+ * @param fka2_arr same as fka1_arr for the second factor.
+ * @param dfka2_arr same as dfka1_arr for the second factor.
+ * @param is_product if not 0, the function is the product of the factors described by fka1_arr and fka2_arr.
+ * @param extrap_order_lok see ccl_f3d_t_new.
+ * @param extrap_order_hik see ccl_f3d_t_new.
+ * @param extrap_linear_growth: see ccl_f3d_t_new.
+ * @param is_tkka_log: see ccl_f3d_t_new.
+ * @param growth_factor_0: see ccl_f3d_t_new.
+ * @param growth_exponent: see ccl_f3d_t_new.
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ */
+ccl_f3d_t *ccl_f3d_t_new_external(int na,double *a_arr,
+                                  int nk,double *lk_arr,
+                                  double *tkka_arr,
+                                  double *dtkka_arr,
+                                  double *fka1_arr,
+                                  double *dfka1_arr,
+                                  double *fka2_arr,
+                                  double *dfka2_arr,
+                                  int is_product,
+                                  int extrap_order_lok,
+                                  int extrap_order_hik,
+                                  ccl_f2d_extrap_growth_t extrap_linear_growth,
+                                  int is_tkka_log,
+                                  double growth_factor_0,
+                                  int growth_exponent,
+                                  int *status);
+
 /**
  * Evaluate 3D function of k1, k2 and a defined by ccl_f3d_t structure.
  * @param f3d ccl_f3d_t structure defining f(k1,k2,a).
@@ -12,6 +12,10 @@ CCL_BEGIN_DECLS
 //times smaller than its maximum.
 #define CCL_FRAC_RELEVANT 5E-4
 
+//Maximum number of coefficients of the polynomial in redshift
+//describing the amplitude of a tracer.
+#define CCL_MAX_TRACER_AMPLITUDE_COEFFS 8
+
 typedef struct {
   int der_bessel; //Bessel derivative order.
   int der_angles; //Ell-dependent prefactor.
@@ -19,6 +23,8 @@ typedef struct {
   ccl_f1d_t *kernel; //Radial kernel.
   double chi_min; //Minimum radial comoving distance for this tracer.
   double chi_max; //Maximum radial comoving distance for this tracer.
+  int n_amplitude; //Number of amplitude coefficients (0 means amplitude 1).
+  double amplitude[CCL_MAX_TRACER_AMPLITUDE_COEFFS]; //Amplitude polynomial coefficients in z.
 } ccl_cl_tracer_t;
 
 /**
@@ -58,6 +64,19 @@ ccl_cl_tracer_t *ccl_cl_tracer_t_new(ccl_cosmology *cosmo,
 				     int extrap_order_hik,
 				     int *status);
 
+/**
+ * Replace the radial kernel of a tracer in place, leaving its transfer
+ * function untouched.
+ * @param tr tracer.
+ * @param n_w number of array elements in radial kernel (at least 2).
+ * @param chi_w values of the radial comoving distance for the radial kernel.
+ * @param w_w corresponding values of the radial kernel.
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ */
+void ccl_cl_tracer_t_set_kernel(ccl_cl_tracer_t *tr,
+				int n_w,double *chi_w,double *w_w,
+				int *status);
+
 /**
  * ccl_tracer_t_free destructor
  */
@@ -83,7 +102,8 @@ double ccl_cl_tracer_t_get_kernel(ccl_cl_tracer_t *tr,double chi,int *status);
 
 
 /**
- * Return the value of the transfer function of a tracer.
+ * Return the value of the transfer function of a tracer, including its
+ * amplitude (see ccl_cl_tracer_t_set_amplitude).
  * @param tr tracer.
  * @param lk natural logarithm of the wavenumber in units of Mpc^-1.
  * @param a scale factor value.
@@ -92,6 +112,26 @@ double ccl_cl_tracer_t_get_kernel(ccl_cl_tracer_t *tr,double chi,int *status);
  */
 double ccl_cl_tracer_t_get_transfer(ccl_cl_tracer_t *tr,double lk,double a,int *status);
 
+/**
+ * Set the amplitude of a tracer, given by a polynomial in redshift
+ * A(z) = sum_i c_i z^i, which multiplies its transfer function when it is
+ * evaluated. Changing the amplitude does not rebuild any spline.
+ * @param tr tracer.
+ * @param n_coeffs number of polynomial coefficients (at most CCL_MAX_TRACER_AMPLITUDE_COEFFS). If 0, the amplitude is 1.
+ * @param coeffs polynomial coefficients, from the lowest order.
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ */
+void ccl_cl_tracer_t_set_amplitude(ccl_cl_tracer_t *tr,
+				   int n_coeffs,double *coeffs,int *status);
+
+/**
+ * Return the amplitude of a tracer.
+ * @param tr tracer.
+ * @param a scale factor value.
+ * @return amplitude value.
+ */
+double ccl_cl_tracer_t_get_amplitude(ccl_cl_tracer_t *tr,double a);
+
 /**
  * Computes the radial kernel for number counts
  * @param nz number of samples over which the redshift distribution is sampled.
@@ -106,6 +146,26 @@ void ccl_get_number_counts_kernel(ccl_cosmology *cosmo,
 				  int nz,double *z_arr,double *nz_arr,
 				  int normalize_nz,
 				  double *pchi_arr,int *status);
+
+/**
+ * Computes the radial kernels for number counts for a stack of redshift
+ * distributions sampled at the same redshifts (e.g. realisations of the
+ * photo-z uncertainty).
+ * @param nz number of samples over which the redshift distributions are sampled.
+ * @param z_arr array of input redshifts.
+ * @param n_real number of redshift distributions.
+ * @param nz_arr array of redshift distribution values, of size n_real * nz
+ *        (one distribution after the other).
+ * @param normalize_nz if not zero, the input redshift distributions will be normalized to unit integral.
+ * @param pchi_arr output array containing the radial kernels, of size n_real * nz.
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ */
+void ccl_get_number_counts_kernel_multi(ccl_cosmology *cosmo,
+					int nz,double *z_arr,
+					int n_real,double *nz_arr,
+					int normalize_nz,
+					double *pchi_arr,int *status);
+
 /**
  * Return the number of samples over which the lensing kernel will be computed.
  * @param nz number of input redshifts.
@@ -148,6 +208,33 @@ void ccl_get_lensing_mag_kernel(ccl_cosmology *cosmo,
 				int nz_s,double *zs_arr,double *sz_arr,
 				int nchi,double *chi_arr,double *wL_arr,int *status);
 
+/**
+ * Return lensing kernels for a stack of redshift distributions sampled at
+ * the same redshifts, computed on a shared grid of distances.
+ * @param cosmo cosmology.
+ * @param nz number of input redshifts for the redshift distributions.
+ * @param z_arr input redshifts for the redshift distributions.
+ * @param n_real number of redshift distributions.
+ * @param nz_arr input redshift distributions, of size n_real * nz
+ *        (one distribution after the other).
+ * @param normalize_nz if not zero, will normalize redshift distributions to unit integral.
+ * @param z_max maximum redshift for integrals.
+ * @param nz_s number of input redshifts for the magnification bias.
+ * @param zs_arr input redshifts for the magnification bias.
+ * @param sz_arr magnification bias, shared by all distributions. If NULL, magnification bias will be assumed to be zero.
+ * @param nchi number of distance values.
+ * @param chis input array of distances.
+ * @param wL_arr lensing kernels, of size n_real * nchi.
+ * @param status Status flag. 0 if there are no errors, nonzero otherwise.
+ */
+void ccl_get_lensing_mag_kernel_multi(ccl_cosmology *cosmo,
+				      int nz,double *z_arr,
+				      int n_real,double *nz_arr,
+				      int normalize_nz,double z_max,
+				      int nz_s,double *zs_arr,double *sz_arr,
+				      int nchi,double *chi_arr,double *wL_arr,
+				      int *status);
+
 /**
  * Return radial kernel for CMB lensing convergence.
  * @param cosmo cosmology.
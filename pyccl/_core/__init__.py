@@ -2,3 +2,4 @@ from .parameters import *
 from .caching import *
 from .schema import *
 from .deprecations import *
+from .shared import *
@@ -211,11 +211,11 @@ def build_string_Pk2D(self, na=6, nk=6, decimals=2):
         return "pyccl.Pk2D(empty)"
 
     # get what's needed from the Pk2D object
-    a, lk, pk = self.get_spline_arrays()
-    lk /= np.log(10)  # easier to read in log10
+    a, lk, pk, is_log = self.get_spline_views()
+    lk = lk / np.log(10)  # easier to read in log10
     islog = str(bool(self.psp.is_log))
     extrap = (self.psp.extrap_order_lok, self.psp.extrap_order_hik)
-    H = hex(sum([hash_(obj) for obj in [a, lk, pk]]))
+    H = hex(self._hash_arrs())
 
     newline = "\n\t"  # what to do when starting a new line
     legend = "a \\ log10(k)"  # table legend
@@ -223,7 +223,11 @@ def build_string_Pk2D(self, na=6, nk=6, decimals=2):
     meta += [f"HASH_ARRS = {H:34}"]
 
     T = Table(n_y=na, n_x=nk, decimals=decimals, legend=legend,
-              newline=newline, data_x=lk, data_y=a, data_z=pk, meta=meta)
+              newline=newline, data_x=lk, meta=meta)
+    # only the rows that are printed need to be exponentiated
+    T.data_y, T.data_z = a[T.idx], pk[T.idx]
+    if is_log:
+        T.data_z = np.exp(T.data_z)
 
     s = build_string_simple(self) + f"{newline}"
     s += T.build()
@@ -285,7 +289,7 @@ def build_string_Tracer(self):
              0  0x82ad882c232406bb  0xa0657c0f1c98fd77    0       2
              1  0x7ab385bb323530da         None           0       0
     """
-    def get_tracer_info(tr):
+    def get_tracer_info(tr, amplitude):
         # Return a string with info for the C-level tracer.
 
         kernel = []
@@ -306,6 +310,8 @@ def build_string_Tracer(self):
             transfer.append(tr.transfer.is_log)
             transfer.append((tr.transfer.extrap_order_lok,
                              tr.transfer.extrap_order_hik))
+        if amplitude:
+            transfer.append(amplitude)
         transfer = hex(hash_(transfer)) if transfer else 'None'
 
         prefac = tr.der_angles
@@ -323,8 +329,8 @@ def build_string_Tracer(self):
     newline = "\n\t"
     s = build_string_simple(self)
     s += print_row(newline, "num", "kernel", "transfer", "prefac", "bessel")
-    for num, tracer in enumerate(tracers):
-        s += print_row(newline, num, *get_tracer_info(tracer))
+    for num, (tracer, amp) in enumerate(zip(tracers, self._amplitudes)):
+        s += print_row(newline, num, *get_tracer_info(tracer, amp))
     return s
 
 
@@ -356,24 +362,31 @@ def build_string_Tk3D(self, na=2, nk=4, decimals=2):
         return "pyccl.Tk3D(empty)"
 
     # get what's needed from the Tk3D object
-    a, lk1, lk2, tks = self.get_spline_arrays()
-    lk1 /= np.log(10)  # easier to read in log10
-    lk2 /= np.log(10)  # easier to read in log10
+    a, lk1, lk2, tks, is_log = self.get_spline_views()
+    lk1 = lk1 / np.log(10)  # easier to read in log10
+    lk2 = lk2 / np.log(10)  # easier to read in log10
     islog = str(bool(self.tsp.is_log))
     extrap = (self.tsp.extrap_order_lok, self.tsp.extrap_order_hik)
-    H = hex(sum([hash_(obj) for obj in [a, lk1, lk2, *tks]]))
+    H = hex(self._hash_arrs())
 
     newline = "\n\t"
     meta = [f"is_log = {islog:5.5s}, extrap_orders = {extrap}"]
     meta += [f"HASH_ARRS = {H:34}"]
 
+    T = Table(n_y=na, n_x=nk, decimals=decimals, newline=newline,
+              legend="a \\ log10(k1)", meta=[])
+
     # we will print 2 tables
     if not self.tsp.is_product:
         # get the start and the end of the trispectrum, diagonally in `k`
-        tks = [tks[0][:, 0, :], tks[0][:, :, -1]]
-
-    T = Table(n_y=na, n_x=nk, decimals=decimals, newline=newline,
-              data_y=a, legend="a \\ log10(k1)", meta=[])
+        tks = [np.array([tks[i][0, :] for i in T.idx]),
+               np.array([tks[i][:, -1] for i in T.idx])]
+    else:
+        tks = [tk[T.idx] for tk in tks]
+    # only the rows that are printed need to be exponentiated
+    if is_log:
+        tks = [np.exp(tk) for tk in tks]
+    T.data_y = a[T.idx]
 
     s = build_string_simple(self) + f"{newline}"
     T.data_x, T.data_z = lk1, tks[0]
@@ -0,0 +1,135 @@
+"""Numerical arrays stored in memory that can be shared across processes."""
+__all__ = ("SharedArrays",)
+
+import os
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+
+class SharedArrays:
+    """Collection of ``float64`` arrays stored contiguously in a single
+    block of memory that other processes can attach to. This is either
+    a :class:`multiprocessing.shared_memory.SharedMemory` block or a
+    memory-mapped file.
+
+    These objects are lightweight and can be pickled (e.g. to pass them to
+    the workers of a process pool). Unpickling them attaches to the existing
+    memory without copying it, so large arrays can be sent to other
+    processes without being pickled. They are mainly meant to be created
+    with :meth:`~pyccl.pk2d.Pk2D.to_shared` and
+    :meth:`~pyccl.tk3d.Tk3D.to_shared`, and consumed with the corresponding
+    ``from_shared`` methods.
+
+    .. note::
+
+        The objects built from these arrays interpolate them in place, so
+        that all the processes on a node share a single copy of the spline
+        data.
+
+    .. note::
+
+        The process that created the storage owns it, and must call
+        :meth:`unlink` once it is no longer needed by any process.
+
+    Args:
+        shapes (:obj:`list`): shapes of the arrays to store.
+        meta (:obj:`dict`): metadata describing the arrays. It must be
+            picklable.
+        path (:obj:`str`): if not ``None``, the arrays are stored in a new
+            memory-mapped file at this path. Otherwise, a new shared memory
+            block is created.
+    """
+
+    def __init__(self, shapes, meta=None, *, path=None):
+        self.shapes = [tuple(int(n) for n in shape) for shape in shapes]
+        self.meta = {} if meta is None else dict(meta)
+        self.path = None if path is None else os.fspath(path)
+        self.name = None
+        self._open(create=True)
+
+    @property
+    def size(self):
+        """Total number of elements stored."""
+        return sum(int(np.prod(shape)) for shape in self.shapes)
+
+    def _open(self, create):
+        # Zero-sized shared memory blocks and memory maps are not allowed.
+        size = max(self.size, 1)
+        self._shm = None
+        if self.path is None:
+            if create:
+                self._shm = shared_memory.SharedMemory(create=True,
+                                                       size=8*size)
+                self.name = self._shm.name
+                _created_names.add(self.name)
+            else:
+                self._shm = _attach_shared_memory(self.name)
+            buf = np.ndarray((size,), dtype=float, buffer=self._shm.buf)
+        else:
+            buf = np.memmap(self.path, dtype=float, shape=(size,),
+                            mode="w+" if create else "r")
+
+        self._buffer = buf
+        self.arrays = []
+        start = 0
+        for shape in self.shapes:
+            stop = start + int(np.prod(shape))
+            self.arrays.append(buf[start:stop].reshape(shape))
+            start = stop
+
+    def flush(self):
+        """Make sure that the data are written to the memory-mapped file
+        (if any)."""
+        if self.path is not None:
+            self._buffer.flush()
+
+    def close(self):
+        """Stop using the shared storage from this process. All arrays
+        pointing to it must have been deleted beforehand."""
+        self.arrays = []
+        self._buffer = None
+        if self._shm is not None:
+            self._shm.close()
+
+    def unlink(self):
+        """Release the shared storage. Only the process that created it
+        should call this method, once no process needs it any longer."""
+        self.close()
+        if self.path is None:
+            self._shm.unlink()
+            _created_names.discard(self.name)
+        else:
+            os.remove(self.path)
+
+    def __getstate__(self):
+        return {"shapes": self.shapes, "meta": self.meta,
+                "path": self.path, "name": self.name}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open(create=False)
+
+    def __repr__(self):
+        where = self.path if self.path is not None else self.name
+        return f"SharedArrays({where}, shapes={self.shapes})"
+
+
+# Names of the shared memory blocks created (and not yet unlinked) by
+# this process, which are tracked by its resource tracker.
+_created_names = set()
+
+
+def _attach_shared_memory(name):
+    # Attach to an existing shared memory block. The block must be excluded
+    # from the resource tracker of this process, which would otherwise
+    # destroy it when the process exits. This is an argument since Python
+    # 3.13. Before that, the block must be unregistered after attaching,
+    # unless this process created it.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == "posix" and name not in _created_names:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
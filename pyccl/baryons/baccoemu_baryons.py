@@ -184,19 +184,9 @@ class BaryonsBaccoemu(Baryons):
         self.bcm_params.update(new_bcm_params)
 
     def _include_baryonic_effects(self, cosmo, pk):
-        # Applies boost factor
-        a_arr, lk_arr, pk_arr = pk.get_spline_arrays()
-        k_arr = np.exp(lk_arr)
-        fka = self.boost_factor(cosmo, k_arr, a_arr)
-        pk_arr *= fka
-
-        if pk.psp.is_log:
-            np.log(pk_arr, out=pk_arr)  # in-place log
-
-        return Pk2D(a_arr=a_arr, lk_arr=lk_arr, pk_arr=pk_arr,
-                    is_logp=pk.psp.is_log,
-                    extrap_order_lok=pk.extrap_order_lok,
-                    extrap_order_hik=pk.extrap_order_hik)
+        # Applies boost factor lazily, without tabulating the product.
+        return Pk2D.from_boost(
+            pk, lambda k, a: self.boost_factor(cosmo, k, a))
 
     def _check_a_range(self, a):
         if np.ndim(a) == 0:
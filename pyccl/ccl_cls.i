@@ -112,3 +112,78 @@ void angular_cl_vec_limber(ccl_cosmology * cosmo,
 }
 
 %}
+
+
+%inline %{
+
+ccl_cl_tracer_collection_t **cl_tracer_collection_array_new(int n,
+                                                            int *status) {
+  ccl_cl_tracer_collection_t **trcs = NULL;
+  trcs = malloc(n * sizeof(ccl_cl_tracer_collection_t *));
+  if (trcs == NULL)
+    *status = CCL_ERROR_MEMORY;
+  return trcs;
+}
+
+void cl_tracer_collection_array_set(ccl_cl_tracer_collection_t **trcs,
+                                    int i, ccl_cl_tracer_collection_t *trc) {
+  trcs[i] = trc;
+}
+
+void cl_tracer_collection_array_free(ccl_cl_tracer_collection_t **trcs) {
+  free(trcs);
+}
+
+%}
+
+
+%feature("pythonprepend") angular_cl_vec_limber_multi %{
+    if nout != npairs * numpy.size(ell):
+        raise CCLError("`nout` must match `npairs` times the size of `ell`!")
+%}
+
+%inline %{
+
+void angular_cl_vec_limber_multi(ccl_cosmology * cosmo,
+                                 int npairs,
+                                 ccl_cl_tracer_collection_t **clts1,
+                                 ccl_cl_tracer_collection_t **clts2,
+                                 ccl_f2d_t *pspec,
+                                 double* ell, int nell,
+                                 int integration_type,
+                                 int nout, double* output,
+                                 int *status) {
+  ccl_angular_cls_limber_multi(cosmo, npairs, clts1, clts2, pspec,
+                               nell, ell, output,
+                               integration_type, status);
+}
+
+%}
+
+
+%feature("pythonprepend") angular_cl_vec_limber_templates %{
+    if nout % numpy.size(ell) != 0:
+        raise CCLError("`nout` must be a multiple of the size of `ell`!")
+%}
+
+%inline %{
+
+void angular_cl_vec_limber_templates(ccl_cosmology * cosmo,
+                                     ccl_cl_tracer_collection_t *clt1,
+                                     ccl_cl_tracer_collection_t *clt2,
+                                     int ncoeffs,
+                                     ccl_f2d_t *pspec,
+                                     double* ell, int nell,
+                                     int integration_type,
+                                     int nout, double* output,
+                                     int *status) {
+  if (nout != clt1->n_tracers * clt2->n_tracers * ncoeffs * ncoeffs * nell) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return;
+  }
+  ccl_angular_cls_limber_templates(cosmo, clt1, clt2, ncoeffs, pspec,
+                                   nell, ell, output,
+                                   integration_type, status);
+}
+
+%}
@@ -11,9 +11,14 @@
     (double* larr, int nlarr),
     (double* clarr, int nclarr),
     (double* theta, int nt),
+    (double* aarr, int naarr),
     (double* r, int nr),
     (double* s, int ns),
-    (double* sig, int nsig)}
+    (double* sig, int nsig),
+    (double* table, int ntable)}
+%apply (int* IN_ARRAY1, int DIM1) {
+    (int* corr_types, int ntypes),
+    (int* ls, int nls)};
 %apply (int DIM1, double* ARGOUT_ARRAY1) {
     (int nout, double* output),
     (int nxi, double* xi),
@@ -27,11 +32,63 @@
         raise CCLError("Input shape for `theta` must match `(nout,)`!")
 %}
 
+%feature("pythonprepend") correlation_multi_vec %{
+    if numpy.shape(clarr) != (numpy.size(corr_types)*numpy.size(larr),):
+        raise CCLError("Input shape for `clarr` must match "
+                       "`(ntypes * nlarr,)`!")
+
+    if numpy.shape(theta) != (nout // max(numpy.size(corr_types), 1),):
+        raise CCLError("Input shape for `theta` must match "
+                       "`(nout // ntypes,)`!")
+%}
+
+%feature("pythonprepend") correlation_legendre_table_vec %{
+    if nout != numpy.size(theta) * (ell_max + 1):
+        raise CCLError("Input shape for `theta` must match "
+                       "`(nout // (ell_max + 1),)`!")
+%}
+
+%feature("pythonprepend") correlation_multi_binned_vec %{
+    if numpy.shape(clarr) != (numpy.size(corr_types)*numpy.size(larr),):
+        raise CCLError("Input shape for `clarr` must match "
+                       "`(ntypes * nlarr,)`!")
+
+    if nout != numpy.size(corr_types) * (numpy.size(theta) - 1):
+        raise CCLError("Output size `nout` must match "
+                       "`ntypes * (nt - 1)`!")
+%}
+
+%feature("pythonprepend") correlation_legendre_table_binned_vec %{
+    if nout != (numpy.size(theta) - 1) * (ell_max + 1):
+        raise CCLError("Input shape for `theta` must match "
+                       "`(nout // (ell_max + 1) + 1,)`!")
+%}
+
+%feature("pythonprepend") correlation_tabulated_vec %{
+    if numpy.size(clarr) % numpy.size(larr) != 0:
+        raise CCLError("Input size of `clarr` must be a multiple of "
+                       "that of `larr`!")
+
+    if numpy.size(table) % (ell_max + 1) != 0:
+        raise CCLError("Input size of `table` must be a multiple of "
+                       "`ell_max + 1`!")
+
+    if (nout * numpy.size(larr) * (ell_max + 1) !=
+            numpy.size(clarr) * numpy.size(table)):
+        raise CCLError("Output size `nout` must match `n_cl * n_theta`!")
+%}
+
 %feature("pythonprepend") correlation_3d_vec %{
     if numpy.shape(r) != (nxi,):
         raise CCLError("Input shape for `r` must match `(nxi,)`!")
 %}
 
+%feature("pythonprepend") correlation_multipoles_multi_vec %{
+    if nxis != numpy.size(aarr) * numpy.size(ls) * numpy.size(s):
+        raise CCLError("Output size `nxis` must match "
+                       "`naarr * nls * ns`!")
+%}
+
 %feature("pythonprepend") correlation_multipole_vec %{
     if numpy.shape(s) != (nxis,):
         raise CCLError("Input shape for `s` must match `(nxis,)`!")
@@ -63,6 +120,48 @@ void correlation_vec(ccl_cosmology *cosmo, double* larr, int nlarr,
         output, corr_type, 0, NULL, method, status);
 }
 
+void correlation_multi_vec(ccl_cosmology *cosmo, double* larr, int nlarr,
+                           double* clarr, int nclarr, int* corr_types,
+                           int ntypes, double* theta, int nt, int method,
+                           int nout, double* output, int *status) {
+    ccl_correlation_multi(
+        cosmo, nlarr, larr, ntypes, clarr, corr_types, nt, theta,
+        output, 0, NULL, method, status);
+}
+
+void correlation_legendre_table_vec(int corr_type, double* theta, int nt,
+                                    int ell_max, int nout, double* output,
+                                    int *status) {
+    ccl_correlation_legendre_table(corr_type, nt, theta, ell_max,
+                                   output, status);
+}
+
+void correlation_multi_binned_vec(ccl_cosmology *cosmo, double* larr,
+                                  int nlarr, double* clarr, int nclarr,
+                                  int* corr_types, int ntypes, double* theta,
+                                  int nt, int method, int nout,
+                                  double* output, int *status) {
+    ccl_correlation_multi_binned(
+        cosmo, nlarr, larr, ntypes, clarr, corr_types, nt-1, theta,
+        output, 0, NULL, method, status);
+}
+
+void correlation_legendre_table_binned_vec(int corr_type, double* theta,
+                                           int nt, int ell_max, int nout,
+                                           double* output, int *status) {
+    ccl_correlation_legendre_table_binned(corr_type, nt-1, theta, ell_max,
+                                          output, status);
+}
+
+void correlation_tabulated_vec(ccl_cosmology *cosmo, double* larr, int nlarr,
+                               double* clarr, int nclarr, double* table,
+                               int ntable, int ell_max, int nout,
+                               double* output, int *status) {
+    ccl_correlation_tabulated(
+        cosmo, nlarr, larr, nclarr/nlarr, clarr, ntable/(ell_max+1),
+        ell_max, table, output, 0, NULL, status);
+}
+
 void correlation_3d_vec(ccl_cosmology *cosmo,ccl_f2d_t *psp,
                         double a, double* r, int nr,
                         int nxi, double* xi, int *status) {
@@ -77,6 +176,13 @@ void correlation_multipole_vec(ccl_cosmology *cosmo,ccl_f2d_t *psp,
   ccl_correlation_multipole(cosmo,psp,a,beta,l,ns,s,xis,status);
 }
 
+void correlation_multipoles_multi_vec(ccl_cosmology *cosmo,ccl_f2d_t *psp,
+                                      double *aarr,int naarr,int *ls,int nls,
+                                      double *s,int ns,int nxis,double *xis,
+                                      int *status){
+  ccl_correlation_multipoles_multi(cosmo,psp,naarr,aarr,nls,ls,ns,s,xis,status);
+}
+
 void correlation_3dRsd_vec(ccl_cosmology *cosmo,ccl_f2d_t *psp,
                            double a,double mu,double beta,
                            double *s,int ns,
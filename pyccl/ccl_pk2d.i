@@ -9,10 +9,20 @@
 %apply (double* IN_ARRAY1, int DIM1) {(double* aarr, int na)};
 %apply (double* IN_ARRAY1, int DIM1) {(double* pkarr, int npk)};
 %apply (int DIM1, double* ARGOUT_ARRAY1) {(int ndout, double* doutput)};
+// Arrays used in place (e.g. in shared memory). They are never copied.
+%apply (double* INPLACE_ARRAY1, int DIM1) {(double* xext, int nxext)};
+%apply (double* INPLACE_ARRAY1, int DIM1) {(double* yext, int nyext)};
+%apply (double* INPLACE_ARRAY1, int DIM1) {(double* zext, int nzext)};
+%apply (double* INPLACE_ARRAY1, int DIM1) {(double* dzext, int ndzext)};
 
 %include "../include/ccl_f2d.h"
 %include "../include/ccl_core.h"
 
+%feature("pythonprepend") pk2d_eval_pairs %{
+    if numpy.shape(lkarr) != (ndout,) or numpy.shape(aarr) != (ndout,):
+        raise CCLError("Input shapes for `lkarr` and `aarr` must match `(ndout,)`!")
+%}
+
 %inline %{
 ccl_f2d_t *set_pk2d_new_from_arrays(double* lkarr,int nk,
 				    double* aarr,int na,
@@ -27,6 +37,39 @@ ccl_f2d_t *set_pk2d_new_from_arrays(double* lkarr,int nk,
   return psp;
 }
 
+// The arrays passed to the two functions below are used in place. In
+// set_pk2d_new_external, they must outlive the returned structure.
+void bicubic_derivs(double* xext,int nxext,
+                    double* yext,int nyext,
+                    double* zext,int nzext,
+                    double* dzext,int ndzext,
+                    int *status)
+{
+  if((nzext != nxext*nyext) || (ndzext != 3*nzext)) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return;
+  }
+  ccl_bicubic_derivs(nxext,xext,nyext,yext,zext,dzext,status);
+}
+
+ccl_f2d_t *set_pk2d_new_external(double* xext,int nxext,
+                                 double* yext,int nyext,
+                                 double* zext,int nzext,
+                                 double* dzext,int ndzext,
+                                 int order_lok,int order_hik,
+                                 int is_logp,
+                                 int *status)
+{
+  if((nzext != nxext*nyext) || (ndzext != 3*nzext)) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return NULL;
+  }
+  ccl_f2d_t *psp=ccl_f2d_t_new_external(nyext,yext,nxext,xext,zext,dzext,
+                                        order_lok,order_hik,ccl_f2d_cclgrowth,
+                                        is_logp,0,2,status);
+  return psp;
+}
+
 void get_pk_spline_a(ccl_cosmology *cosmo,int ndout,double* doutput,int *status)
 {
   ccl_get_pk_spline_a_array(cosmo,ndout,doutput,status);
@@ -55,6 +98,17 @@ void pk2d_eval_multi(ccl_f2d_t *psp,double* lkarr,int nk,
     doutput[ii]=ccl_f2d_t_eval(psp,lkarr[ii],a,cosmo,status);
 }
 
+void pk2d_eval_pairs(ccl_f2d_t *psp,double* lkarr,int nk,
+		     double* aarr,int na,ccl_cosmology *cosmo,
+		     int ndout,double *doutput,int *status)
+{
+  for(int ii=0;ii<ndout;ii++) {
+    doutput[ii]=ccl_f2d_t_eval(psp,lkarr[ii],aarr[ii],cosmo,status);
+    if(*status)
+      break;
+  }
+}
+
 void pk2d_der_eval_multi(ccl_f2d_t *psp,double* lkarr,int nk,
 			 double a,ccl_cosmology *cosmo,
 			 int ndout,double *doutput,int *status)
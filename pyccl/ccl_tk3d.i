@@ -10,6 +10,8 @@
 %apply (double* IN_ARRAY1, int DIM1) {(double* pk1arr, int npk1)};
 %apply (double* IN_ARRAY1, int DIM1) {(double* pk2arr, int npk2)};
 %apply (double* IN_ARRAY1, int DIM1) {(double* tkkarr, int ntkk)};
+%apply (double* IN_ARRAY1, int DIM1) {(double* uarr, int nu)};
+%apply (double* IN_ARRAY1, int DIM1) {(double* varr, int nv)};
 %apply (int DIM1, double* ARGOUT_ARRAY1) {(int ndout, double* doutput)};
 
 %include "../include/ccl_f2d.h"
@@ -42,6 +44,55 @@ ccl_f3d_t *tk3d_new_factorizable(double* lkarr,int nk,
   return tsp;
 }
 
+ccl_f3d_t *tk3d_new_lowrank(double* lkarr,int nk,
+                            double* aarr,int na,
+                            int rank,
+                            double* uarr,int nu,
+                            double* varr,int nv,
+                            int order_lok,int order_hik,
+                            int is_logp, int *status)
+{
+  if((nu != na*rank*nk) || (nv != na*rank*nk)) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return NULL;
+  }
+  ccl_f3d_t *tsp=ccl_f3d_t_new_lowrank(na,aarr,nk,lkarr,rank,uarr,varr,
+                                       order_lok,order_hik,ccl_f2d_constantgrowth,
+                                       is_logp,1,4,status);
+  return tsp;
+}
+
+// The arrays passed to the function below are used in place, and must
+// outlive the returned structure. For factorizable trispectra, zext and
+// dzext hold the two factors and their derivatives one after the other.
+ccl_f3d_t *tk3d_new_external(double* xext,int nxext,
+                             double* yext,int nyext,
+                             double* zext,int nzext,
+                             double* dzext,int ndzext,
+                             int is_product,
+                             int order_lok,int order_hik,
+                             int is_logp, int *status)
+{
+  int nk = nxext, na = nyext;
+  int nz = is_product ? 2*na*nk : na*nk*nk;
+  if((nzext != nz) || (ndzext != 3*nz)) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return NULL;
+  }
+  ccl_f3d_t *tsp;
+  if(is_product)
+    tsp=ccl_f3d_t_new_external(na,yext,nk,xext,NULL,NULL,
+                               zext,dzext,&(zext[na*nk]),&(dzext[3*na*nk]),
+                               1,order_lok,order_hik,ccl_f2d_constantgrowth,
+                               is_logp,1,4,status);
+  else
+    tsp=ccl_f3d_t_new_external(na,yext,nk,xext,zext,dzext,
+                               NULL,NULL,NULL,NULL,
+                               0,order_lok,order_hik,ccl_f2d_constantgrowth,
+                               is_logp,1,4,status);
+  return tsp;
+}
+
 void tk3d_eval_multi(ccl_f3d_t *tsp,double* lkarr,int nk,
 		     double a,int ndout,double *doutput,
                      int *status)
@@ -19,7 +19,8 @@
     (double* a_s, int na),
     (double* tka_s, int ntka),
     (double* tk_s, int ntk),
-    (double* ta_s, int nta)}
+    (double* ta_s, int nta),
+    (double* coeffs, int ncoeffs)}
 %apply (int DIM1, double* ARGOUT_ARRAY1) {(int nout, double* output)};
 
 %inline %{
@@ -76,6 +77,46 @@ void get_lensing_kernel_wrapper(ccl_cosmology *cosmo,
 }
 %}
 
+%feature("pythonprepend") get_lensing_kernel_multi_wrapper %{
+    if numpy.size(n) % numpy.size(z_n) != 0:
+        raise CCLError("Input size for `n` must be a multiple of `z_n`!")
+
+    if numpy.shape(z_b) != numpy.shape(b):
+        raise CCLError("Input shape for `z_b` must match `b`!")
+
+    if nout * numpy.size(z_n) != numpy.size(n) * numpy.size(chi_s):
+        raise CCLError("Input shape for `nout` must match the number "
+                       "of distributions times the size of `chi_s`!")
+%}
+
+%inline %{
+void get_lensing_kernel_multi_wrapper(ccl_cosmology *cosmo,
+				      double *z_n, int nz_n,
+				      double *n, int nn,
+				      double z_max,
+				      int has_magbias,
+				      double *z_b, int nz_b,
+				      double *b, int nb,
+				      double *chi_s, int nchi,
+				      int nout,double *output,
+				      int *status)
+{
+  int nz_s=-1;
+  double *zs_arr=NULL;
+  double *sz_arr=NULL;
+
+  if(has_magbias) {
+    nz_s=nz_b;
+    zs_arr=z_b;
+    sz_arr=b;
+  }
+  ccl_get_lensing_mag_kernel_multi(cosmo,
+				   nz_n, z_n, nn/nz_n, n, 1, z_max,
+				   nz_s,zs_arr,sz_arr,
+				   nchi,chi_s,output,status);
+}
+%}
+
 %inline %{
 void get_kappa_kernel_wrapper(ccl_cosmology *cosmo,double chi_source,
 			      double* chi_s, int nchi,
@@ -102,6 +143,26 @@ void get_number_counts_kernel_wrapper(ccl_cosmology *cosmo,
 }
 %}
 
+%feature("pythonprepend") get_number_counts_kernel_multi_wrapper %{
+    if numpy.size(n) % numpy.size(z_n) != 0:
+        raise CCLError("Input size for `n` must be a multiple of `z_n`!")
+
+    if nout != numpy.size(n):
+        raise CCLError("Input shape for `nout` must match `n`!")
+%}
+
+%inline %{
+void get_number_counts_kernel_multi_wrapper(ccl_cosmology *cosmo,
+					    double *z_n, int nz_n,
+					    double *n, int nn,
+					    int nout,double *output,
+					    int *status)
+{
+  ccl_get_number_counts_kernel_multi(cosmo,nz_n,z_n,nn/nz_n,n,1,
+				     output,status);
+}
+%}
+
 %feature("pythonprepend") cl_tracer_get_kernel %{
     if chi_s.size != nout:
         raise CCLError("Input shape for `chi_s` must match `nout`")
@@ -140,6 +201,30 @@ void cl_tracer_get_f_ell(ccl_cl_tracer_t *tr,
 }
 %}
 
+%inline %{
+void cl_tracer_set_amplitude(ccl_cl_tracer_t *tr,
+			     double *coeffs, int ncoeffs,
+			     int *status)
+{
+  ccl_cl_tracer_t_set_amplitude(tr, ncoeffs, coeffs, status);
+}
+%}
+
+%feature("pythonprepend") cl_tracer_set_kernel %{
+    if numpy.shape(chi_s) != numpy.shape(wchi_s):
+        raise CCLError("Input shape for `chi_s` must match `wchi_s`!")
+%}
+
+%inline %{
+void cl_tracer_set_kernel(ccl_cl_tracer_t *tr,
+			  double *chi_s, int nchi,
+			  double *wchi_s, int nwchi,
+			  int *status)
+{
+  ccl_cl_tracer_t_set_kernel(tr, nchi, chi_s, wchi_s, status);
+}
+%}
+
 %feature("pythonprepend") cl_tracer_get_transfer %{
     if a_s.size * lk_s.size != nout:
         raise CCLError("`nout` must match the shapes of `k_s` times `a_s`")
@@ -17,6 +17,11 @@
 %apply (int DIM1, double* ARGOUT_ARRAY1) {(int t_size, double* tarr)};
 %apply (int DIM1, double* ARGOUT_ARRAY1) {(int a_size, double* out_arr)};
 
+%apply (double** ARGOUTVIEW_ARRAY1, int* DIM1) {
+  (double** xview, int* nxview),
+  (double** yview, int* nyview),
+  (double** zview, int* nzview)};
+
 %apply (int* OUTPUT) {(int *size)};
 %apply int *OUTPUT { int *x_size, int *y_size };
 
@@ -168,6 +173,73 @@ void get_spline3d_arrays(gsl_spline2d **spline2d,
   memcpy(yarr, spline2d[0]->yarr, sizeof(double)*y_size);
 }
 
+// The functions below return views of the arrays held by GSL splines,
+// without copying them. The memory belongs to the spline, so the
+// returned arrays must not outlive it.
+void get_spline2d_views(gsl_spline2d *spline2d,
+                        double** xview, int* nxview,
+                        double** yview, int* nyview,
+                        double** zview, int* nzview,
+                        int *status)
+{
+  *xview = NULL; *yview = NULL; *zview = NULL;
+  *nxview = 0; *nyview = 0; *nzview = 0;
+  if(spline2d == NULL) {
+    *status = CCL_ERROR_MEMORY;
+    return;
+  }
+  *xview = spline2d->xarr;
+  *yview = spline2d->yarr;
+  *zview = spline2d->zarr;
+  *nxview = spline2d->interp_object.xsize;
+  *nyview = spline2d->interp_object.ysize;
+  *nzview = (*nxview) * (*nyview);
+}
+
+void get_spline3d_views(gsl_spline2d **spline2d, int ia,
+                        double** xview, int* nxview,
+                        double** yview, int* nyview,
+                        double** zview, int* nzview,
+                        int *status)
+{
+  if(spline2d == NULL) {
+    *xview = NULL; *yview = NULL; *zview = NULL;
+    *nxview = 0; *nyview = 0; *nzview = 0;
+    *status = CCL_ERROR_MEMORY;
+    return;
+  }
+  get_spline2d_views(spline2d[ia], xview, nxview, yview, nyview,
+                     zview, nzview, status);
+}
+
+void get_spline1d_array_views(gsl_spline **splines, int i,
+                              double** xview, int* nxview,
+                              double** yview, int* nyview,
+                              int *status)
+{
+  if((splines == NULL) || (splines[i] == NULL)) {
+    *xview = NULL; *yview = NULL;
+    *nxview = 0; *nyview = 0;
+    *status = CCL_ERROR_MEMORY;
+    return;
+  }
+  *xview = splines[i]->x;
+  *nxview = splines[i]->size;
+  *yview = splines[i]->y;
+  *nyview = splines[i]->size;
+}
+
+void get_array_view(double *arr, int a_size,
+                    double** xview, int* nxview,
+                    int *status)
+{
+  *xview = arr;
+  *nxview = a_size;
+  if(arr == NULL) {
+    *status = CCL_ERROR_MEMORY;
+    *nxview = 0;
+  }
+}
 
 void get_array(double *arr,
                int a_size, double* out_arr,
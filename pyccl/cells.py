@@ -1,10 +1,11 @@
-__all__ = ("angular_cl",)
+__all__ = ("angular_cl", "angular_cl_templates",)
 
 import numpy as np
 
 from . import DEFAULT_POWER_SPECTRUM, CCLWarning, check, lib, warnings
-from .pyutils import integ_types
+from .pyutils import limber_integ_types
 from . import nonlimber
+from .tracers import TracerStack
 
 
 def angular_cl(
@@ -28,8 +29,14 @@ def angular_cl(
     Args:
         cosmo (:class:`~pyccl.cosmology.Cosmology`): A Cosmology object.
         tracer1 (:class:`~pyccl.tracers.Tracer`): a Tracer object,
-            of any kind.
-        tracer2 (:class:`~pyccl.tracers.Tracer`): a second Tracer object.
+            of any kind, or a :class:`~pyccl.tracers.TracerStack`.
+        tracer2 (:class:`~pyccl.tracers.Tracer`): a second Tracer object,
+            or a :class:`~pyccl.tracers.TracerStack`. If any of the tracers
+            is a stack, the power spectra of all its members are returned
+            (see :class:`~pyccl.tracers.TracerStack` for how two stacks are
+            paired). With ``limber_integration_method='spline'`` or
+            ``'matrix'``, the Limber integrals of all members share their
+            evaluations of the power spectrum.
         ell (:obj:`float` or `array`): Angular multipole(s) at which to evaluate
             the angular power spectrum.
         p_of_k_a (:class:`~pyccl.pk2d.Pk2D`, :obj:`str` or :obj:`None`): 3D Power
@@ -43,12 +50,26 @@ def angular_cl(
         limber_max_error (float) : Maximum fractional error for Limber integration.
         limber_integration_method (string) : integration method to be used
             for the Limber integrals. Possibilities: 'qag_quad' (GSL's `qag`
-            method backed up by `quad` when it fails) and 'spline' (the
-            integrand is splined and then integrated numerically).
+            method backed up by `quad` when it fails), 'spline' (the
+            integrand is splined and then integrated numerically) and
+            'matrix' (the kernels and transfer functions of all distinct
+            tracers, and the power spectrum, are sampled once on a shared
+            grid of wavenumbers, and all pairs are obtained from a single
+            matrix product between the first and second tracers of the
+            pairs, or pair by pair if they only need few of its elements).
         non_limber_integration_method (string) : integration method to be used
-            for the non-Limber integrals. Currently the only method implemented
-            is ``'FKEM'`` (see the `N5K paper <https://arxiv.org/abs/2212.04291>`_
-            for details).
+            for the non-Limber integrals. Possibilities: ``'FKEM'`` (see the
+            `N5K paper <https://arxiv.org/abs/2212.04291>`_ for details) and
+            ``'bessel'`` (the radial kernels are projected onto spherical
+            Bessel functions by direct quadrature on a fixed grid of
+            wavenumbers). Both methods use the ``fkem_chi_min`` and
+            ``fkem_Nchi`` sampling parameters. The projections of the
+            ``'bessel'`` method only depend on the tracers and on the
+            background and growth of the cosmology, so they are reused when
+            only the power spectrum changes. This method needs finer
+            sampling than ``'FKEM'``: oscillations of the Bessel functions
+            are only resolved for :math:`k\\chi\\,\\Delta\\ln\\chi<\\pi/2`,
+            which must be well above the non-Limber multipoles.
         fkem_chi_min: Minimum comoving distance used by `FKEM` to sample the
             tracer radial kernels. If ``None``, the minimum distance over which
             the kernels are defined will be used (capped to 1E-6 Mpc if this
@@ -76,7 +97,9 @@ def angular_cl(
     Returns:
         :obj:`float` or `array`: Angular (cross-)power spectrum values, \
             :math:`C_\\ell`, for the pair of tracers, as a function of \
-            :math:`\\ell`.
+            :math:`\\ell`. If any of the tracers is a \
+            :class:`~pyccl.tracers.TracerStack`, the output has an extra \
+            leading dimension running over its members.
     """  # noqa
     if cosmo["Omega_k"] != 0:
         warnings.warn(
@@ -84,12 +107,12 @@ def angular_cl(
             "when computing angular power spectra in non-flat cosmologies!",
             category=CCLWarning, importance='low')
 
-    if limber_integration_method not in integ_types:
+    if limber_integration_method not in limber_integ_types:
         raise ValueError(
             "Limber integration method %s not supported"
             % limber_integration_method
         )
-    if non_limber_integration_method not in ["FKEM"]:
+    if non_limber_integration_method not in ["FKEM", "bessel"]:
         raise ValueError(
             "Non-Limber integration method %s not supported"
             % limber_integration_method
@@ -101,6 +124,15 @@ def angular_cl(
     else:
         auto_limber = False
 
+    if isinstance(tracer1, TracerStack) or isinstance(tracer2, TracerStack):
+        return _angular_cl_stack(
+            cosmo, tracer1, tracer2, ell, p_of_k_a=p_of_k_a,
+            l_limber=l_limber, limber_max_error=limber_max_error,
+            limber_integration_method=limber_integration_method,
+            non_limber_integration_method=non_limber_integration_method,
+            fkem_chi_min=fkem_chi_min, fkem_Nchi=fkem_Nchi,
+            p_of_k_a_lin=p_of_k_a_lin, return_meta=return_meta)
+
     # we need the distances for the integrals
     cosmo.compute_distances()
 
@@ -140,6 +172,16 @@ def angular_cl(
                 l_limber,
                 **fkem_params
             )
+        elif non_limber_integration_method == "bessel":
+            l_limber, cl_non_limber, status = nonlimber._nonlimber_bessel(
+                cosmo,
+                tracer1,
+                tracer2,
+                p_of_k_a,
+                ell_use,
+                l_limber,
+                **fkem_params
+            )
         check(status, cosmo=cosmo)
     else:
         cl_non_limber = np.array([])
@@ -152,7 +194,7 @@ def angular_cl(
             clt2,
             psp,
             ell_use_limber,
-            integ_types[limber_integration_method],
+            limber_integ_types[limber_integration_method],
             ell_use_limber.size,
             status,
         )
@@ -173,3 +215,177 @@ def angular_cl(
 
     check(status, cosmo=cosmo)
     return (cl, meta) if return_meta else cl
+
+
+def angular_cl_templates(
+    cosmo,
+    tracer1,
+    tracer2,
+    ell,
+    *,
+    p_of_k_a=DEFAULT_POWER_SPECTRUM,
+    n_coeffs=1,
+    limber_integration_method="qag_quad"
+):
+    """Calculate Limber angular power spectrum templates for the amplitudes
+    of the tracers contained in two :class:`~pyccl.tracers.Tracer` objects
+    (see :meth:`~pyccl.tracers.Tracer.set_amplitude`).
+
+    The angular power spectrum is bilinear in the amplitudes of the tracers.
+    If the amplitude of the :math:`i`-th tracer in ``tracer1`` is the
+    polynomial :math:`A^1_i(z)=\\sum_p c^1_{ip}\\,z^p` (and similarly for
+    ``tracer2``), then
+
+    .. math::
+        C_\\ell = \\sum_{ipjq} c^1_{ip}\\,c^2_{jq}\\,T_{ipjq}(\\ell),
+
+    which can be evaluated with
+    ``np.einsum('ip,jq,ipjql->l', c1, c2, templates)``. The current
+    amplitudes of the tracers are ignored when computing the templates.
+
+    Args:
+        cosmo (:class:`~pyccl.cosmology.Cosmology`): A Cosmology object.
+        tracer1 (:class:`~pyccl.tracers.Tracer`): a Tracer object,
+            of any kind.
+        tracer2 (:class:`~pyccl.tracers.Tracer`): a second Tracer object.
+        ell (:obj:`float` or `array`): Angular multipole(s) at which to
+            evaluate the templates.
+        p_of_k_a (:class:`~pyccl.pk2d.Pk2D`, :obj:`str` or :obj:`None`): 3D
+            Power spectrum to project (see :func:`angular_cl`).
+        n_coeffs (:obj:`int`): number of polynomial coefficients of the
+            amplitudes (1 for constant amplitudes, at most 8).
+        limber_integration_method (string) : integration method to be used
+            for the Limber integrals (see :func:`angular_cl`). With
+            ``'spline'`` or ``'matrix'``, all templates share their
+            evaluations of the power spectrum.
+
+    Returns:
+        `array`: templates :math:`T_{ipjq}(\\ell)`, with shape
+        ``(n1, n_coeffs, n2, n_coeffs, ell.size)``, where ``n1`` and ``n2``
+        are the number of tracers in ``tracer1`` and ``tracer2``. The last
+        dimension is squeezed if ``ell`` is a scalar.
+    """
+    if limber_integration_method not in limber_integ_types:
+        raise ValueError(
+            "Limber integration method %s not supported"
+            % limber_integration_method
+        )
+    if not (1 <= n_coeffs <= 8):
+        raise ValueError("n_coeffs must be between 1 and 8")
+
+    ell_use = np.atleast_1d(np.array(ell, dtype=float))
+    if not (np.diff(ell_use) > 0).all():
+        raise ValueError("ell values must be monotonically increasing")
+
+    cosmo.compute_distances()
+    if p_of_k_a is None:
+        p_of_k_a = DEFAULT_POWER_SPECTRUM
+    psp = cosmo.parse_pk2d(p_of_k_a, is_linear=False)
+
+    status = 0
+    clt1, status = lib.cl_tracer_collection_t_new(status)
+    clt2, status = lib.cl_tracer_collection_t_new(status)
+    for t in tracer1._trc:
+        status = lib.add_cl_tracer_to_collection(clt1, t, status)
+    for t in tracer2._trc:
+        status = lib.add_cl_tracer_to_collection(clt2, t, status)
+
+    shape = (len(tracer1._trc), n_coeffs, len(tracer2._trc), n_coeffs,
+             ell_use.size)
+    cl, status = lib.angular_cl_vec_limber_templates(
+        cosmo.cosmo, clt1, clt2, n_coeffs, psp, ell_use,
+        limber_integ_types[limber_integration_method], int(np.prod(shape)),
+        status)
+    cl = cl.reshape(shape)
+    if np.ndim(ell) == 0:
+        cl = cl[..., 0]
+
+    # Free up tracer collections
+    lib.cl_tracer_collection_t_free(clt1)
+    lib.cl_tracer_collection_t_free(clt2)
+
+    check(status, cosmo=cosmo)
+    return cl
+
+
+def _stack_pairs(tracer1, tracer2):
+    """Pairs of tracers entering the power spectra between two tracers, at
+    least one of which is a :class:`~pyccl.tracers.TracerStack`.
+    """
+    n1 = len(tracer1) if isinstance(tracer1, TracerStack) else None
+    n2 = len(tracer2) if isinstance(tracer2, TracerStack) else None
+    if (n1 is not None) and (n2 is not None) and (n1 != n2):
+        raise ValueError("Tracer stacks must have the same number of "
+                         f"members to be paired. Got {n1} and {n2}.")
+    n_pairs = n2 if n1 is None else n1
+    trs1 = list(tracer1) if n1 is not None else [tracer1] * n_pairs
+    trs2 = list(tracer2) if n2 is not None else [tracer2] * n_pairs
+    return list(zip(trs1, trs2))
+
+
+def _angular_cl_stack(cosmo, tracer1, tracer2, ell, *, p_of_k_a, l_limber,
+                      limber_integration_method, return_meta, **kwargs):
+    """Angular power spectra for all the pairs of tracers in one or two
+    :class:`~pyccl.tracers.TracerStack` objects. Pure Limber calculations
+    are done in a single call for all pairs.
+    """
+    pairs = _stack_pairs(tracer1, tracer2)
+    ell_use = np.atleast_1d(ell)
+
+    non_limber = (type(l_limber) is str) or (ell_use[0] < l_limber)
+    if non_limber or (limber_integration_method not in limber_integ_types):
+        # The transition to Limber is found independently for every pair.
+        out = [angular_cl(cosmo, t1, t2, ell, p_of_k_a=p_of_k_a,
+                          l_limber=l_limber,
+                          limber_integration_method=limber_integration_method,
+                          return_meta=True, **kwargs)
+               for t1, t2 in pairs]
+        cl = np.array([o[0] for o in out])
+        meta = {"l_limber": np.array([o[1]["l_limber"] for o in out])}
+        return (cl, meta) if return_meta else cl
+
+    if cosmo["Omega_k"] != 0:
+        warnings.warn(
+            "CCL does not properly use the hyperspherical Bessel functions "
+            "when computing angular power spectra in non-flat cosmologies!",
+            category=CCLWarning, importance='low')
+    if not (np.diff(ell_use) > 0).all():
+        raise ValueError("ell values must be monotonically increasing")
+
+    cosmo.compute_distances()
+    if p_of_k_a is None:
+        p_of_k_a = DEFAULT_POWER_SPECTRUM
+    psp = cosmo.parse_pk2d(p_of_k_a, is_linear=False)
+
+    # One collection per distinct tracer, so that the C layer can reuse
+    # the transfers of tracers shared by several pairs.
+    n_pairs = len(pairs)
+    status = 0
+    clts1, status = lib.cl_tracer_collection_array_new(n_pairs, status)
+    clts2, status = lib.cl_tracer_collection_array_new(n_pairs, status)
+    collections = {}
+    for ip, (t1, t2) in enumerate(pairs):
+        for clts, t in ((clts1, t1), (clts2, t2)):
+            if id(t) not in collections:
+                clt, status = lib.cl_tracer_collection_t_new(status)
+                for tr in t._trc:
+                    status = lib.add_cl_tracer_to_collection(clt, tr, status)
+                collections[id(t)] = clt
+            lib.cl_tracer_collection_array_set(clts, ip, collections[id(t)])
+
+    cl, status = lib.angular_cl_vec_limber_multi(
+        cosmo.cosmo, n_pairs, clts1, clts2, psp, ell_use,
+        limber_integ_types[limber_integration_method], n_pairs*ell_use.size,
+        status)
+    cl = cl.reshape((n_pairs, ell_use.size))
+    if np.ndim(ell) == 0:
+        cl = cl[:, 0]
+
+    # Free up tracer collections
+    for clt in collections.values():
+        lib.cl_tracer_collection_t_free(clt)
+    lib.cl_tracer_collection_array_free(clts1)
+    lib.cl_tracer_collection_array_free(clts2)
+
+    check(status, cosmo=cosmo)
+    return (cl, {"l_limber": l_limber}) if return_meta else cl
@@ -1,10 +1,11 @@
-__all__ = ("CorrelationMethods", "CorrelationTypes", "correlation",
+__all__ = ("CorrelationMethods", "CorrelationTypes", "LegendreTable",
+           "correlation",
            "correlation_3d", "correlation_multipole", "correlation_3dRsd",
            "correlation_3dRsd_avgmu", "correlation_pi_sigma",)
 
 from enum import Enum
 import numpy as np
-from . import DEFAULT_POWER_SPECTRUM, check, lib
+from . import DEFAULT_POWER_SPECTRUM, check, lib, spline_params
 
 
 class CorrelationMethods(Enum):
@@ -42,7 +43,86 @@ correlation_types = {
 }
 
 
-def correlation(cosmo, *, ell, C_ell, theta, type='NN', method='fftlog'):
+class LegendreTable:
+    """Table of the kernels entering the sum over Legendre polynomials used
+    by the ``'legendre'`` method of :func:`correlation`, for a fixed set of
+    angular separations.
+
+    Building the table is the expensive part of this method. Once built, it
+    can be passed to :func:`correlation` (argument ``legendre_table``) for
+    any number of power spectra, and the correlation functions are then
+    computed as a matrix product.
+
+    The kernels are stored in a single contiguous array of shape
+    ``(n_theta, ell_max+1)``, with the factor :math:`1/4\\pi` included.
+    If ``theta_edges`` is passed instead of ``theta``, the kernels are
+    averaged analytically over the angular bins, and the table has one row
+    per bin.
+
+    Args:
+        theta (:obj:`float` or `array`): Angular separation(s) (in
+            degrees).
+        type (:obj:`str`): Type of correlation function. Only ``'NN'`` and
+            ``'NG'`` are supported by the ``'legendre'`` method.
+        ell_max (:obj:`int`): maximum multipole of the sum. If ``None``,
+            ``ccl.spline_params.ELL_MAX_CORR`` is used.
+        theta_edges (`array`): Edges of the angular bins (in degrees).
+            Only one of ``theta`` and ``theta_edges`` may be passed.
+    """
+
+    def __init__(self, theta=None, *, type='NN', ell_max=None,
+                 theta_edges=None):
+        if type not in ['NN', 'NG']:
+            raise ValueError(f"Correlation type {type} is not supported "
+                             "by the Legendre method.")
+        if ell_max is None:
+            ell_max = spline_params.ELL_MAX_CORR
+
+        self.theta, self.theta_edges = _check_theta(theta, theta_edges)
+        self.type = type
+        self.ell_max = int(ell_max)
+
+        status = 0
+        if self.theta_edges is None:
+            n_theta = self.theta.size
+            table, status = lib.correlation_legendre_table_vec(
+                correlation_types[type], self.theta, self.ell_max,
+                n_theta*(self.ell_max+1), status)
+        else:
+            n_theta = self.theta_edges.size-1
+            table, status = lib.correlation_legendre_table_binned_vec(
+                correlation_types[type], self.theta_edges, self.ell_max,
+                n_theta*(self.ell_max+1), status)
+        check(status)
+        self.table = table.reshape([n_theta, self.ell_max+1])
+
+    def __repr__(self):
+        return (f"LegendreTable(type={self.type}, n_theta={len(self.table)},"
+                f" ell_max={self.ell_max})")
+
+
+def _check_theta(theta, theta_edges):
+    # Validate angular separations or bin edges. Only one of them can be
+    # passed.
+    if (theta is None) == (theta_edges is None):
+        raise ValueError("Exactly one of `theta` and `theta_edges` must be "
+                         "passed.")
+    if theta is not None:
+        return np.atleast_1d(np.asarray(theta, dtype=float)), None
+
+    theta_edges = np.asarray(theta_edges, dtype=float)
+    if (theta_edges.ndim != 1) or (theta_edges.size < 2):
+        raise ValueError("`theta_edges` must be a 1D array with at least "
+                         "two elements.")
+    if np.any(np.diff(theta_edges) <= 0) or (theta_edges[0] < 0) or \
+            (theta_edges[-1] > 180):
+        raise ValueError("`theta_edges` must be increasing and between 0 "
+                         "and 180 degrees.")
+    return None, theta_edges
+
+
+def correlation(cosmo, *, ell, C_ell, theta=None, type='NN', method='fftlog',
+                legendre_table=None, theta_edges=None):
     r"""Compute the angular correlation function.
 
     .. math::
@@ -85,7 +165,10 @@ def correlation(cosmo, *, ell, C_ell, theta, type='NN', method='fftlog'):
         cosmo (:class:`~pyccl.cosmology.Cosmology`): A Cosmology object.
         ell (array): Multipoles corresponding to the input angular power
                           spectrum.
-        C_ell (array): Input angular power spectrum.
+        C_ell (array): Input angular power spectrum. A 2D array of shape
+            ``(n_spectra, n_ell)`` may be passed to compute the correlation
+            functions of several power spectra at once. In this case, the
+            transform set-up is shared by all of them.
         theta (:obj:`float` or `array`): Angular separation(s) at which to
             calculate the angular correlation function (in degrees).
         type (:obj:`str`): Type of correlation function. Choices: ``'NN'`` (0x0),
@@ -95,22 +178,38 @@ def correlation(cosmo, *, ell, C_ell, theta, type='NN', method='fftlog'):
             the CCL paper). The naming system roughly follows the nomenclature
             used in `TreeCorr
             <https://rmjarvis.github.io/TreeCorr/_build/html/correlation2.html>`_.
+            If ``C_ell`` is 2D, a sequence with one type per power spectrum
+            may also be passed.
         method (:obj:`str`): Method to compute the correlation function.
             Choices: ``'Bessel'`` (direct integration over Bessel function),
             ``'FFTLog'`` (fast integration with FFTLog), ``'Legendre'``
             (brute-force sum over Legendre polynomials).
+        legendre_table (:class:`LegendreTable`): If not ``None``, the
+            ``'legendre'`` method is used with the kernels stored in this
+            table, which avoids recomputing them. ``theta`` (or
+            ``theta_edges``) and ``type`` must then match those of the table.
+        theta_edges (`array`): Edges of angular bins (in degrees). If passed
+            instead of ``theta``, the correlation function averaged over
+            each bin (weighted by solid angle) is returned. The
+            ``'Legendre'`` method uses analytical bin-averaged kernels, and
+            the ``'FFTLog'`` method integrates its finely-sampled output
+            over each bin. Not available for the ``'Bessel'`` method.
 
     Returns:
         (:obj:`float` or `array`): Value(s) of the correlation function at the
-        input angular separations.
+        input angular separations (or in the input bins). If ``C_ell`` is
+        2D, the first dimension of the output corresponds to the different
+        power spectra.
     """ # noqa
     cosmo_in = cosmo
     cosmo = cosmo.cosmo
     status = 0
     method = method.lower()
 
-    if type not in correlation_types:
-        raise ValueError(f"Invalid correlation type {type}.")
+    types = [type] if isinstance(type, str) else list(type)
+    for t in types:
+        if t not in correlation_types:
+            raise ValueError(f"Invalid correlation type {t}.")
 
     if method not in correlation_methods.keys():
         raise ValueError(f"Invalid correlation method {method}.")
@@ -119,6 +218,42 @@ def correlation(cosmo, *, ell, C_ell, theta, type='NN', method='fftlog'):
     if scalar := isinstance(theta, (int, float)):
         theta = np.array([theta, ])
 
+    binned = theta_edges is not None
+    if binned:
+        _, theta = _check_theta(theta, theta_edges)
+        if method == 'bessel':
+            raise ValueError("Bin-averaged correlation functions are not "
+                             "available for the Bessel method.")
+    elif theta is None:
+        raise ValueError("Either `theta` or `theta_edges` must be passed.")
+
+    if legendre_table is not None:
+        if method != 'legendre':
+            raise ValueError("Tabulated kernels can only be used with the "
+                             "Legendre method.")
+        if any(t != legendre_table.type for t in types):
+            raise ValueError("Correlation type must match that of the "
+                             "Legendre table.")
+        theta_table = legendre_table.theta_edges if binned \
+            else legendre_table.theta
+        if (theta_table is None) or not np.array_equal(theta, theta_table):
+            raise ValueError("Angular separations must match those of the "
+                             "Legendre table.")
+
+    if (np.ndim(C_ell) == 2) or (legendre_table is not None) or binned:
+        wth = _correlation_multi(cosmo_in, ell, np.atleast_2d(C_ell), theta,
+                                 types, method, legendre_table, binned)
+        if np.ndim(C_ell) == 1:
+            wth = wth[0]
+        if scalar:
+            return wth[..., 0]
+        return wth
+
+    if len(types) != 1:
+        raise ValueError("A single correlation type must be passed for a "
+                         "single power spectrum.")
+    type, = types
+
     if np.all(np.array(C_ell) == 0):
         # short-cut and also avoid integration errors
         wth = np.zeros_like(theta)
@@ -134,6 +269,92 @@ def correlation(cosmo, *, ell, C_ell, theta, type='NN', method='fftlog'):
     return wth
 
 
+def _correlation_multi(cosmo, ell, C_ell, theta, types, method,
+                       legendre_table=None, binned=False):
+    # Correlation functions of a 2D array of power spectra, computed in a
+    # single call so that the transform set-up is shared by all of them.
+    # If binned, `theta` holds the bin edges.
+    C_ell = np.asarray(C_ell, dtype=float)
+    n_cl = len(C_ell)
+    if len(types) == 1:
+        types = types * n_cl
+    if len(types) != n_cl:
+        raise ValueError("The number of correlation types must match the "
+                         "number of power spectra.")
+    corr_types = np.array([correlation_types[t] for t in types],
+                          dtype=np.intc)
+
+    n_out = len(theta)-1 if binned else len(theta)
+    wth = np.zeros((n_cl, n_out))
+    # short-cut for vanishing spectra to avoid integration errors
+    good = np.any(C_ell != 0, axis=1)
+    n_good = np.sum(good)
+    if n_good == 0:
+        return wth
+
+    status = 0
+    if legendre_table is not None:
+        out, status = lib.correlation_tabulated_vec(
+            cosmo.cosmo, ell, C_ell[good].flatten(),
+            legendre_table.table.ravel(), legendre_table.ell_max,
+            n_good*n_out, status)
+    elif binned:
+        out, status = lib.correlation_multi_binned_vec(
+            cosmo.cosmo, ell, C_ell[good].flatten(), corr_types[good],
+            theta, correlation_methods[method], n_good*n_out, status)
+    else:
+        out, status = lib.correlation_multi_vec(
+            cosmo.cosmo, ell, C_ell[good].flatten(), corr_types[good],
+            theta, correlation_methods[method], n_good*n_out, status)
+    check(status, cosmo)
+    wth[good] = out.reshape([n_good, n_out])
+    return wth
+
+
+def _correlation_multipoles(cosmo, psp, a, ells, r, beta=None):
+    # Correlation function multipoles for several scale factors, with shape
+    # `(n_a, n_ell, n_r)`. All scale factors are transformed together. If
+    # `beta` is not None, the linear redshift-space prefactors are included.
+    a = np.atleast_1d(np.asarray(a, dtype=float))
+    ells = np.atleast_1d(np.asarray(ells, dtype=np.intc))
+    r = np.atleast_1d(np.asarray(r, dtype=float))
+    if beta is not None:
+        beta = np.broadcast_to(beta, a.shape)
+        prefac = np.array([_rsd_multipole_prefactor(ell, beta)
+                           for ell in ells]).T
+
+    status = 0
+    xis, status = lib.correlation_multipoles_multi_vec(
+        cosmo.cosmo, psp, a, ells, r, a.size*ells.size*r.size, status)
+    check(status, cosmo)
+    xis = xis.reshape([a.size, ells.size, r.size])
+
+    if beta is not None:
+        xis *= prefac[:, :, None]
+    return xis
+
+
+def _rsd_multipole_prefactor(ell, beta):
+    # Linear (Kaiser) redshift-space prefactors of the multipoles, including
+    # the sign i^ell.
+    if ell == 0:
+        return 1. + 2. / 3 * beta + 1. / 5 * beta * beta
+    if ell == 2:
+        return -(4. / 3 * beta + 4. / 7 * beta * beta)
+    if ell == 4:
+        return 8. / 35 * beta * beta
+    raise ValueError(f"Unavailable multipole ell={ell}. Choose between "
+                     "0, 2 and 4.")
+
+
+def _rsd_combine_multipoles(xis, mu):
+    # Sum the RSD multipoles (0, 2, 4) of shape `(n_a, 3, n_r)` weighted by
+    # Legendre polynomials.
+    p2 = 0.5 * (3 * mu**2 - 1)
+    p4 = 0.125 * (35 * mu**4 - 30 * mu**2 + 3)
+    return xis[:, 0] + xis[:, 1] * p2 + xis[:, 2] * p4
+
+
 def correlation_3d(cosmo, *, r, a, p_of_k_a=DEFAULT_POWER_SPECTRUM):
     r"""Compute the 3D correlation function:
 
@@ -144,7 +365,9 @@ def correlation_3d(cosmo, *, r, a, p_of_k_a=DEFAULT_POWER_SPECTRUM):
         cosmo (:class:`~pyccl.cosmology.Cosmology`): A Cosmology object.
         r (:obj:`float` or `array`): distance(s) at which to calculate the 3D
             correlation function (in Mpc).
-        a (:obj:`float`): scale factor.
+        a (:obj:`float` or `array`): scale factor(s). If an array, all
+            scale factors are transformed together, and the first dimension
+            of the output corresponds to them.
         p_of_k_a (:class:`~pyccl.pk2d.Pk2D`, :obj:`str` or :obj:`None`): 3D Power spectrum
             to integrate. If a string, it must correspond to one of the
             non-linear power spectra stored in `cosmo` (e.g.
@@ -166,6 +389,12 @@ def correlation_3d(cosmo, *, r, a, p_of_k_a=DEFAULT_POWER_SPECTRUM):
     if scalar := isinstance(r, (int, float)):
         r = np.array([r, ])
 
+    if np.ndim(a) > 0:
+        xi = _correlation_multipoles(cosmo_in, psp, a, 0, r)[:, 0]
+        if scalar:
+            return xi[:, 0]
+        return xi
+
     # Call 3D correlation function
     xi, status = lib.correlation_3d_vec(cosmo, psp, a, r,
                                         len(r), status)
@@ -186,9 +415,14 @@ def correlation_multipole(cosmo, *, r, a, beta, ell,
         cosmo (:class:`~pyccl.cosmology.Cosmology`): A Cosmology object.
         r (:obj:`float` or `array`): distance(s) at which to calculate the 3D
             correlation function (in Mpc).
-        a (:obj:`float`): scale factor.
-        beta (:obj:`float`): growth rate divided by galaxy bias.
-        ell (:obj:`int`) : the desired multipole
+        a (:obj:`float` or `array`): scale factor(s). If an array, all
+            scale factors are transformed together, and the first dimension
+            of the output corresponds to them.
+        beta (:obj:`float` or `array`): growth rate divided by galaxy bias.
+            If ``a`` is an array, one value per scale factor may be passed.
+        ell (:obj:`int` or `array`) : the desired multipole(s). If an array,
+            the output has one dimension for the multipoles, after that of
+            the scale factors (if any).
         p_of_k_a (:class:`~pyccl.pk2d.Pk2D`, :obj:`str` or :obj:`None`): 3D Power spectrum
             to integrate. If a string, it must correspond to one of the
             non-linear power spectra stored in `cosmo` (e.g.
@@ -210,6 +444,16 @@ def correlation_multipole(cosmo, *, r, a, beta, ell,
     if scalar := isinstance(r, (int, float)):
         r = np.array([r, ])
 
+    if (np.ndim(a) > 0) or (np.ndim(ell) > 0):
+        xis = _correlation_multipoles(cosmo_in, psp, a, ell, r, beta=beta)
+        if np.ndim(ell) == 0:
+            xis = xis[:, 0]
+        if np.ndim(a) == 0:
+            xis = xis[0]
+        if scalar:
+            return xis[..., 0]
+        return xis
+
     # Call 3D correlation function
     xis, status = lib.correlation_multipole_vec(cosmo, psp, a, beta, ell, r,
                                                 len(r), status)
@@ -235,10 +479,14 @@ def correlation_3dRsd(cosmo, *, r, a, mu, beta,
         cosmo (:class:`~pyccl.cosmology.Cosmology`): A Cosmology object.
         r (:obj:`float` or `array`): distance(s) at which to calculate the
             3D correlation function (in Mpc).
-        a (:obj:`float`): scale factor.
+        a (:obj:`float` or `array`): scale factor(s). If an array, the
+            multipoles of all scale factors are computed together (and
+            ``use_spline`` is ignored), and the first dimension of the output
+            corresponds to them.
         mu (:obj:`float`): cosine of the angle at which to calculate the 3D
             correlation function.
-        beta (:obj:`float`): growth rate divided by galaxy bias.
+        beta (:obj:`float` or `array`): growth rate divided by galaxy bias.
+            If ``a`` is an array, one value per scale factor may be passed.
         p_of_k_a (:class:`~pyccl.pk2d.Pk2D`, :obj:`str` or :obj:`None`): 3D Power spectrum
             to integrate. If a string, it must correspond to one of the
             non-linear power spectra stored in `cosmo` (e.g.
@@ -262,6 +510,14 @@ def correlation_3dRsd(cosmo, *, r, a, mu, beta,
     if scalar := isinstance(r, (int, float)):
         r = np.array([r, ])
 
+    if np.ndim(a) > 0:
+        xis = _correlation_multipoles(cosmo_in, psp, a, [0, 2, 4], r,
+                                      beta=beta)
+        xis = _rsd_combine_multipoles(xis, mu)
+        if scalar:
+            return xis[:, 0]
+        return xis
+
     # Call 3D correlation function
     xis, status = lib.correlation_3dRsd_vec(cosmo, psp, a, mu, beta, r,
                                             len(r), int(use_spline), status)
@@ -282,8 +538,11 @@ def correlation_3dRsd_avgmu(cosmo, *, r, a, beta,
         cosmo (:class:`~pyccl.cosmology.Cosmology`): A Cosmology object.
         r (:obj:`float` or `array`): distance(s) at which to calculate the 3D
             correlation function (in Mpc).
-        a (:obj:`float`): scale factor.
-        beta (:obj:`float`): growth rate divided by galaxy bias.
+        a (:obj:`float` or `array`): scale factor(s). If an array, all
+            scale factors are transformed together, and the first dimension
+            of the output corresponds to them.
+        beta (:obj:`float` or `array`): growth rate divided by galaxy bias.
+            If ``a`` is an array, one value per scale factor may be passed.
         p_of_k_a (:class:`~pyccl.pk2d.Pk2D`, :obj:`str` or :obj:`None`): 3D Power spectrum
             to integrate. If a string, it must correspond to one of the
             non-linear power spectra stored in `cosmo` (e.g.
@@ -305,6 +564,12 @@ def correlation_3dRsd_avgmu(cosmo, *, r, a, beta,
     if scalar := isinstance(r, (int, float)):
         r = np.array([r, ])
 
+    if np.ndim(a) > 0:
+        xis = _correlation_multipoles(cosmo_in, psp, a, 0, r, beta=beta)
+        if scalar:
+            return xis[:, 0, 0]
+        return xis[:, 0]
+
     # Call 3D correlation function
     xis, status = lib.correlation_3dRsd_avgmu_vec(cosmo, psp, a, beta, r,
                                                   len(r), status)
@@ -328,8 +593,12 @@ def correlation_pi_sigma(cosmo, *, pi, sigma, a, beta,
         pi (:obj:`float`): distance times cosine of the angle (in Mpc).
         sigma (:obj:`float` or `array`): distance(s) times sine of the angle
             (in Mpc).
-        a (:obj:`float`): scale factor.
-        beta (:obj:`float`): growth rate divided by galaxy bias.
+        a (:obj:`float` or `array`): scale factor(s). If an array, the
+            multipoles of all scale factors are computed together (and
+            ``use_spline`` is ignored), and the first dimension of the output
+            corresponds to them.
+        beta (:obj:`float` or `array`): growth rate divided by galaxy bias.
+            If ``a`` is an array, one value per scale factor may be passed.
         p_of_k_a (:class:`~pyccl.pk2d.Pk2D`, :obj:`str` or :obj:`None`): 3D Power spectrum
             to integrate. If a string, it must correspond to one of the
             non-linear power spectra stored in `cosmo` (e.g.
@@ -353,6 +622,15 @@ def correlation_pi_sigma(cosmo, *, pi, sigma, a, beta,
     if scalar := isinstance(sigma, (int, float)):
         sigma = np.array([sigma, ])
 
+    if np.ndim(a) > 0:
+        s = np.sqrt(pi**2 + np.asarray(sigma)**2)
+        xis = _correlation_multipoles(cosmo_in, psp, a, [0, 2, 4], s,
+                                      beta=beta)
+        xis = _rsd_combine_multipoles(xis, pi / s)
+        if scalar:
+            return xis[:, 0]
+        return xis
+
     # Call 3D correlation function
     xis, status = lib.correlation_pi_sigma_vec(cosmo, psp, a, beta, pi, sigma,
                                                len(sigma), int(use_spline),
@@ -18,6 +18,7 @@ and instead can be accessed at a global level. You can do so as e.g.
 __all__ = ("TransferFunctions", "MatterPowerSpectra",
            "Cosmology", "CosmologyVanillaLCDM", "CosmologyCalculator",)
 
+import functools
 import yaml
 from copy import deepcopy
 from enum import Enum
@@ -34,6 +35,7 @@ from . import (
     DEFAULT_POWER_SPECTRUM, DefaultParams, Pk2D, check, lib,
     unlock_instance, emulators, baryons, modified_gravity)
 from . import physical_constants as const
+from ._core import hash_
 
 
 class TransferFunctions(Enum):
@@ -335,6 +337,27 @@ class Cosmology(CCLObject):
         is ``True``."""
         return {**self._params_init_kwargs, **self._config_init_kwargs}
 
+    @functools.cached_property
+    def _cache_key(self):
+        """Hash of this cosmology, computed only once. Used as a key by
+        the caches of cosmology-dependent quantities."""
+        return hash(self)
+
+    @functools.cached_property
+    def _background_cache_key(self):
+        """Hash of the parameters of this cosmology that determine its
+        background and growth, computed only once. Used as a key by the
+        caches of quantities that do not depend on the power spectrum.
+        """
+        pk_only = ["sigma8", "A_s", "n_s", "transfer_function",
+                   "matter_power_spectrum", "baryonic_effects"]
+        params = {key: value for key, value in self.to_dict().items()
+                  if key not in pk_only}
+        inputs = getattr(self, "_input_arrays", {})
+        return hash_((self.__class__.__qualname__, params,
+                      self._accuracy_params, inputs.get("background"),
+                      inputs.get("growth")))
+
     def write_yaml(self, filename, *, sort_keys=False):
         """Write a YAML representation of the parameters to file.
 
@@ -536,6 +559,9 @@ class Cosmology(CCLObject):
         state.pop('cosmo', None)
         state.pop('_params', None)
         state.pop('_config', None)
+        # the hash is not preserved across processes
+        state.pop('_cache_key', None)
+        state.pop('_background_cache_key', None)
         return state
 
     def __setstate__(self, state):
@@ -1,10 +1,13 @@
 __all__ = ("angular_cl_cov_cNG", "sigma2_B_disc", "sigma2_B_from_mask",
-           "angular_cl_cov_SSC",)
+           "angular_cl_cov_SSC", "build_cl_covariance",
+           "build_cl_covariance_gaussian",)
 
 import numpy as np
+from scipy.interpolate import Akima1DInterpolator
 
 from . import DEFAULT_POWER_SPECTRUM, check, lib
-from .pyutils import _check_array_params, integ_types
+from .pyutils import _check_array_params, integ_types, resample_array
+from .tk3d import Tk3D
 
 
 def angular_cl_cov_cNG(cosmo, tracer1, tracer2, *, ell, t_of_kk_a,
@@ -204,6 +207,9 @@ def sigma2_B_from_mask(cosmo, a_arr=None, *, mask_wl=None,
             :math:`{\\tt mask\\_wl}=\\sum_m W^A_{\\ell m} {W^B}^*_{\\ell m}`.
             It is the responsibility of the user to the provide the mask power
             out to sufficiently high ell for their required precision.
+            A 2D array with shape ``(n_mask, n_ell)`` may be passed to
+            compute the projected variance for several pairs of masks at
+            once.
         p_of_k_a (:class:`~pyccl.pk2d.Pk2D` or :obj:`str`): Linear
             power spectrum to use. Defaults to the
             internal linear power spectrum from `cosmo`.
@@ -214,7 +220,9 @@ def sigma2_B_from_mask(cosmo, a_arr=None, *, mask_wl=None,
         - a_arr (`array`): an array of scale factor values at which the
           projected variance has been evaluated. Only returned if ``a_arr`` is
           ``None`` on input.
-        - sigma2_B (:obj:`float` or `array`): projected variance.
+        - sigma2_B (:obj:`float` or `array`): projected variance. If
+          ``mask_wl`` is 2D, the first dimension of this array corresponds
+          to the different masks.
     """
     full_output = a_arr is None
 
@@ -228,27 +236,30 @@ def sigma2_B_from_mask(cosmo, a_arr=None, *, mask_wl=None,
         cosmo.compute_linear_power()
         p_of_k_a = cosmo.get_linear_power()
 
-    ell = np.arange(mask_wl.size)
-
-    sigma2_B = np.zeros(a_arr.size)
-    for i in range(sigma2_B.size):
-        if 1-a_arr[i] < 1e-6:
-            # For a=1, the integral becomes independent of the footprint in
-            # the flat-sky approximation. So we are just using the method
-            # for the disc geometry here
-            sigma2_B[i] = sigma2_B_disc(cosmo=cosmo, a_arr=a_arr[i],
-                                        p_of_k_a=p_of_k_a)
-        else:
-            chi = cosmo.comoving_angular_distance(a=a_arr)
-            k = (ell+0.5)/chi[i]
-            pk = p_of_k_a(k, a_arr[i], cosmo)
-            # See eq. E.10 of 2007.01844
-            sigma2_B[i] = np.sum(pk * mask_wl)/chi[i]**2
+    mask_wl = np.asarray(mask_wl, dtype=float)
+    ell = np.arange(mask_wl.shape[-1])
+
+    sigma2_B = np.zeros(mask_wl.shape[:-1] + a_arr.shape)
+    # For a=1, the integral becomes independent of the footprint in the
+    # flat-sky approximation. So we are just using the method for the
+    # disc geometry there.
+    is_one = 1-a_arr < 1e-6
+    if np.any(is_one):
+        sigma2_B[..., is_one] = sigma2_B_disc(cosmo=cosmo,
+                                              a_arr=a_arr[is_one],
+                                              p_of_k_a=p_of_k_a)
+    a_use = a_arr[~is_one]
+    if a_use.size > 0:
+        chi = cosmo.comoving_angular_distance(a=a_use)
+        k = (ell[None, :]+0.5)/chi[:, None]
+        pk = p_of_k_a._eval_pairs(k, a_use[:, None], cosmo)
+        # See eq. E.10 of 2007.01844
+        sigma2_B[..., ~is_one] = (mask_wl @ pk.T)/chi**2
 
     if full_output:
         return a_arr, sigma2_B
     if ndim == 0:
-        return sigma2_B[0]
+        return sigma2_B.take(0, axis=-1)
     return sigma2_B
 
 
@@ -376,3 +387,321 @@ def angular_cl_cov_SSC(cosmo, tracer1, tracer2, *, ell, t_of_kk_a,
 
     check(status, cosmo=cosmo_in)
     return cov
+
+
+def _limber_transfers(cosmo, tracer, ell, chi, a):
+    # Limber transfer functions Delta_ell(chi) of a tracer (summed over
+    # all its contributions) on a grid of multipoles and distances, with
+    # shape ``(ell.size, chi.size)``. As in the C covariance integrator,
+    # contributions involving Bessel function derivatives are neglected.
+    out = np.zeros([ell.size, chi.size])
+    good = chi > 0
+    chi_g = chi[good]
+    a_g = a[good]
+    lk = np.log((ell[:, None]+0.5)/chi_g[None, :])
+    for t in tracer._trc:
+        if t.der_bessel >= 1:
+            continue
+        status = 0
+        w, status = lib.cl_tracer_get_kernel(t, chi_g, chi_g.size, status)
+        check(status)
+        fl, status = lib.cl_tracer_get_f_ell(t, ell, ell.size, status)
+        check(status)
+        tr = np.zeros([ell.size, chi_g.size])
+        for ic, aa in enumerate(a_g):
+            tr[:, ic], status = lib.cl_tracer_get_transfer(
+                t, lk[:, ic], np.array([aa]), ell.size, status)
+            check(status)
+        dd = tr * w[None, :] * fl[:, None]
+        if t.der_bessel == -1:
+            dd /= (ell[:, None]+0.5)**2
+        out[:, good] += dd
+    return out
+
+
+def build_cl_covariance(cosmo, tracers, pairs, ell, *, t_of_kk_a,
+                        sigma2_B=None, ssc=False, fsky=1., out=None,
+                        n_workers=1):
+    """Build the full non-Gaussian covariance matrix of a set of angular
+    power spectra. For each pair of power spectra :math:`C_\\ell^{ab}` and
+    :math:`C_\\ell^{cd}` in ``pairs``, the covariance block is computed as
+    in :func:`angular_cl_cov_cNG` (or :func:`angular_cl_cov_SSC` if
+    ``ssc`` is ``True`` or ``sigma2_B`` is provided).
+
+    The radial integrals are computed as with
+    ``integration_method='spline'`` in these functions: the integrand is
+    sampled on a grid of comoving distances covering the range shared by
+    the four tracers (with the spacing set by
+    ``ccl.spline_params.DCHI_INTEGRATION``), and integrated with an Akima
+    spline. However, the Limber transfer functions of each tracer and the
+    trispectrum are evaluated only once for all the blocks sharing the same
+    range, and all multipoles are integrated at once. Only the blocks with
+    :math:`(ab)\\leq(cd)` are computed, and pairs differing only in the
+    order of their tracers are computed only once.
+
+    Args:
+        cosmo (:class:`~pyccl.cosmology.Cosmology`): A Cosmology object.
+        tracers (:obj:`list` or :obj:`dict`): collection of
+            :class:`~pyccl.tracers.Tracer` objects.
+        pairs (:obj:`list`): list of pairs ``(a, b)`` of indices (or keys)
+            into ``tracers`` defining the power spectra whose covariance
+            will be computed.
+        ell (`array`): multipoles at which the power spectra are
+            evaluated.
+        t_of_kk_a (:class:`~pyccl.tk3d.Tk3D` or :obj:`callable`): 3D
+            connected trispectrum. If a function, it will be called as
+            ``t_of_kk_a(a, b, c, d)`` for each block, and must return the
+            :class:`~pyccl.tk3d.Tk3D` to use for tracers ``a``, ``b``, ``c``
+            and ``d``. The trispectra returned for ``(a, b, c, d)`` and
+            ``(c, d, a, b)`` must be the transpose of each other.
+            Functions returning the same object for several blocks will
+            only have it evaluated once.
+        sigma2_B (:obj:`tuple` or :obj:`None`): A tuple of arrays
+            (a, sigma2_B(a)) containing the variance of the projected matter
+            overdensity over the footprint as a function of the scale factor.
+            If not ``None``, the super-sample covariance is computed.
+        ssc (:obj:`bool`): if ``True``, compute the super-sample
+            covariance. If ``sigma2_B`` is ``None``, a compact circular
+            footprint covering a sky fraction ``fsky`` is assumed.
+        fsky (:obj:`float`): sky fraction.
+        out (`array`): if not ``None``, array with shape
+            ``(len(pairs)*ell.size, len(pairs)*ell.size)`` (e.g. a
+            :class:`numpy.memmap`) where the covariance will be written
+            block by block as it is computed.
+        n_workers (:obj:`int`): number of threads used to compute the
+            covariance blocks.
+
+    Returns:
+        `array`: covariance matrix, such that
+        ``out[p*nl+i1, q*nl+i2]`` is the covariance between
+        ``C^{pairs[p]}(ell[i1])`` and ``C^{pairs[q]}(ell[i2])``, where
+        ``nl = ell.size``.
+    """
+    ell = np.atleast_1d(np.asarray(ell, dtype=float))
+    nl = ell.size
+    npairs = len(pairs)
+    shape = (npairs*nl, npairs*nl)
+    if out is None:
+        out = np.zeros(shape)
+    elif np.shape(out) != shape:
+        raise ValueError(f"Output array must have shape {shape}.")
+
+    ssc = ssc or (sigma2_B is not None)
+
+    cosmo.compute_distances()
+    trs = {p[i]: tracers[p[i]] for p in pairs for i in range(2)}
+    dchi = cosmo.cosmo.spline_params.DCHI_INTEGRATION
+    chipow = 4 if ssc else 6
+    if ssc:
+        if sigma2_B is None:
+            a_s, s2b = sigma2_B_disc(cosmo, fsky=fsky)
+        else:
+            a_s, s2b = _check_array_params(sigma2_B, 'sigma2_B')
+
+    pair_keys = [tuple(sorted(p, key=str)) for p in pairs]
+
+    # Unique blocks, and the range of distances shared by their tracers
+    # (as in the C integrator).
+    blocks = {}
+    for ip, p in enumerate(pair_keys):
+        for iq in range(ip, npairs):
+            q = pair_keys[iq]
+            if (q, p) in blocks:
+                blocks[(q, p)].append((iq, ip))
+            else:
+                blocks.setdefault((p, q), []).append((ip, iq))
+    ranges = {}
+    for key in blocks:
+        ts = [trs[t] for t in key[0] + key[1]]
+        ranges[key] = (max(t.chi_min for t in ts), min(t.chi_max for t in ts))
+
+    # Distance grid, radial weights and transfer functions for each range.
+    grids = {}
+    deltas = {}
+    prods = {}
+    for key, (chimin, chimax) in ranges.items():
+        if chimax <= chimin:
+            continue
+        if (chimin, chimax) not in grids:
+            nchi = int(max((chimax-chimin)/dchi+0.5, 1))+1
+            chi = np.linspace(chimin, chimax, nchi)
+            good = chi > 0
+            a = np.ones(nchi)
+            a[good] = cosmo.scale_factor_of_chi(chi[good])
+            wchi = np.zeros(nchi)
+            wchi[good] = chi[good]**(-chipow)
+            if ssc:
+                wchi *= resample_array(a_s, s2b, a, 'constant', 'constant',
+                                       s2b[0], s2b[-1])
+            else:
+                wchi /= 4*np.pi*fsky
+            grids[(chimin, chimax)] = (chi, a, good, wchi)
+        chi, a, _, _ = grids[(chimin, chimax)]
+        for p in key:
+            for t in p:
+                if (t, chimin, chimax) not in deltas:
+                    deltas[(t, chimin, chimax)] = _limber_transfers(
+                        cosmo, trs[t], ell, chi, a)
+            if (p, chimin, chimax) not in prods:
+                prods[(p, chimin, chimax)] = (
+                    deltas[(p[0], chimin, chimax)]
+                    * deltas[(p[1], chimin, chimax)])
+
+    tkk_cache = {}
+
+    def get_tkk(tk, chi_range):
+        if (id(tk), chi_range) not in tkk_cache:
+            chi, a, good, _ = grids[chi_range]
+            tkk = np.zeros([chi.size, nl, nl])
+            for ic in np.where(good)[0]:
+                # Tk3D returns T(k[j], k[i]); we want T(k1[i], k2[j]).
+                tkk[ic] = tk((ell+0.5)/chi[ic], a[ic]).T
+            tkk_cache[(id(tk), chi_range)] = (tk, tkk)
+        return tkk_cache[(id(tk), chi_range)][1]
+
+    tkks = {}
+    for key in blocks:
+        (ta, tb), (tc, td) = key
+        if isinstance(t_of_kk_a, Tk3D):
+            tk = t_of_kk_a
+        else:
+            tk = t_of_kk_a(ta, tb, tc, td)
+        if ranges[key] in grids:
+            tkks[key] = get_tkk(tk, ranges[key])
+
+    def compute_block(key):
+        if key not in tkks:
+            return key, np.zeros([nl, nl])
+        chimin, chimax = ranges[key]
+        chi, _, _, wchi = grids[(chimin, chimax)]
+        d1 = prods[(key[0], chimin, chimax)] * wchi[None, :]
+        d2 = prods[(key[1], chimin, chimax)]
+        fchi = np.einsum('ic,jc,cij->cij', d1, d2, tkks[key])
+        return key, Akima1DInterpolator(chi, fchi).integrate(chi[0], chi[-1])
+
+    def store(key, cov):
+        for ip, iq in blocks[key]:
+            out[ip*nl:(ip+1)*nl, iq*nl:(iq+1)*nl] = cov
+            if ip != iq:
+                out[iq*nl:(iq+1)*nl, ip*nl:(ip+1)*nl] = cov.T
+
+    if n_workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=n_workers) as ex:
+            for key, cov in ex.map(compute_block, blocks):
+                store(key, cov)
+    else:
+        for key in blocks:
+            store(*compute_block(key))
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def build_cl_covariance_gaussian(cl, ell, *, pairs=None, noise=None,
+                                 fsky=1., delta_ell=1., bpw_windows=None,
+                                 out=None):
+    """Build the Gaussian covariance matrix of a set of angular power
+    spectra. For each pair of power spectra :math:`C_\\ell^{ab}` and
+    :math:`C_\\ell^{cd}`, the covariance is
+
+    .. math::
+        {\\rm Cov}_{\\rm G}(\\ell,\\ell')=\\delta_{\\ell\\ell'}
+        \\frac{\\hat{C}^{ac}_\\ell\\hat{C}^{bd}_\\ell+
+               \\hat{C}^{ad}_\\ell\\hat{C}^{bc}_\\ell}
+              {(2\\ell+1)\\,\\Delta\\ell\\,f_{\\rm sky}},
+
+    where :math:`\\hat{C}^{ab}_\\ell=C^{ab}_\\ell+\\delta_{ab}N^a_\\ell`
+    includes the noise power spectrum of each tracer. If bandpower window
+    functions :math:`W_{b\\ell}` are provided, the covariance of the
+    bandpowers :math:`C_b=\\sum_\\ell W_{b\\ell}C_\\ell` is returned
+    instead.
+
+    The output has the same layout as that of :func:`build_cl_covariance`,
+    so that both can be summed directly. Only the blocks with
+    :math:`(ab)\\leq(cd)` are computed.
+
+    Args:
+        cl (`array`): power spectra of all pairs of tracers, with shape
+            ``(n_tracer, n_tracer, ell.size)``. This array must be symmetric
+            in its first two dimensions.
+        ell (`array`): multipoles at which the power spectra are given.
+        pairs (:obj:`list`): list of pairs ``(a, b)`` of tracer indices
+            defining the power spectra whose covariance will be computed.
+            If ``None``, all pairs with ``a <= b`` are used.
+        noise (:obj:`float` or `array`): noise power spectrum of each
+            tracer. Either a scalar, an array with shape ``(n_tracer,)``
+            (white noise for each tracer) or an array with shape
+            ``(n_tracer, ell.size)``. If ``None``, no noise is added.
+        fsky (:obj:`float`): sky fraction.
+        delta_ell (:obj:`float` or `array`): width of the multipole bin
+            represented by each element of ``ell``.
+        bpw_windows (`array`): if not ``None``, bandpower window functions
+            with shape ``(n_bpw, ell.size)``.
+        out (`array`): if not ``None``, array with shape
+            ``(len(pairs)*n_ell, len(pairs)*n_ell)`` (e.g. a
+            :class:`numpy.memmap`) where the covariance will be written
+            block by block, where ``n_ell`` is ``n_bpw`` or ``ell.size``.
+
+    Returns:
+        `array`: covariance matrix, such that ``out[p*n_ell+i1,
+        q*n_ell+i2]`` is the covariance between the ``i1``-th element of
+        the power spectrum of ``pairs[p]`` and the ``i2``-th element of
+        that of ``pairs[q]``.
+    """
+    cl = np.asarray(cl, dtype=float)
+    ell = np.atleast_1d(np.asarray(ell, dtype=float))
+    ntr = cl.shape[0]
+    if cl.shape != (ntr, ntr, ell.size):
+        raise ValueError("Power spectra must have shape "
+                         "(n_tracer, n_tracer, ell.size).")
+    if pairs is None:
+        pairs = [(i, j) for i in range(ntr) for j in range(i, ntr)]
+    pairs = np.array(pairs, dtype=int).reshape([-1, 2])
+    npairs = len(pairs)
+
+    if noise is not None:
+        cl = cl.copy()
+        noise = np.asarray(noise, dtype=float)
+        if noise.ndim == 1:
+            noise = noise[:, None]
+        cl[np.arange(ntr), np.arange(ntr)] += np.broadcast_to(
+            noise, (ntr, ell.size))
+
+    # Inverse number of modes
+    norm = 1/((2*ell+1)*delta_ell*fsky)
+
+    if bpw_windows is not None:
+        bpw_windows = np.asarray(bpw_windows, dtype=float)
+        if bpw_windows.ndim != 2 or bpw_windows.shape[1] != ell.size:
+            raise ValueError("Bandpower windows must have shape "
+                             "(n_bpw, ell.size).")
+        nb = len(bpw_windows)
+    else:
+        nb = ell.size
+
+    shape = (npairs*nb, npairs*nb)
+    if out is None:
+        out = np.zeros(shape)
+    elif np.shape(out) != shape:
+        raise ValueError(f"Output array must have shape {shape}.")
+
+    ia, ib = pairs.T
+    for ip, (a, b) in enumerate(pairs):
+        # Diagonal of all blocks (ab, cd) with cd >= ab at once.
+        c, d = ia[ip:], ib[ip:]
+        diag = (cl[a, c]*cl[b, d] + cl[a, d]*cl[b, c]) * norm
+        if bpw_windows is None:
+            blocks = map(np.diag, diag)
+        else:
+            blocks = np.einsum('il,ql,jl->qij', bpw_windows, diag,
+                               bpw_windows)
+        for iq, block in enumerate(blocks, start=ip):
+            out[ip*nb:(ip+1)*nb, iq*nb:(iq+1)*nb] = block
+            if iq != ip:
+                out[iq*nb:(iq+1)*nb, ip*nb:(ip+1)*nb] = block.T
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
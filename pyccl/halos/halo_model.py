@@ -63,6 +63,12 @@ class HMCalculator(CCLAutoRepr):
             self._integrator = self._integ_spline
         else:
             raise ValueError("Invalid integration method.")
+        # Integration weights over log10(M): since Simpson's rule is
+        # linear, ∫ dlog10M f(M) = Σ_i w_i f(M_i). The (Akima) spline
+        # integrator is not linear, so it needs the full integrand.
+        self._wM = None
+        if integration_method_M == "simpson":
+            self._wM = self._integrator(np.eye(nM), self._lmass)
 
         # Cache last results for mass function and halo bias.
         self._cosmo_mf = self._cosmo_bf = None
@@ -115,6 +121,35 @@ class HMCalculator(CCLAutoRepr):
         i1 = self._integrator(self._mf * self._bf * array_2, self._lmass)
         return i1 + self._mbf0 * array_2[..., 0]
 
+    def _mass_weights(self, *, get_bf):
+        # Weights w_i such that ∫ dM n(M) [b(M)] f(M) = Σ_i w_i f(M_i),
+        # including the contribution from masses below the integration range.
+        # Only available for Simpson integration.
+        if get_bf:
+            w = self._wM * self._mf * self._bf
+            w[0] += self._mbf0
+        else:
+            w = self._wM * self._mf
+            w[0] += self._mf0
+        return w
+
+    def _integrate_outer(self, uk, uk_p, *, get_bf):
+        #  ∫ dM n(M) [b(M)] f(k,M) g(k',M), with f and g given with shape
+        #  (N_M, N_k) and k' along the first axis of the output. This is a
+        #  matrix product, so no (N_k, N_k, N_M) array is allocated.
+        if self._wM is None:
+            uk = uk.T[None, :, :] * uk_p.T[:, None, :]
+            if get_bf:
+                return self._integrate_over_mbf(uk)
+            return self._integrate_over_mf(uk)
+        w = self._mass_weights(get_bf=get_bf)
+        return (uk_p.T * w) @ uk
+
+    def _get_mass_chunk(self, size, max_memory):
+        # Number of halo masses whose `size` double-precision values per
+        # mass fit within `max_memory` bytes (at least one).
+        return int(min(max(max_memory // (8 * size), 1), self._mass.size))
+
     def integrate_over_massfunc(self, func, cosmo, a):
         """ Returns the integral over mass of a given funcion times
         the mass function:
@@ -287,13 +322,10 @@ class HMCalculator(CCLAutoRepr):
 
         self._check_mass_def(prof, prof2, prof3)
         self._get_ingredients(cosmo, a, get_bf=True)
-        uk1 = prof.fourier(cosmo, k, self._mass, a).T
+        uk1 = prof.fourier(cosmo, k, self._mass, a)
         uk23 = prof_2pt.fourier_2pt(cosmo, k, self._mass, a, prof2,
-                                    prof2=prof3).T
-
-        uk = uk1[None, :, :] * uk23[:, None, :]
-        i13 = self._integrate_over_mbf(uk)
-        return i13
+                                    prof2=prof3)
+        return self._integrate_outer(uk1, uk23, get_bf=True)
 
     def I_0_2(self, cosmo, k, a, prof, *, prof2=None, prof_2pt):
         """ Solves the integral:
@@ -332,7 +364,8 @@ class HMCalculator(CCLAutoRepr):
         uk = prof_2pt.fourier_2pt(cosmo, k, self._mass, a, prof, prof2=prof2).T
         return self._integrate_over_mf(uk)
 
-    def I_1_2(self, cosmo, k, a, prof, *, prof2=None, prof_2pt, diag=True):
+    def I_1_2(self, cosmo, k, a, prof, *, prof2=None, prof_2pt, diag=True,
+              max_memory=None):
         """ Solves the integral:
 
         .. math::
@@ -360,6 +393,14 @@ class HMCalculator(CCLAutoRepr):
             diag (bool): If True, both halo profiles depend on the same k. If
                 False, they will depend on k and k', respectively. Default
                 True.
+            max_memory (:obj:`int`): if ``diag`` is False, approximate
+                maximum size, in bytes, of the two-point moments held in
+                memory at any time. The output is then computed in tiles of
+                ``(k', k)`` pairs and, for ``integration_method_M='simpson'``,
+                the mass integral is accumulated over chunks of halo masses
+                (the ``'spline'`` integrator needs all masses at once). A
+                ``ValueError`` is raised if a single tile does not fit. If
+                ``None``, all wavenumbers and masses are processed at once.
 
         Returns:
              (:obj:`float` or `array`): integral values evaluated at each
@@ -370,13 +411,62 @@ class HMCalculator(CCLAutoRepr):
             prof2 = prof
         self._check_mass_def(prof, prof2)
         self._get_ingredients(cosmo, a, get_bf=True)
-        uk = prof_2pt.fourier_2pt(cosmo, k, self._mass, a, prof,
-                                  prof2=prof2, diag=diag)
-        if diag is True:
-            uk = uk.T
+        if max_memory is None or diag is True:
+            uk = prof_2pt.fourier_2pt(cosmo, k, self._mass, a, prof,
+                                      prof2=prof2, diag=diag)
+            if diag is True:
+                uk = uk.T
+            else:
+                uk = np.transpose(uk, axes=[1, 2, 0])
+            return self._integrate_over_mbf(uk)
+
+        k_use = np.atleast_1d(k)
+        nk = k_use.size
+        nM = self._mass.size
+        # Smallest number of masses processed at once: Simpson's rule is
+        # linear, so its sum can be accumulated one mass at a time.
+        linear = self._wM is not None
+        min_chunk = 1 if linear else nM
+        if 8 * min_chunk * nk**2 <= max_memory:
+            tile = nk
         else:
-            uk = np.transpose(uk, axes=[1, 2, 0])
-        i12 = self._integrate_over_mbf(uk)
+            # Off-diagonal tiles need the moments on the union of the two
+            # sets of wavenumbers, of size up to twice the tile.
+            tile = int(np.sqrt(max_memory / (8 * min_chunk))) // 2
+        if tile < 1:
+            raise ValueError(
+                f"max_memory={max_memory} bytes is too small to hold the "
+                f"two-point moments of {min_chunk} halo mass(es).")
+        w = self._mass_weights(get_bf=True) if linear else None
+
+        i12 = np.zeros([nk, nk])
+        tiles = [np.arange(i0, min(i0+tile, nk)) for i0 in range(0, nk, tile)]
+        for ik_p in tiles:
+            for ik in tiles:
+                # Wavenumbers needed by this tile, and the positions of the
+                # k' (rows) and k (columns) of the tile among them.
+                ik_u = np.union1d(ik_p, ik)
+                pos_p = np.searchsorted(ik_u, ik_p)
+                pos = np.searchsorted(ik_u, ik)
+                if linear:
+                    chunk = self._get_mass_chunk(ik_u.size**2, max_memory)
+                else:
+                    chunk = nM
+                block = 0
+                for i0 in range(0, nM, chunk):
+                    uk = prof_2pt.fourier_2pt(
+                        cosmo, k_use[ik_u], self._mass[i0:i0+chunk], a,
+                        prof, prof2=prof2, diag=False)
+                    uk = uk.reshape([-1, ik_u.size, ik_u.size])
+                    uk = uk[:, pos_p][:, :, pos]
+                    if linear:
+                        block += np.tensordot(w[i0:i0+chunk], uk, axes=1)
+                    else:
+                        block = self._integrate_over_mbf(
+                            np.transpose(uk, axes=[1, 2, 0]))
+                i12[ik_p[0]:ik_p[-1]+1, ik[0]:ik[-1]+1] = block
+        if np.ndim(k) == 0:
+            return i12[0, 0]
         return i12
 
     def I_0_22(self, cosmo, k, a, prof, *,
@@ -432,13 +522,13 @@ class HMCalculator(CCLAutoRepr):
         self._check_mass_def(prof, prof2, prof3, prof4)
         self._get_ingredients(cosmo, a, get_bf=False)
         uk12 = prof12_2pt.fourier_2pt(
-            cosmo, k, self._mass, a, prof, prof2=prof2).T
+            cosmo, k, self._mass, a, prof, prof2=prof2)
 
         if (prof, prof2, prof12_2pt) == (prof3, prof4, prof34_2pt):
             # 4pt approximation of the same profile
             uk34 = uk12
         else:
             uk34 = prof34_2pt.fourier_2pt(
-                cosmo, k, self._mass, a, prof3, prof2=prof4).T
+                cosmo, k, self._mass, a, prof3, prof2=prof4)
 
-        return self._integrate_over_mf(uk12[None, :, :] * uk34[:, None, :])
+        return self._integrate_outer(uk12, uk34, get_bf=False)
@@ -5,6 +5,9 @@ __all__ = ("halomod_trispectrum_1h", "halomod_Tk3D_1h",
            "halomod_Tk3D_SSC_linear_bias", "halomod_Tk3D_SSC",
            "halomod_Tk3D_cNG")
 
+import copy
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import scipy
 
@@ -14,7 +17,7 @@ from . import HaloProfileNFW, Profile2pt
 
 def halomod_trispectrum_1h(cosmo, hmc, k, a, prof, *,
                            prof2=None, prof3=None, prof4=None,
-                           prof12_2pt=None, prof34_2pt=None):
+                           prof12_2pt=None, prof34_2pt=None, out=None):
     """ Computes the halo model 1-halo trispectrum for four different
     quantities defined by their respective halo profiles. The 1-halo
     trispectrum for four profiles :math:`u_{1,2}`, :math:`v_{1,2}` is
@@ -56,6 +59,9 @@ def halomod_trispectrum_1h(cosmo, hmc, k, a, prof, *,
             ``prof2`` will be used as ``prof4``.
         prof34_2pt (:class:`~pyccl.halos.profiles_2pt.Profile2pt`):
             same as ``prof12_2pt`` for ``prof3`` and ``prof4``.
+        out (`array`): if not ``None``, array of shape ``(N_a, N_k, N_k)``
+            (e.g. a :class:`numpy.memmap`) in which the trispectrum will be
+            stored. It will also be returned.
 
     Returns:
         (:obj:`float` or `array`): 1-halo trispectrum evaluated at each
@@ -75,7 +81,7 @@ def halomod_trispectrum_1h(cosmo, hmc, k, a, prof, *,
 
     na = len(a_use)
     nk = len(k_use)
-    out = np.zeros([na, nk, nk])
+    out = _get_output(out, na, nk)
     for ia, aa in enumerate(a_use):
         # normalizations
         norm1 = prof.get_normalization(cosmo, aa, hmc=hmc)
@@ -117,7 +123,8 @@ def halomod_Tk3D_1h(cosmo, hmc, prof, *,
                     prof12_2pt=None, prof34_2pt=None,
                     lk_arr=None, a_arr=None,
                     extrap_order_lok=1, extrap_order_hik=1,
-                    use_log=False):
+                    use_log=False, rank_tol=None, out=None,
+                    executor=None, n_workers=1):
     """ Returns a :class:`~pyccl.tk3d.Tk3D` object containing
     the 1-halo trispectrum for four quantities defined by
     their respective halo profiles. See :meth:`halomod_trispectrum_1h`
@@ -159,6 +166,30 @@ def halomod_Tk3D_1h(cosmo, hmc, prof, *,
         use_log (:obj:`bool`): if ``True``, the trispectrum will be
             interpolated in log-space (unless negative or
             zero values are found).
+        rank_tol (:obj:`float`): if not ``None``, the trispectrum will be
+            stored as a low-rank expansion with this relative
+            tolerance. See :class:`~pyccl.tk3d.Tk3D`.
+        out (:obj:`array`): if not ``None``, array of shape
+            ``(N_a, N_k, N_k)`` (e.g. a :class:`numpy.memmap`) in which the
+            trispectrum is computed before being interpolated, instead of
+            allocating a new one. If ``use_log`` is ``True``, it will hold
+            the logarithm of the trispectrum on output.
+        executor (:class:`concurrent.futures.Executor`): if not ``None``,
+            executor to which the chunks of scale factors (see
+            ``n_workers``) are submitted. If ``None`` and ``n_workers`` is
+            larger than 1, a :class:`~concurrent.futures.ProcessPoolExecutor`
+            with ``n_workers`` processes is used. With process pools, all the
+            inputs (including custom profiles) must be picklable, and each
+            worker computes with its own copy of them. A
+            :class:`~concurrent.futures.ThreadPoolExecutor` avoids copying
+            the inputs, but gains little since most of the calculation holds
+            the GIL. Its threads share ``cosmo``, the profiles and
+            ``p_of_k_a``, which are then only read (``cosmo`` is
+            precomputed before dispatching), so custom profiles caching
+            results must do so in a thread-safe way.
+        n_workers (:obj:`int`): number of chunks into which ``a_arr`` is
+            split and evaluated in parallel, each with its own copy of
+            ``hmc``.
 
     Returns:
         :class:`~pyccl.tk3d.Tk3D`: 1-halo trispectrum.
@@ -168,17 +199,20 @@ def halomod_Tk3D_1h(cosmo, hmc, prof, *,
     if a_arr is None:
         a_arr = cosmo.get_pk_spline_a()
 
-    tkk = halomod_trispectrum_1h(cosmo, hmc, np.exp(lk_arr), a_arr,
-                                 prof, prof2=prof2,
-                                 prof12_2pt=prof12_2pt,
-                                 prof3=prof3, prof4=prof4,
-                                 prof34_2pt=prof34_2pt)
+    tkk = _parallel_over_a(halomod_trispectrum_1h,
+                           cosmo, hmc, np.exp(lk_arr), a_arr,
+                           prof, prof2=prof2,
+                           prof12_2pt=prof12_2pt,
+                           prof3=prof3, prof4=prof4,
+                           prof34_2pt=prof34_2pt, out=out,
+                           executor=executor, n_workers=n_workers)
 
-    tkk, use_log = _logged_output(tkk, log=use_log)
+    tkk, use_log = _logged_output(tkk, log=use_log, inplace=out is not None)
 
     return Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkk,
                 extrap_order_lok=extrap_order_lok,
-                extrap_order_hik=extrap_order_hik, is_logt=use_log)
+                extrap_order_hik=extrap_order_hik, is_logt=use_log,
+                rank_tol=rank_tol)
 
 
 def halomod_Tk3D_SSC_linear_bias(cosmo, hmc, *, prof,
@@ -324,7 +358,7 @@ def halomod_Tk3D_SSC(
         prof12_2pt=None, prof34_2pt=None,
         p_of_k_a=None, lk_arr=None, a_arr=None,
         extrap_order_lok=1, extrap_order_hik=1, use_log=False,
-        extrap_pk=False):
+        extrap_pk=False, executor=None, n_workers=1):
     """ Returns a :class:`~pyccl.tk3d.Tk3D` object containing
     the super-sample covariance trispectrum, given by the tensor
     product of the power spectrum responses associated with the
@@ -392,6 +426,11 @@ def halomod_Tk3D_SSC(
             Whether to extrapolate ``p_of_k_a`` in case ``a`` is out of its
             support. If ``False``, and the queried values are out of bounds,
             an error is raised. The default is ``False``.
+        executor (:class:`concurrent.futures.Executor`): executor used to
+            parallelize the calculation over scale factors. See
+            :meth:`halomod_Tk3D_1h`.
+        n_workers (:obj:`int`): number of chunks of scale factors evaluated
+            in parallel. See :meth:`halomod_Tk3D_1h`.
 
     Returns:
         :class:`~pyccl.tk3d.Tk3D`: SSC effective trispectrum.
@@ -405,12 +444,30 @@ def halomod_Tk3D_SSC(
     prof, prof2, prof3, prof4, prof12_2pt, prof34_2pt = \
         _allocate_profiles(prof, prof2, prof3, prof4, prof12_2pt, prof34_2pt)
 
-    k_use = np.exp(lk_arr)
+    dpk12, dpk34 = _parallel_over_a(
+        _get_ssc_responses, cosmo, hmc, np.exp(lk_arr), a_arr, prof,
+        prof2=prof2, prof3=prof3, prof4=prof4, prof12_2pt=prof12_2pt,
+        prof34_2pt=prof34_2pt, p_of_k_a=p_of_k_a, extrap_pk=extrap_pk,
+        executor=executor, n_workers=n_workers)
+
+    dpk12, dpk34, use_log = _logged_output(dpk12, dpk34, log=use_log)
+
+    return Tk3D(a_arr=a_arr, lk_arr=lk_arr,
+                pk1_arr=dpk12, pk2_arr=dpk34,
+                extrap_order_lok=extrap_order_lok,
+                extrap_order_hik=extrap_order_hik, is_logt=use_log)
+
+
+def _get_ssc_responses(cosmo, hmc, k, a, prof, *, prof2, prof3, prof4,
+                       prof12_2pt, prof34_2pt, p_of_k_a, extrap_pk):
+    # Power spectrum responses entering halomod_Tk3D_SSC, with shape
+    # (N_a, N_k) each.
+    k_use = np.atleast_1d(k)
     pk2d = cosmo.parse_pk(p_of_k_a)
     extrap = cosmo if extrap_pk else None  # extrapolation rule for pk2d
 
-    dpk12, dpk34 = [np.zeros((len(a_arr), len(k_use))) for _ in range(2)]
-    for ia, aa in enumerate(a_arr):
+    dpk12, dpk34 = [np.zeros((len(a), len(k_use))) for _ in range(2)]
+    for ia, aa in enumerate(a):
         # normalizations & I11 integral
         norm1 = prof.get_normalization(cosmo, aa, hmc=hmc)
         i11_1 = hmc.I_1_1(cosmo, k_use, aa, prof)
@@ -474,12 +531,7 @@ def halomod_Tk3D_SSC(
                 dpk34[ia] -= _get_counterterm(prof3, prof4, prof34_2pt,
                                               norm3, norm4, i11_3, i11_4)
 
-    dpk12, dpk34, use_log = _logged_output(dpk12, dpk34, log=use_log)
-
-    return Tk3D(a_arr=a_arr, lk_arr=lk_arr,
-                pk1_arr=dpk12, pk2_arr=dpk34,
-                extrap_order_lok=extrap_order_lok,
-                extrap_order_hik=extrap_order_hik, is_logt=use_log)
+    return dpk12, dpk34
 
 
 def _allocate_profiles(prof, prof2, prof3, prof4, prof12_2pt, prof34_2pt):
@@ -598,7 +650,90 @@ def _get_ints_I_1_1(hmc, cosmo, k_use, aa, prof, prof2, prof3, prof4):
     return i1, i2, i3, i4
 
 
-def _logged_output(*arrs, log):
+def _isotropize(integ, order):
+    # Average of integ(theta) over theta in [0, pi]. If `order` is not None,
+    # a Gauss-Legendre quadrature with `order` nodes in ln(pi - theta) is
+    # used. This resolves the sharp features of the integrands close to
+    # theta = pi, where |k + k'| ~ |k - k'|, and the contribution from
+    # pi - theta < 1E-8 is neglected. All nodes are evaluated at once, along
+    # the third-to-last axis of the integrand.
+    if order is None:
+        return scipy.integrate.quad_vec(integ, 0, np.pi)[0] / np.pi
+    x, w = np.polynomial.legendre.leggauss(order)
+    lphi_min, lphi_max = np.log(1E-8), np.log(np.pi)
+    phi = np.exp(lphi_min + 0.5 * (lphi_max - lphi_min) * (x + 1))
+    w = 0.5 * (lphi_max - lphi_min) * w * phi
+    theta = np.pi - phi
+    return np.sum(integ(theta[:, None, None]) * w[:, None, None],
+                  axis=-3) / np.pi
+
+
+def _call_on_chunk(func, cosmo, hmc, k, a, args, kwargs):
+    return func(cosmo, hmc, k, a, *args, **kwargs)
+
+
+def _parallel_over_a(func, cosmo, hmc, k, a, *args, executor=None,
+                     n_workers=1, out=None, **kwargs):
+    # Evaluates func(cosmo, hmc, k, a, *args, **kwargs) for chunks of scale
+    # factors in parallel. The outputs (arrays, or tuples of arrays, with the
+    # scale factor along the first axis) are concatenated in the order of a.
+    # If `out` is not None, the (single) output of each chunk is stored in it
+    # as soon as it is available, and `func` must accept an `out` argument.
+    # Without an executor, the chunks are sent to worker processes, each of
+    # which works on its own (pickled) copy of all the inputs.
+    if executor is None and n_workers <= 1:
+        if out is not None:
+            kwargs["out"] = out
+        return func(cosmo, hmc, k, a, *args, **kwargs)
+
+    a_chunks = np.array_split(np.atleast_1d(a), min(n_workers, np.size(a)))
+    n_chunks = len(a_chunks)
+    # Compute the cosmological quantities needed by all chunks beforehand
+    # (worker processes receive the power spectra, and threads do not race
+    # to compute them), and give each chunk its own copy of the calculator
+    # (and its cache).
+    cosmo.compute_growth()
+    cosmo.compute_sigma()
+    if str(kwargs.get("p_of_k_a")) == "nonlinear":
+        cosmo.compute_nonlin_power()
+    hmcs = [copy.copy(hmc) for _ in range(n_chunks)]
+    inputs = ([func]*n_chunks, [cosmo]*n_chunks, hmcs, [k]*n_chunks,
+              a_chunks, [args]*n_chunks, [kwargs]*n_chunks)
+    if out is not None:
+        out = _get_output(out, np.size(a), np.size(k))
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=n_workers) as ex:
+            outs = _collect_chunks(ex.map(_call_on_chunk, *inputs), out)
+    else:
+        outs = _collect_chunks(executor.map(_call_on_chunk, *inputs), out)
+
+    if out is not None:
+        return out
+    if isinstance(outs[0], tuple):
+        return tuple(np.concatenate(o) for o in zip(*outs))
+    return np.concatenate(outs)
+
+
+def _collect_chunks(results, out):
+    # Stores the chunks in `out` as they come in, or returns them all.
+    if out is None:
+        return list(results)
+    i0 = 0
+    for res in results:
+        out[i0:i0+len(res)] = res
+        i0 += len(res)
+
+
+def _get_output(out, na, nk):
+    # Array where a trispectrum will be stored.
+    if out is None:
+        return np.zeros([na, nk, nk])
+    if np.shape(out) != (na, nk, nk):
+        raise ValueError(f"out should have shape {(na, nk, nk)}")
+    return out
+
+
+def _logged_output(*arrs, log, inplace=False):
     """Helper that logs the output if needed."""
     if not log:
         return *arrs, log
@@ -608,14 +743,16 @@ def _logged_output(*arrs, log):
                       "Interpolating linearly.",
                       category=CCLWarning, importance='high')
         return *arrs, False
-    return *[np.log(arr) for arr in arrs], log
+    return *[np.log(arr, out=arr if inplace else None)
+             for arr in arrs], log
 
 
 def halomod_trispectrum_2h_22(cosmo, hmc, k, a, prof, *, prof2=None,
                               prof3=None, prof4=None, prof13_2pt=None,
                               prof14_2pt=None, prof24_2pt=None,
                               prof32_2pt=None, p_of_k_a=None,
-                              separable_growth=False):
+                              separable_growth=False, max_memory=None,
+                              out=None, angular_order=None):
     """ Computes the "22" term of the isotropized halo model 2-halo trispectrum
     for four profiles :math:`u_{1,2}`, :math:`v_{1,2}` as
 
@@ -672,6 +809,18 @@ def halomod_trispectrum_2h_22(cosmo, hmc, k, a, prof, *, prof2=None,
         separable_growth (bool): Indicates whether a separable
             growth function approximation can be used to calculate
             the isotropized power spectrum.
+        max_memory (int): approximate maximum size, in bytes, of the
+            intermediate arrays used in the mass integrals over pairs of
+            wavenumbers. See
+            :meth:`~pyccl.halos.halo_model.HMCalculator.I_1_2`.
+        out (array_like): if not `None`, array of shape `(N_a, N_k, N_k)`
+            (e.g. a `numpy.memmap`) in which the trispectrum will be
+            stored. It will also be returned.
+        angular_order (int): if not `None`, number of nodes of the
+            Gauss-Legendre quadrature (in :math:`\\log(\\pi-\\theta)`) used to
+            average over the angle between the two wavenumbers, with all
+            nodes evaluated at once. Values of ~100 typically achieve
+            sub-percent accuracy. If `None`, an adaptive quadrature is used.
 
     Returns:
         float or array_like: integral values evaluated at each
@@ -703,12 +852,11 @@ def halomod_trispectrum_2h_22(cosmo, hmc, k, a, prof, *, prof2=None,
             k = np.sqrt(k_use[:, None]**2+k_use[None, :]**2
                         + 2*k_use[None, :]*k_use[:, None]*mu)
             kk = k.flatten()
-            pk = pk2d(kk, aa, cosmo).reshape([nk, nk])
+            pk = pk2d(kk, aa, cosmo).reshape(k.shape)
             return pk
-        int_pk = scipy.integrate.quad_vec(integ, 0, np.pi)[0]
-        return int_pk/np.pi
+        return _isotropize(integ, angular_order)
 
-    out = np.zeros([na, nk, nk])
+    out = _get_output(out, na, nk)
     if separable_growth:
         p_separable = get_isotropized_pkr(1.0)
     for ia, aa in enumerate(a_use):
@@ -726,7 +874,8 @@ def halomod_trispectrum_2h_22(cosmo, hmc, k, a, prof, *, prof2=None,
 
         # Permutation 1
         i13 = hmc.I_1_2(cosmo, k_use, aa, prof, prof2=prof3,
-                        prof_2pt=prof13_2pt, diag=False)
+                        prof_2pt=prof13_2pt, diag=False,
+                        max_memory=max_memory)
 
         if (([prof2, prof4] == [prof, prof3]) or
            [prof2, prof4] == [prof3, prof]) and \
@@ -734,7 +883,8 @@ def halomod_trispectrum_2h_22(cosmo, hmc, k, a, prof, *, prof2=None,
             i24 = i13
         else:
             i24 = hmc.I_1_2(cosmo, k_use, aa, prof2, prof2=prof4,
-                            prof_2pt=prof24_2pt, diag=False)
+                            prof_2pt=prof24_2pt, diag=False,
+                            max_memory=max_memory)
         # Permutation 2
         if (prof4 == prof3) and (prof14_2pt == prof13_2pt):
             i14 = i13
@@ -742,7 +892,8 @@ def halomod_trispectrum_2h_22(cosmo, hmc, k, a, prof, *, prof2=None,
             i14 = i24
         else:
             i14 = hmc.I_1_2(cosmo, k_use, aa, prof, prof2=prof4,
-                            prof_2pt=prof14_2pt, diag=False)
+                            prof_2pt=prof14_2pt, diag=False,
+                            max_memory=max_memory)
 
         if (prof2 == prof) and (prof32_2pt == prof13_2pt):
             i32 = i13.T
@@ -754,7 +905,8 @@ def halomod_trispectrum_2h_22(cosmo, hmc, k, a, prof, *, prof2=None,
             i32 = i14.T
         else:
             i32 = hmc.I_1_2(cosmo, k_use, aa, prof3, prof2=prof2,
-                            prof_2pt=prof32_2pt, diag=False)
+                            prof_2pt=prof32_2pt, diag=False,
+                            max_memory=max_memory)
 
         tk_2h_22 = p * (i13 * i24 + i14 * i32)
         # Normalize
@@ -771,7 +923,7 @@ def halomod_trispectrum_2h_22(cosmo, hmc, k, a, prof, *, prof2=None,
 def halomod_trispectrum_2h_13(cosmo, hmc, k, a, prof, *,
                               prof2=None, prof3=None, prof4=None,
                               prof12_2pt=None, prof34_2pt=None,
-                              p_of_k_a=None):
+                              p_of_k_a=None, out=None):
     """ Computes the "12" term of the isotropized halo model 2-halo trispectrum
     for four profiles :math:`u_{1,2}`, :math:`v_{1,2}` as
 
@@ -820,6 +972,9 @@ def halomod_trispectrum_2h_13(cosmo, hmc, k, a, prof, *,
         p_of_k_a (:class:`~pyccl.pk2d.Pk2D`): a `Pk2D` object to
             be used as the linear matter power spectrum. If `None`, the power
             spectrum stored within `cosmo` will be used.
+        out (array_like): if not `None`, array of shape `(N_a, N_k, N_k)`
+            (e.g. a `numpy.memmap`) in which the trispectrum will be
+            stored. It will also be returned.
 
     Returns:
         float or array_like: integral values evaluated at each
@@ -843,7 +998,7 @@ def halomod_trispectrum_2h_13(cosmo, hmc, k, a, prof, *,
 
     na = len(a_use)
     nk = len(k_use)
-    out = np.zeros([na, nk, nk])
+    out = _get_output(out, na, nk)
     for ia, aa in enumerate(a_use):
         # Compute profile normalizations
         norm1, norm2, norm3, norm4 = _get_norms(prof, prof2, prof3, prof4,
@@ -928,7 +1083,8 @@ def halomod_trispectrum_3h(cosmo, hmc, k, a, prof, *, prof2=None,
                            prof3=None, prof4=None,
                            prof13_2pt=None, prof14_2pt=None,
                            prof24_2pt=None, prof32_2pt=None,
-                           p_of_k_a=None, separable_growth=False):
+                           p_of_k_a=None, separable_growth=False,
+                           max_memory=None, out=None, angular_order=None):
     """ Computes the isotropized halo model 3-halo trispectrum for four
     profiles :math:`u_{1,2}`, :math:`v_{1,2}` as
 
@@ -987,6 +1143,18 @@ def halomod_trispectrum_3h(cosmo, hmc, k, a, prof, *, prof2=None,
         separable_growth (bool): Indicates whether a separable
             growth function approximation can be used to calculate
             the isotropized power spectrum.
+        max_memory (int): approximate maximum size, in bytes, of the
+            intermediate arrays used in the mass integrals over pairs of
+            wavenumbers. See
+            :meth:`~pyccl.halos.halo_model.HMCalculator.I_1_2`.
+        out (array_like): if not `None`, array of shape `(N_a, N_k, N_k)`
+            (e.g. a `numpy.memmap`) in which the trispectrum will be
+            stored. It will also be returned.
+        angular_order (int): if not `None`, number of nodes of the
+            Gauss-Legendre quadrature (in :math:`\\log(\\pi-\\theta)`) used to
+            average over the angle between the two wavenumbers, with all
+            nodes evaluated at once. Values of ~100 typically achieve
+            sub-percent accuracy. If `None`, an adaptive quadrature is used.
 
     Returns:
         float or array_like: integral values evaluated at each
@@ -1036,7 +1204,7 @@ def halomod_trispectrum_3h(cosmo, hmc, k, a, prof, *, prof2=None,
             kr, f2 = get_kr_and_f2(theta)
             pkr = pk2d(kr.flatten(), a, cosmo).reshape(kr.shape)
             return pkr * f2
-        P3 = scipy.integrate.quad_vec(integ, 0, np.pi)[0] / np.pi
+        P3 = _isotropize(integ, angular_order)
 
         Bpt = 6. / 7. * pk * pk.T + 2 * pk * P3
         Bpt += Bpt.T
@@ -1046,7 +1214,7 @@ def halomod_trispectrum_3h(cosmo, hmc, k, a, prof, *, prof2=None,
     na = len(a_use)
     nk = len(k_use)
 
-    out = np.zeros([na, nk, nk])
+    out = _get_output(out, na, nk)
 
     if separable_growth:
         Bpt_separable = get_Bpt(1.0)
@@ -1063,13 +1231,15 @@ def halomod_trispectrum_3h(cosmo, hmc, k, a, prof, *, prof2=None,
 
         # Permutation 1: 2 <-> 3
         i24 = hmc.I_1_2(cosmo, k_use, aa, prof2, prof2=prof4,
-                        prof_2pt=prof24_2pt, diag=False)
+                        prof_2pt=prof24_2pt, diag=False,
+                        max_memory=max_memory)
         # Permutation 2: 2 <-> 4
         if (prof3 == prof4) and (prof32_2pt == prof24_2pt):
             i32 = i24.T
         else:
             i32 = hmc.I_1_2(cosmo, k_use, aa, prof3, prof2=prof2,
-                            prof_2pt=prof32_2pt, diag=False)
+                            prof_2pt=prof32_2pt, diag=False,
+                            max_memory=max_memory)
         # Permutation 3: 1 <-> 3
         if (prof == prof2) and (prof14_2pt == prof24_2pt):
             i14 = i24
@@ -1079,7 +1249,8 @@ def halomod_trispectrum_3h(cosmo, hmc, k, a, prof, *, prof2=None,
             i14 = i32.T
         else:
             i14 = hmc.I_1_2(cosmo, k_use, aa, prof, prof2=prof4,
-                            prof_2pt=prof14_2pt, diag=False)
+                            prof_2pt=prof14_2pt, diag=False,
+                            max_memory=max_memory)
         # Permutation 4: 1 <-> 4
         if (prof == prof2) and (prof13_2pt == prof32_2pt):
             i31 = i32
@@ -1091,7 +1262,8 @@ def halomod_trispectrum_3h(cosmo, hmc, k, a, prof, *, prof2=None,
             i31 = i24.T
         else:
             i31 = hmc.I_1_2(cosmo, k_use, aa, prof3, prof2=prof,
-                            prof_2pt=prof13_2pt, diag=False)
+                            prof_2pt=prof13_2pt, diag=False,
+                            max_memory=max_memory)
 
         # Permutation 5: 12 <-> 34 is 0 due to Bpt_3_4_12=0
         if separable_growth:
@@ -1115,7 +1287,8 @@ def halomod_trispectrum_3h(cosmo, hmc, k, a, prof, *, prof2=None,
 
 
 def halomod_trispectrum_4h(cosmo, hmc, k, a, prof, prof2=None, prof3=None,
-                           prof4=None, p_of_k_a=None, separable_growth=False):
+                           prof4=None, p_of_k_a=None, separable_growth=False,
+                           out=None, angular_order=None):
     """ Computes the isotropized halo model 4-halo trispectrum for four
     profiles :math:`u_{1,2}`, :math:`v_{1,2}` as
 
@@ -1161,6 +1334,14 @@ def halomod_trispectrum_4h(cosmo, hmc, k, a, prof, prof2=None, prof3=None,
         separable_growth (bool): Indicates whether a separable
             growth function approximation can be used to calculate
             the isotropized power spectrum.
+        out (array_like): if not `None`, array of shape `(N_a, N_k, N_k)`
+            (e.g. a `numpy.memmap`) in which the trispectrum will be
+            stored. It will also be returned.
+        angular_order (int): if not `None`, number of nodes of the
+            Gauss-Legendre quadrature (in :math:`\\log(\\pi-\\theta)`) used to
+            average over the angle between the two wavenumbers, with all
+            nodes evaluated at once. Values of ~100 typically achieve
+            sub-percent accuracy. If `None`, an adaptive quadrature is used.
 
     Returns:
         float or array_like: integral values evaluated at each
@@ -1199,9 +1380,9 @@ def halomod_trispectrum_4h(cosmo, hmc, k, a, prof, prof2=None, prof3=None,
                 2/7. * k ** 2 / kr2 * (1 + kp / k * cth)**2
             f2[np.where(kr == 0)] = 13. / 28
 
-            pkr = pk2d(kr.flatten(), a, cosmo).reshape((nk, nk))
-            return np.array([pkr * f2**2, pkr * f2 * f2.T])
-        P4A, P4X = scipy.integrate.quad_vec(integ, 0, np.pi)[0] / np.pi
+            pkr = pk2d(kr.flatten(), a, cosmo).reshape(kr.shape)
+            return np.array([pkr * f2**2, pkr * f2 * np.swapaxes(f2, -1, -2)])
+        P4A, P4X = _isotropize(integ, angular_order)
 
         return P4A, P4X
 
@@ -1219,15 +1400,14 @@ def halomod_trispectrum_4h(cosmo, hmc, k, a, prof, prof2=None, prof3=None,
             intd[np.where(kr == 0)] = 0
             return intd
 
-        isotropized_integ = \
-            scipy.integrate.quad_vec(integ, 0, np.pi)[0] / np.pi
+        isotropized_integ = _isotropize(integ, angular_order)
 
         X = -7./4. * (1 + r**2) + isotropized_integ
 
         return X
 
     X = get_X()
-    out = np.zeros([na, nk, nk])
+    out = _get_output(out, na, nk)
     if separable_growth:
         pk_separable = pk2d(k_use, 1.0, cosmo)[None, :]
         P4A_separable, P4X_separable = get_P4A_P4X(1.0)
@@ -1278,7 +1458,9 @@ def halomod_Tk3D_2h(cosmo, hmc,
                     p_of_k_a=None,
                     lk_arr=None, a_arr=None,
                     extrap_order_lok=1, extrap_order_hik=1, use_log=False,
-                    separable_growth=False):
+                    separable_growth=False,
+                    rank_tol=None, max_memory=None, out=None,
+                    angular_order=None, executor=None, n_workers=1):
     """ Returns a :class:`~pyccl.tk3d.Tk3D` object containing the 2-halo
     trispectrum for four quantities defined by their respective halo profiles.
     See :meth:`halomod_trispectrum_1h` for more details about the actual
@@ -1337,6 +1519,23 @@ def halomod_Tk3D_2h(cosmo, hmc,
         separable_growth (bool): Indicates whether a separable
             growth function approximation can be used to calculate
             the isotropized power spectrum.
+        rank_tol (float): if not ``None``, the trispectrum will be
+            stored as a low-rank expansion with this relative
+            tolerance. See :class:`~pyccl.tk3d.Tk3D`.
+        max_memory (int): approximate maximum size, in bytes, of the
+            intermediate arrays used in the mass integrals. See
+            :meth:`halomod_trispectrum_2h_22`.
+        angular_order (int): number of nodes of the Gauss-Legendre
+            quadrature used to average over angles. See
+            :meth:`halomod_trispectrum_2h_22`.
+        out (array_like): if not `None`, array of shape `(N_a, N_k, N_k)`
+            in which the trispectrum is computed before being interpolated.
+            See :meth:`halomod_Tk3D_1h`.
+        executor (:class:`concurrent.futures.Executor`): executor used to
+            parallelize the calculation over scale factors. See
+            :meth:`halomod_Tk3D_1h`.
+        n_workers (:obj:`int`): number of chunks of scale factors evaluated
+            in parallel. See :meth:`halomod_Tk3D_1h`.
 
     Returns:
         :class:`~pyccl.tk3d.Tk3D`: 2-halo trispectrum.
@@ -1346,30 +1545,35 @@ def halomod_Tk3D_2h(cosmo, hmc,
     if a_arr is None:
         a_arr = cosmo.get_pk_spline_a()
 
-    tkk_2h_22 = halomod_trispectrum_2h_22(cosmo, hmc, np.exp(lk_arr), a_arr,
-                                          prof, prof2=prof2,
-                                          prof3=prof3, prof4=prof4,
-                                          prof13_2pt=prof13_2pt,
-                                          prof14_2pt=prof14_2pt,
-                                          prof24_2pt=prof24_2pt,
-                                          prof32_2pt=prof32_2pt,
-                                          p_of_k_a=p_of_k_a,
-                                          separable_growth=separable_growth)
-
-    tkk_2h_13 = halomod_trispectrum_2h_13(cosmo, hmc, np.exp(lk_arr), a_arr,
-                                          prof, prof2=prof2,
-                                          prof3=prof3, prof4=prof4,
-                                          prof12_2pt=prof12_2pt,
-                                          prof34_2pt=prof34_2pt,
-                                          p_of_k_a=p_of_k_a)
-
-    tkk = tkk_2h_22 + tkk_2h_13
-
-    tkk, use_log = _logged_output(tkk, log=use_log)
+    tkk = _parallel_over_a(halomod_trispectrum_2h_22,
+                           cosmo, hmc, np.exp(lk_arr), a_arr,
+                           prof, prof2=prof2,
+                           prof3=prof3, prof4=prof4,
+                           prof13_2pt=prof13_2pt,
+                           prof14_2pt=prof14_2pt,
+                           prof24_2pt=prof24_2pt,
+                           prof32_2pt=prof32_2pt,
+                           p_of_k_a=p_of_k_a,
+                           separable_growth=separable_growth,
+                           max_memory=max_memory,
+                           angular_order=angular_order, out=out,
+                           executor=executor, n_workers=n_workers)
+
+    tkk += _parallel_over_a(halomod_trispectrum_2h_13,
+                            cosmo, hmc, np.exp(lk_arr), a_arr,
+                            prof, prof2=prof2,
+                            prof3=prof3, prof4=prof4,
+                            prof12_2pt=prof12_2pt,
+                            prof34_2pt=prof34_2pt,
+                            p_of_k_a=p_of_k_a,
+                            executor=executor, n_workers=n_workers)
+
+    tkk, use_log = _logged_output(tkk, log=use_log, inplace=out is not None)
 
     tk3d = Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkk,
                 extrap_order_lok=extrap_order_lok,
-                extrap_order_hik=extrap_order_hik, is_logt=use_log)
+                extrap_order_hik=extrap_order_hik, is_logt=use_log,
+                rank_tol=rank_tol)
     return tk3d
 
 
@@ -1379,7 +1583,9 @@ def halomod_Tk3D_3h(cosmo, hmc,
                     prof32_2pt=None,
                     lk_arr=None, a_arr=None, p_of_k_a=None,
                     extrap_order_lok=1, extrap_order_hik=1,
-                    use_log=False, separable_growth=False):
+                    use_log=False, separable_growth=False,
+                    rank_tol=None, max_memory=None, out=None,
+                    angular_order=None, executor=None, n_workers=1):
     """ Returns a :class:`~pyccl.tk3d.Tk3D` object containing
     the 3-halo trispectrum for four quantities defined by
     their respective halo profiles. See :meth:`halomod_trispectrum_3h`
@@ -1434,6 +1640,23 @@ def halomod_Tk3D_3h(cosmo, hmc,
         separable_growth (bool): Indicates whether a separable
             growth function approximation can be used to calculate
             the isotropized power spectrum.
+        rank_tol (float): if not ``None``, the trispectrum will be
+            stored as a low-rank expansion with this relative
+            tolerance. See :class:`~pyccl.tk3d.Tk3D`.
+        max_memory (int): approximate maximum size, in bytes, of the
+            intermediate arrays used in the mass integrals. See
+            :meth:`halomod_trispectrum_2h_22`.
+        angular_order (int): number of nodes of the Gauss-Legendre
+            quadrature used to average over angles. See
+            :meth:`halomod_trispectrum_2h_22`.
+        out (array_like): if not `None`, array of shape `(N_a, N_k, N_k)`
+            in which the trispectrum is computed before being interpolated.
+            See :meth:`halomod_Tk3D_1h`.
+        executor (:class:`concurrent.futures.Executor`): executor used to
+            parallelize the calculation over scale factors. See
+            :meth:`halomod_Tk3D_1h`.
+        n_workers (:obj:`int`): number of chunks of scale factors evaluated
+            in parallel. See :meth:`halomod_Tk3D_1h`.
 
     Returns:
         :class:`~pyccl.tk3d.Tk3D`: 3-halo trispectrum.
@@ -1443,23 +1666,28 @@ def halomod_Tk3D_3h(cosmo, hmc,
     if a_arr is None:
         a_arr = cosmo.get_pk_spline_a()
 
-    tkk = halomod_trispectrum_3h(cosmo, hmc, np.exp(lk_arr), a_arr,
-                                 prof=prof,
-                                 prof2=prof2,
-                                 prof3=prof3,
-                                 prof4=prof4,
-                                 prof13_2pt=prof13_2pt,
-                                 prof14_2pt=prof14_2pt,
-                                 prof24_2pt=prof24_2pt,
-                                 prof32_2pt=prof32_2pt,
-                                 p_of_k_a=p_of_k_a,
-                                 separable_growth=separable_growth)
-
-    tkk, use_log = _logged_output(tkk, log=use_log)
+    tkk = _parallel_over_a(halomod_trispectrum_3h,
+                           cosmo, hmc, np.exp(lk_arr), a_arr,
+                           prof=prof,
+                           prof2=prof2,
+                           prof3=prof3,
+                           prof4=prof4,
+                           prof13_2pt=prof13_2pt,
+                           prof14_2pt=prof14_2pt,
+                           prof24_2pt=prof24_2pt,
+                           prof32_2pt=prof32_2pt,
+                           p_of_k_a=p_of_k_a,
+                           separable_growth=separable_growth,
+                           max_memory=max_memory,
+                           angular_order=angular_order, out=out,
+                           executor=executor, n_workers=n_workers)
+
+    tkk, use_log = _logged_output(tkk, log=use_log, inplace=out is not None)
 
     tk3d = Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkk,
                 extrap_order_lok=extrap_order_lok,
-                extrap_order_hik=extrap_order_hik, is_logt=use_log)
+                extrap_order_hik=extrap_order_hik, is_logt=use_log,
+                rank_tol=rank_tol)
     return tk3d
 
 
@@ -1467,7 +1695,9 @@ def halomod_Tk3D_4h(cosmo, hmc,
                     prof, prof2=None, prof3=None, prof4=None,
                     lk_arr=None, a_arr=None, p_of_k_a=None,
                     extrap_order_lok=1, extrap_order_hik=1,
-                    use_log=False, separable_growth=False):
+                    use_log=False, separable_growth=False,
+                    rank_tol=None, angular_order=None, out=None,
+                    executor=None, n_workers=1):
     """ Returns a :class:`~pyccl.tk3d.Tk3D` object containing
     the 3-halo trispectrum for four quantities defined by
     their respective halo profiles. See :meth:`halomod_trispectrum_4h`
@@ -1511,6 +1741,20 @@ def halomod_Tk3D_4h(cosmo, hmc,
         separable_growth (bool): Indicates whether a separable
             growth function approximation can be used to calculate
             the isotropized power spectrum.
+        rank_tol (float): if not ``None``, the trispectrum will be
+            stored as a low-rank expansion with this relative
+            tolerance. See :class:`~pyccl.tk3d.Tk3D`.
+        angular_order (int): number of nodes of the Gauss-Legendre
+            quadrature used to average over angles. See
+            :meth:`halomod_trispectrum_2h_22`.
+        out (array_like): if not `None`, array of shape `(N_a, N_k, N_k)`
+            in which the trispectrum is computed before being interpolated.
+            See :meth:`halomod_Tk3D_1h`.
+        executor (:class:`concurrent.futures.Executor`): executor used to
+            parallelize the calculation over scale factors. See
+            :meth:`halomod_Tk3D_1h`.
+        n_workers (:obj:`int`): number of chunks of scale factors evaluated
+            in parallel. See :meth:`halomod_Tk3D_1h`.
 
     Returns:
         :class:`~pyccl.tk3d.Tk3D`: 4-halo trispectrum.
@@ -1520,19 +1764,23 @@ def halomod_Tk3D_4h(cosmo, hmc,
     if a_arr is None:
         a_arr = cosmo.get_pk_spline_a()
 
-    tkk = halomod_trispectrum_4h(cosmo, hmc, np.exp(lk_arr), a_arr,
-                                 prof=prof,
-                                 prof2=prof2,
-                                 prof3=prof3,
-                                 prof4=prof4,
-                                 p_of_k_a=None,
-                                 separable_growth=separable_growth)
+    tkk = _parallel_over_a(halomod_trispectrum_4h,
+                           cosmo, hmc, np.exp(lk_arr), a_arr,
+                           prof=prof,
+                           prof2=prof2,
+                           prof3=prof3,
+                           prof4=prof4,
+                           p_of_k_a=None,
+                           separable_growth=separable_growth,
+                           angular_order=angular_order, out=out,
+                           executor=executor, n_workers=n_workers)
 
-    tkk, use_log = _logged_output(tkk, log=use_log)
+    tkk, use_log = _logged_output(tkk, log=use_log, inplace=out is not None)
 
     tk3d = Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkk,
                 extrap_order_lok=extrap_order_lok,
-                extrap_order_hik=extrap_order_hik, is_logt=use_log)
+                extrap_order_hik=extrap_order_hik, is_logt=use_log,
+                rank_tol=rank_tol)
     return tk3d
 
 
@@ -1542,7 +1790,9 @@ def halomod_Tk3D_cNG(cosmo, hmc, prof, prof2=None, prof3=None, prof4=None,
                      p_of_k_a=None,
                      lk_arr=None, a_arr=None, extrap_order_lok=1,
                      extrap_order_hik=1, use_log=False,
-                     separable_growth=False):
+                     separable_growth=False,
+                     rank_tol=None, max_memory=None, out=None,
+                     angular_order=None, executor=None, n_workers=1):
     """ Returns a :class:`~pyccl.tk3d.Tk3D` object containing the non-Gaussian
     covariance trispectrum for four quantities defined by their respective halo
     profiles. This is the sum of the trispectrum terms 1h + 2h + 3h + 4h.
@@ -1600,6 +1850,23 @@ def halomod_Tk3D_cNG(cosmo, hmc, prof, prof2=None, prof3=None, prof4=None,
         separable_growth (bool): Indicates whether a separable
             growth function approximation can be used to calculate
             the isotropized power spectrum.
+        rank_tol (float): if not ``None``, the trispectrum will be
+            stored as a low-rank expansion with this relative
+            tolerance. See :class:`~pyccl.tk3d.Tk3D`.
+        max_memory (int): approximate maximum size, in bytes, of the
+            intermediate arrays used in the mass integrals. See
+            :meth:`halomod_trispectrum_2h_22`.
+        angular_order (int): number of nodes of the Gauss-Legendre
+            quadrature used to average over angles. See
+            :meth:`halomod_trispectrum_2h_22`.
+        out (array_like): if not `None`, array of shape `(N_a, N_k, N_k)`
+            in which the trispectrum is computed before being interpolated.
+            See :meth:`halomod_Tk3D_1h`.
+        executor (:class:`concurrent.futures.Executor`): executor used to
+            parallelize the calculation over scale factors. See
+            :meth:`halomod_Tk3D_1h`.
+        n_workers (:obj:`int`): number of chunks of scale factors evaluated
+            in parallel. See :meth:`halomod_Tk3D_1h`.
 
     Returns:
         :class:`~pyccl.tk3d.Tk3D`: 2-halo trispectrum.
@@ -1609,52 +1876,69 @@ def halomod_Tk3D_cNG(cosmo, hmc, prof, prof2=None, prof3=None, prof4=None,
     if a_arr is None:
         a_arr = cosmo.get_pk_spline_a()
 
-    tkk = halomod_trispectrum_1h(cosmo, hmc, np.exp(lk_arr), a_arr,
-                                 prof, prof2=prof2,
+    tkk = _parallel_over_a(_trispectrum_cNG,
+                           cosmo, hmc, np.exp(lk_arr), a_arr,
+                           prof, prof2=prof2, prof3=prof3, prof4=prof4,
+                           prof12_2pt=prof12_2pt, prof13_2pt=prof13_2pt,
+                           prof14_2pt=prof14_2pt, prof24_2pt=prof24_2pt,
+                           prof32_2pt=prof32_2pt, prof34_2pt=prof34_2pt,
+                           p_of_k_a=p_of_k_a,
+                           separable_growth=separable_growth,
+                           max_memory=max_memory,
+                           angular_order=angular_order, out=out,
+                           executor=executor, n_workers=n_workers)
+
+    tkk, use_log = _logged_output(tkk, log=use_log, inplace=out is not None)
+
+    tk3d = Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkk,
+                extrap_order_lok=extrap_order_lok,
+                extrap_order_hik=extrap_order_hik, is_logt=use_log,
+                rank_tol=rank_tol)
+    return tk3d
+
+
+def _trispectrum_cNG(cosmo, hmc, k, a, prof, *, prof2, prof3, prof4,
+                     prof12_2pt, prof13_2pt, prof14_2pt, prof24_2pt,
+                     prof32_2pt, prof34_2pt, p_of_k_a, separable_growth,
+                     max_memory, angular_order, out=None):
+    # Sum of the 1h, 2h, 3h and 4h trispectra, so that each chunk of scale
+    # factors computes all the terms in one go.
+    tkk = halomod_trispectrum_1h(cosmo, hmc, k, a, prof, prof2=prof2,
                                  prof12_2pt=prof12_2pt,
                                  prof3=prof3, prof4=prof4,
-                                 prof34_2pt=prof34_2pt)
+                                 prof34_2pt=prof34_2pt, out=out)
 
-    tkk += halomod_trispectrum_2h_22(cosmo, hmc, np.exp(lk_arr), a_arr,
-                                     prof, prof2=prof2,
+    tkk += halomod_trispectrum_2h_22(cosmo, hmc, k, a, prof, prof2=prof2,
                                      prof3=prof3, prof4=prof4,
                                      prof13_2pt=prof13_2pt,
                                      prof14_2pt=prof14_2pt,
                                      prof24_2pt=prof24_2pt,
                                      prof32_2pt=prof32_2pt,
                                      p_of_k_a=p_of_k_a,
-                                     separable_growth=separable_growth)
+                                     separable_growth=separable_growth,
+                                     max_memory=max_memory,
+                                     angular_order=angular_order)
 
-    tkk += halomod_trispectrum_2h_13(cosmo, hmc, np.exp(lk_arr), a_arr,
-                                     prof, prof2=prof2,
+    tkk += halomod_trispectrum_2h_13(cosmo, hmc, k, a, prof, prof2=prof2,
                                      prof3=prof3, prof4=prof4,
                                      prof12_2pt=prof12_2pt,
                                      prof34_2pt=prof34_2pt,
                                      p_of_k_a=p_of_k_a)
 
-    tkk += halomod_trispectrum_3h(cosmo, hmc, np.exp(lk_arr), a_arr,
-                                  prof=prof,
-                                  prof2=prof2,
-                                  prof3=prof3,
-                                  prof4=prof4,
+    tkk += halomod_trispectrum_3h(cosmo, hmc, k, a, prof=prof,
+                                  prof2=prof2, prof3=prof3, prof4=prof4,
                                   prof13_2pt=prof13_2pt,
                                   prof14_2pt=prof14_2pt,
                                   prof24_2pt=prof24_2pt,
                                   prof32_2pt=prof32_2pt,
                                   p_of_k_a=p_of_k_a,
-                                  separable_growth=separable_growth)
+                                  separable_growth=separable_growth,
+                                  max_memory=max_memory,
+                                  angular_order=angular_order)
 
-    tkk += halomod_trispectrum_4h(cosmo, hmc, np.exp(lk_arr), a_arr,
-                                  prof=prof,
-                                  prof2=prof2,
-                                  prof3=prof3,
-                                  prof4=prof4,
+    tkk += halomod_trispectrum_4h(cosmo, hmc, k, a, prof=prof,
+                                  prof2=prof2, prof3=prof3, prof4=prof4,
                                   p_of_k_a=p_of_k_a,
-                                  separable_growth=separable_growth)
-
-    tkk, use_log = _logged_output(tkk, log=use_log)
-
-    tk3d = Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkk,
-                extrap_order_lok=extrap_order_lok,
-                extrap_order_hik=extrap_order_hik, is_logt=use_log)
-    return tk3d
+                                  separable_growth=separable_growth,
+                                  angular_order=angular_order)
+    return tkk
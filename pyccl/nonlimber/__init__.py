@@ -1 +1,2 @@
 from ._nonlimber_FKEM import _nonlimber_FKEM
+from ._nonlimber_bessel import _nonlimber_bessel
@@ -8,6 +8,8 @@ We utilize a modified generalized version of FFTLog
 __all__ = ("_nonlimber_FKEM",)
 
 
+from collections import OrderedDict
+
 import numpy as np
 from .. import lib, check
 from ..pyutils import integ_types
@@ -55,6 +57,13 @@ def _get_k_common(ks_1, ks_2):
     """
     all_ks = [np.asarray(k, dtype=float) for k in (*ks_1, *ks_2)]
 
+    # All transforms sharing the same Bessel parameters are evaluated
+    # on the same grid, which can then be used directly.
+    k0 = all_ks[0]
+    if (np.all(np.isfinite(k0) & (k0 > 0.0))
+            and all(np.array_equal(k, k0) for k in all_ks[1:])):
+        return k0
+
     k_mins = [k[np.isfinite(k) & (k > 0.0)].min() for k in all_ks]
     k_maxs = [k[np.isfinite(k) & (k > 0.0)].max() for k in all_ks]
 
@@ -65,16 +74,113 @@ def _get_k_common(ks_1, ks_2):
     return np.logspace(np.log10(k_min), np.log10(k_max), n_k)
 
 
-def _chi_integrands(cosmo, clt,
+def _interp_to_common(k, ks, fs):
+    """Linearly interpolate a set of functions onto a common grid of
+    wavenumbers. Functions sampled on the same grid are interpolated
+    together.
+    Args:
+        k (array): Common wavenumbers.
+        ks (list): Wavenumbers at which each function is sampled.
+        fs (array): Functions to interpolate, with shape
+            ``(n_functions, n_k)``.
+    Returns:
+        fs_interp (array): Interpolated functions, with shape
+            ``(n_functions, k.size)``.
+    """
+    fs_interp = np.zeros((len(fs), len(k)))
+    done = np.zeros(len(fs), dtype=bool)
+    for i in range(len(fs)):
+        if done[i]:
+            continue
+        same = [j for j in range(i, len(fs))
+                if not done[j] and np.array_equal(ks[j], ks[i])]
+        done[same] = True
+        if np.array_equal(ks[i], k):
+            fs_interp[same] = fs[same]
+            continue
+        # Same as np.interp (including its clamping at the edges),
+        # but for all the functions at once.
+        kp = ks[i]
+        ind = np.clip(np.searchsorted(kp, k), 1, len(kp) - 1)
+        w = np.clip((k - kp[ind - 1]) / (kp[ind] - kp[ind - 1]), 0.0, 1.0)
+        f = fs[same]
+        fs_interp[same] = f[:, ind - 1] * (1.0 - w) + f[:, ind] * w
+    return fs_interp
+
+
+def _get_sub_transfer(tracer, lk, a):
+    """Transfer function of a single C-level tracer (element of
+    ``Tracer._trc``), flattened over ``lk`` and ``a``.
+    """
+    lk_use = np.atleast_1d(lk).astype(float)
+    a_use = np.atleast_1d(a).astype(float)
+    status = 0
+    transfer, status = lib.cl_tracer_get_transfer(
+        tracer, lk_use, a_use, lk_use.size * a_use.size, status)
+    check(status)
+    return transfer
+
+
+def _radial_integrands(cosmo, clt, k_low, chi_logspace_arr):
+    """
+    Computes the radial functions of all the tracers in a collection that
+    are transformed by FFTLog. These do not depend on the multipole, and
+    are therefore only computed once.
+    Args:
+        cosmo (:class:`~pyccl.core.Cosmology`): A Cosmology object.
+        clt (:class:`~pyccl.tracers.TracerCollection`): TracerCollection
+            object for tracer.
+        k_low (float): large-scale wavenumber for scale-dependence
+            kernel approximation.
+        chi_logspace_arr (array): Array of comoving distances in log-space
+            over which FKEM evaluates the radial kernels.
+    Returns:
+        fchis (array): Radial functions for each tracer.
+    """
+    kernels, chis = clt.get_kernel()
+    a_arr = ccl.scale_factor_of_chi(cosmo, chi_logspace_arr)
+    growfac_arr = ccl.growth_factor(cosmo, a_arr)
+    avg_as = clt.get_avg_weighted_a()
+
+    fchis = np.zeros((len(kernels), len(chi_logspace_arr)))
+    for i, t in enumerate(clt._trc):
+        transfer_low = _get_sub_transfer(t, np.log(k_low), a_arr)
+        transfer_avg = _get_sub_transfer(t, np.log(k_low), avg_as[i])[0]
+        # check no zeros in transfer functions
+        if transfer_avg == 0.0:
+            raise ZeroDivisionError(
+                "Zero transfer function encountered in FKEM chi "
+                "integrand calculation. "
+                "Setting integrand to zero."
+            )
+
+        fchi_interp = make_interp_spline(
+            chis[i], kernels[i], k=1
+        )
+        # transfer function approximation for the case
+        # when it's inseperable in k and a
+        # exact for seperable transfer functions
+        fchis[i] = (
+            fchi_interp(chi_logspace_arr)
+            * chi_logspace_arr
+            * growfac_arr
+            * transfer_low
+            / transfer_avg
+        )
+    return fchis
+
+
+def _chi_integrands(cosmo, clt, fchis,
                     Nchi, chi_min, chi_max,
-                    ell, k_low,
-                    chi_logspace_arr, status):
+                    ell, chi_logspace_arr):
     """
     Computes the chi integrands for FKEM using FFTLog
     Args:
         cosmo (:class:`~pyccl.core.Cosmology`): A Cosmology object.
         clt (:class:`~pyccl.tracers.TracerCollection`): TracerCollection
             object for tracer.
+        fchis (array): Radial functions for each tracer (see
+            :func:`_radial_integrands`).
         Nchi (int): Number of values of the comoving distance
             over which FKEM will evaluate the radial kernels.
         chi_min (float): Minimum comoving distance used by FKEM to sample
@@ -82,84 +188,101 @@ def _chi_integrands(cosmo, clt,
         chi_max (float): Maximum comoving distance used by FKEM to sample
             the radial kernels.
         ell (float): Angular multipole at which to evaluate the integrand.
-        k_low (float): large-scale wavenumber for scale-dependence
-            kernel approximation.
         chi_logspace_arr (array): Array of comoving distances in log-space
             over which FKEM evaluates the radial kernels.
-        status (int): Status flag for error checking.
     Returns:
         k (array): Wavenumbers at which to evaluate the full integral.
         fks (array): Chi integrands for each tracer.
         transfers (array): Transfer functions for each tracer.
     """
-
-    kernels, chis = clt.get_kernel()
     bessels = clt.get_bessel_derivative()
-    a_arr = ccl.scale_factor_of_chi(cosmo, chi_logspace_arr)
-    growfac_arr = ccl.growth_factor(cosmo, a_arr)
     avg_as = clt.get_avg_weighted_a()
 
-    fks = np.zeros((len(kernels), Nchi))
-    transfers = np.zeros((len(kernels), Nchi))
-    ks = []
-    for i in range(len(kernels)):
-        k, fk = clt._get_fkem_fft(
-            clt._trc[i], Nchi, chi_min, chi_max, ell, cosmo,
-        )
-
+    n_trc = len(clt._trc)
+    ks = [None] * n_trc
+    fks = np.zeros((n_trc, Nchi))
+    # Tracers missing from the cache that share the same Bessel
+    # parameters are transformed in a single call to fftlog.
+    to_transform = {}
+    for i, t in enumerate(clt._trc):
+        k, fk = clt._get_fkem_fft(t, Nchi, chi_min, chi_max, ell, cosmo)
         if (k is None) or (fk is None):
-            transfer_low = np.array(
-                clt.get_transfer(np.log(k_low), a_arr)
-            )
-            transfer_avg = clt.get_transfer(np.log(k_low), avg_as[i])
-            # check no zeros in transfer functions
-            if np.any(transfer_avg == 0.0):
-                raise ZeroDivisionError(
-                    "Zero transfer function encountered in FKEM chi "
-                    "integrand calculation. "
-                    "Setting integrand to zero."
-                )
-
-            fchi_interp = make_interp_spline(
-                chis[i], kernels[i], k=1
-            )
-            # transfer function approximation for the case
-            # when it's inseperable in k and a
-            # exact for seperable transfer functions
-            fchi_arr = (
-                fchi_interp(chi_logspace_arr)
-                * chi_logspace_arr
-                * growfac_arr
-                * transfer_low[i]
-                / transfer_avg[i]
-            )
-            # calls to fftlog to perform integration over chi integrals
-            nu, deriv, plaw = _get_general_params(bessels[i])
-            k, fk = _fftlog_transform_general(
-                chi_logspace_arr,
-                fchi_arr.flatten(),
-                float(ell),
-                nu,
-                1,
-                float(deriv),
-                float(plaw),
-            )
-            check(status, cosmo=cosmo)
-
-        clt._set_fkem_fft(
-            clt._trc[i], cosmo, Nchi, chi_min, chi_max, ell, k, fk,
+            params = _get_general_params(bessels[i])
+            to_transform.setdefault(params, []).append(i)
+        else:
+            ks[i] = k
+            fks[i] = fk
+
+    for (nu, deriv, plaw), ind in to_transform.items():
+        # calls to fftlog to perform integration over chi integrals
+        k, fk = _fftlog_transform_general(
+            chi_logspace_arr,
+            fchis[ind],
+            float(ell),
+            nu,
+            1,
+            float(deriv),
+            float(plaw),
         )
-        ks.append(k)
-        fks[i] = fk
-        transfers[i] = np.array(clt.get_transfer(np.log(k), avg_as[i]))[i]
+        for j, i in enumerate(ind):
+            clt._set_fkem_fft(
+                clt._trc[i], cosmo, Nchi, chi_min, chi_max, ell, k, fk[j],
+            )
+            ks[i] = k
+            fks[i] = fk[j]
 
+    transfers = np.array([_get_sub_transfer(t, np.log(ks[i]), avg_as[i])
+                          for i, t in enumerate(clt._trc)])
     return ks, fks, transfers
 
 
-def _auto_limber_transition_ell(clt1, clt2, cosmo, psp_lin, psp_nonlin,
-                                fks_1, fks_2, transfers_t1, transfers_t2,
-                                fll_t1, fll_t2, k, kpow, pk, dlnr,
-                                el, ell, limber_max_error, status):
+def _single_tracer_collections(clt1, clt2):
+    """Build C-level tracer collection arrays holding, for every pair of
+    tracers in ``clt1`` and ``clt2``, one of the tracers of the pair.
+    These are used to compute the Limber power spectra of all pairs in a
+    single call.
+    Returns:
+        singles (list): The single-tracer collections (to be freed).
+        clts1 (array): Collections with the first tracer of each pair.
+        clts2 (array): Collections with the second tracer of each pair.
+    """
+    status = 0
+    singles1, singles2 = [], []
+    for trcs, singles in ((clt1._trc, singles1), (clt2._trc, singles2)):
+        for t in trcs:
+            clt, status = lib.cl_tracer_collection_t_new(status)
+            check(status)
+            status = lib.add_cl_tracer_to_collection(clt, t, status)
+            check(status)
+            singles.append(clt)
+
+    n_pairs = len(singles1) * len(singles2)
+    clts1, status = lib.cl_tracer_collection_array_new(n_pairs, status)
+    check(status)
+    clts2, status = lib.cl_tracer_collection_array_new(n_pairs, status)
+    check(status)
+    for i, c1 in enumerate(singles1):
+        for j, c2 in enumerate(singles2):
+            ip = i * len(singles2) + j
+            lib.cl_tracer_collection_array_set(clts1, ip, c1)
+            lib.cl_tracer_collection_array_set(clts2, ip, c2)
+    return singles1 + singles2, clts1, clts2
+
+
+def _limber_pairs(cosmo, clts1, clts2, n_pairs, psp, ell):
+    """Limber power spectra of all pairs of single-tracer collections
+    at a single multipole.
+    """
+    status = 0
+    cls, status = lib.angular_cl_vec_limber_multi(
+        cosmo.cosmo, n_pairs, clts1, clts2, psp, [ell],
+        integ_types["qag_quad"], n_pairs, status)
+    check(status, cosmo=cosmo)
+    return cls
+
+
+def _auto_limber_transition_ell(cl_limber_lin, cl_limber_nonlin,
+                                cls_nonlimber_lin, limber_max_error):
     """
     Helper function for _nonlimber_FKEM to determine whether the
     Limber transition ell/threshold has been reached for all
@@ -167,115 +290,182 @@ def _auto_limber_transition_ell(clt1, clt2, cosmo, psp_lin, psp_nonlin,
     to ensure that the non-Limber calculation is accurate up to the
     specified limber_max_error threshold.
     Args:
-        clt1 (:class:`~pyccl.tracers.TracerCollection`):
-            TracerCollection object for tracer 1.
-        clt2 (:class:`~pyccl.tracers.TracerCollection`):
-            TracerCollection object for tracer 2.
-        cosmo (:class:`~pyccl.core.Cosmology`):
-            A Cosmology object.
-        psp_lin (:class:`~pyccl.pk2d.Pk2D`):
-            Linear power spectrum to use for growth factor scaling.
-        psp_nonlin (:class:`~pyccl.pk2d.Pk2D`):
-            Non-linear power spectrum to project.
-        fks_1 (array):
-            Chi integrands for tracer 1.
-        fks_2 (array):
-            Chi integrands for tracer 2.
-        transfers_t1 (array):
-            Transfer functions for tracer 1.
-        transfers_t2 (array):
-            Transfer functions for tracer 2.
-        fll_t1 (array):
-            f_ell values for tracer 1.
-        fll_t2 (array):
-            f_ell values for tracer 2.
-        k (array):
-            Wavenumbers at which to evaluate the full integral.
-        kpow (float):
-            Power of k in the integrand.
-        pk (function):
-            Function that takes k and a and returns the power spectrum.
-        dlnr (float):
-            Logarithmic spacing of chi values for FKEM.
-        el (int):
-            Index of the current ell in the loop over ls.
-        ell (float):
-            Current ell value.
+        cl_limber_lin (array):
+            Limber power spectra for each pair of tracers, computed
+            with the linear power spectrum.
+        cl_limber_nonlin (array):
+            Limber power spectra for each pair of tracers, computed
+            with the non-linear power spectrum.
+        cls_nonlimber_lin (array):
+            Non-Limber power spectra for each pair of tracers, computed
+            with the linear power spectrum.
         limber_max_error (float):
             Maximum fractional error for Limber integration.
-        status (int):
-            Status flag for error checking.
     Returns:
-        status (int):
-            Updated status flag for error checking.
         is_limber (bool):
             Whether the Limber transition ell/threshold
             has been reached for all combinations of tracers.
     """
-    for i in range(len(clt1._trc)):
-        for j in range(len(clt2._trc)):
-            ti = clt1._trc[i]
-            tj = clt2._trc[j]
-            t1_temp, status = lib.cl_tracer_collection_t_new(status)
-            check(status)
-            t2_temp, status = lib.cl_tracer_collection_t_new(status)
-            check(status)
-            status = lib.add_cl_tracer_to_collection(t1_temp, ti, status)
-            check(status)
-            status = lib.add_cl_tracer_to_collection(t2_temp, tj, status)
-            check(status)
+    cl_temp = cl_limber_nonlin - cl_limber_lin + cls_nonlimber_lin
+    thresh = cl_temp / cl_limber_nonlin - 1.0
+    return not np.any(np.abs(thresh) >= limber_max_error)
+
+
+def _nonlimber_pairs(cosmo, clt1, clt2, fchis_t1, fchis_t2, pk,
+                     fll_t1, fll_t2, el, ell,
+                     Nchi, chi_min, chi_max, chi_logspace_arr, dlnr,
+                     chi_integrands=_chi_integrands):
+    """Linear non-Limber power spectra of all pairs of tracers in
+    ``clt1`` and ``clt2`` at a single multipole. The chi integrals
+    are computed by ``chi_integrands`` (see :func:`_chi_integrands`).
+    Returns:
+        cls (array): Power spectra, flattened over pairs ``(i, j)``.
+    """
+    kpow = 3
+    # chi-integral integrand splines
+    ks, fks_1, transfers_t1 = chi_integrands(
+        cosmo, clt1, fchis_t1,
+        Nchi, chi_min, chi_max,
+        ell, chi_logspace_arr
+    )
+
+    if clt1 != clt2:
+        ks_2, fks_2, transfers_t2 = chi_integrands(
+            cosmo, clt2, fchis_t2,
+            Nchi, chi_min, chi_max,
+            ell, chi_logspace_arr
+        )
+    else:
+        fks_2 = fks_1
+        transfers_t2 = transfers_t1
+        ks_2 = ks
+    k = _get_k_common(ks, ks_2)
+    # need to interpolate the fks and transfers to the common k array
+    integ_t1 = _interp_to_common(k, ks, fks_1 * transfers_t1)
+    if clt1 != clt2:
+        integ_t2 = _interp_to_common(k, ks_2, fks_2 * transfers_t2)
+    else:
+        integ_t2 = integ_t1
+
+    w_k = k**kpow * pk(k, 1.0, cosmo) * dlnr * 2.0 / np.pi
+    return (
+        np.dot(integ_t1 * w_k[None, :], integ_t2.T)
+        * fll_t1[:, None, el]
+        * fll_t2[None, :, el]
+    ).flatten()
+
+
+def _bisect_transition(n, is_limber, lo=-1, hi=None, guess=None):
+    """Find the index of the first multipole at which the Limber
+    approximation is accurate enough, assuming that it remains so at
+    all higher multipoles.
+    Args:
+        n (int): Number of multipoles.
+        is_limber (function): Function of the index of a multipole
+            returning whether the transition has been reached there.
+        lo (int): Index of a multipole known to be below the transition
+            (-1 if none is known).
+        hi (int): Index of a multipole known to be above the transition
+            (``n`` if none is known).
+        guess (int): Index of a likely transition, which is probed
+            (together with its neighbours) first.
+    Returns:
+        lo (int): Index of the last multipole below the transition.
+        hi (int): Index of the first multipole above the transition
+            (``n`` if it was not reached).
+    """
+    if hi is None:
+        hi = n
+    probes = [] if guess is None else [guess, guess - 1, guess + 1]
+    while hi - lo > 1:
+        i = next((p for p in probes if lo < p < hi), (lo + hi) // 2)
+        if is_limber(i):
+            hi = i
+        else:
+            lo = i
+    return lo, hi
 
-            cl_limber_lin_temp, status = lib.angular_cl_vec_limber(
-                cosmo.cosmo,
-                t1_temp,
-                t2_temp,
-                psp_lin,
-                [ell],
-                integ_types["qag_quad"],
-                1,
-                status,
-            )
-            check(status, cosmo=cosmo)
-            cl_limber_nonlin_temp, status = lib.angular_cl_vec_limber(
-                cosmo.cosmo,
-                t1_temp,
-                t2_temp,
-                psp_nonlin,
-                [ell],
-                integ_types["qag_quad"],
-                1,
-                status,
-            )
-            check(status, cosmo=cosmo)
-
-            cls_nonlimber_lin_temp = (
-                np.sum(
-                    fks_1[i]
-                    * transfers_t1[i]
-                    * fks_2[j]
-                    * transfers_t2[j]
-                    * (k**kpow
-                        * pk(k, 1.0, cosmo))
-                )
-                * dlnr
-                * 2.0
-                / np.pi
-                * fll_t1[i][el]
-                * fll_t2[j][el]
-            )
-            cl_temp = (
-                cl_limber_nonlin_temp[-1]
-                - cl_limber_lin_temp[-1]
-                + cls_nonlimber_lin_temp
-            )
-            thresh = cl_temp / cl_limber_nonlin_temp[-1] - 1.0
 
-            lib.cl_tracer_collection_t_free(t1_temp)
-            lib.cl_tracer_collection_t_free(t2_temp)
+class _LimberTransitions:
+    """Table of the Limber transition multipoles found with
+    ``l_limber='auto'``, indexed by the fingerprints of the pair of
+    tracers and the settings of the calculation. For each cosmology,
+    it stores the largest multipole known to be below the transition and
+    the smallest one known to be above it. Transitions found for other
+    cosmologies are used as a first guess.
 
-            if np.abs(thresh) >= limber_max_error:
-                return status, False
-    return status, True
+    Args:
+        maxsize (:obj:`int`): maximum number of tracer pairs to store.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key, cosmo_key):
+        """Returns the bracket of the transition for this cosmology (or
+        ``None``), and the transition for the latest other cosmology
+        (or ``None``).
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None, None
+        self._data.move_to_end(key)
+        bracket = entry.get(cosmo_key)
+        others = [hi for ck, (lo, hi) in entry.items()
+                  if ck != cosmo_key and np.isfinite(hi)]
+        return bracket, (others[-1] if others else None)
+
+    def update(self, key, cosmo_key, lo, hi):
+        entry = self._data.setdefault(key, OrderedDict())
+        lo_old, hi_old = entry.pop(cosmo_key, (-np.inf, np.inf))
+        entry[cosmo_key] = (max(lo, lo_old), min(hi, hi_old))
+        self._data.move_to_end(key)
+        while len(entry) > self.maxsize:
+            entry.popitem(last=False)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+
+_limber_transitions = _LimberTransitions()
+
+
+def _find_limber_transition(cosmo, clt1, clt2, ls, is_limber, key):
+    """Find the Limber transition multipole among ``ls`` with a bisection
+    search, using and refining the table of known transitions.
+    Args:
+        cosmo (:class:`~pyccl.core.Cosmology`): A Cosmology object.
+        clt1 (:class:`~pyccl.tracers.TracerCollection`): TracerCollection
+            object for tracer 1.
+        clt2 (:class:`~pyccl.tracers.TracerCollection`): TracerCollection
+            object for tracer 2.
+        ls (array): Angular multipoles, in increasing order.
+        is_limber (function): Function of the index of a multipole
+            returning whether the transition has been reached there.
+        key (tuple): Settings of the calculation that the transition
+            depends on.
+    Returns:
+        l_limber (float): Transition multipole (the largest multipole if
+        the transition was not reached).
+    """
+    key = (hash(clt1), hash(clt2)) + key
+    bracket, guess = _limber_transitions.get(key, cosmo._cache_key)
+    ls = np.asarray(ls, dtype=float)
+    n = len(ls)
+    lo, hi = -1, n
+    if bracket is not None:
+        lo = np.searchsorted(ls, bracket[0], side="right") - 1
+        hi = np.searchsorted(ls, bracket[1], side="left")
+    if guess is not None:
+        guess = int(np.searchsorted(ls, guess, side="left"))
+    lo, hi = _bisect_transition(n, is_limber, lo, hi, guess)
+    _limber_transitions.update(key, cosmo._cache_key,
+                               ls[lo] if lo >= 0 else -np.inf,
+                               ls[hi] if hi < n else np.inf)
+    return ls[hi] if hi < n else ls[-1]
 
 
 def _nonlimber_FKEM(
@@ -317,7 +507,25 @@ def _nonlimber_FKEM(
         status (int): Error status. 0 if there were no errors.
     """
 
-    kpow = 3
+    return _nonlimber_projected(cosmo, clt1, clt2, p_of_k_a, ls, l_limber,
+                                _chi_integrands, **params)
+
+
+def _nonlimber_projected(
+        cosmo, clt1, clt2, p_of_k_a,
+        ls, l_limber, chi_integrands, **params):
+    """Non-Limber angular power spectra computed from the projections of
+    the tracer radial kernels onto spherical Bessel functions. The
+    non-Limber calculation is done for the linear power spectrum, and
+    the difference with Limber is added to the non-linear Limber
+    power spectra.
+    Args:
+        chi_integrands (function): Function computing the projections
+            at a given multipole (see :func:`_chi_integrands`).
+        other arguments: see :func:`_nonlimber_FKEM`.
+    Returns:
+        see :func:`_nonlimber_FKEM`.
+    """
     k_low = 1.0e-5
     cells = []
     kernels_t1, chis_t1 = clt1.get_kernel()
@@ -386,16 +594,6 @@ def _nonlimber_FKEM(
     psp_lin = cosmo.parse_pk2d(p_of_k_a_lin, is_linear=True)
     psp_nonlin = cosmo.parse_pk2d(p_of_k_a, is_linear=False)
 
-    t1, status = lib.cl_tracer_collection_t_new(status)
-    check(status)
-    t2, status = lib.cl_tracer_collection_t_new(status)
-    check(status)
-    for t in clt1._trc:
-        status = lib.add_cl_tracer_to_collection(t1, t, status)
-        check(status)
-    for t in clt2._trc:
-        status = lib.add_cl_tracer_to_collection(t2, t, status)
-        check(status)
     if isinstance(p_of_k_a_lin, ccl.Pk2D):
         pk = p_of_k_a_lin
     else:
@@ -411,113 +609,88 @@ def _nonlimber_FKEM(
 
     dlnr = np.log(chi_max / chi_min) / (Nchi - 1.0)
 
-    for el in range(len(ls)):
-        ell = ls[el]
-        cls_nonlimber_lin = 0.0
-        status = 0
-        cl_limber_lin, status = lib.angular_cl_vec_limber(
-            cosmo.cosmo,
-            t1,
-            t2,
-            psp_lin,
-            [ell],
-            integ_types["qag_quad"],
-            1,
-            status,
-        )
-        check(status, cosmo=cosmo)
-        cl_limber_nonlin, status = lib.angular_cl_vec_limber(
-            cosmo.cosmo,
-            t1,
-            t2,
-            psp_nonlin,
-            [ell],
-            integ_types["qag_quad"],
-            1,
-            status,
-        )
-        check(status, cosmo=cosmo)
+    # the radial functions to transform do not depend on ell
+    fchis_t1 = _radial_integrands(cosmo, clt1, k_low, chi_logspace_arr)
+    fchis_t2 = fchis_t1
+    if clt1 != clt2:
+        fchis_t2 = _radial_integrands(cosmo, clt2, k_low, chi_logspace_arr)
 
-        # chi-integral integrand splines
-        ks, fks_1, transfers_t1 = _chi_integrands(
-            cosmo, clt1,
-            Nchi, chi_min, chi_max,
-            ell, k_low,
-            chi_logspace_arr, status
-        )
+    if type(l_limber) is str:
+        # Find the transition with a bisection search, assuming that
+        # Limber remains accurate beyond it. The Limber power spectra of
+        # all pairs of tracers are checked, not just the total cl,
+        # since the total can be dominated by one combination of
+        # tracers that has reached the limber threshold.
+        n_pairs = len(clt1._trc) * len(clt2._trc)
+        singles, clts1, clts2 = _single_tracer_collections(clt1, clt2)
+
+        def is_limber(el):
+            cls_nonlimber_lin = _nonlimber_pairs(
+                cosmo, clt1, clt2, fchis_t1, fchis_t2, pk,
+                fll_t1, fll_t2, el, ls[el],
+                Nchi, chi_min, chi_max, chi_logspace_arr, dlnr,
+                chi_integrands)
+            cls_limber_lin = _limber_pairs(cosmo, clts1, clts2, n_pairs,
+                                           psp_lin, ls[el])
+            cls_limber_nonlin = _limber_pairs(cosmo, clts1, clts2, n_pairs,
+                                              psp_nonlin, ls[el])
+            return _auto_limber_transition_ell(
+                cls_limber_lin, cls_limber_nonlin, cls_nonlimber_lin,
+                limber_max_error)
+
+        key = (chi_integrands.__name__, hash(p_of_k_a), hash(p_of_k_a_lin),
+               limber_max_error, Nchi, chi_min)
+        try:
+            l_limber = _find_limber_transition(cosmo, clt1, clt2, ls,
+                                               is_limber, key)
+        finally:
+            for clt in singles:
+                lib.cl_tracer_collection_t_free(clt)
+            lib.cl_tracer_collection_array_free(clts1)
+            lib.cl_tracer_collection_array_free(clts2)
+
+    # All the ells up to the transition are known in advance, so
+    # the Limber power spectra are computed in a single call.
+    above = np.flatnonzero(np.asarray(ls) >= l_limber)
+    n_ell = above[0] + 1 if above.size else len(ls)
+    t1, status = lib.cl_tracer_collection_t_new(status)
+    check(status)
+    t2, status = lib.cl_tracer_collection_t_new(status)
+    check(status)
+    for t in clt1._trc:
+        status = lib.add_cl_tracer_to_collection(t1, t, status)
+        check(status)
+    for t in clt2._trc:
+        status = lib.add_cl_tracer_to_collection(t2, t, status)
+        check(status)
+    ls_limber = np.asarray(ls[:n_ell], dtype=float)
+    cl_limber_lin, status = lib.angular_cl_vec_limber(
+        cosmo.cosmo, t1, t2, psp_lin, ls_limber,
+        integ_types["qag_quad"], n_ell, status,
+    )
+    check(status, cosmo=cosmo)
+    cl_limber_nonlin, status = lib.angular_cl_vec_limber(
+        cosmo.cosmo, t1, t2, psp_nonlin, ls_limber,
+        integ_types["qag_quad"], n_ell, status,
+    )
+    check(status, cosmo=cosmo)
+    lib.cl_tracer_collection_t_free(t1)
+    lib.cl_tracer_collection_t_free(t2)
 
-        if clt1 != clt2:
-            ks_2, fks_2, transfers_t2 = _chi_integrands(
-                cosmo, clt2,
-                Nchi, chi_min, chi_max,
-                ell, k_low,
-                chi_logspace_arr, status
-            )
-        else:
-            fks_2 = fks_1
-            transfers_t2 = transfers_t1
-            ks_2 = ks
-        k = _get_k_common(ks, ks_2)
-        # need to interpolate the fks and transfers to the common k array
-        fks_1_interp = np.zeros((len(clt1._trc), len(k)))
-        fks_2_interp = np.zeros((len(clt2._trc), len(k)))
-        transfers_t1_interp = np.zeros((len(clt1._trc), len(k)))
-        transfers_t2_interp = np.zeros((len(clt2._trc), len(k)))
-        for i in range(len(clt1._trc)):
-            fks_1_interp[i] = np.interp(k, ks[i], fks_1[i])
-            transfers_t1_interp[i] = np.interp(k, ks[i], transfers_t1[i])
-        for i in range(len(clt2._trc)):
-            fks_2_interp[i] = np.interp(k, ks_2[i], fks_2[i])
-            transfers_t2_interp[i] = np.interp(k, ks_2[i], transfers_t2[i])
-
-        cls_nonlimber_lin = np.sum(
-            fks_1_interp[:, None, :]
-            * transfers_t1_interp[:, None, :]
-            * fks_2_interp[None, :, :]
-            * transfers_t2_interp[None, :, :]
-            * (k**kpow
-                * pk(k, 1.0, cosmo))[None, None, :]
-            * dlnr
-            * 2.0
-            / np.pi
-            * fll_t1[:, None, None, el]
-            * fll_t2[None, :, None, el]
-        )
+    for el in range(n_ell):
+        # non-Limber power spectra of all pairs of tracers.
+        # The FFTLog integrals computed during the search of the
+        # transition are retrieved from the cache.
+        cls_nonlimber_lin = _nonlimber_pairs(
+            cosmo, clt1, clt2, fchis_t1, fchis_t2, pk,
+            fll_t1, fll_t2, el, ls[el],
+            Nchi, chi_min, chi_max, chi_logspace_arr, dlnr,
+            chi_integrands)
         # append the final cl calculation to the returned array
-        # see whether the Limber transition ell/threshold has been reached
-        # and check whether to continue to higher ells
-        cells.append(
-            cl_limber_nonlin[-1] - cl_limber_lin[-1] + cls_nonlimber_lin
-        )
-
-        if (type(l_limber) is not str and ell >= l_limber):
-            l_limber = ell
-            break
-        if l_limber == "auto":
-            # need to check each individual combination of tracers
-            # to ensure all have reached the limber threshold,
-            # not just the total cl
-            # if any of the individual combinations of tracers
-            # have not reached the limber threshold,
-            # we need to continue to higher ells
-            # this is because the total cl can be dominated
-            # by one combination of tracers that has reached
-            # the limber threshold
-            status, is_limber = _auto_limber_transition_ell(
-                clt1, clt2, cosmo, psp_lin,
-                psp_nonlin, fks_1_interp, fks_2_interp,
-                transfers_t1_interp, transfers_t2_interp,
-                fll_t1, fll_t2, k, kpow,
-                pk, dlnr, el, ell,
-                limber_max_error, status
-            )
-            if is_limber:
-                l_limber = ell
-                break
-    if type(l_limber) is str:
-        l_limber = ls[-1]
+        cells.append(cl_limber_nonlin[el] - cl_limber_lin[el]
+                     + np.sum(cls_nonlimber_lin))
+    if n_ell and ls[n_ell - 1] >= l_limber:
+        l_limber = ls[n_ell - 1]
     if False in np.isfinite(cells):
         status = 1
-    lib.cl_tracer_collection_t_free(t1)
-    lib.cl_tracer_collection_t_free(t2)
     return l_limber, np.array(cells), status
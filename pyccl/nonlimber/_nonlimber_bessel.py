@@ -0,0 +1,143 @@
+"""Non-Limber integration from the projections of the tracer radial
+kernels onto spherical Bessel functions, computed by direct quadrature
+on a fixed grid of wavenumbers.
+
+The radial integrals are sampled on a logarithmic grid in the comoving
+distance, and on a logarithmic grid of wavenumbers with the same spacing.
+The spherical Bessel functions then only need to be evaluated on a 1D
+table of :math:`x=k\\chi`, and the quadrature for all wavenumbers is a
+correlation of the radial kernels with this table. The projections only
+depend on the tracers and on the background and growth of the cosmology,
+so they are cached and reused when only the power spectrum changes.
+"""
+__all__ = ("_nonlimber_bessel",)
+
+import functools
+
+import numpy as np
+from scipy.signal import fftconvolve
+from scipy.special import spherical_jn
+
+from ._nonlimber_FKEM import (
+    _nonlimber_projected, _get_sub_transfer)
+
+# Range of wavenumbers (in Mpc^-1) of the projections.
+_K_MIN = 1.0e-5
+_K_MAX = 10.0
+
+
+@functools.lru_cache(maxsize=256)
+def _j_ell_table(ell, b, lnx0, dlnx, n):
+    """Table of spherical Bessel functions of order ``ell`` (or their
+    derivatives), at ``x = exp(lnx0 + i * dlnx)`` for ``i < n``.
+    Args:
+        ell (float): Angular multipole.
+        b (int): Bessel function derivative order
+            (corresponds to CCL bessel_deriv_type). For -1, the table
+            holds :math:`j_\\ell(x)/x^2`.
+    Returns:
+        table (array): Spherical Bessel functions, tapered to zero where
+        their oscillations are not resolved by the logarithmic sampling.
+    """
+    x = np.exp(lnx0 + dlnx * np.arange(n))
+    ell = int(ell)
+    if b == 1:
+        table = spherical_jn(ell, x, derivative=True)
+    elif b == 2:
+        # From the spherical Bessel equation.
+        table = (- 2 * spherical_jn(ell, x, derivative=True) / x
+                 - (1 - ell * (ell + 1) / x**2) * spherical_jn(ell, x))
+    else:
+        table = spherical_jn(ell, x)
+        if b < 0:
+            table = table / x**2
+
+    # Oscillations have a period 2 pi / x in log(x), so they are
+    # smoothly suppressed between half the Nyquist frequency and the
+    # Nyquist frequency of the grid.
+    x_nyq = np.pi / dlnx
+    u = np.clip((x - 0.5 * x_nyq) / (0.5 * x_nyq), 0.0, 1.0)
+    table *= 0.5 * (1 + np.cos(np.pi * u))
+    table.flags.writeable = False
+    return table
+
+
+def _get_k_grid(dlnchi):
+    """Logarithmic grid of wavenumbers with spacing ``dlnchi``, anchored
+    to ``k = 1`` so that grids with the same spacing coincide.
+    Returns:
+        m (array): Indices of the wavenumbers, ``ln(k) = m * dlnchi``.
+    """
+    m_min = int(np.floor(np.log(_K_MIN) / dlnchi))
+    m_max = int(np.ceil(np.log(_K_MAX) / dlnchi))
+    return np.arange(m_min, m_max + 1)
+
+
+def _chi_integrands_bessel(cosmo, clt, fchis,
+                           Nchi, chi_min, chi_max,
+                           ell, chi_logspace_arr):
+    """
+    Computes the projections of the radial kernels of a collection onto
+    spherical Bessel functions by direct quadrature. Arguments and
+    outputs are the same as for
+    :func:`~pyccl.nonlimber._nonlimber_FKEM._chi_integrands`, except that
+    all the projections share the same wavenumbers.
+    """
+    dlnchi = np.log(chi_max / chi_min) / (Nchi - 1.0)
+    m = _get_k_grid(dlnchi)
+    lk = m * dlnchi
+    k = np.exp(lk)
+
+    bessels = clt.get_bessel_derivative()
+    avg_as = clt.get_avg_weighted_a()
+    cosmo_key = cosmo._background_cache_key
+
+    n_trc = len(clt._trc)
+    fks = np.zeros((n_trc, len(k)))
+    to_project = {}
+    keys = []
+    for i, t in enumerate(clt._trc):
+        key = (clt._fkem_id, id(t), "bessel", Nchi, chi_min, chi_max, ell,
+               cosmo_key)
+        keys.append(key)
+        cached = clt._fkem_cache.get(key)
+        if cached is None:
+            to_project.setdefault(int(bessels[i]), []).append(i)
+        else:
+            fks[i] = cached[1]
+
+    for b, ind in to_project.items():
+        # Trapezoidal weights in log(chi).
+        g = fchis[ind] * dlnchi
+        g[:, [0, -1]] *= 0.5
+        # Since ln(k_m * chi_j) = (m + j) * dlnchi + const, the projections
+        # sum_j g_j j_ell(k_m chi_j) are the correlation of g with a table
+        # of the Bessel functions, which is computed with FFTs.
+        table = _j_ell_table(float(ell), b, lk[0] + np.log(chi_min), dlnchi,
+                             len(k) + Nchi - 1)
+        fk = fftconvolve(table[None, :], g[:, ::-1], mode="valid", axes=1)
+        for j, i in enumerate(ind):
+            clt._fkem_cache.set(keys[i], k, fk[j])
+            fks[i] = fk[j]
+
+    transfers = np.array([_get_sub_transfer(t, lk, avg_as[i])
+                          for i, t in enumerate(clt._trc)])
+    return [k] * n_trc, fks, transfers
+
+
+def _nonlimber_bessel(
+        cosmo, clt1, clt2, p_of_k_a,
+        ls, l_limber, **params):
+    """Performs the non-Limber integration for angular power spectra
+    from the projections of the radial kernels onto spherical Bessel
+    functions, computed by direct quadrature on a fixed grid of
+    wavenumbers. Arguments, parameters and outputs are the same as for
+    :func:`~pyccl.nonlimber._nonlimber_FKEM._nonlimber_FKEM`.
+
+    The sampling of the comoving distance must be fine enough to
+    resolve the oscillations of the Bessel functions: these are
+    suppressed where :math:`k\\chi\\,\\Delta\\ln\\chi > \\pi/2`, which
+    must be well above :math:`\\ell` for all the non-Limber multipoles.
+    """
+    return _nonlimber_projected(cosmo, clt1, clt2, p_of_k_a, ls, l_limber,
+                                _chi_integrands_bessel, **params)
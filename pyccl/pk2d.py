@@ -1,12 +1,15 @@
 __all__ = ("Pk2D", "parse_pk2d", "parse_pk",)
 
+import threading
+
 import numpy as np
 
 from . import (
-    CCLObject, DEFAULT_POWER_SPECTRUM, UnlockInstance, check, get_pk_spline_a,
-    get_pk_spline_lk, lib, unlock_instance)
+    CCLObject, DEFAULT_POWER_SPECTRUM, SharedArrays, UnlockInstance, check,
+    get_pk_spline_a, get_pk_spline_lk, lib, unlock_instance)
 from . import CCLWarning, CCLError, warnings
-from .pyutils import _get_spline1d_arrays, _get_spline2d_arrays
+from ._core import hash_
+from .pyutils import _get_spline1d_arrays, _get_spline2d_views, _readonly
 
 
 class Pk2D(CCLObject):
@@ -20,7 +23,12 @@ class Pk2D(CCLObject):
         or in-place is supported between ``Pk2D`` objects and other ``Pk2D``
         objects, integers, or floats. When the second object is also of type
         ``Pk2D``, the a- and k-range changes to the most restrictive range.
-        Exponentiation is also supported for integers and floats.
+        Exponentiation is also supported for integers and floats. These
+        operations are lazy: they only record the expression, which is
+        never tabulated. It is evaluated pointwise in C from the splines of
+        its operands whenever the result is evaluated (including within the
+        C-level Limber integrals). Only very long chains of operations are
+        tabulated on the grid of the first operand.
 
     .. note::
 
@@ -60,6 +68,10 @@ class Pk2D(CCLObject):
     .. automethod:: __call__
     """ # noqa E501
     from ._core.repr_ import build_string_Pk2D as __repr__
+    # Maximum depth of lazy arithmetic expressions before they are evaluated.
+    _lazy_max_depth = 64
+    # Serialises the evaluation of lazy expressions across threads.
+    _lazy_lock = threading.RLock()
 
     def __init__(self, *, a_arr=None, lk_arr=None, pk_arr=None,
                  is_logp=True, extrap_order_lok=1, extrap_order_hik=2):
@@ -73,7 +85,8 @@ class Pk2D(CCLObject):
             raise ValueError("Input scale factor array in `a_arr` is not "
                              "monotonically increasing.")
 
-        pkflat = pk_arr.flatten()
+        # Avoid copying the input (e.g. if it is memory-mapped).
+        pkflat = np.ravel(pk_arr)
         # Check dimensions make sense
         if len(pkflat) != len(a_arr)*len(lk_arr):
             raise ValueError("Size of input arrays is inconsistent")
@@ -125,6 +138,197 @@ class Pk2D(CCLObject):
                    is_logp=is_logp, extrap_order_lok=extrap_order_lok,
                    extrap_order_hik=extrap_order_hik)
 
+    @classmethod
+    def from_boost(cls, pk, boost):
+        """Generates a `Pk2D` object holding the product of a power spectrum
+        and a multiplicative boost, :math:`P(k,a)\\,B(k,a)`.
+
+        The product is never tabulated. Instead, both factors are evaluated
+        and multiplied on the fly whenever the returned object is evaluated
+        (including within the C-level Limber integrals). Changing the boost
+        therefore only requires tabulating the boost itself, and ``pk`` can
+        be shared by any number of boosted power spectra.
+
+        .. note::
+
+            The returned object holds references to ``pk`` and to the
+            boost, so these are kept alive for as long as it exists. Its
+            interpolation range and extrapolation behaviour are those of
+            ``pk``. The boost is never extrapolated in scale factor:
+            outside of its range it is evaluated at the closest available
+            scale factor.
+
+        Args:
+            pk (:class:`Pk2D`): power spectrum to be boosted.
+            boost (:class:`Pk2D`, `array` or :obj:`callable`): the boost
+                :math:`B(k,a)`. If a `Pk2D`, its support must contain that
+                of ``pk``. If an array, it must have shape ``(na, nk)`` and
+                hold the values of the boost at the scale factors and
+                wavenumbers at which ``pk`` is sampled. If a function, it
+                must have signature ``f(k, a)``, be vectorized in both
+                arguments and return an array of shape ``(na, nk)``. It is
+                then sampled on the same grid as ``pk``.
+
+        Returns:
+            :class:`~pyccl.pk2d.Pk2D`. Boosted power spectrum.
+        """
+        if not pk:
+            raise ValueError("Pk2D object does not have data.")
+
+        if not isinstance(boost, Pk2D):
+            a_arr, lk_arr = pk._get_spline_grid()
+            if callable(boost):
+                boost = boost(np.exp(lk_arr), a_arr)
+            boost = np.asarray(boost, dtype=float)
+            if boost.shape != (a_arr.size, lk_arr.size):
+                raise ValueError("Boost array must have shape (na, nk) "
+                                 "matching the power spectrum sampling.")
+            logb = np.all(boost > 0)
+            boost = Pk2D(a_arr=a_arr, lk_arr=lk_arr,
+                         pk_arr=np.log(boost) if logb else boost,
+                         is_logp=logb,
+                         extrap_order_lok=pk.extrap_order_lok,
+                         extrap_order_hik=pk.extrap_order_hik)
+        elif pk not in boost:
+            raise ValueError("The boost is defined over a smaller range "
+                             "than the power spectrum.")
+
+        pk2d = Pk2D.__new__(cls)
+        status = 0
+        psp, status = lib.f2d_t_new_boosted(pk.psp, boost.psp, status)
+        check(status)
+        with UnlockInstance(pk2d):
+            pk2d.psp = psp
+            pk2d._pk_base = pk
+            pk2d._pk_boost = boost
+        return pk2d
+
+    def to_shared(self, path=None):
+        """Store the spline data of this power spectrum in memory that
+        other processes can attach to. The power spectra built from it with
+        :meth:`from_shared` interpolate it in place, so that any number of
+        processes share a single copy of the data.
+
+        The data include the derivatives at the nodes used by the bicubic
+        interpolation, so that the interpolation is the same as that of
+        this object.
+
+        Args:
+            path (:obj:`str`): if not ``None``, store the data in a
+                memory-mapped file at this path. Otherwise, use a shared
+                memory block.
+
+        Returns:
+            :class:`~pyccl.SharedArrays`. Picklable handle to the shared
+            data. The caller must call its ``unlink`` method once the data
+            are no longer needed.
+        """
+        a_arr, lk_arr, pk_arr, is_log = self.get_spline_views()
+        shared = SharedArrays(
+            [a_arr.shape, lk_arr.shape, pk_arr.shape, (3,) + pk_arr.shape],
+            meta={"type": "Pk2D", "is_log": is_log,
+                  "extrap_order_lok": self.extrap_order_lok,
+                  "extrap_order_hik": self.extrap_order_hik},
+            path=path)
+        a_sh, lk_sh, pk_sh, dpk_sh = shared.arrays
+        a_sh[...] = a_arr
+        lk_sh[...] = lk_arr
+        pk_sh[...] = pk_arr
+        status = 0
+        status = lib.bicubic_derivs(lk_sh, a_sh, pk_sh.reshape(-1),
+                                    dpk_sh.reshape(-1), status)
+        check(status)
+        shared.flush()
+        return shared
+
+    @classmethod
+    def from_shared(cls, shared):
+        """Build a :class:`Pk2D` from data stored with :meth:`to_shared`.
+        The new object interpolates the shared data in place, without
+        copying them.
+
+        .. note::
+
+            The new object holds references to the shared arrays, which
+            therefore stay mapped in this process for as long as it
+            exists. ``shared`` must not be closed before then.
+
+        Args:
+            shared (:class:`~pyccl.SharedArrays`): shared spline data.
+
+        Returns:
+            :class:`~pyccl.pk2d.Pk2D`. Power spectrum object.
+        """
+        if shared.meta.get("type") != "Pk2D":
+            raise ValueError("Shared data do not hold a Pk2D.")
+        pk2d = Pk2D.__new__(cls)
+        pk2d._attach_shared(shared)
+        return pk2d
+
+    def _attach_shared(self, shared):
+        # Build the C interpolator of the data held by `shared`.
+        meta = shared.meta
+        a_arr, lk_arr, pk_arr, dpk_arr = arrs = tuple(shared.arrays)
+        status = 0
+        psp, status = lib.set_pk2d_new_external(
+            lk_arr, a_arr, pk_arr.reshape(-1), dpk_arr.reshape(-1),
+            int(meta["extrap_order_lok"]), int(meta["extrap_order_hik"]),
+            int(meta["is_log"]), status)
+        check(status)
+        with UnlockInstance(self, mutate=False):
+            self.psp = psp
+            # Keep the shared memory mapped while it is interpolated.
+            self._shared = shared
+            self._shared_arrays = arrs
+
+    def __getstate__(self):
+        # Remove the C data before pickling, so that power spectra (e.g.
+        # those held by a Cosmology) can be sent to other processes. Plain
+        # power spectra store their spline data instead, while boosted, lazy
+        # and shared objects rebuild their C data from their attributes.
+        state = self.__dict__.copy()
+        state.pop('_shared_arrays', None)
+        if state.pop('psp', None) is not None and not (
+                self.is_boosted or self.is_lazy or self.is_shared):
+            state['_spline_data'] = (*self.get_spline_views(),
+                                     self.extrap_order_lok,
+                                     self.extrap_order_hik)
+        return state
+
+    def __setstate__(self, state):
+        spline_data = state.pop('_spline_data', None)
+        self.__dict__ = state
+        status = 0
+        if self.is_shared:
+            self._attach_shared(self._shared)
+            return
+        if self.is_boosted:
+            psp, status = lib.f2d_t_new_boosted(
+                self._pk_base.psp, self._pk_boost.psp, status)
+        elif spline_data is not None:
+            a_arr, lk_arr, pk_arr, is_log, lok, hik = spline_data
+            psp, status = lib.set_pk2d_new_from_arrays(
+                lk_arr, a_arr, pk_arr.ravel(), int(lok), int(hik),
+                int(is_log), status)
+        else:
+            # Empty or lazy (built on first access to `psp`).
+            return
+        check(status)
+        with UnlockInstance(self, mutate=False):
+            self.psp = psp
+
+    @property
+    def is_shared(self):
+        """Whether this object interpolates data held in shared memory (see
+        :meth:`from_shared`)."""
+        return '_shared' in vars(self)
+
+    @property
+    def is_boosted(self):
+        """Whether this object is a lazy product of a power spectrum and a
+        boost (see :meth:`from_boost`)."""
+        return '_pk_boost' in vars(self)
+
     def __eq__(self, other):
         # Check object id.
         if self is other:
@@ -140,26 +344,61 @@ class Pk2D(CCLObject):
                 and self.extrap_order_hik == other.extrap_order_hik):
             return False
         # Check the individual splines.
-        a1, lk1, pk1 = self.get_spline_arrays()
-        a2, lk2, pk2 = other.get_spline_arrays()
+        a1, lk1, pk1, log1 = self.get_spline_views()
+        a2, lk2, pk2, log2 = other.get_spline_views()
+        if log1 != log2:
+            pk1 = np.exp(pk1) if log1 else pk1
+            pk2 = np.exp(pk2) if log2 else pk2
         return ((a1 == a2).all() and (lk1 == lk2).all()
                 and np.array_equal(pk1, pk2))
 
     def __hash__(self):
-        return hash(repr(self))
+        # Hash the data as compared by `__eq__`, so that equal objects
+        # stored in linear and in log space share the same hash.
+        if not self:
+            return hash(repr(self))
+        return hash((self.extrap_order_lok, self.extrap_order_hik,
+                     self._hash_arrs()))
+
+    def _hash_arrs(self):
+        # Hash of the spline data, with the power spectrum in linear space.
+        a, lk, pk, is_log = self.get_spline_views()
+        if is_log:
+            pk = np.exp(pk)
+        return sum([hash_(obj) for obj in [a, lk, pk]])
 
     @property
     def has_psp(self):
-        return 'psp' in vars(self)
+        # Lazy expressions build their C expression on first access to `psp`.
+        return 'psp' in vars(self) or self.is_lazy
+
+    @property
+    def is_lazy(self):
+        """Whether this object holds an arithmetic expression of other
+        :class:`Pk2D` objects, evaluated pointwise from their splines."""
+        return '_expr' in vars(self)
 
     @property
     def extrap_order_lok(self):
+        if self.is_lazy:
+            return self._extrap_orders[0]
         return self.psp.extrap_order_lok if self else None
 
     @property
     def extrap_order_hik(self):
+        if self.is_lazy:
+            return self._extrap_orders[1]
         return self.psp.extrap_order_hik if self else None
 
+    def __getattr__(self, name):
+        # Only called if `name` is not found. The C expression of lazy
+        # objects is built here the first time it is needed.
+        if name == 'psp' and self.is_lazy:
+            self._build_expr()
+            return vars(self)['psp']
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'")
+
     @classmethod
     def from_model(cls, cosmo, model):
         """:class:`Pk2D` constructor returning the power spectrum
@@ -304,6 +543,23 @@ class Pk2D(CCLObject):
             out = np.squeeze(out, axis=0)
         return out
 
+    def _eval_pairs(self, k, a, cosmo):
+        """Evaluate the power spectrum at pairs of wavenumbers and scale
+        factors, ``out[...] = P(k[...], a[...])``, in a single call. Both
+        arrays must have the same shape. The linear growth factor of
+        ``cosmo`` is used to extrapolate in the scale factor.
+        """
+        cosmo.compute_growth()
+        self.psp.extrap_linear_growth = 401
+        k_use, a_use = np.broadcast_arrays(np.asarray(k, dtype=float),
+                                           np.asarray(a, dtype=float))
+        lk_use = np.log(k_use).ravel()
+        status = 0
+        f, status = lib.pk2d_eval_pairs(self.psp, lk_use, a_use.ravel(),
+                                        cosmo.cosmo, lk_use.size, status)
+        check(status, cosmo)
+        return f.reshape(k_use.shape)
+
     # Save a dummy cosmology as an attribute of the `__call__` method
     # so we don't have to initialize one every time no `cosmo` is passed.
     # This is gentle with memory too, as `free` does not work for an empty
@@ -327,33 +583,193 @@ class Pk2D(CCLObject):
             - lk_arr: Array of natural logarithm of wavenumber k.
             - pk_arr: Array of the power spectrum :math:`P(k, a)`. The shape
               is ``(a_arr.size, lk_arr.size)``.
+
+            These are copies of the internal data. Use
+            :meth:`get_spline_views` to access it without copying.
+        """
+        a_arr, lk_arr, pk_arr, is_log = self.get_spline_views()
+        pk_arr = np.exp(pk_arr) if is_log else pk_arr.copy()
+        return a_arr.copy(), lk_arr.copy(), pk_arr
+
+    def get_spline_views(self):
+        """Get read-only views of the spline data arrays internally stored
+        by this object, without copying them. The views keep this object
+        alive for as long as they exist.
+
+        Returns:
+            Tuple containing
+
+            - a_arr: Array of scale factors.
+            - lk_arr: Array of natural logarithm of wavenumber k.
+            - pk_arr: Array of the stored values of the power spectrum.
+              The shape is ``(a_arr.size, lk_arr.size)``.
+            - is_log: Whether ``pk_arr`` holds :math:`\\log P(k, a)` rather
+              than :math:`P(k, a)`.
+
+            For boosted power spectra (see :meth:`from_boost`) and lazy
+            arithmetic expressions (see :attr:`is_lazy`), ``pk_arr`` is
+            evaluated on the grid of the base power spectrum or of the first
+            operand, and is not a view.
         """
         if not self:
             raise ValueError("Pk2D object does not have data.")
 
-        a_arr, lk_arr, pk_arr = _get_spline2d_arrays(self.psp.fka)
-        if self.psp.is_log:
-            pk_arr = np.exp(pk_arr)
+        if self.is_boosted or self.is_lazy:
+            # Evaluate the product or expression on its grid.
+            a_arr, lk_arr = self._get_spline_grid()
+            return a_arr, lk_arr, self(np.exp(lk_arr), a_arr), False
 
-        return a_arr, lk_arr, pk_arr
+        if self.is_shared:
+            a_arr, lk_arr, pk_arr = [_readonly(arr)
+                                     for arr in self._shared_arrays[:3]]
+        else:
+            a_arr, lk_arr, pk_arr = _get_spline2d_views(self.psp.fka, self)
+        return a_arr, lk_arr, pk_arr, bool(self.psp.is_log)
+
+    def _get_spline_grid(self):
+        # Scale factor and log(k) arrays over which this object is sampled.
+        if self.is_lazy:
+            return self._grid
+        if self.is_boosted:
+            return self._pk_base._get_spline_grid()
+        if self.is_shared:
+            return tuple(_readonly(arr) for arr in self._shared_arrays[:2])
+        a_arr, lk_arr, _ = _get_spline2d_views(self.psp.fka, self)
+        return a_arr, lk_arr
+
+    def _get_range(self):
+        # Interpolation range as (amin, amax, lkmin, lkmax).
+        if self.is_lazy:
+            a_arr, lk_arr = self._grid
+            return a_arr[0], a_arr[-1], lk_arr[0], lk_arr[-1]
+        return self.psp.amin, self.psp.amax, self.psp.lkmin, self.psp.lkmax
 
     def __del__(self):
         """Free memory associated with this Pk2D structure."""
-        if self:
+        # Expression nodes do not own the splines of their operands.
+        if 'psp' in vars(self):
             lib.f2d_t_free(self.psp)
 
     def __bool__(self):
         return self.has_psp
 
     def __contains__(self, other):
-        if not (self.psp.lkmin <= other.psp.lkmin
-                and self.psp.lkmax >= other.psp.lkmax
-                and self.psp.amin <= other.psp.amin
-                and self.psp.amax >= other.psp.amax):
+        amin, amax, lkmin, lkmax = self._get_range()
+        amin_o, amax_o, lkmin_o, lkmax_o = other._get_range()
+        if not (lkmin <= lkmin_o and lkmax >= lkmax_o
+                and amin <= amin_o and amax >= amax_o):
             return False
         return True
 
-    def _get_binary_operator_arrays(self, other):
+    @classmethod
+    def _from_expr(cls, expr, pk):
+        # Lazy Pk2D holding the arithmetic expression `expr`, a tuple
+        # `(operator, operand_1, operand_2)` with operator one of
+        # 'add', 'mul' or 'pow'. It is sampled on the grid of `pk` and
+        # inherits its extrapolation orders.
+        new = Pk2D.__new__(Pk2D)
+        depth = 1 + max(getattr(x, '_depth', 0) for x in expr[1:])
+        with UnlockInstance(new):
+            new._expr = expr
+            new._grid = pk._get_spline_grid()
+            new._extrap_orders = (pk.extrap_order_lok, pk.extrap_order_hik)
+            new._depth = depth
+        if depth >= cls._lazy_max_depth:
+            # Keep the depth of the C expression bounded for long chains of
+            # operations (e.g. in-place operations in a loop).
+            new._materialize()
+        return new
+
+    def _build_expr(self):
+        # Build the C expression node evaluating this lazy object pointwise.
+        # The operands are kept alive by `_expr`.
+        with Pk2D._lazy_lock:
+            if 'psp' in vars(self):
+                return
+            op, x, y = self._expr
+            opcode = {'add': lib.f2d_expr_add, 'mul': lib.f2d_expr_mul,
+                      'pow': lib.f2d_expr_pow}[op]
+            psp_y, c = (y.psp, 0.) if isinstance(y, Pk2D) else (None, y)
+            status = 0
+            psp, status = lib.f2d_t_new_expr(opcode, x.psp, psp_y,
+                                             float(c), status)
+            check(status)
+            with UnlockInstance(self, mutate=False):
+                self.psp = psp
+
+    def _materialize(self):
+        # Evaluate the lazy expression held by this object on its grid in
+        # a single pass, and build its spline.
+        with Pk2D._lazy_lock:
+            if self.is_lazy:
+                self._materialize_locked()
+
+    def _materialize_locked(self):
+        a_arr, lk_arr = self._grid
+        pk_arr = self._eval_on_grid(a_arr, lk_arr, {})
+
+        logp = np.all(pk_arr > 0)
+        if logp:
+            pk_arr = np.log(pk_arr)
+
+        lok, hik = self._extrap_orders
+        status = 0
+        psp, status = lib.set_pk2d_new_from_arrays(lk_arr, a_arr,
+                                                   pk_arr.flatten(),
+                                                   int(lok), int(hik),
+                                                   int(logp), status)
+        check(status)
+        with UnlockInstance(self, mutate=False):
+            self.psp = psp
+            # Release the operands. The grid and extrapolation orders are
+            # kept, since other threads may still be reading them.
+            del self._expr, self._depth
+
+    def _eval_on_grid(self, a_arr, lk_arr, cache):
+        # Values of this power spectrum on the grid `(a_arr, lk_arr)`.
+        # Lazy expressions are evaluated directly on that grid, without
+        # building any intermediate spline. `cache` maps `id`s to the values
+        # of the operands already evaluated, so that operands appearing
+        # multiple times are only evaluated once.
+        key = id(self)
+        if key in cache:
+            return cache[key]
+
+        if self.is_lazy:
+            op, x, y = self._expr
+            vx = x._eval_on_grid(a_arr, lk_arr, cache)
+            if isinstance(y, Pk2D):
+                y = y._eval_on_grid(a_arr, lk_arr, cache)
+            if op == 'add':
+                out = vx + y
+            elif op == 'mul':
+                out = vx * y
+            else:
+                if x.is_lazy:
+                    # Non-lazy operands are checked in `__pow__`.
+                    self._check_pow(vx, y)
+                out = vx ** y
+        else:
+            a_own, lk_own = self._get_spline_grid()
+            if (a_own.size == a_arr.size and lk_own.size == lk_arr.size
+                    and np.allclose(a_own, a_arr)
+                    and np.allclose(lk_own, lk_arr)):
+                out = self.get_spline_arrays()[-1]
+            else:
+                out = self(np.exp(lk_arr), a_arr)
+
+        cache[key] = out
+        return out
+
+    @staticmethod
+    def _check_pow(pk_arr, exponent):
+        if np.any(pk_arr < 0) and exponent % 1 != 0:
+            warnings.warn(
+                "Taking a non-positive Pk2D object to a non-integer "
+                "power may lead to unexpected results",
+                category=CCLWarning, importance='high')
+
+    def _check_binary_operator(self, other):
         if not (self and other):
             raise ValueError("Pk2D object does not have data.")
         if self not in other:
@@ -363,21 +779,19 @@ class Pk2D(CCLObject):
                 "is forbidden. If you want to operate on the smaller support, "
                 "try swapping the operands.")
 
-        a_arr_a, lk_arr_a, pk_arr_a = self.get_spline_arrays()
-        a_arr_b, lk_arr_b, pk_arr_b = other.get_spline_arrays()
+        a_arr_a, lk_arr_a = self._get_spline_grid()
+        a_arr_b, lk_arr_b = other._get_spline_grid()
         if not (a_arr_a.size == a_arr_b.size
                 and lk_arr_a.size == lk_arr_b.size
                 and np.allclose(a_arr_a, a_arr_b)
                 and np.allclose(lk_arr_a, lk_arr_b)):
+            amin, amax, lkmin, lkmax = self._get_range()
             warnings.warn(
                 "Operands defined over different ranges. "
                 "The result will be interpolated and clipped to "
-                f"{self.psp.lkmin} <= log k <= {self.psp.lkmax} and "
-                f"{self.psp.amin} <= a <= {self.psp.amax}.",
+                f"{lkmin} <= log k <= {lkmax} and "
+                f"{amin} <= a <= {amax}.",
                 category=CCLWarning, importance='low')
-            pk_arr_b = other(np.exp(lk_arr_a), a_arr_a)
-
-        return a_arr_a, lk_arr_a, pk_arr_a, pk_arr_b
 
     def __add__(self, other):
         """Adds two Pk2D instances.
@@ -385,29 +799,17 @@ class Pk2D(CCLObject):
         The a and k ranges of the 2nd operand need to be the same or smaller
         than the 1st operand.
         The returned Pk2D object uses the same a and k arrays as the first
-        operand.
+        operand. It is evaluated lazily (see :attr:`is_lazy`).
         """
         if isinstance(other, (float, int)):
-            a_arr_a, lk_arr_a, pk_arr_a = self.get_spline_arrays()
-            pk_arr_new = pk_arr_a + other
+            if not self:
+                raise ValueError("Pk2D object does not have data.")
         elif isinstance(other, Pk2D):
-            a_arr_a, lk_arr_a, pk_arr_a, pk_arr_b = \
-                self._get_binary_operator_arrays(other)
-            pk_arr_new = pk_arr_a + pk_arr_b
+            self._check_binary_operator(other)
         else:
             raise TypeError("Addition of Pk2D is only defined for "
                             "floats, ints, and Pk2D objects.")
-
-        logp = np.all(pk_arr_new > 0)
-        if logp:
-            pk_arr_new = np.log(pk_arr_new)
-
-        new = Pk2D(a_arr=a_arr_a, lk_arr=lk_arr_a, pk_arr=pk_arr_new,
-                   is_logp=logp,
-                   extrap_order_lok=self.extrap_order_lok,
-                   extrap_order_hik=self.extrap_order_hik)
-
-        return new
+        return self._from_expr(('add', self, other), self)
 
     def __mul__(self, other):
         """Multiply two Pk2D instances.
@@ -415,54 +817,33 @@ class Pk2D(CCLObject):
         The a and k ranges of the 2nd operand need to be the same or smaller
         than the 1st operand.
         The returned Pk2D object uses the same a and k arrays as the first
-        operand.
+        operand. It is evaluated lazily (see :attr:`is_lazy`).
         """
         if isinstance(other, (float, int)):
-            a_arr_a, lk_arr_a, pk_arr_a = self.get_spline_arrays()
-            pk_arr_new = other * pk_arr_a
+            if not self:
+                raise ValueError("Pk2D object does not have data.")
         elif isinstance(other, Pk2D):
-            a_arr_a, lk_arr_a, pk_arr_a, pk_arr_b = \
-                self._get_binary_operator_arrays(other)
-            pk_arr_new = pk_arr_a * pk_arr_b
+            self._check_binary_operator(other)
         else:
             raise TypeError("Multiplication of Pk2D is only defined for "
                             "floats, ints, and Pk2D objects.")
-
-        logp = np.all(pk_arr_new > 0)
-        if logp:
-            pk_arr_new = np.log(pk_arr_new)
-
-        new = Pk2D(a_arr=a_arr_a, lk_arr=lk_arr_a, pk_arr=pk_arr_new,
-                   is_logp=logp,
-                   extrap_order_lok=self.extrap_order_lok,
-                   extrap_order_hik=self.extrap_order_hik)
-        return new
+        return self._from_expr(('mul', self, other), self)
 
     def __pow__(self, exponent):
-        """Take a Pk2D instance to a power.
+        """Take a Pk2D instance to a power. The result is evaluated lazily
+        (see :attr:`is_lazy`).
         """
         if not isinstance(exponent, (float, int)):
             raise TypeError(
                 "Exponentiation of Pk2D is only defined for floats and ints.")
-        a_arr_a, lk_arr_a, pk_arr_a = self.get_spline_arrays()
-        if np.any(pk_arr_a < 0) and exponent % 1 != 0:
-            warnings.warn(
-                "Taking a non-positive Pk2D object to a non-integer "
-                "power may lead to unexpected results",
-                category=CCLWarning, importance='high')
-
-        pk_arr_new = pk_arr_a**exponent
-
-        logp = np.all(pk_arr_new > 0)
-        if logp:
-            pk_arr_new = np.log(pk_arr_new)
-
-        new = Pk2D(a_arr=a_arr_a, lk_arr=lk_arr_a, pk_arr=pk_arr_new,
-                   is_logp=logp,
-                   extrap_order_lok=self.extrap_order_lok,
-                   extrap_order_hik=self.extrap_order_hik)
-
-        return new
+        if not self:
+            raise ValueError("Pk2D object does not have data.")
+        if not self.is_lazy:
+            # Values stored in log-space are positive.
+            _, _, pk_arr, is_log = self.get_spline_views()
+            if not is_log:
+                self._check_pow(pk_arr, exponent)
+        return self._from_expr(('pow', self, exponent), self)
 
     def __sub__(self, other):
         return self + (-1)*other
@@ -34,6 +34,11 @@ integ_types = {
     'qag_quad': lib.integration_qag_quad,
     'spline': lib.integration_spline}
 
+# Limber power spectra can also be computed as matrix products.
+limber_integ_types = {
+    **integ_types,
+    'matrix': lib.integration_matrix}
+
 extrap_types = {
     'none': lib.f1d_extrap_0,
     'constant': lib.f1d_extrap_const,
@@ -744,6 +749,141 @@ def _get_spline3d_arrays(gsl_spline, length):
     return xarr, yarr, zarr.reshape((length, x_size, y_size))
 
 
+class _SplineView:
+    """Expose a NumPy array pointing to memory owned by a C object,
+    holding a reference to the Python object that owns it.
+
+    NumPy arrays created with ``np.asarray`` from this object keep it (and
+    hence the owner) alive, so the memory is not freed while they exist.
+    """
+    __slots__ = ("__array_interface__", "_owner")
+
+    def __init__(self, arr, owner):
+        self.__array_interface__ = arr.__array_interface__
+        self._owner = owner
+
+
+def _readonly_view(arr, owner, shape=None):
+    """Return a read-only view of ``arr``, which points to memory held by
+    ``owner``, tied to the lifetime of ``owner``.
+    """
+    view = np.asarray(_SplineView(arr, owner))
+    if shape is not None:
+        view = view.reshape(shape)
+    view.flags.writeable = False
+    return view
+
+
+def _readonly(arr):
+    """Return a read-only view of ``arr``."""
+    view = np.asarray(arr).view()
+    view.flags.writeable = False
+    return view
+
+
+def _get_spline2d_views(gsl_spline, owner):
+    """Get read-only views of the array data of a 2D GSL spline.
+
+    Unlike :func:`_get_spline2d_arrays`, no data are copied.
+
+    Args:
+        gsl_spline: `SWIGObject` of gsl_spline2d *
+            The SWIG object of the 2D GSL spline.
+        owner:
+            The Python object that owns the spline. It is kept alive for
+            as long as the views exist.
+
+    Returns:
+        yarr: `array`
+            The y array of the spline.
+        xarr: `array`
+            The x array of the spline.
+        zarr: `array`
+            The z array of the spline. The shape is (yarr.size, xarr.size).
+    """
+    status = 0
+    xarr, yarr, zarr, status = lib.get_spline2d_views(gsl_spline, status)
+    check(status)
+
+    return (_readonly_view(yarr, owner), _readonly_view(xarr, owner),
+            _readonly_view(zarr, owner, (yarr.size, xarr.size)))
+
+
+def _get_array_view(arr, size, owner):
+    """Get a read-only view of a C array of doubles of a given size, held
+    by ``owner``."""
+    status = 0
+    view, status = lib.get_array_view(arr, size, status)
+    check(status)
+    return _readonly_view(view, owner)
+
+
+def _get_spline3d_views(gsl_spline, length, owner):
+    """Get read-only views of the array data of an array of 2D GSL splines.
+
+    Unlike :func:`_get_spline3d_arrays`, no data are copied. Since each
+    spline owns its own data, the z arrays are returned as a list.
+
+    Args:
+        gsl_spline (`SWIGObject` of gsl_spline2d **):
+            The SWIG object of the 2D GSL spline.
+        length (:obj:`int`):
+            The length of the 3rd dimension.
+        owner:
+            The Python object that owns the splines. It is kept alive for
+            as long as the views exist.
+
+    Returns:
+        xarr: `array`
+            The x array of the spline.
+        yarr: `array`
+            The y array of the spline.
+        zarrs: `list`
+            The z arrays of each spline. Their shape is
+            (xarr.size, yarr.size).
+    """
+    status = 0
+    zarrs = []
+    for i in range(length):
+        xarr, yarr, zarr, status = lib.get_spline3d_views(gsl_spline, i,
+                                                          status)
+        check(status)
+        zarrs.append(_readonly_view(zarr, owner, (xarr.size, yarr.size)))
+
+    # all splines share the same x and y arrays
+    return _readonly_view(xarr, owner), _readonly_view(yarr, owner), zarrs
+
+
+def _get_spline1d_array_views(gsl_splines, length, owner):
+    """Get read-only views of the array data of an array of 1D GSL splines
+    sharing the same x array.
+
+    Args:
+        gsl_splines (`SWIGObject` of gsl_spline **):
+            The SWIG object of the array of 1D GSL splines.
+        length (:obj:`int`):
+            The number of splines.
+        owner:
+            The Python object that owns the splines. It is kept alive for
+            as long as the views exist.
+
+    Returns:
+        xarr: `array`
+            The x array of the splines.
+        yarrs: `list`
+            The y arrays of each spline.
+    """
+    status = 0
+    yarrs = []
+    for i in range(length):
+        xarr, yarr, status = lib.get_spline1d_array_views(gsl_splines, i,
+                                                          status)
+        check(status)
+        yarrs.append(_readonly_view(yarr, owner))
+
+    return _readonly_view(xarr, owner), yarrs
+
+
 def check_openmp_version():
     """Return the OpenMP specification release date.
     Return 0 if OpenMP is not working.
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pytest
 import pyccl as ccl
@@ -279,6 +281,220 @@ def test_fkem_multicomponent_tracer():
     assert np.all(np.isfinite(cl_gk))
 
 
+def test_fkem_cache():
+    from pyccl.tracers import Tracer
+    cache = Tracer._fkem_cache
+    cosmo = ccl.CosmologyVanillaLCDM()
+    params = dict(cosmo._params_init_kwargs)
+    z = np.linspace(0.01, 2.0, 100)
+    nz = np.exp(-((z - 1.0) ** 2) / 0.1)
+    lens = ccl.WeakLensingTracer(cosmo, dndz=(z, nz))
+    kw = dict(l_limber=20, non_limber_integration_method="FKEM",
+              fkem_Nchi=100, fkem_chi_min=1e-6)
+    ells = np.array([2., 5., 10., 20.])
+
+    cl1 = ccl.angular_cl(cosmo, lens, lens, ells, **kw)
+    # The cosmology is not modified by the cache lookups.
+    assert cosmo._params_init_kwargs == params
+    assert cosmo._cache_key == hash(cosmo)
+    n_entries = len(cache._keys[lens._fkem_id])
+    assert n_entries == ells.size
+    cl2 = ccl.angular_cl(cosmo, lens, lens, ells, **kw)
+    assert np.all(cl1 == cl2)
+    assert len(cache._keys[lens._fkem_id]) == n_entries
+
+    # Entries are discarded when the tracer changes or is deleted.
+    lens.set_amplitude(2.)
+    assert lens._fkem_id not in cache._keys
+    ccl.angular_cl(cosmo, lens, lens, ells, **kw)
+    fkem_id = lens._fkem_id
+    del lens
+    assert fkem_id not in cache._keys
+
+    # The cache is bounded in size.
+    maxbytes = cache.maxbytes
+    try:
+        cache.maxbytes = 0
+        lens = ccl.WeakLensingTracer(cosmo, dndz=(z, nz))
+        ccl.angular_cl(cosmo, lens, lens, ells, **kw)
+        assert cache.nbytes == 0
+    finally:
+        cache.maxbytes = maxbytes
+
+
+def test_fkem_cache_threads():
+    from pyccl.tracers import _FKEMCache
+    arr = np.zeros(8)
+    cache = _FKEMCache(maxbytes=20*2*arr.nbytes)
+
+    def work(owner):
+        for i in range(500):
+            cache.set((owner, i % 30), arr, arr)
+            cache.get((owner, (i+1) % 30))
+            if i % 50 == 0:
+                cache.discard(owner)
+
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        list(ex.map(work, range(8)))
+    # The entries and the byte count are consistent.
+    assert cache.nbytes == 2*arr.nbytes*len(cache) <= cache.maxbytes
+    assert sorted(k for keys in cache._keys.values() for k in keys) == \
+        sorted(cache._data)
+
+    # Discarding (e.g. from the garbage collector) while the cache is in use
+    # does not wait for it, and is applied by the next operation.
+    cache.clear()
+    cache.set((0, 0), arr, arr)
+    with cache._lock:
+        cache.discard(0)
+        assert len(cache) == 1
+    assert cache.get((0, 0)) is None
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_fkem_bisect_transition():
+    from pyccl.nonlimber._nonlimber_FKEM import _bisect_transition
+    n = 30
+    for t in range(n + 1):
+        calls = []
+
+        def is_limber(i):
+            calls.append(i)
+            return i >= t
+
+        assert _bisect_transition(n, is_limber) == (t - 1, t)
+        assert len(calls) <= 5
+        # A correct first guess needs at most two checks.
+        calls.clear()
+        assert _bisect_transition(n, is_limber, guess=t) == (t - 1, t)
+        assert len(calls) <= 2
+
+
+def test_fkem_auto_transition_table(monkeypatch):
+    from pyccl.nonlimber import _nonlimber_FKEM as fkem
+    fkem._limber_transitions.clear()
+    z = np.linspace(0.01, 2.0, 100)
+    nz = np.exp(-((z - 1.0) ** 2) / 0.1)
+    cosmo = ccl.CosmologyVanillaLCDM()
+    lens = ccl.WeakLensingTracer(cosmo, dndz=(z, nz))
+    ells = np.arange(2, 300, 4).astype(float)
+    kw = dict(non_limber_integration_method="FKEM",
+              fkem_Nchi=200, fkem_chi_min=1e-6)
+
+    calls = []
+    limber_pairs = fkem._limber_pairs
+
+    def counted(*args):
+        calls.append(args[-1])
+        return limber_pairs(*args)
+
+    monkeypatch.setattr(fkem, "_limber_pairs", counted)
+    cl, meta = ccl.angular_cl(cosmo, lens, lens, ells, l_limber="auto",
+                              return_meta=True, **kw)
+    # Bisection: lin and nonlin Limber at a few multipoles only.
+    assert 0 < len(calls) <= 2 * 8
+
+    # The transition is now known, so no check is needed.
+    calls.clear()
+    cl2, meta2 = ccl.angular_cl(cosmo, lens, lens, ells, l_limber="auto",
+                                return_meta=True, **kw)
+    assert len(calls) == 0
+    assert meta2["l_limber"] == meta["l_limber"]
+    assert np.allclose(cl2, cl, atol=0, rtol=1e-10)
+
+    # Same as fixing the transition.
+    cl3 = ccl.angular_cl(cosmo, lens, lens, ells,
+                         l_limber=int(meta["l_limber"]), **kw)
+    assert np.allclose(cl3, cl, atol=0, rtol=1e-10)
+
+
+def _nonlimber_pairs_reference(cosmo, clt1, clt2, fchis_t1, fchis_t2, pk,
+                               fll_t1, fll_t2, el, ell,
+                               Nchi, chi_min, chi_max, chi_logspace_arr,
+                               dlnr, chi_integrands):
+    # Non-batched reference: the radial integrals and transfer functions of
+    # each tracer are interpolated separately onto the common k grid.
+    from pyccl.nonlimber import _nonlimber_FKEM as fkem
+    ks_1, fks_1, tr_1 = chi_integrands(cosmo, clt1, fchis_t1, Nchi,
+                                       chi_min, chi_max, ell,
+                                       chi_logspace_arr)
+    ks_2, fks_2, tr_2 = chi_integrands(cosmo, clt2, fchis_t2, Nchi,
+                                       chi_min, chi_max, ell,
+                                       chi_logspace_arr)
+    k = fkem._get_k_common(ks_1, ks_2)
+    integ_1 = np.array([np.interp(k, kk, f) * np.interp(k, kk, t)
+                        for kk, f, t in zip(ks_1, fks_1, tr_1)])
+    integ_2 = np.array([np.interp(k, kk, f) * np.interp(k, kk, t)
+                        for kk, f, t in zip(ks_2, fks_2, tr_2)])
+    w_k = k**3 * pk(k, 1.0, cosmo) * dlnr * 2.0 / np.pi
+    return (np.dot(integ_1 * w_k[None, :], integ_2.T)
+            * fll_t1[:, None, el] * fll_t2[None, :, el]).flatten()
+
+
+@pytest.mark.parametrize("l_limber", [40, "auto"])
+def test_fkem_batched_ells(l_limber, monkeypatch):
+    # All multipoles computed at once must match one at a time, for
+    # tracers with several Bessel derivative orders.
+    z = np.linspace(0.01, 2.0, 100)
+    nz = np.exp(-((z - 1.0) ** 2) / 0.1)
+    cosmo = ccl.CosmologyVanillaLCDM()
+    nc = ccl.NumberCountsTracer(cosmo, dndz=(z, nz), has_rsd=True,
+                                bias=(z, np.ones_like(z)),
+                                mag_bias=(z, np.ones_like(z)))
+    lens = ccl.WeakLensingTracer(cosmo, dndz=(z, nz))
+    ells = np.array([2., 5., 10., 20., 40.])
+    kw = dict(l_limber=l_limber, non_limber_integration_method="FKEM",
+              fkem_Nchi=200, fkem_chi_min=1e-6)
+
+    cl, meta = ccl.angular_cl(cosmo, nc, lens, ells, return_meta=True, **kw)
+    assert meta["l_limber"] <= ells[-1]
+    # Beyond the transition, the batched call uses pure Limber.
+    ells_nl = ells[ells <= meta["l_limber"]]
+    cl_one = np.array([ccl.angular_cl(cosmo, nc, lens, [ell], **kw)[0]
+                       for ell in ells_nl])
+    assert np.allclose(cl[:ells_nl.size], cl_one, atol=0, rtol=1e-10)
+
+    # The batched transforms interpolate the product of the radial
+    # integrals and transfer functions, rather than each of them.
+    from pyccl.nonlimber import _nonlimber_FKEM as fkem
+    monkeypatch.setattr(fkem, "_nonlimber_pairs", _nonlimber_pairs_reference)
+    cl_ref = ccl.angular_cl(cosmo, nc, lens, ells, **kw)
+    assert np.allclose(cl, cl_ref, atol=0, rtol=1e-3)
+
+
+@pytest.mark.parametrize("kind", ["nc", "wl"])
+def test_bessel_nonlimber_vs_fkem(kind):
+    z = np.linspace(0.01, 2.0, 200)
+    nz = np.exp(-((z - 1.0) ** 2) / 0.1)
+    pars = dict(Omega_c=0.25, Omega_b=0.05, h=0.67, n_s=0.96,
+                transfer_function="bbks", matter_power_spectrum="linear")
+    cosmo = ccl.Cosmology(sigma8=0.8, **pars)
+    if kind == "nc":
+        tr = ccl.NumberCountsTracer(cosmo, dndz=(z, nz), has_rsd=True,
+                                    bias=(z, 1.5 * np.ones_like(z)))
+    else:
+        tr = ccl.WeakLensingTracer(cosmo, dndz=(z, nz))
+    ells = np.array([2., 5., 10., 20., 50.])
+    kw = dict(l_limber=60, fkem_Nchi=2000, fkem_chi_min=1.0)
+
+    cl_fkem = ccl.angular_cl(cosmo, tr, tr, ells,
+                             non_limber_integration_method="FKEM", **kw)
+    cl_bessel = ccl.angular_cl(cosmo, tr, tr, ells,
+                               non_limber_integration_method="bessel", **kw)
+    assert np.allclose(cl_bessel, cl_fkem, atol=0, rtol=1e-2)
+
+    # The projections are reused when only the power spectrum changes.
+    cosmo2 = ccl.Cosmology(sigma8=0.7, **pars)
+    assert cosmo2._background_cache_key == cosmo._background_cache_key
+    assert cosmo2._cache_key != cosmo._cache_key
+    n_entries = len(tr._fkem_cache._keys[tr._fkem_id])
+    cl2 = ccl.angular_cl(cosmo2, tr, tr, ells,
+                         non_limber_integration_method="bessel", **kw)
+    assert len(tr._fkem_cache._keys[tr._fkem_id]) == n_entries
+    assert np.allclose(cl2, cl_bessel * (0.7 / cosmo["sigma8"])**2,
+                       atol=0, rtol=1e-3)
+
+
 def test_fkem_decomposed_matches_direct_number_counts_mag():
     z = np.linspace(0.01, 2.0, 200)
     nz = np.exp(-((z - 1.0) ** 2) / 0.1)
@@ -409,4 +625,90 @@ def test_cells_mg():
     assert np.all(np.fabs(1 - cl1 / cl0) < 1e-10)
 
 
+@pytest.mark.parametrize("method", ["spline", "matrix", "qag_quad"])
+def test_cells_tracer_stack(method):
+    # Stack of shifted n(z)s, e.g. photo-z realisations
+    dz = np.array([-0.02, 0.0, 0.03])
+    nn = np.exp(-(((ZZ[None, :] - 0.5 - dz[:, None]) / 0.1) ** 2))
+    b = np.sqrt(1.0 + ZZ)
+    lens = ccl.WeakLensingTracer(COSMO, dndz=(ZZ, nn))
+    clus = ccl.NumberCountsTracer(COSMO, has_rsd=False,
+                                  dndz=(ZZ, nn), bias=(ZZ, b))
+    assert isinstance(lens, ccl.TracerStack)
+    assert len(lens) == len(clus) == 3
+
+    ells = np.geomspace(10, 2000, 16)
+    rtol = 1e-10 if method == "qag_quad" else 1e-3
+    for t1, t2 in [(lens, lens), (clus, lens), (lens, LENS), (LENS, clus)]:
+        cl = ccl.angular_cl(COSMO, t1, t2, ells,
+                            limber_integration_method=method)
+        assert cl.shape == (3, ells.size)
+        for i in range(3):
+            tr1 = t1[i] if isinstance(t1, ccl.TracerStack) else t1
+            tr2 = t2[i] if isinstance(t2, ccl.TracerStack) else t2
+            cl_i = ccl.angular_cl(COSMO, tr1, tr2, ells,
+                                  limber_integration_method=method)
+            assert np.allclose(cl[i], cl_i, atol=0, rtol=rtol)
+
+    # Scalar ell
+    cl = ccl.angular_cl(COSMO, lens, lens, 100.)
+    assert cl.shape == (3,)
+
+    # Non-Limber multipoles are computed pair by pair
+    cl, meta = ccl.angular_cl(COSMO, lens, clus, ells, l_limber=20,
+                              return_meta=True)
+    assert cl.shape == (3, ells.size)
+    assert np.all(meta["l_limber"] == 20)
+
+
+@pytest.mark.parametrize("has_rsd", [True, False])
+def test_cells_matrix_vs_qag(has_rsd):
+    clus = ccl.NumberCountsTracer(COSMO, has_rsd=has_rsd, dndz=(ZZ, NN),
+                                  bias=(ZZ, np.ones_like(ZZ)))
+    ells = np.geomspace(2, 3000, 32)
+    for t1, t2 in [(LENS, LENS), (clus, LENS), (clus, clus)]:
+        cl_qag = ccl.angular_cl(COSMO, t1, t2, ells)
+        cl_mat = ccl.angular_cl(COSMO, t1, t2, ells,
+                                limber_integration_method="matrix")
+        assert np.allclose(cl_mat, cl_qag, atol=0, rtol=1e-3)
+
+
+def test_cells_tracer_stack_raises():
+    nn = np.array([NN, NN])
+    lens2 = ccl.WeakLensingTracer(COSMO, dndz=(ZZ, nn))
+    lens3 = ccl.WeakLensingTracer(COSMO, dndz=(ZZ, np.array([NN, NN, NN])))
+    with pytest.raises(ValueError):
+        ccl.angular_cl(COSMO, lens2, lens3, [10., 100.])
+
+
+@pytest.mark.parametrize("method", ["spline", "matrix", "qag_quad"])
+def test_cells_amplitude_templates(method):
+    b = np.ones_like(ZZ)
+    clus = ccl.NumberCountsTracer(COSMO, has_rsd=True, dndz=(ZZ, NN),
+                                  bias=(ZZ, b))
+    lens = ccl.WeakLensingTracer(COSMO, dndz=(ZZ, NN))
+    ells = np.geomspace(10, 1000, 8)
+    c1 = np.array([[1.2, 0.5], [1.0, 0.0]])
+    c2 = np.array([[0.9, 0.0]])
+
+    tmp = ccl.angular_cl_templates(COSMO, clus, lens, ells, n_coeffs=2,
+                                   limber_integration_method=method)
+    assert tmp.shape == (2, 2, 1, 2, ells.size)
+
+    clus.set_amplitude(c1[0], index=0)
+    lens.set_amplitude(c2[0])
+    cl = ccl.angular_cl(COSMO, clus, lens, ells,
+                        limber_integration_method=method)
+    cl_tmp = np.einsum('ip,jq,ipjql->l', c1, c2, tmp)
+    assert np.allclose(cl, cl_tmp, atol=0, rtol=1e-3)
+
+    # Templates ignore the current amplitudes
+    tmp2 = ccl.angular_cl_templates(COSMO, clus, lens, ells, n_coeffs=2,
+                                    limber_integration_method=method)
+    assert np.allclose(tmp, tmp2, atol=0, rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        ccl.angular_cl_templates(COSMO, clus, lens, ells, n_coeffs=9)
+
+
 ccl.gsl_params.reload()  # reset to the default parameters
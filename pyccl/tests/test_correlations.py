@@ -103,6 +103,216 @@ def test_correlation_pi_sigma_smoke(sval):
     assert np.shape(corr) == np.shape(sval)
 
 
+def test_correlation_3d_multi_a():
+    a_arr = np.array([0.5, 0.8, 1.])
+    beta = np.array([0.7, 0.5, 0.4])
+    r = np.logspace(1, 2, 5)
+    kw = dict(atol=0, rtol=1E-8)
+
+    xi = ccl.correlation_3d(COSMO, r=r, a=a_arr)
+    assert xi.shape == (3, 5)
+    for x, a in zip(xi, a_arr):
+        assert np.allclose(x, ccl.correlation_3d(COSMO, r=r, a=a), **kw)
+    assert ccl.correlation_3d(COSMO, r=50., a=a_arr).shape == (3,)
+
+    xi = ccl.correlation_multipole(COSMO, r=r, a=a_arr, beta=beta,
+                                   ell=[0, 2, 4])
+    assert xi.shape == (3, 3, 5)
+    for x, a, b in zip(xi, a_arr, beta):
+        for xl, ell in zip(x, [0, 2, 4]):
+            xl0 = ccl.correlation_multipole(COSMO, r=r, a=a, beta=b, ell=ell)
+            assert np.allclose(xl, xl0, **kw)
+    xi = ccl.correlation_multipole(COSMO, r=r, a=0.8, beta=0.5, ell=[0, 2])
+    assert xi.shape == (2, 5)
+    xi = ccl.correlation_multipole(COSMO, r=r, a=a_arr, beta=0.5, ell=2)
+    assert xi.shape == (3, 5)
+    with pytest.raises(ValueError):
+        ccl.correlation_multipole(COSMO, r=r, a=a_arr, beta=0.5, ell=1)
+
+    xi = ccl.correlation_3dRsd(COSMO, r=r, a=a_arr, mu=0.3, beta=beta)
+    for x, a, b in zip(xi, a_arr, beta):
+        x0 = ccl.correlation_3dRsd(COSMO, r=r, a=a, mu=0.3, beta=b,
+                                   use_spline=False)
+        assert np.allclose(x, x0, **kw)
+
+    xi = ccl.correlation_3dRsd_avgmu(COSMO, r=r, a=a_arr, beta=beta)
+    for x, a, b in zip(xi, a_arr, beta):
+        x0 = ccl.correlation_3dRsd_avgmu(COSMO, r=r, a=a, beta=b)
+        assert np.allclose(x, x0, **kw)
+
+    xi = ccl.correlation_pi_sigma(COSMO, pi=20., sigma=r, a=a_arr,
+                                  beta=beta)
+    for x, a, b in zip(xi, a_arr, beta):
+        x0 = ccl.correlation_pi_sigma(COSMO, pi=20., sigma=r, a=a, beta=b,
+                                      use_spline=False)
+        assert np.allclose(x, x0, **kw)
+
+
+@pytest.mark.parametrize('method,types', [
+    ('fftlog', ['NN', 'NG', 'GG+', 'GG-', 'NN']),
+    ('legendre', ['NN', 'NG', 'NN']),
+    ('bessel', ['NN', 'GG-'])])
+def test_correlation_multi(method, types):
+    z = np.linspace(0., 1., 200)
+    n = np.ones(z.shape)
+    lens = ccl.WeakLensingTracer(COSMO, dndz=(z, n))
+
+    ell = np.unique(np.geomspace(2, 3000, 40).astype(int)).astype(float)
+    cl = ccl.angular_cl(COSMO, lens, lens, ell)
+    cls = np.array([cl*(i+1) for i in range(len(types))])
+    cls[-1] = 0
+    t_arr = np.logspace(-1., np.log10(5.), 5)
+
+    corr = ccl.correlation(COSMO, ell=ell, C_ell=cls, theta=t_arr,
+                           type=types, method=method)
+    assert corr.shape == (len(types), len(t_arr))
+    for c, t, xi in zip(cls, types, corr):
+        xi0 = ccl.correlation(COSMO, ell=ell, C_ell=c, theta=t_arr,
+                              type=t, method=method)
+        assert np.allclose(xi, xi0, atol=0, rtol=1E-10)
+
+    # A single type is broadcast to all spectra.
+    corr = ccl.correlation(COSMO, ell=ell, C_ell=cls, theta=2.,
+                           type='NN', method=method)
+    assert corr.shape == (len(types),)
+
+
+def test_correlation_multi_raises():
+    cls = np.ones([2, 3])
+    with pytest.raises(ValueError):
+        ccl.correlation(COSMO, ell=[1, 2, 3], C_ell=cls, theta=[1],
+                        type=['NN', 'NN', 'NN'])
+    with pytest.raises(ValueError):
+        ccl.correlation(COSMO, ell=[1, 2, 3], C_ell=cls[0], theta=[1],
+                        type=['NN', 'NN'])
+
+
+def test_correlation_legendre_table():
+    z = np.linspace(0., 1., 200)
+    n = np.ones(z.shape)
+    lens = ccl.WeakLensingTracer(COSMO, dndz=(z, n))
+
+    ell = np.unique(np.geomspace(2, 3000, 40).astype(int)).astype(float)
+    cl = ccl.angular_cl(COSMO, lens, lens, ell)
+    t_arr = np.logspace(-1., np.log10(5.), 5)
+
+    tab = ccl.LegendreTable(t_arr, type='NN')
+    assert tab.table.shape == (5, int(ccl.spline_params.ELL_MAX_CORR)+1)
+    xi0 = ccl.correlation(COSMO, ell=ell, C_ell=cl, theta=t_arr,
+                          type='NN', method='legendre')
+    xi = ccl.correlation(COSMO, ell=ell, C_ell=cl, theta=t_arr,
+                         type='NN', method='legendre', legendre_table=tab)
+    assert np.allclose(xi, xi0, atol=0, rtol=1E-8)
+
+    # Batch of spectra
+    xi = ccl.correlation(COSMO, ell=ell, C_ell=[cl, 2*cl], theta=t_arr,
+                         type='NN', method='legendre', legendre_table=tab)
+    assert np.allclose(xi, [xi0, 2*xi0], atol=0, rtol=1E-8)
+
+    # Scalar angle
+    tab = ccl.LegendreTable(2., type='NN')
+    xi = ccl.correlation(COSMO, ell=ell, C_ell=cl, theta=2.,
+                         type='NN', method='legendre', legendre_table=tab)
+    assert np.isscalar(xi) or np.ndim(xi) == 0
+
+    with pytest.raises(ValueError):
+        ccl.LegendreTable(t_arr, type='GG+')
+    with pytest.raises(ValueError):
+        ccl.correlation(COSMO, ell=ell, C_ell=cl, theta=t_arr[:2],
+                        method='legendre', legendre_table=tab)
+    with pytest.raises(ValueError):
+        ccl.correlation(COSMO, ell=ell, C_ell=cl, theta=2.,
+                        method='fftlog', legendre_table=tab)
+    with pytest.raises(ValueError):
+        ccl.correlation(COSMO, ell=ell, C_ell=cl, theta=2., type='NG',
+                        method='legendre', legendre_table=tab)
+
+
+def _bin_average(theta_edges, func, n=101):
+    # Average over each bin, weighted by solid angle, with Simpson's rule.
+    from scipy.integrate import simpson
+    out = []
+    for t0, t1 in zip(theta_edges[:-1], theta_edges[1:]):
+        t = np.linspace(t0, t1, n)
+        w = np.sin(np.radians(t))
+        out.append(simpson(w*func(t), x=t)/simpson(w, x=t))
+    return np.array(out)
+
+
+@pytest.mark.parametrize('method,types', [
+    ('legendre', ['NN', 'NG']),
+    ('fftlog', ['NN', 'NG', 'GG+', 'GG-'])])
+def test_correlation_binned(method, types):
+    # Small ELL_MAX_CORR to make the brute-force average affordable.
+    ccl.spline_params.ELL_MAX_CORR = 2000
+    cosmo = ccl.CosmologyVanillaLCDM(transfer_function='bbks',
+                                     matter_power_spectrum='linear')
+    ccl.spline_params.reload()
+
+    z = np.linspace(0., 1., 200)
+    n = np.ones(z.shape)
+    lens = ccl.WeakLensingTracer(cosmo, dndz=(z, n))
+    ell = np.unique(np.geomspace(2, 2000, 40).astype(int)).astype(float)
+    cl = ccl.angular_cl(cosmo, lens, lens, ell)
+    edges = np.array([0.5, 1., 2.])
+
+    xi = ccl.correlation(cosmo, ell=ell, C_ell=[cl]*len(types),
+                         theta_edges=edges, type=types, method=method)
+    assert xi.shape == (len(types), len(edges)-1)
+    for t, x in zip(types, xi):
+        x0 = _bin_average(
+            edges, lambda th: ccl.correlation(cosmo, ell=ell, C_ell=cl,
+                                              theta=th, type=t,
+                                              method=method))
+        assert np.allclose(x, x0, atol=0, rtol=1E-3)
+
+    # Single power spectrum
+    x = ccl.correlation(cosmo, ell=ell, C_ell=cl, theta_edges=edges,
+                        type=types[0], method=method)
+    assert np.allclose(x, xi[0], atol=0, rtol=1E-12)
+
+    if method == 'legendre':
+        tab = ccl.LegendreTable(theta_edges=edges, type='NN', ell_max=2000)
+        x = ccl.correlation(cosmo, ell=ell, C_ell=cl, theta_edges=edges,
+                            type='NN', method=method, legendre_table=tab)
+        assert np.allclose(x, xi[0], atol=0, rtol=1E-8)
+        with pytest.raises(ValueError):
+            ccl.correlation(cosmo, ell=ell, C_ell=cl, theta=edges,
+                            type='NN', method=method, legendre_table=tab)
+
+
+def test_correlation_binned_fftlog_edges():
+    # Bins extending beyond the angles sampled by FFTLog.
+    z = np.linspace(0., 1., 200)
+    n = np.ones(z.shape)
+    lens = ccl.WeakLensingTracer(COSMO, dndz=(z, n))
+    ell = np.unique(np.geomspace(2, 3000, 40).astype(int)).astype(float)
+    cl = ccl.angular_cl(COSMO, lens, lens, ell)
+
+    xi = ccl.correlation(COSMO, ell=ell, C_ell=cl, type='NN',
+                         theta_edges=[0., 0.5, 1., 180.])
+    assert np.all(np.isfinite(xi))
+    xi0 = ccl.correlation(COSMO, ell=ell, C_ell=cl, type='NN',
+                          theta_edges=[0.5, 1.])
+    assert np.allclose(xi[1], xi0[0], atol=0, rtol=1E-12)
+
+
+def test_correlation_binned_raises():
+    kw = dict(ell=[1, 2, 3], C_ell=[1., 1., 1.])
+    with pytest.raises(ValueError):
+        ccl.correlation(COSMO, **kw, theta_edges=[1., 2.], method='bessel')
+    with pytest.raises(ValueError):
+        ccl.correlation(COSMO, **kw, theta=[1.], theta_edges=[1., 2.])
+    with pytest.raises(ValueError):
+        ccl.correlation(COSMO, **kw)
+    with pytest.raises(ValueError):
+        ccl.correlation(COSMO, **kw, theta_edges=[2., 1.])
+    with pytest.raises(ValueError):
+        ccl.correlation(COSMO, **kw, theta_edges=[1.])
+    with pytest.raises(ValueError):
+        ccl.LegendreTable()
+
+
 def test_correlation_raises():
     with pytest.raises(ValueError):
         ccl.correlation(COSMO, ell=[1], C_ell=[1e-3], theta=[1], method='blah')
@@ -171,3 +171,140 @@ def test_Sigma2B():
     a_cosmo = COSMO.get_pk_spline_a()
     assert np.all(a_s == a_cosmo)
     assert len(a_s) == len(s2b)
+
+
+@pytest.mark.parametrize("typ", ['cNG', 'SSC'])
+def test_build_cl_covariance(typ, tmp_path):
+    # Compares the full matrix against the single-block functions
+    tsp = get_tk3d(2, 2)
+    tr1 = get_tracer()
+    chis = np.linspace(CHIMIN, CHIMAX, NCHI)
+    tr2 = ccl.Tracer()
+    tr2.add_tracer(COSMO, kernel=(chis, chis/CHIMAX))
+    trs = {'a': tr1, 'b': tr2}
+    pairs = [('a', 'a'), ('a', 'b'), ('b', 'a'), ('b', 'b')]
+    ls = np.array([2., 20., 200.])
+    nl = len(ls)
+
+    kwargs = {}
+    if typ == 'SSC':
+        a_s = np.linspace(0.1, 1., 1024)
+        kwargs['sigma2_B'] = (a_s, np.ones_like(a_s))
+        cov_f = ccl.angular_cl_cov_SSC
+    else:
+        cov_f = ccl.angular_cl_cov_cNG
+
+    cov = ccl.build_cl_covariance(COSMO, trs, pairs, ls,
+                                  t_of_kk_a=tsp, **kwargs)
+    assert cov.shape == (len(pairs)*nl, len(pairs)*nl)
+    assert np.allclose(cov, cov.T, rtol=1E-12, atol=0)
+    for ip, (t1, t2) in enumerate(pairs):
+        for iq, (t3, t4) in enumerate(pairs):
+            c = cov_f(COSMO, trs[t1], trs[t2], ell=ls, t_of_kk_a=tsp,
+                      tracer3=trs[t3], tracer4=trs[t4], **kwargs)
+            # Note the transpose: these functions return out[i2, i1]
+            block = cov[ip*nl:(ip+1)*nl, iq*nl:(iq+1)*nl]
+            assert np.allclose(block, c.T, rtol=1E-3, atol=0)
+            # Same integration scheme as the 'spline' method.
+            c = cov_f(COSMO, trs[t1], trs[t2], ell=ls, t_of_kk_a=tsp,
+                      tracer3=trs[t3], tracer4=trs[t4],
+                      integration_method='spline', **kwargs)
+            assert np.allclose(block, c.T, rtol=1E-4, atol=0)
+
+    # Trispectrum per quadruple, threads, and memory-mapped output
+    calls = []
+
+    def tkf(a, b, c, d):
+        calls.append((a, b, c, d))
+        return tsp
+
+    fname = str(tmp_path / "cov.npy")
+    out = np.lib.format.open_memmap(fname, mode='w+', shape=cov.shape)
+    ccl.build_cl_covariance(COSMO, trs, pairs, ls, t_of_kk_a=tkf,
+                            out=out, n_workers=2, **kwargs)
+    # Only (aa,aa), (aa,ab), (aa,bb), (ab,ab), (ab,bb), (bb,bb)
+    assert len(calls) == 6
+    del out
+    assert np.allclose(np.load(fname), cov, rtol=1E-12, atol=0)
+
+    with pytest.raises(ValueError):
+        ccl.build_cl_covariance(COSMO, trs, pairs, ls, t_of_kk_a=tsp,
+                                out=np.zeros([3, 3]))
+
+
+def test_build_cl_covariance_gaussian(tmp_path):
+    # Compares against a brute-force calculation
+    ntr = 3
+    ls = np.arange(2, 50)
+    rng = np.random.default_rng(1234)
+    amp = rng.uniform(0.5, 1., [ntr, ntr])
+    cls = (amp+amp.T)[:, :, None]/(ls+10.)
+    nls = rng.uniform(0., 0.01, ntr)
+    fsky = 0.3
+    pairs = [(i, j) for i in range(ntr) for j in range(i, ntr)]
+    nl = len(ls)
+
+    cl_n = cls + np.diag(nls)[:, :, None]
+    cov_bf = np.zeros([len(pairs)*nl, len(pairs)*nl])
+    for ip, (a, b) in enumerate(pairs):
+        for iq, (c, d) in enumerate(pairs):
+            diag = (cl_n[a, c]*cl_n[b, d] +
+                    cl_n[a, d]*cl_n[b, c])/((2*ls+1)*fsky)
+            cov_bf[ip*nl:(ip+1)*nl, iq*nl:(iq+1)*nl] = np.diag(diag)
+
+    cov = ccl.build_cl_covariance_gaussian(cls, ls, noise=nls, fsky=fsky)
+    assert np.allclose(cov, cov_bf, rtol=1E-12, atol=0)
+
+    # Bandpowers
+    nb = 4
+    bpw = np.zeros([nb, nl])
+    for ib in range(nb):
+        bpw[ib, ib*12:(ib+1)*12] = 1/12.
+    binop = np.kron(np.eye(len(pairs)), bpw)
+    fname = str(tmp_path / "cov.npy")
+    out = np.lib.format.open_memmap(fname, mode='w+',
+                                    shape=(len(pairs)*nb, len(pairs)*nb))
+    ccl.build_cl_covariance_gaussian(cls, ls, noise=nls, fsky=fsky,
+                                     bpw_windows=bpw, out=out)
+    del out
+    assert np.allclose(np.load(fname), binop @ cov_bf @ binop.T,
+                       rtol=1E-12, atol=0)
+
+    # Subset of pairs and different order
+    cov = ccl.build_cl_covariance_gaussian(cls, ls, pairs=[(1, 0), (2, 2)],
+                                           noise=nls, fsky=fsky)
+    i01, i22 = pairs.index((0, 1)), pairs.index((2, 2))
+    idx = np.concatenate([np.arange(i01*nl, (i01+1)*nl),
+                          np.arange(i22*nl, (i22+1)*nl)])
+    assert np.allclose(cov, cov_bf[np.ix_(idx, idx)], rtol=1E-12, atol=0)
+
+    with pytest.raises(ValueError):
+        ccl.build_cl_covariance_gaussian(cls[:, :, 1:], ls)
+    with pytest.raises(ValueError):
+        ccl.build_cl_covariance_gaussian(cls, ls, bpw_windows=bpw[:, 1:])
+    with pytest.raises(ValueError):
+        ccl.build_cl_covariance_gaussian(cls, ls, out=np.zeros([3, 3]))
+
+
+def test_Sigma2B_from_mask_multiple():
+    # Several masks at once give the same result as one at a time
+    from scipy.special import jv
+
+    ell = np.arange(1000)
+    mask_wl = []
+    for fsky in [0.1, 0.3]:
+        kR = (ell+0.5)*np.arccos(1-2*fsky)
+        mask_wl.append((ell+0.5)/(2*np.pi) * (2*jv(1, kR)/(kR))**2)
+    mask_wl = np.array(mask_wl)
+
+    a_use = np.array([0.2, 0.5, 1.0])
+    s2b = ccl.sigma2_B_from_mask(COSMO, a_arr=a_use, mask_wl=mask_wl)
+    assert s2b.shape == (2, 3)
+    for m, s in zip(mask_wl, s2b):
+        s_single = ccl.sigma2_B_from_mask(COSMO, a_arr=a_use, mask_wl=m)
+        assert np.allclose(s, s_single, rtol=1E-12, atol=0)
+
+    s2b = ccl.sigma2_B_from_mask(COSMO, a_arr=0.5, mask_wl=mask_wl)
+    assert s2b.shape == (2,)
+    s2b = ccl.sigma2_B_from_mask(COSMO, a_arr=0.5, mask_wl=mask_wl[0])
+    assert np.ndim(s2b) == 0
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 import pyccl as ccl
 
 cosmo = ccl.Cosmology(
@@ -86,6 +87,11 @@ def test_hmcalculator_I_1_2():
     assert I2.shape == (nk, nk)
     assert np.all(np.diag(I2) == I)
 
+    # Accumulate over chunks of masses
+    I3 = hmc.I_1_2(cosmo, k_use, aa, prof1, prof_2pt=prof12_2pt, prof2=prof2,
+                   diag=False, max_memory=8*5*nk**2)
+    assert np.allclose(I3, I2, atol=0, rtol=1E-10)
+
 
 def test_hmcalculator_I_0_22():
     prof1 = prof2 = P1
@@ -97,3 +103,45 @@ def test_hmcalculator_I_0_22():
 
     # Test correct shape
     assert I.shape == (nk, nk)
+
+    # Compare with the explicit integral over mass
+    uk12 = prof12_2pt.fourier_2pt(cosmo, k_use, hmc._mass, aa, prof1,
+                                  prof2=prof2).T
+    uk34 = prof34_2pt.fourier_2pt(cosmo, k_use, hmc._mass, aa, prof3,
+                                  prof2=prof4).T
+    I2 = hmc._integrate_over_mf(uk12[None, :, :] * uk34[:, None, :])
+    assert np.allclose(I, I2, atol=0, rtol=1E-10)
+
+
+@pytest.mark.parametrize('method', ['simpson', 'spline'])
+def test_hmcalculator_outer_integrals(method):
+    # Integrals computed as matrix products (or over chunks of masses)
+    # agree with the explicit integrals over mass for both integrators.
+    hmc_m = ccl.halos.HMCalculator(mass_function=hmf, halo_bias=hbf,
+                                   mass_def=mdef, integration_method_M=method)
+
+    I = hmc_m.I_1_3(cosmo, k_use, aa, P1, prof_2pt=PKC, prof2=P1, prof3=P3)
+    uk1 = P1.fourier(cosmo, k_use, hmc_m._mass, aa).T
+    uk23 = PKC.fourier_2pt(cosmo, k_use, hmc_m._mass, aa, P1, prof2=P3).T
+    I2 = hmc_m._integrate_over_mbf(uk1[None, :, :] * uk23[:, None, :])
+    assert np.allclose(I, I2, atol=0, rtol=1E-10)
+
+    I = hmc_m.I_0_22(cosmo, k_use, aa, P1, prof12_2pt=PKC, prof2=P1,
+                     prof3=P3, prof4=P3)
+    uk12 = PKC.fourier_2pt(cosmo, k_use, hmc_m._mass, aa, P1, prof2=P1).T
+    uk34 = PKC.fourier_2pt(cosmo, k_use, hmc_m._mass, aa, P3, prof2=P3).T
+    I2 = hmc_m._integrate_over_mf(uk12[None, :, :] * uk34[:, None, :])
+    assert np.allclose(I, I2, atol=0, rtol=1E-10)
+
+    I2 = hmc_m.I_1_2(cosmo, k_use, aa, P1, prof_2pt=PKC, prof2=P3,
+                     diag=False)
+    for max_memory in [8*5*nk**2, 8*hmc_m._mass.size*7**2]:
+        # Tiles over (k', k), with or without chunks of masses
+        I = hmc_m.I_1_2(cosmo, k_use, aa, P1, prof_2pt=PKC, prof2=P3,
+                        diag=False, max_memory=max_memory)
+        assert np.allclose(I, I2, atol=0, rtol=1E-10)
+
+    # Not even a single tile fits
+    with pytest.raises(ValueError):
+        hmc_m.I_1_2(cosmo, k_use, aa, P1, prof_2pt=PKC, prof2=P3,
+                    diag=False, max_memory=8)
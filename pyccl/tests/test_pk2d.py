@@ -1,3 +1,7 @@
+import pickle
+import subprocess
+import sys
+
 import numpy as np
 import pytest
 import pyccl as ccl
@@ -296,6 +300,56 @@ def test_pk2d_get_spline_arrays():
         empty_pk2d.get_spline_arrays()
 
 
+def test_pk2d_get_spline_views():
+    x = np.linspace(0.1, 1, 10)
+    log_y = np.linspace(-3, 1, 20)
+    zarr = np.outer(x, np.exp(log_y))
+    pk = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=np.log(zarr), is_logp=True)
+
+    a, lk, pkv, is_log = pk.get_spline_views()
+    assert is_log
+    assert np.allclose(a, x, rtol=1e-15)
+    assert np.allclose(lk, log_y, rtol=1e-15)
+    assert np.allclose(pkv, np.log(zarr), rtol=1e-15)
+    assert not any(arr.flags.writeable for arr in [a, lk, pkv])
+    with pytest.raises(ValueError):
+        pkv[0, 0] = 0
+
+    # The views are consistent with the arrays and keep the object alive.
+    _, _, pk_arr = pk.get_spline_arrays()
+    assert np.allclose(np.log(pk_arr), pkv, rtol=1e-15)
+    del pk
+    assert np.allclose(pkv, np.log(zarr), rtol=1e-15)
+
+
+@pytest.mark.parametrize('is_logp', [True, False])
+def test_pk2d_get_spline_arrays_copies(is_logp):
+    x = np.linspace(0.1, 1, 10)
+    log_y = np.linspace(-3, 1, 20)
+    zarr = np.outer(x, np.exp(log_y))
+    pk = ccl.Pk2D(a_arr=x, lk_arr=log_y,
+                  pk_arr=np.log(zarr) if is_logp else zarr, is_logp=is_logp)
+
+    # The arrays are writable copies of the internal data.
+    arrs = pk.get_spline_arrays()
+    for arr in arrs:
+        arr *= 2
+    assert np.allclose(pk.get_spline_arrays()[2], zarr, rtol=1e-15)
+
+
+def test_pk2d_hash_log_linear():
+    # Equal power spectra stored in linear and in log space hash equally.
+    x = np.linspace(0.1, 1, 10)
+    log_y = np.linspace(-3, 1, 20)
+    log_z = np.log(np.outer(x, np.exp(log_y)))
+    pk_log = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=log_z, is_logp=True)
+    pk_lin = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=np.exp(log_z),
+                      is_logp=False)
+    assert pk_log == pk_lin
+    assert hash(pk_log) == hash(pk_lin)
+    assert len({pk_log, pk_lin}) == 1
+
+
 def test_pk2d_add():
     x = np.linspace(0.1, 1, 10)
     log_y = np.linspace(-3, 1, 20)
@@ -473,9 +527,197 @@ def test_pk2d_operations():
                        rtol=1e-15)
 
 
+def test_pk2d_lazy_operations():
+    # Operations are only evaluated when needed, in a single pass.
+    x = np.linspace(0.1, 1, 10)
+    log_y = np.linspace(-3, 1, 20)
+    zarr_a = np.outer(x, np.exp(log_y))
+    zarr_b = np.outer(x**2, np.exp(-log_y))
+    pk_a = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=np.log(zarr_a))
+    pk_b = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=zarr_b, is_logp=False)
+    b1, b2 = 1.5, 0.3
+
+    pk = b1**2*pk_a + 2*b1*b2*pk_a*pk_b + b2**2*pk_b**2
+    assert pk.is_lazy
+    assert "psp" not in vars(pk)
+    assert pk.extrap_order_lok == pk_a.extrap_order_lok
+    assert pk.extrap_order_hik == pk_a.extrap_order_hik
+
+    _, _, zarr = pk.get_spline_arrays()
+    # The expression is evaluated pointwise, without being tabulated.
+    assert pk.is_lazy
+    assert pk.psp.fka is None
+    assert np.allclose(zarr, (b1**2*zarr_a + 2*b1*b2*zarr_a*zarr_b
+                              + b2**2*zarr_b**2), rtol=1e-14)
+
+    # Off the grid, and outside of the range in k, the expression is
+    # evaluated from the values of its operands.
+    k = np.exp(np.linspace(-4, 2, 37))
+    a = np.linspace(0.15, 0.95, 7)
+    pa, pb = pk_a(k, a), pk_b(k, a)
+    assert np.allclose(pk(k, a), b1**2*pa + 2*b1*b2*pa*pb + b2**2*pb**2,
+                       rtol=1e-14)
+    da = pk_a(k, a, derivative=True)
+    db = pk_b(k, a, derivative=True)
+    assert np.allclose((pk_a*pk_b)(k, a, derivative=True), da + db,
+                       rtol=1e-12)
+    assert np.allclose((pk_a + pk_b)(k, a, derivative=True),
+                       (pa*da + pb*db) / (pa + pb), rtol=1e-12)
+    assert np.allclose((pk_b**3)(k, a, derivative=True), 3*db, rtol=1e-12)
+
+    # Long chains of operations are evaluated along the way.
+    pk = pk_a.copy()
+    for _ in range(2*ccl.Pk2D._lazy_max_depth):
+        pk += pk_b
+    assert np.allclose(pk.get_spline_arrays()[-1],
+                       zarr_a + 2*ccl.Pk2D._lazy_max_depth*zarr_b)
+
+
+def test_pk2d_lazy_threads():
+    # Concurrent evaluations of a lazy expression build a single spline.
+    from concurrent.futures import ThreadPoolExecutor
+    x = np.linspace(0.1, 1, 10)
+    log_y = np.linspace(-3, 1, 20)
+    zarr = np.outer(x, np.exp(log_y))
+    pk_a = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=np.log(zarr))
+    for _ in range(8):
+        pk = 2*pk_a + pk_a*pk_a
+        with ThreadPoolExecutor(8) as pool:
+            psps = list(pool.map(lambda _: pk.psp, range(8)))
+        assert all(psp is psps[0] for psp in psps)
+        assert pk.extrap_order_lok == pk_a.extrap_order_lok
+        assert np.allclose(pk.get_spline_arrays()[-1], 2*zarr + zarr**2,
+                           rtol=1e-14)
+
+
+@pytest.mark.parametrize('use_file', [True, False])
+def test_pk2d_shared(use_file, tmp_path):
+    x = np.linspace(0.1, 1, 10)
+    log_y = np.linspace(-3, 1, 20)
+    zarr = np.outer(x, np.exp(log_y))
+    pk = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=np.log(zarr),
+                  extrap_order_lok=0)
+
+    shared = pk.to_shared(path=tmp_path / "pk.dat" if use_file else None)
+    # Attach as a worker process would.
+    pk2 = ccl.Pk2D.from_shared(pickle.loads(pickle.dumps(shared)))
+    assert pk2.is_shared and not pk.is_shared
+    assert pk2 == pk
+    assert pk2.extrap_order_lok == 0
+    # Same interpolation, off the grid and when extrapolating in k.
+    k = np.exp(np.linspace(-4, 2, 64))
+    a = np.linspace(0.1, 1, 7)
+    assert np.allclose(pk2(k, a), pk(k, a), rtol=1e-12)
+    assert np.allclose(pk2(k, a, derivative=True),
+                       pk(k, a, derivative=True), rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        ccl.Tk3D.from_shared(shared)
+    shared.unlink()
+
+
+def test_pk2d_shared_attach_exit():
+    # A process attaching to the shared memory must not destroy it on exit.
+    x = np.linspace(0.1, 1, 10)
+    log_y = np.linspace(-3, 1, 20)
+    pk = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=np.outer(x, log_y),
+                  is_logp=False)
+    shared = pk.to_shared()
+    code = ("import pickle, sys; import pyccl; "
+            "pickle.loads(sys.stdin.buffer.read()).close()")
+    # Capturing the output also waits for the resource tracker of the
+    # child process, which inherits its output streams.
+    subprocess.run([sys.executable, "-c", code], check=True,
+                   input=pickle.dumps(shared), capture_output=True)
+    assert ccl.Pk2D.from_shared(pickle.loads(pickle.dumps(shared))) == pk
+    shared.unlink()
+
+
+def test_pk2d_pickle():
+    # Power spectra (e.g. those held by a computed Cosmology) can be sent
+    # to other processes.
+    x = np.linspace(0.1, 1, 10)
+    log_y = np.linspace(-3, 1, 20)
+    pk = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=np.outer(x, np.exp(log_y)),
+                  is_logp=False, extrap_order_lok=0)
+    boosted = ccl.Pk2D.from_boost(pk, lambda k, a: 1 + np.outer(a, k))
+    lazy = (pk * boosted + 1) ** 0.5
+    shared = pk.to_shared()
+    k = np.exp(np.linspace(-4, 2, 64))
+    a = np.linspace(0.1, 1, 7)
+    for p in [pk, boosted, lazy, ccl.Pk2D.from_shared(shared)]:
+        p2 = pickle.loads(pickle.dumps(p))
+        assert p2 == p
+        assert p2.is_boosted == p.is_boosted
+        assert p2.is_lazy == p.is_lazy
+        assert p2.is_shared == p.is_shared
+        assert p2.extrap_order_lok == 0
+        assert np.allclose(p2(k, a), p(k, a), atol=0, rtol=1e-12)
+    assert not pickle.loads(pickle.dumps(ccl.Pk2D.__new__(ccl.Pk2D)))
+    shared.unlink()
+
+    cosmo = ccl.CosmologyVanillaLCDM(transfer_function="bbks")
+    cosmo.compute_linear_power()
+    cosmo2 = pickle.loads(pickle.dumps(cosmo))
+    assert cosmo2.has_linear_power
+    assert cosmo2.get_linear_power() == cosmo.get_linear_power()
+
+
 def test_pk2d_from_model_smoke():
     # Verify that both `from_model` methods are equivalent.
     cosmo = ccl.CosmologyVanillaLCDM(transfer_function="bbks")
     pk1 = ccl.Pk2D.from_model(cosmo, "bbks")
     pk2 = cosmo.get_linear_power()
     assert np.all(pk1.get_spline_arrays()[-1] == pk2.get_spline_arrays()[-1])
+
+
+def test_pk2d_from_boost():
+    # Boosted power spectra should match the product of both factors,
+    # whether the boost is passed as an array, a function or a Pk2D.
+    x = np.linspace(0.1, 1, 10)
+    log_y = np.linspace(-3, 1, 20)
+    zarr_a = np.outer(x, np.exp(log_y))
+    pk = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=np.log(zarr_a), is_logp=True)
+
+    def boost(k, a):
+        return 1 + 0.1*np.outer(a, np.log(k))
+
+    ks = np.exp(np.linspace(-2.5, 0.5, 8))
+    pk_bst = pk(ks, x) * boost(ks, x)
+    barr = boost(np.exp(log_y), x)
+    pkb_arr = ccl.Pk2D(a_arr=x, lk_arr=log_y, pk_arr=barr, is_logp=False)
+    for b in [boost, barr, pkb_arr]:
+        pkb = ccl.Pk2D.from_boost(pk, b)
+        assert pkb.is_boosted and not pk.is_boosted
+        assert np.allclose(pkb(ks, x), pk_bst, atol=0, rtol=1e-6)
+        # Tabulated arrays and arithmetic materialize the product.
+        _, _, zarr_b = pkb.get_spline_arrays()
+        assert np.allclose(zarr_b, zarr_a*barr, atol=0, rtol=1e-6)
+        assert np.allclose((pkb/pk).get_spline_arrays()[-1], barr,
+                           atol=0, rtol=1e-6)
+        assert pkb.extrap_order_lok == pk.extrap_order_lok
+        assert pkb.extrap_order_hik == pk.extrap_order_hik
+
+    # Logarithmic derivatives add up.
+    dpk = pk(ks, 0.5, derivative=True)
+    dpkb = ccl.Pk2D.from_boost(pk, boost)(ks, 0.5, derivative=True)
+    db = 0.05/boost(ks, 0.5)[0]
+    assert np.allclose(dpkb, dpk+db, atol=1e-5, rtol=0)
+
+    # Boosts can be stacked.
+    pkbb = ccl.Pk2D.from_boost(ccl.Pk2D.from_boost(pk, barr), barr)
+    assert np.allclose(pkbb(ks, x), pk_bst*boost(ks, x), atol=0, rtol=1e-6)
+
+    # Out of range
+    with pytest.raises(ValueError):
+        pkb(ks, 0.05)
+
+    # Errors
+    with pytest.raises(ValueError):
+        ccl.Pk2D.from_boost(pk, barr[1:])
+    with pytest.raises(ValueError):
+        ccl.Pk2D.from_boost(ccl.Pk2D.__new__(ccl.Pk2D), barr)
+    pk_small = ccl.Pk2D(a_arr=x[1:], lk_arr=log_y,
+                        pk_arr=barr[1:], is_logp=False)
+    with pytest.raises(ValueError):
+        ccl.Pk2D.from_boost(pk, pk_small)
@@ -1,3 +1,5 @@
+import pickle
+
 import numpy as np
 import pytest
 import pyccl as ccl
@@ -222,6 +224,152 @@ def test_tk3d_spline_arrays(is_product):
         assert np.allclose(np.log(out[0]), tkka_arr, rtol=1e-15)
 
 
+@pytest.mark.parametrize('is_product', [True, False])
+def test_tk3d_spline_views(is_product):
+    (a_arr, lk_arr, fka1_arr, fka2_arr, tkka_arr) = get_arrays()
+    if is_product:
+        tsp = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr,
+                       pk1_arr=fka1_arr, pk2_arr=fka2_arr)
+    else:
+        tsp = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkka_arr)
+
+    a_get, lk_get1, lk_get2, out, is_log = tsp.get_spline_views()
+    assert is_log
+    assert not any(arr.flags.writeable
+                   for arr in [a_get, lk_get1, lk_get2, *out])
+    del tsp
+    assert np.allclose(a_get, a_arr, rtol=1e-15)
+    assert np.allclose(lk_get1, lk_arr, rtol=1e-15)
+    assert np.allclose(lk_get2, lk_arr, rtol=1e-15)
+
+    if is_product:
+        assert np.allclose(out[0], fka1_arr, rtol=1e-15)
+        assert np.allclose(out[1], fka2_arr, rtol=1e-15)
+    else:
+        assert len(out) == len(a_arr)
+        assert np.allclose(np.array(out), tkka_arr, rtol=1e-15)
+
+
+@pytest.mark.parametrize('is_product', [True, False])
+def test_tk3d_spline_arrays_copies(is_product):
+    (a_arr, lk_arr, fka1_arr, fka2_arr, tkka_arr) = get_arrays()
+    if is_product:
+        tsp = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, pk1_arr=np.exp(fka1_arr),
+                       pk2_arr=np.exp(fka2_arr), is_logt=False)
+    else:
+        tsp = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=np.exp(tkka_arr),
+                       is_logt=False)
+
+    # The arrays are writable copies of the internal data.
+    a_get, lk_get1, lk_get2, out = tsp.get_spline_arrays()
+    for arr in [a_get, lk_get1, lk_get2, *out]:
+        arr *= 2
+    _, _, _, out = tsp.get_spline_arrays()
+    assert np.allclose(np.log(out[0]),
+                       fka1_arr if is_product else tkka_arr, rtol=1e-14)
+
+
+@pytest.mark.parametrize('is_product', [True, False])
+def test_tk3d_hash_log_linear(is_product):
+    # Equal trispectra stored in linear and in log space hash equally.
+    (a_arr, lk_arr, fka1_arr, fka2_arr, tkka_arr) = get_arrays()
+    if is_product:
+        kw_log = dict(pk1_arr=fka1_arr, pk2_arr=fka2_arr)
+        kw_lin = dict(pk1_arr=np.exp(fka1_arr), pk2_arr=np.exp(fka2_arr))
+    else:
+        kw_log = dict(tkk_arr=tkka_arr)
+        kw_lin = dict(tkk_arr=np.exp(tkka_arr))
+    tsp_log = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, is_logt=True, **kw_log)
+    tsp_lin = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, is_logt=False, **kw_lin)
+    assert tsp_log == tsp_lin
+    assert hash(tsp_log) == hash(tsp_lin)
+
+
+@pytest.mark.parametrize('kind', ['product', 'full', 'lowrank'])
+def test_tk3d_shared(kind):
+    (a_arr, lk_arr, fka1_arr, fka2_arr, tkka_arr) = get_arrays()
+    if kind == 'product':
+        tsp = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr,
+                       pk1_arr=fka1_arr, pk2_arr=fka2_arr)
+    else:
+        tsp = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkka_arr,
+                       rank_tol=1e-10 if kind == 'lowrank' else None)
+
+    shared = tsp.to_shared()
+    # The trispectrum is stored in the same form.
+    if kind == 'product':
+        assert shared.shapes[2] == (2, a_arr.size, lk_arr.size)
+    elif kind == 'lowrank':
+        assert shared.shapes[2] == (a_arr.size, tsp.rank, lk_arr.size)
+
+    tsp2 = ccl.Tk3D.from_shared(pickle.loads(pickle.dumps(shared)))
+    assert tsp2.is_shared == (kind != 'lowrank')
+    assert tsp2.tsp.is_product == tsp.tsp.is_product
+    assert tsp2.rank == tsp.rank
+    assert tsp2 == tsp
+    # Same interpolation, off the grid and when extrapolating in k.
+    k = np.exp(np.linspace(lk_arr[0]-1, lk_arr[-1]+1, 64))
+    a = np.linspace(a_arr[0], a_arr[-1], 7)
+    assert np.allclose(tsp2(k, a), tsp(k, a), rtol=1e-12)
+    shared.unlink()
+
+
+def test_tk3d_lowrank():
+    (a_arr, lk_arr, fka1_arr, fka2_arr, tkka_arr) = get_arrays()
+    tsp = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkka_arr)
+    assert tsp.rank == 0
+
+    # log(T) = log(f1(k1)) + log(f2(k2)) has rank 2.
+    tsp_lr = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkka_arr,
+                      rank_tol=1E-10)
+    assert tsp_lr.rank == 2
+
+    # Evaluation inside and outside of the interpolation range
+    atest = 0.5
+    ktest = np.geomspace(5E-5, 2E2, 16)
+    ptrue = tkkaf(ktest[None, :], ktest[:, None], atest)
+    assert np.allclose(tsp_lr(ktest, atest), ptrue, atol=0, rtol=1e-6)
+
+    # The full trispectrum is reconstructed from the factors
+    _, lk1, lk2, out = tsp_lr.get_spline_arrays()
+    assert np.allclose(lk1, lk_arr, rtol=1e-15)
+    assert np.allclose(lk2, lk_arr, rtol=1e-15)
+    assert np.allclose(np.log(out[0]), tkka_arr, atol=1e-10, rtol=0)
+    assert np.allclose(tsp_lr.get_spline_views()[3], tkka_arr,
+                       atol=1e-10, rtol=0)
+
+    # A looser tolerance keeps fewer terms
+    tsp_lr = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkka_arr,
+                      rank_tol=0.5)
+    assert tsp_lr.rank == 1
+
+    with pytest.raises(ValueError):
+        ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkka_arr,
+                 rank_tol=-1)
+
+
+def test_tk3d_lowrank_extrap_orders():
+    (a_arr, lk_arr, fka1_arr, fka2_arr, tkka_arr) = get_arrays()
+    tsps = {(lok, hik): ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr,
+                                 tkk_arr=tkka_arr, rank_tol=1E-10,
+                                 extrap_order_lok=lok, extrap_order_hik=hik)
+            for lok, hik in [(0, 1), (1, 1), (1, 0)]}
+    for (lok, hik), tsp in tsps.items():
+        assert tsp.extrap_order_lok == lok
+        assert tsp.extrap_order_hik == hik
+
+    atest = 0.5
+    k_lo = np.exp(lk_arr[0]) * np.array([0.1, 0.5])
+    k_hi = np.exp(lk_arr[-1]) * np.array([2., 10.])
+    # Orders only matter on their side of the interpolation range.
+    assert np.allclose(tsps[(0, 1)](k_hi, atest), tsps[(1, 1)](k_hi, atest),
+                       atol=0, rtol=1e-12)
+    assert not np.allclose(tsps[(0, 1)](k_lo, atest),
+                           tsps[(1, 1)](k_lo, atest), atol=0, rtol=1e-6)
+    assert not np.allclose(tsps[(1, 0)](k_hi, atest),
+                           tsps[(1, 1)](k_hi, atest), atol=0, rtol=1e-6)
+
+
 def test_tk3d_spline_arrays_raises():
     (a_arr, lk_arr, fka1_arr, fka2_arr, tkka_arr) = get_arrays()
     tsp = ccl.Tk3D(a_arr=a_arr, lk_arr=lk_arr, tkk_arr=tkka_arr)
@@ -98,6 +98,14 @@ def test_tkk1h_tk3d():
     tkk_arr_2 = tk3d(k_arr, a_arr)
     assert np.allclose(tkk_arr, tkk_arr_2, atol=0, rtol=1e-4)
 
+    # Parallel over scale factors
+    tk3d_2 = ccl.halos.halomod_Tk3D_1h(
+        COSMO, hmc,
+        prof=P1, prof2=P2, prof12_2pt=PKC,
+        prof3=P3, prof4=P4, prof34_2pt=PKC,
+        lk_arr=np.log(k_arr), use_log=True, n_workers=3)
+    assert np.allclose(tk3d_2(k_arr, a_arr), tkk_arr_2, atol=0, rtol=1E-12)
+
 
 def test_tkk1h_warns():
     hmc = ccl.halos.HMCalculator(mass_function=HMF, halo_bias=HBF,
@@ -221,6 +221,36 @@ def test_Tk3D_2h():
     assert np.all(np.fabs((tkk_arr / tkk_arr_2 - 1)).flatten()
                   < 1E-4)
 
+    # Memory-bounded evaluation into a preallocated array
+    out = np.zeros([len(a_arr), len(k_arr), len(k_arr)])
+    tkk_22 = ccl.halos.halomod_trispectrum_2h_22(COSMO, hmc, k_arr, a_arr,
+                                                 P1, prof2=P2,
+                                                 prof3=P3, prof4=P4,
+                                                 prof13_2pt=PKC,
+                                                 prof14_2pt=PKC,
+                                                 prof24_2pt=PKC,
+                                                 prof32_2pt=PKC,
+                                                 max_memory=2**16, out=out)
+    assert tkk_22 is out
+    tkk_22 += ccl.halos.halomod_trispectrum_2h_13(COSMO, hmc, k_arr, a_arr,
+                                                  prof=P1, prof2=P2,
+                                                  prof3=P3, prof4=P4)
+    assert np.allclose(tkk_22, tkk_arr, atol=0, rtol=1E-10)
+
+    with pytest.raises(ValueError):
+        ccl.halos.halomod_trispectrum_2h_13(COSMO, hmc, k_arr, a_arr,
+                                            prof=P1, out=out[1:])
+
+    # Tk3D computed in a preallocated array
+    out = np.zeros([len(a_arr), len(k_arr), len(k_arr)])
+    tk3d = ccl.halos.halomod_Tk3D_2h(COSMO, hmc, P1, prof2=P2,
+                                     prof3=P3, prof4=P4,
+                                     lk_arr=np.log(k_arr), a_arr=a_arr,
+                                     max_memory=2**12, out=out)
+    assert np.allclose(out, tkk_arr, atol=0, rtol=1E-10)
+    tkk_arr_2 = np.array([tk3d(k_arr, a) for a in a_arr])
+    assert np.allclose(tkk_arr_2, tkk_arr, atol=0, rtol=1E-10)
+
     # Negative profile in logspace
     with pytest.warns(ccl.CCLWarning):
         ccl.halos.halomod_Tk3D_2h(COSMO, hmc, P3, prof2=Pneg, prof3=P3,
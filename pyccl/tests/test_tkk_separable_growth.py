@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 import pyccl as ccl
 
 
@@ -205,3 +206,19 @@ def test_Tk3D_separable_growth():
     tkk_arr_2 = np.array([tk3d_2(k_arr, a) for a in a_arr])
     assert np.all(np.fabs((tkk_arr / tkk_arr_2 - 1)).flatten()
                   < 1E-4)
+
+
+@pytest.mark.parametrize('func', [ccl.halos.halomod_trispectrum_2h_22,
+                                  ccl.halos.halomod_trispectrum_3h,
+                                  ccl.halos.halomod_trispectrum_4h])
+@pytest.mark.parametrize('separable_growth', [False, True])
+def test_tkk_angular_order(func, separable_growth):
+    # Gauss-Legendre angular averaging vs. adaptive quadrature
+    hmc = ccl.halos.HMCalculator(mass_function=HMF, halo_bias=HBF,
+                                 mass_def=M200)
+    a_arr = np.array([0.4, 1.0])
+    tkk = func(COSMO, hmc, KK, a_arr, P1, prof2=P1, prof3=P3, prof4=P3,
+               separable_growth=separable_growth)
+    tkk_2 = func(COSMO, hmc, KK, a_arr, P1, prof2=P1, prof3=P3, prof4=P3,
+                 separable_growth=separable_growth, angular_order=128)
+    assert np.all(np.fabs(tkk_2 - tkk) < 1E-3 * np.fabs(tkk).max())
@@ -1,3 +1,5 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import numpy as np
 import pytest
 import pyccl as ccl
@@ -106,3 +108,49 @@ def test_Tk3D_cNG():
         ccl.halos.halomod_Tk3D_cNG(COSMO, hmc, P3, prof2=Pneg, prof3=P3,
                                    prof4=P3, lk_arr=np.log(k_arr), a_arr=a_arr,
                                    use_log=True)
+
+
+def test_Tk3D_cNG_process_pool():
+    hmc = ccl.halos.HMCalculator(mass_function=HMF, halo_bias=HBF,
+                                 mass_def=M200)
+    lk_arr = np.log(np.geomspace(1E-3, 10, 8))
+    a_arr = np.array([0.3, 0.5, 0.7, 1.0])
+    kwargs = dict(prof2=P2, prof3=P3, prof4=P4, prof12_2pt=PKC,
+                  prof34_2pt=PKC, lk_arr=lk_arr, a_arr=a_arr)
+
+    tk3d = ccl.halos.halomod_Tk3D_cNG(COSMO, hmc, P1, **kwargs)
+    with ProcessPoolExecutor(max_workers=2) as ex:
+        tk3d_2 = ccl.halos.halomod_Tk3D_cNG(COSMO, hmc, P1, executor=ex,
+                                            n_workers=2, **kwargs)
+
+    k_arr = np.exp(lk_arr)
+    assert np.allclose(tk3d_2(k_arr, a_arr), tk3d(k_arr, a_arr),
+                       atol=0, rtol=1E-10)
+
+
+@pytest.mark.parametrize('executor', [None, ThreadPoolExecutor])
+def test_Tk3D_cNG_parallel_hod(executor):
+    # Parallel results match the serial ones for the HOD profile and the
+    # non-linear power spectrum, with worker processes (default) or threads
+    # sharing the inputs.
+    hmc = ccl.halos.HMCalculator(mass_function=HMF, halo_bias=HBF,
+                                 mass_def=M200)
+    lk_arr = np.log(np.geomspace(1E-3, 10, 8))
+    a_arr = np.array([0.3, 0.5, 0.7, 0.8, 1.0])
+    kwargs = dict(prof2=P2, prof3=P2, prof4=P2, prof12_2pt=PKCH,
+                  prof34_2pt=PKCH, prof13_2pt=PKCH, prof14_2pt=PKCH,
+                  prof24_2pt=PKCH, prof32_2pt=PKCH, p_of_k_a="nonlinear",
+                  lk_arr=lk_arr, a_arr=a_arr)
+
+    tk3d = ccl.halos.halomod_Tk3D_cNG(COSMO, hmc, P2, **kwargs)
+    if executor is None:
+        tk3d_2 = ccl.halos.halomod_Tk3D_cNG(COSMO, hmc, P2, n_workers=3,
+                                            **kwargs)
+    else:
+        with executor(max_workers=3) as ex:
+            tk3d_2 = ccl.halos.halomod_Tk3D_cNG(COSMO, hmc, P2, executor=ex,
+                                                n_workers=3, **kwargs)
+
+    k_arr = np.exp(lk_arr)
+    assert np.allclose(tk3d_2(k_arr, a_arr), tk3d(k_arr, a_arr),
+                       atol=0, rtol=1E-10)
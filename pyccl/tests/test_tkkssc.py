@@ -49,6 +49,13 @@ def test_tkkssc_smoke(p1, p2, cv12, p3, p4, cv34, pk):
 
     assert (np.isfinite(tkk(0.1, 0.5))).all()
 
+    tkk_2 = ccl.halos.halomod_Tk3D_SSC(
+        COSMO, HMC,
+        prof=p1, prof2=p2, prof12_2pt=cv12,
+        prof3=p3, prof4=p4, prof34_2pt=cv34,
+        p_of_k_a=pk, lk_arr=np.log(KK), a_arr=AA, n_workers=2)
+    assert np.allclose(tkk_2(KK, AA), tkk(KK, AA), atol=0, rtol=1E-12)
+
 
 def test_tkkssc_linear_bias_smoke():
     tkkl = ccl.halos.halomod_Tk3D_SSC_linear_bias(
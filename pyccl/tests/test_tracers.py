@@ -357,6 +357,164 @@ def test_tracer_magnification_kernel_spline_vs_gsl_intergation(z_min, z_max,
                            atol=1e-8, rtol=1e-5)
 
 
+@pytest.mark.parametrize('z_min, z_max, n_z_samples, Omega_k',
+                         [(0.0, 1.0, 2000, 0.),
+                          (0.0, 1.0, 500, 0.),
+                          (0.3, 1.0, 1000, 0.),
+                          (0.0, 1.0, 1000, 0.05),
+                          (0.0, 1.0, 1000, -0.05)])
+def test_tracer_lensing_kernel_cumulative_vs_gsl_integration(
+        z_min, z_max, n_z_samples, Omega_k):
+    z = np.linspace(z_min, z_max, n_z_samples)
+    n = dndz(z)
+    s = 0.2 + 0.1 * z
+
+    def get_kernel():
+        cosmo = ccl.CosmologyVanillaLCDM(Omega_k=Omega_k,
+                                         transfer_function='bbks',
+                                         matter_power_spectrum="linear")
+        _, w = ccl.get_lensing_kernel(cosmo, dndz=(z, n), mag_bias=(z, s))
+        ccl.gsl_params.reload()
+        return w
+
+    ccl.gsl_params.LENSING_KERNEL_CUMULATIVE_INTEGRATION = True
+    w_cumulative = get_kernel()
+    ccl.gsl_params.LENSING_KERNEL_SPLINE_INTEGRATION = False
+    w_gsl = get_kernel()
+
+    tol = 1e-5 if n_z_samples >= 1000 else 5e-4
+    assert np.allclose(w_cumulative, w_gsl, rtol=0,
+                       atol=tol * np.amax(np.fabs(w_gsl)))
+
+
+def test_tracer_stack():
+    z = np.linspace(0., 1., 500)
+    dz = np.array([-0.03, 0., 0.02, 0.05])
+    nn = np.array([dndz(z - d) for d in dz])
+    b = np.sqrt(1. + z)
+
+    # Kernels of all distributions at once
+    chi, w = ccl.get_lensing_kernel(COSMO, dndz=(z, nn), mag_bias=(z, b))
+    assert w.shape == (len(dz), chi.size)
+    for n, w_n in zip(nn, w):
+        chi_n, w_1 = ccl.get_lensing_kernel(COSMO, dndz=(z, n),
+                                            mag_bias=(z, b))
+        assert np.allclose(chi, chi_n, atol=0, rtol=1e-12)
+        assert np.allclose(w_n, w_1, atol=0, rtol=1e-12)
+    chi, w = ccl.get_density_kernel(COSMO, dndz=(z, nn))
+    assert w.shape == nn.shape
+    for n, w_n in zip(nn, w):
+        _, w_1 = ccl.get_density_kernel(COSMO, dndz=(z, n))
+        assert np.allclose(w_n, w_1, atol=0, rtol=1e-12)
+
+    # Tracers
+    for kwargs, constructor in [
+            (dict(ia_bias=(z, b)), ccl.WeakLensingTracer),
+            (dict(bias=(z, b), mag_bias=(z, b), has_rsd=True),
+             ccl.NumberCountsTracer)]:
+        stack = constructor(COSMO, dndz=(z, nn), **kwargs)
+        assert isinstance(stack, ccl.TracerStack)
+        assert len(stack) == len(dz)
+        for n, tr in zip(nn, stack):
+            tr1 = constructor(COSMO, dndz=(z, n), **kwargs)
+            assert tr == tr1
+            assert np.allclose(tr.get_dndz(z), n)
+
+    with pytest.raises(ValueError):
+        ccl.get_density_kernel(COSMO, dndz=(z, nn[:, :-1]))
+    with pytest.raises(ValueError):
+        ccl.TracerStack([])
+
+
+def test_tracer_amplitude():
+    tr1, _ = get_tracer('nc')
+    tr2, _ = get_tracer('nc')
+    lk = np.log(np.geomspace(1e-3, 1, 8))
+    a = np.linspace(0.5, 1, 5)
+    z = 1/a-1
+    t0 = tr1.get_transfer(lk, a)
+
+    tr1.set_amplitude([1.5, 0.3], index=0)
+    assert check_eq_repr_hash(tr1, tr2, equal=False)
+    amp = tr1.get_amplitude(z)
+    assert np.allclose(amp[0], 1.5 + 0.3*z)
+    assert np.allclose(amp[1:], 1.)
+    t1 = tr1.get_transfer(lk, a)
+    assert np.allclose(t1[0], t0[0] * amp[0][None, :], atol=0, rtol=1e-12)
+    assert np.allclose(t1[1:], t0[1:], atol=0, rtol=1e-12)
+
+    # Resetting the amplitude recovers the original tracer
+    tr1.set_amplitude(None)
+    assert check_eq_repr_hash(tr1, tr2)
+    assert np.allclose(tr1.get_transfer(lk, a), t0, atol=0, rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        tr1.set_amplitude(np.ones(9))
+
+
+@pytest.mark.parametrize('tracer_type', ['nc', 'wl'])
+def test_tracer_update_photoz(tracer_type):
+    z = np.linspace(0., 1.5, 1000)
+    n = dndz(z)
+    b = np.sqrt(1. + z)
+    kwargs = {'nc': dict(bias=(z, b), mag_bias=(z, b), has_rsd=True),
+              'wl': dict(ia_bias=(z, b))}[tracer_type]
+    constructor = {'nc': ccl.NumberCountsTracer,
+                   'wl': ccl.WeakLensingTracer}[tracer_type]
+    tr = constructor(COSMO, dndz=(z, n), **kwargs)
+    ells = np.geomspace(10, 1000, 8)
+
+    delta_z, stretch = 0.05, 1.2
+    z_mean = np.sum(z*n)/np.sum(n)
+    n_new = np.interp(z_mean + (z - z_mean - delta_z) / stretch, z, n,
+                      left=0, right=0)
+    tr_new = constructor(COSMO, dndz=(z, n_new), **kwargs)
+
+    tr.update_photoz(COSMO, delta_z=delta_z, stretch=stretch)
+    assert np.allclose(tr.get_dndz(z), n_new)
+    for w, w_new in zip(tr.get_kernel(chi=None)[0],
+                        tr_new.get_kernel(chi=None)[0]):
+        assert np.allclose(w, w_new, atol=1e-4*np.amax(np.fabs(w_new)),
+                           rtol=1e-4)
+    assert np.allclose(tr.get_avg_weighted_a(), tr_new.get_avg_weighted_a(),
+                       atol=0, rtol=1e-4)
+    assert np.allclose(ccl.angular_cl(COSMO, tr, tr, ells),
+                       ccl.angular_cl(COSMO, tr_new, tr_new, ells),
+                       atol=0, rtol=1e-3)
+
+    # Updates are always relative to the original N(z)
+    tr.update_photoz(COSMO)
+    tr_orig = constructor(COSMO, dndz=(z, n), **kwargs)
+    for w, w_orig in zip(tr.get_kernel(chi=None)[0],
+                         tr_orig.get_kernel(chi=None)[0]):
+        assert np.allclose(w, w_orig, atol=0, rtol=1e-10)
+
+    # Shift past the upper edge of the redshift nodes
+    delta_z = 0.9
+    n_new = np.interp(z - delta_z, z, n, left=0, right=0)
+    tr_new = constructor(COSMO, dndz=(z, n_new), **kwargs)
+    with pytest.warns(ccl.CCLWarning):
+        tr.update_photoz(COSMO, delta_z=delta_z)
+    assert np.allclose(tr.get_dndz(z), n_new)
+    for w, w_new in zip(tr.get_kernel(chi=None)[0],
+                        tr_new.get_kernel(chi=None)[0]):
+        assert np.allclose(w, w_new, atol=1e-4*np.amax(np.fabs(w_new)),
+                           rtol=1e-4)
+    # ... or entirely out of them
+    with pytest.raises(ValueError):
+        tr.update_photoz(COSMO, delta_z=2.)
+
+    with pytest.raises(ValueError):
+        tr.update_photoz(COSMO, stretch=0.)
+    with pytest.raises(ValueError):
+        ccl.tracers.NzTracer().update_photoz(COSMO, delta_z=0.1)
+
+    # The mean redshift of a distribution with zero integral is undefined
+    tr._store_nz(z, np.zeros_like(z), tr._nz_kernels)
+    with pytest.raises(ValueError):
+        tr.update_photoz(COSMO, delta_z=0.1)
+
+
 def test_tracer_delta_function_nz():
     z = np.linspace(0., 1., 2000)
     z_s_idx = int(z.size*0.8)
@@ -2,8 +2,10 @@ __all__ = ("Tk3D",)
 
 import numpy as np
 
-from . import CCLObject, check, lib
-from .pyutils import _get_spline2d_arrays, _get_spline3d_arrays
+from . import CCLObject, SharedArrays, UnlockInstance, check, lib
+from ._core import hash_
+from .pyutils import (_get_array_view, _get_spline1d_array_views,
+                      _get_spline2d_views, _get_spline3d_views, _readonly)
 
 
 class Tk3D(CCLObject):
@@ -87,6 +89,16 @@ class Tk3D(CCLObject):
             depending on the value of ``is_logt``.
         extrap_order_hik (:obj:`int`): same as ``extrap_order_lok`` for
             k-values above the maximum of the splines.
+        rank_tol (:obj:`float`): if not ``None``, and ``tkk_arr`` is
+            provided, the trispectrum at each scale factor is stored as a
+            truncated singular value expansion
+            :math:`T(k_1,k_2)=\\sum_{i<r} s_i\\,u_i(k_1)\\,v_i(k_2)`
+            (applied to :math:`\\log(T)` if ``is_logt`` is ``True``). The
+            rank :math:`r` is the smallest one for which the relative
+            (Frobenius) error of the expansion is below ``rank_tol`` at all
+            scale factors. The factors are interpolated with 1D cubic
+            splines, which uses less memory and is faster to evaluate than
+            bicubic interpolation of the full array when :math:`r` is small.
 
     .. automethod:: __call__
     """
@@ -94,7 +106,7 @@ class Tk3D(CCLObject):
 
     def __init__(self, *, a_arr, lk_arr, tkk_arr=None,
                  pk1_arr=None, pk2_arr=None, is_logt=True,
-                 extrap_order_lok=1, extrap_order_hik=1):
+                 extrap_order_lok=1, extrap_order_hik=1, rank_tol=None):
         na = len(a_arr)
         nk = len(lk_arr)
 
@@ -122,8 +134,8 @@ class Tk3D(CCLObject):
                                  "shapes are wrong")
 
             self.tsp, status = lib.tk3d_new_factorizable(lk_arr, a_arr,
-                                                         pk1_arr.flatten(),
-                                                         pk2_arr.flatten(),
+                                                         np.ravel(pk1_arr),
+                                                         np.ravel(pk2_arr),
                                                          int(extrap_order_lok),
                                                          int(extrap_order_lok),
                                                          int(is_logt), status)
@@ -131,13 +143,147 @@ class Tk3D(CCLObject):
             if tkk_arr.shape != (na, nk, nk):
                 raise ValueError("Input trispectrum shape is wrong")
 
-            self.tsp, status = lib.tk3d_new_from_arrays(lk_arr, a_arr,
-                                                        tkk_arr.flatten(),
-                                                        int(extrap_order_lok),
-                                                        int(extrap_order_lok),
-                                                        int(is_logt), status)
+            if rank_tol is not None:
+                u_arr, v_arr = _lowrank_factors(tkk_arr, rank_tol)
+                self.tsp, status = lib.tk3d_new_lowrank(
+                    lk_arr, a_arr, u_arr.shape[1],
+                    np.ravel(u_arr), np.ravel(v_arr),
+                    int(extrap_order_lok), int(extrap_order_hik),
+                    int(is_logt), status)
+            else:
+                self.tsp, status = lib.tk3d_new_from_arrays(
+                    lk_arr, a_arr, np.ravel(tkk_arr),
+                    int(extrap_order_lok), int(extrap_order_lok),
+                    int(is_logt), status)
         check(status)
 
+    def to_shared(self, path=None):
+        """Store the spline data of this trispectrum in memory that other
+        processes can attach to. The trispectra built from it with
+        :meth:`from_shared` interpolate it in place, so that any number of
+        processes share a single copy of the data.
+
+        The data are stored in the same form as in this object: as the
+        two factors of factorizable trispectra, as the low-rank expansion
+        of trispectra built with ``rank_tol``, or as the full trispectrum
+        otherwise. For the latter two, the data include the derivatives at
+        the nodes used by the bicubic interpolation, so that the
+        interpolation is the same as that of this object. Low-rank
+        expansions are small, and are copied into the 1D splines of each
+        object built with :meth:`from_shared`.
+
+        Args:
+            path (:obj:`str`): if not ``None``, store the data in a
+                memory-mapped file at this path. Otherwise, use a shared
+                memory block.
+
+        Returns:
+            :class:`~pyccl.SharedArrays`. Picklable handle to the shared
+            data. The caller must call its ``unlink`` method once the data
+            are no longer needed.
+        """
+        rank = self.rank
+        if rank > 0:
+            # Low-rank factors, without reconstructing the trispectrum.
+            na = self.tsp.na
+            a_arr = _get_array_view(self.tsp.a_arr, na, self)
+            lk_arr, us = _get_spline1d_array_views(self.tsp.tkka_u,
+                                                   na*rank, self)
+            _, vs = _get_spline1d_array_views(self.tsp.tkka_v, na*rank, self)
+            out = [us, vs]
+            is_log = bool(self.tsp.is_log)
+        else:
+            a_arr, lk_arr, _, out, is_log = self.get_spline_views()
+        na, nk = a_arr.size, lk_arr.size
+        if self.tsp.is_product:
+            shapes = [(2, na, nk), (2, 3, na, nk)]
+        elif rank > 0:
+            shapes = [(na, rank, nk), (na, rank, nk)]
+        else:
+            shapes = [(na, nk, nk), (na, 3, nk, nk)]
+        shared = SharedArrays(
+            [a_arr.shape, lk_arr.shape] + shapes,
+            meta={"type": "Tk3D", "is_log": is_log,
+                  "is_product": bool(self.tsp.is_product), "rank": rank,
+                  "extrap_order_lok": self.extrap_order_lok,
+                  "extrap_order_hik": self.extrap_order_hik},
+            path=path)
+        a_sh, lk_sh, tk_sh, dtk_sh = shared.arrays
+        a_sh[...] = a_arr
+        lk_sh[...] = lk_arr
+
+        status = 0
+        if self.tsp.is_product:
+            for tk, dtk, tk_in in zip(tk_sh, dtk_sh, out):
+                tk[...] = tk_in
+                status = lib.bicubic_derivs(lk_sh, a_sh, tk.reshape(-1),
+                                            dtk.reshape(-1), status)
+        elif rank > 0:
+            tk_sh[...] = np.reshape(out[0], (na, rank, nk))
+            dtk_sh[...] = np.reshape(out[1], (na, rank, nk))
+        else:
+            # One scale factor at a time.
+            for tk, dtk, tk_in in zip(tk_sh, dtk_sh, out):
+                tk[...] = tk_in
+                status = lib.bicubic_derivs(lk_sh, lk_sh, tk.reshape(-1),
+                                            dtk.reshape(-1), status)
+        check(status)
+        shared.flush()
+        return shared
+
+    @classmethod
+    def from_shared(cls, shared):
+        """Build a :class:`Tk3D` from data stored with :meth:`to_shared`.
+        Unless the trispectrum is stored as a low-rank expansion, the new
+        object interpolates the shared data in place, without copying
+        them.
+
+        .. note::
+
+            The new object holds references to the shared arrays, which
+            therefore stay mapped in this process for as long as it
+            exists. ``shared`` must not be closed before then.
+
+        Args:
+            shared (:class:`~pyccl.SharedArrays`): shared spline data.
+
+        Returns:
+            :class:`~pyccl.tk3d.Tk3D`. Trispectrum object.
+        """
+        meta = shared.meta
+        if meta.get("type") != "Tk3D":
+            raise ValueError("Shared data do not hold a Tk3D.")
+        # For low-rank expansions, the last two arrays hold the k1 and k2
+        # factors rather than the trispectrum and its derivatives.
+        a_arr, lk_arr, tk_arr, dtk_arr = arrs = tuple(shared.arrays)
+        lok, hik = int(meta["extrap_order_lok"]), int(meta["extrap_order_hik"])
+        is_log = int(meta["is_log"])
+
+        status = 0
+        if meta["rank"] > 0:
+            tsp, status = lib.tk3d_new_lowrank(
+                lk_arr, a_arr, meta["rank"], tk_arr.reshape(-1),
+                dtk_arr.reshape(-1), lok, hik, is_log, status)
+        else:
+            tsp, status = lib.tk3d_new_external(
+                lk_arr, a_arr, tk_arr.reshape(-1), dtk_arr.reshape(-1),
+                int(meta["is_product"]), lok, hik, is_log, status)
+        tk3d = Tk3D.__new__(cls)
+        with UnlockInstance(tk3d):
+            tk3d.tsp = tsp
+            if meta["rank"] == 0:
+                # Keep the shared memory mapped while it is interpolated.
+                tk3d._shared = shared
+                tk3d._shared_arrays = arrs
+        check(status)
+        return tk3d
+
+    @property
+    def is_shared(self):
+        """Whether this object interpolates data held in shared memory (see
+        :meth:`from_shared`)."""
+        return '_shared' in vars(self)
+
     def __eq__(self, other):
         # Check object id.
         if self is other:
@@ -156,19 +302,41 @@ class Tk3D(CCLObject):
                 and self.extrap_order_hik == other.extrap_order_hik):
             return False
         # Check the individual splines.
-        a1, lk11, lk12, tk1 = self.get_spline_arrays()
-        a2, lk21, lk22, tk2 = other.get_spline_arrays()
+        a1, lk11, lk12, tk1, log1 = self.get_spline_views()
+        a2, lk21, lk22, tk2, log2 = other.get_spline_views()
+        if log1 != log2:
+            tk1 = [np.exp(tk) for tk in tk1] if log1 else tk1
+            tk2 = [np.exp(tk) for tk in tk2] if log2 else tk2
         return ((a1 == a2).all()
-                and (lk11 == lk21).all() and (lk21 == lk22).all()
-                and np.array_equal(tk1, tk2))
+                and (lk11 == lk21).all() and (lk12 == lk22).all()
+                and len(tk1) == len(tk2)
+                and all(np.array_equal(t1, t2) for t1, t2 in zip(tk1, tk2)))
 
     def __hash__(self):
-        return hash(repr(self))
+        # Hash the data as compared by `__eq__`, so that equal objects
+        # stored in linear and in log space share the same hash.
+        if not self:
+            return hash(repr(self))
+        return hash((self.tsp.is_product, self.extrap_order_lok,
+                     self.extrap_order_hik, self._hash_arrs()))
+
+    def _hash_arrs(self):
+        # Hash of the spline data, with the trispectrum in linear space.
+        a, lk1, lk2, tks, is_log = self.get_spline_views()
+        if is_log:
+            tks = [np.exp(tk) for tk in tks]
+        return sum([hash_(obj) for obj in [a, lk1, lk2, *tks]])
 
     @property
     def has_tsp(self):
         return 'tsp' in vars(self)
 
+    @property
+    def rank(self):
+        """Number of terms in the low-rank expansion of the trispectrum
+        (see ``rank_tol``), or 0 if the full trispectrum is stored."""
+        return self.tsp.rank if self else None
+
     @property
     def extrap_order_lok(self):
         return self.tsp.extrap_order_lok if self else None
@@ -232,26 +400,92 @@ class Tk3D(CCLObject):
             - out (list of ``numpy.ndarray``): The trispectrum
               :math:`T(k_1, k_2, z)` or its factors
               :math:`f(k_1, z),\\,\\,f(k_2, z)`.
+
+            These are copies of the internal data. Use
+            :meth:`get_spline_views` to access it without copying.
+        """
+        a_arr, lk_arr1, lk_arr2, out, is_log = self.get_spline_views()
+        if not self.tsp.is_product:
+            # each scale factor is stored in a different spline
+            out = [np.array(out)]
+
+        if is_log:
+            out = [np.exp(tk) for tk in out]
+        elif self.tsp.is_product:
+            out = [tk.copy() for tk in out]
+
+        return a_arr.copy(), lk_arr1.copy(), lk_arr2.copy(), out
+
+    def get_spline_views(self):
+        """Get read-only views of the spline data arrays internally stored
+        by this object, without copying them. The views keep this object
+        alive for as long as they exist.
+
+        Returns:
+            Tuple containing
+
+            - a_arr (1D ``numpy.ndarray``): Array of scale factors.
+            - lk_arr1, lk_arr2 (1D ``numpy.ndarray``): Arrays of
+              :math:`log(k)`.
+            - out (list of ``numpy.ndarray``): The stored values of the
+              factors :math:`f(k_1, z),\\,\\,f(k_2, z)` if the trispectrum
+              is factorizable. Otherwise, the stored values of the
+              trispectrum :math:`T(k_1, k_2, z)`, with one 2D array for each
+              scale factor. For trispectra stored as a low-rank expansion,
+              these arrays are reconstructed from its factors, and are not
+              views.
+            - is_log (:obj:`bool`): Whether ``out`` holds the logarithm of
+              the stored function.
         """
         if not self:
             raise ValueError("Tk3D object does not have data.")
 
-        out = []
-        if self.tsp.is_product:
-            a_arr, lk_arr1, pk_arr1 = _get_spline2d_arrays(self.tsp.fka_1.fka)
-            _, lk_arr2, pk_arr2 = _get_spline2d_arrays(self.tsp.fka_2.fka)
-            out.append(pk_arr1)
-            out.append(pk_arr2)
+        if self.is_shared:
+            a_arr, lk_arr1, tk_arr = [_readonly(arr)
+                                      for arr in self._shared_arrays[:3]]
+            lk_arr2 = lk_arr1
+            out = list(tk_arr)
+        elif self.tsp.is_product:
+            a_arr, lk_arr1, pk_arr1 = _get_spline2d_views(
+                self.tsp.fka_1.fka, self)
+            _, lk_arr2, pk_arr2 = _get_spline2d_views(
+                self.tsp.fka_2.fka, self)
+            out = [pk_arr1, pk_arr2]
+        elif self.tsp.rank > 0:
+            a_arr = _get_array_view(self.tsp.a_arr, self.tsp.na, self)
+            na, rank = self.tsp.na, self.tsp.rank
+            lk_arr1, us = _get_spline1d_array_views(self.tsp.tkka_u,
+                                                    na*rank, self)
+            lk_arr2, vs = _get_spline1d_array_views(self.tsp.tkka_v,
+                                                    na*rank, self)
+            # out[ia][ik2, ik1] = sum_i u_i(k1) v_i(k2)
+            out = [np.array(vs[ia*rank:(ia+1)*rank]).T
+                   @ np.array(us[ia*rank:(ia+1)*rank])
+                   for ia in range(na)]
         else:
-            status = 0
-            a_arr, status = lib.get_array(self.tsp.a_arr, self.tsp.na, status)
-            check(status)
-            lk_arr1, lk_arr2, tkka_arr = _get_spline3d_arrays(self.tsp.tkka,
-                                                              self.tsp.na)
-            out.append(tkka_arr)
-
-        if self.tsp.is_log:
-            # exponentiate in-place
-            [np.exp(tk, out=tk) for tk in out]
-
-        return a_arr, lk_arr1, lk_arr2, out
+            a_arr = _get_array_view(self.tsp.a_arr, self.tsp.na, self)
+            lk_arr1, lk_arr2, out = _get_spline3d_views(self.tsp.tkka,
+                                                        self.tsp.na, self)
+
+        return a_arr, lk_arr1, lk_arr2, out, bool(self.tsp.is_log)
+
+
+def _lowrank_factors(tkk_arr, rank_tol):
+    # Truncated singular value decomposition of the trispectrum at each
+    # scale factor. Returns the k1 and k2 factors, with shape [na, rank, nk]
+    # and the singular values absorbed in both. Note that the first index
+    # of tkk_arr[ia] corresponds to k2.
+    if rank_tol < 0:
+        raise ValueError("`rank_tol` must be non-negative.")
+    vs, s, us = np.linalg.svd(tkk_arr)
+    # Relative error of the expansion truncated at each rank.
+    s2 = s**2
+    err = np.sqrt(np.clip(1-np.cumsum(s2, axis=-1) /
+                          np.sum(s2, axis=-1, keepdims=True), 0, None))
+    err[~np.isfinite(err)] = 0
+    rank = int(np.max(np.sum(err > rank_tol, axis=-1)))+1
+    rank = min(rank, s.shape[-1])
+    sq = np.sqrt(s[:, :rank])
+    u_arr = us[:, :rank, :] * sq[:, :, None]
+    v_arr = np.transpose(vs[:, :, :rank], (0, 2, 1)) * sq[:, :, None]
+    return u_arr, v_arr
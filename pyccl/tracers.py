@@ -26,13 +26,14 @@ as sub-classes of the :class:`Tracer` base class can be found below. The
 documentation of the base :class:`Tracer` class is a good place to start.
 """
 
-from collections import OrderedDict
+import itertools
+import threading
+from collections import OrderedDict, deque
 
 import numpy as np
 from scipy.integrate import simpson
 from scipy.interpolate import interp1d
 
-from pyccl._core.caching import _to_hashable
 
 from . import ccllib as lib
 from .pyutils import check
@@ -43,7 +44,8 @@ from .pyutils import (_check_array_params, NoneArr, _vectorize_fn6,
                       _get_spline1d_arrays, _get_spline2d_arrays)
 
 __all__ = ("get_density_kernel", "get_lensing_kernel", "get_kappa_kernel",
-           "Tracer", "NzTracer", "NumberCountsTracer", "WeakLensingTracer",
+           "Tracer", "NzTracer", "TracerStack", "NumberCountsTracer",
+           "WeakLensingTracer",
            "CMBLensingTracer", "tSZTracer", "CIBTracer", "ISWTracer",)
 
 
@@ -81,6 +83,16 @@ def _check_background_spline_compatibility(cosmo, z):
             f"Background splines: z=[{1/a_bg.max()-1}, {1/a_bg.min()-1}].")
 
 
+def _check_nz_stack(z_n, n):
+    """Check that a (possibly 2D) array of redshift distributions is
+    sampled at the redshifts ``z_n``.
+    """
+    if (n.ndim > 2) or ((n.ndim == 2) and (n.shape[1] != z_n.size)):
+        raise ValueError("N(z) must be an array of shape (n_z,) or "
+                         "(n_real, n_z), where n_z is the number of "
+                         "redshifts.")
+
+
 def get_density_kernel(cosmo, *, dndz):
     """This convenience function returns the radial kernel for
     galaxy-clustering-like tracers. Given an unnormalized
@@ -96,17 +108,27 @@ def get_density_kernel(cosmo, *, dndz):
         dndz (:obj:`tuple`): A tuple of arrays ``(z, N(z))``
             giving the redshift distribution of the objects.
             The units are arbitrary; ``N(z)`` will be normalized
-            to unity.
+            to unity. ``N(z)`` may also be a 2D array of shape
+            ``(n_real, n_z)`` holding several distributions (e.g.
+            realisations of the photo-z uncertainty), in which case all
+            kernels are computed in a single call and ``W(chi)`` has
+            the same shape.
     """
     z_n, n = _check_array_params(dndz, 'dndz')
+    _check_nz_stack(z_n, n)
     _check_background_spline_compatibility(cosmo, dndz[0])
     # this call inits the distance splines neded by the kernel functions
     chi = cosmo.comoving_radial_distance(1./(1.+z_n))
     status = 0
-    wchi, status = lib.get_number_counts_kernel_wrapper(cosmo.cosmo,
-                                                        z_n, n,
-                                                        len(z_n),
-                                                        status)
+    if n.ndim == 2:
+        wchi, status = lib.get_number_counts_kernel_multi_wrapper(
+            cosmo.cosmo, z_n, n.flatten(), n.size, status)
+        wchi = wchi.reshape(n.shape)
+    else:
+        wchi, status = lib.get_number_counts_kernel_wrapper(cosmo.cosmo,
+                                                            z_n, n,
+                                                            len(z_n),
+                                                            status)
     check(status, cosmo=cosmo)
     return chi, wchi
 
@@ -133,6 +155,10 @@ def get_lensing_kernel(cosmo, *, dndz, mag_bias=None, n_chi=None):
         dndz (:obj:`tuple`): A tuple of arrays ``(z, N(z))``
             giving the redshift distribution of the objects.
             The units are arbitrary; ``N(z)`` will be normalized to unity.
+            ``N(z)`` may also be a 2D array of shape ``(n_real, n_z)``
+            holding several distributions, in which case all kernels are
+            computed in a single call on the same grid of distances and
+            ``W(chi)`` has shape ``(n_real, n_chi)``.
         mag_bias (:obj:`tuple`): A tuple of arrays ``(z, s(z))``
             giving the magnification bias as a function of redshift. If
             ``None``, ``s=0`` will be assumed.
@@ -141,6 +167,7 @@ def get_lensing_kernel(cosmo, *, dndz, mag_bias=None, n_chi=None):
     cosmo.compute_distances()
 
     z_n, n = _check_array_params(dndz, 'dndz')
+    _check_nz_stack(z_n, n)
     has_magbias = mag_bias is not None
     z_s, s = _check_array_params(mag_bias, 'mag_bias')
     _check_background_spline_compatibility(cosmo, dndz[0])
@@ -149,8 +176,10 @@ def get_lensing_kernel(cosmo, *, dndz, mag_bias=None, n_chi=None):
         # Calculate number of samples in chi
         n_chi = lib.get_nchi_lensing_kernel_wrapper(z_n)
 
+    gsl_params = cosmo.cosmo.gsl_params
     if (n_chi > len(z_n)
-            and cosmo.cosmo.gsl_params.LENSING_KERNEL_SPLINE_INTEGRATION):
+            and gsl_params.LENSING_KERNEL_SPLINE_INTEGRATION
+            and not gsl_params.LENSING_KERNEL_CUMULATIVE_INTEGRATION):
         warnings.warn(
             f"The number of samples in the n(z) ({len(z_n)}) is smaller than "
             f"the number of samples in the lensing kernel ({n_chi}). Consider "
@@ -164,10 +193,17 @@ def get_lensing_kernel(cosmo, *, dndz, mag_bias=None, n_chi=None):
     chi, status = lib.get_chis_lensing_kernel_wrapper(cosmo.cosmo, z_n[-1],
                                                       n_chi, status)
     # Compute kernel
-    wchi, status = lib.get_lensing_kernel_wrapper(cosmo.cosmo,
-                                                  z_n, n, z_n[-1],
-                                                  int(has_magbias), z_s, s,
-                                                  chi, n_chi, status)
+    if n.ndim == 2:
+        wchi, status = lib.get_lensing_kernel_multi_wrapper(
+            cosmo.cosmo, z_n, n.flatten(), z_n[-1], int(has_magbias), z_s, s,
+            chi, len(n)*n_chi, status)
+        wchi = wchi.reshape((len(n), n_chi))
+    else:
+        wchi, status = lib.get_lensing_kernel_wrapper(cosmo.cosmo,
+                                                      z_n, n, z_n[-1],
+                                                      int(has_magbias),
+                                                      z_s, s,
+                                                      chi, n_chi, status)
     check(status, cosmo=cosmo)
     return chi, wchi
 
@@ -196,6 +232,111 @@ def get_kappa_kernel(cosmo, *, z_source, n_samples=100):
     return chi, wchi
 
 
+def _get_avg_weighted_a(cosmo, chi, wchi):
+    """Kernel-weighted mean scale factor of a radial kernel."""
+    if len(wchi) == 0:
+        return 1.0
+    a = cosmo.scale_factor_of_chi(chi)
+    wint = simpson(wchi, x=a)
+    if wint != 0:  # Avoid division by zero
+        return simpson(a*wchi, x=a)/wint
+    # If kernel integral is zero, just set to z=0
+    return 1.0
+
+
+class _FKEMCache:
+    r"""Least-recently-used cache of the integrals over :math:`\chi`
+    computed by the non-Limber methods (FKEM and ``'bessel'``), shared by
+    all tracers. Its size is bounded by the total number of bytes of the
+    stored arrays.
+
+    Entries are keyed by the identifier of the owning :class:`Tracer`,
+    so that all the entries of a tracer can be discarded when any of
+    its ingredients changes.
+
+    All the operations are serialised by a lock, so that the cache can be
+    used from several threads. Since tracers discard their entries when
+    they are garbage-collected (possibly while the cache is in use),
+    :meth:`discard` never waits for the lock: if it is held, the entries
+    are removed by the next operation instead.
+
+    Args:
+        maxbytes (:obj:`int`): maximum number of bytes to store.
+    """
+
+    def __init__(self, maxbytes=128 * 1024**2):
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._keys = {}
+        self._lock = threading.Lock()
+        # Owners whose entries are still to be discarded.
+        self._discarded = deque()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            self._discard_pending()
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, ks, fks):
+        with self._lock:
+            self._discard_pending()
+            self._pop(key)
+            self._data[key] = (ks, fks)
+            self._keys.setdefault(key[0], set()).add(key)
+            self.nbytes += ks.nbytes + fks.nbytes
+            # Evict least-recently-used entries
+            while self.nbytes > self.maxbytes and self._data:
+                self._pop(next(iter(self._data)))
+
+    def pop(self, key):
+        with self._lock:
+            self._discard_pending()
+            return self._pop(key)
+
+    def _pop(self, key):
+        value = self._data.pop(key, None)
+        if value is not None:
+            self.nbytes -= value[0].nbytes + value[1].nbytes
+            keys = self._keys[key[0]]
+            keys.discard(key)
+            if not keys:
+                del self._keys[key[0]]
+        return value
+
+    def discard(self, owner):
+        """Remove all the entries of the tracer with identifier ``owner``.
+        """
+        self._discarded.append(owner)
+        if self._lock.acquire(blocking=False):
+            try:
+                self._discard_pending()
+            finally:
+                self._lock.release()
+
+    def _discard_pending(self):
+        while self._discarded:
+            owner = self._discarded.popleft()
+            for key in list(self._keys.get(owner, ())):
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._keys.clear()
+            self._discarded.clear()
+            self.nbytes = 0
+
+
+_tracer_ids = itertools.count()
+
+
 class Tracer(CCLObject):
     """Tracers contain the information necessary to describe the
     contribution of a given sky observable to its cross-power spectrum
@@ -219,6 +360,7 @@ class Tracer(CCLObject):
     tracers that get combined linearly when computing power spectra.
     """
     from ._core.repr_ import build_string_Tracer as __repr__
+    _fkem_cache = _FKEMCache()
 
     def __init__(self):
         """By default this `Tracer` object will contain no actual
@@ -226,9 +368,9 @@ class Tracer(CCLObject):
         """
         # Do nothing, just initialize list of tracers
         self._trc = []
-        self.chi_fft_dict = OrderedDict()
-        self._fkem_cache_maxsize = 1024
+        self._fkem_id = next(_tracer_ids)
         self.avg_weighted_a = []
+        self._amplitudes = []
 
     def __eq__(self, other):
         # Check object id.
@@ -253,6 +395,10 @@ class Tracer(CCLObject):
         if not (np.array_equal(*bessel) and np.array_equal(*angles)):
             return False
 
+        # Check the amplitudes.
+        if self._amplitudes != other._amplitudes:
+            return False
+
         # Check the kernels.
         for t1, t2 in zip(self._trc, other._trc):
             if bool(t1.kernel) ^ bool(t2.kernel):
@@ -401,7 +547,8 @@ class Tracer(CCLObject):
 
     def get_transfer(self, lk, a):
         """Get the transfer functions for all tracers contained
-        in this ``Tracer``.
+        in this ``Tracer``, including their amplitudes (see
+        :meth:`set_amplitude`).
 
         Args:
             lk (:obj:`float` or `array`): values of the natural logarithm of
@@ -468,36 +615,33 @@ class Tracer(CCLObject):
             chimax (float): Maximum comoving distance.
             ell (float): Angular multipole.
             cosmo (:class:`~pyccl.core.Cosmology`): A Cosmology object.
-                Used to generate a hash of the cosmological parameters,
-                ensuring the cache is invalidated when cosmology changes.
+                Its cache key ensures that the cache is invalidated when
+                cosmology changes.
 
         Returns:
             `tuple`: k values and fft integral values at each k,
             or (None, None) on cache miss.
         """
-        d = cosmo._params_init_kwargs
-        d.update(cosmo._config_init_kwargs)
-        cosmo_hash = hash(_to_hashable(d))
-        key = (hash(tracer), Nchi, chimin, chimax, ell, cosmo_hash)
-        temp = self.chi_fft_dict.get(key)
+        key = (self._fkem_id, id(tracer), Nchi, chimin, chimax, ell,
+               cosmo._cache_key)
+        temp = self._fkem_cache.get(key)
         if temp is None:
             return None, None
-        # Move to end for LRU behaviour
-        self.chi_fft_dict.move_to_end(key)
         return temp[0], temp[1]
 
     def _set_fkem_fft(self, tracer, cosmo, Nchi, chimin, chimax, ell,
                       ks, fft):
         """Store an FFTLog integral over chi for FKEM non-limber
-        calculation, with LRU eviction.
+        calculation in the cache shared by all tracers (see
+        :attr:`_fkem_cache`).
 
         Args:
             tracer: C-level tracer object (element of ``self._trc``).
                 Used as an identity-based key component so that each
                 sub-tracer within this collection is cached separately.
             cosmo (:class:`~pyccl.core.Cosmology`): A Cosmology object.
-                Used to generate a hash of the cosmological parameters,
-                ensuring the cache is invalidated when cosmology changes.
+                Its cache key ensures that the cache is invalidated when
+                cosmology changes.
             Nchi (int): Number of comoving distance samples.
             chimin (float): Minimum comoving distance.
             chimax (float): Maximum comoving distance.
@@ -508,16 +652,9 @@ class Tracer(CCLObject):
         Returns:
             `tuple`: k values and fft integral values at each k.
         """
-        d = cosmo._params_init_kwargs
-        d.update(cosmo._config_init_kwargs)
-        cosmo_hash = hash(_to_hashable(d))
-        key = (hash(tracer), Nchi, chimin, chimax, ell, cosmo_hash)
-
-        self.chi_fft_dict[key] = (ks, fft)
-        self.chi_fft_dict.move_to_end(key)
-        # Evict oldest (least-recently-used) entries
-        while len(self.chi_fft_dict) > self._fkem_cache_maxsize:
-            self.chi_fft_dict.popitem(last=False)
+        key = (self._fkem_id, id(tracer), Nchi, chimin, chimax, ell,
+               cosmo._cache_key)
+        self._fkem_cache.set(key, ks, fft)
         return ks, fft
 
     def get_avg_weighted_a(self):
@@ -755,16 +892,70 @@ class Tracer(CCLObject):
                                           int(extrap_order_hik),
                                           status)
         self._trc.append(_check_returned_tracer(ret))
-        a = cosmo.scale_factor_of_chi(chi_s)
-        if len(wchi_s) == 0:
-            avg_a = 1.0
+        self._amplitudes.append(())
+        self.avg_weighted_a.append(_get_avg_weighted_a(cosmo, chi_s, wchi_s))
+
+    @unlock_instance
+    def set_amplitude(self, amplitude, *, index=None):
+        """Set the amplitude of some of the tracers contained in this
+        ``Tracer``. The amplitude multiplies the transfer function of each
+        tracer when it is evaluated (e.g. inside the Limber integrand), so
+        it can be changed without recomputing any of the tracer's splines.
+        This is useful to vary fast nuisance parameters, such as galaxy
+        bias, intrinsic alignment or magnification bias amplitudes. See also
+        :func:`~pyccl.cells.angular_cl_templates`.
+
+        Args:
+            amplitude (:obj:`float` or `array`): a constant amplitude, or
+                the coefficients :math:`c_i` of a polynomial in redshift,
+                :math:`A(z)=\\sum_i c_i\\,z^i`, in increasing order. At
+                most 8 coefficients are allowed. If ``None``, the amplitude
+                is reset to 1.
+            index (:obj:`int` or `list`): index or indices of the tracers
+                whose amplitude will be set. If ``None``, the amplitude of
+                all tracers is set.
+        """
+        if amplitude is None:
+            coeffs = np.array([])
         else:
-            wint = simpson(wchi_s, x=a)
-            if wint != 0:  # Avoid division by zero
-                avg_a = simpson(a*wchi_s, x=a)/wint
-            else:  # If kernel integral is zero, just set to z=0
-                avg_a = 1.0
-        self.avg_weighted_a.append(avg_a)
+            coeffs = np.atleast_1d(np.array(amplitude, dtype=float))
+            if (coeffs.ndim != 1) or not (1 <= coeffs.size <= 8):
+                raise ValueError("The amplitude must be a number or an "
+                                 "array of at most 8 coefficients.")
+
+        if index is None:
+            indices = range(len(self._trc))
+        else:
+            indices = np.atleast_1d(index).astype(int)
+
+        for i in indices:
+            status = 0
+            status = lib.cl_tracer_set_amplitude(self._trc[i], coeffs, status)
+            check(status)
+            self._amplitudes[i] = tuple(coeffs)
+        # Cached FKEM integrals depend on the amplitudes.
+        self._fkem_cache.discard(self._fkem_id)
+
+    def get_amplitude(self, z):
+        """Get the amplitudes of all tracers contained in this ``Tracer``
+        (see :meth:`set_amplitude`).
+
+        Args:
+            z (:obj:`float` or `array`): redshift values.
+
+        Returns:
+            `array`: amplitudes of each tracer. The shape will be
+            ``(n_tracer, z.size)``, where ``n_tracer`` is the number of
+            tracers. The last dimension will be squeezed if the input is
+            a scalar.
+        """
+        z_use = np.atleast_1d(z).astype(float)
+        amps = np.array([np.polynomial.polynomial.polyval(z_use, c)
+                         if c else np.ones_like(z_use)
+                         for c in self._amplitudes])
+        if np.ndim(z) == 0 and amps.shape != (0,):
+            amps = np.squeeze(amps, axis=-1)
+        return amps
 
     @classmethod
     def from_z_power(cls, cosmo, *, A, alpha, z_min=0., z_max=6., n_chi=1024):
@@ -807,6 +998,8 @@ class Tracer(CCLObject):
         if hasattr(self, '_trc') and lib.cl_tracer_t_free is not None:
             for t in self._trc:
                 lib.cl_tracer_t_free(t)
+        if hasattr(self, '_fkem_id'):
+            self._fkem_cache.discard(self._fkem_id)
 
 
 class NzTracer(Tracer):
@@ -827,6 +1020,158 @@ class NzTracer(Tracer):
         """
         return self._dndz(z)
 
+    @unlock_instance
+    def update_photoz(self, cosmo, *, delta_z=0., stretch=1., norm_tol=1E-3):
+        r"""Shift and stretch the redshift distribution of this tracer in
+        place. The new distribution is
+
+        .. math::
+            N'(z) = N\left(\bar{z}+\frac{z-\bar{z}-\Delta z}{s}\right),
+
+        where :math:`N(z)` is the distribution the tracer was built with,
+        :math:`\bar{z}` is its mean redshift, :math:`\Delta z` is the
+        shift and :math:`s` is the stretch. Only the radial kernels are
+        recomputed (on the same redshift and distance nodes) and replaced
+        in the existing C-level tracers: the transfer functions are left
+        untouched, so this is much faster than building a new tracer, and
+        the tracer can still be passed to :func:`~pyccl.cells.angular_cl`.
+        Successive updates do not accumulate: they are always applied to
+        the original distribution. Setting
+        ``pyccl.gsl_params.LENSING_KERNEL_CUMULATIVE_INTEGRATION`` makes
+        the update of lensing kernels scale linearly with the number of
+        samples.
+
+        .. note::
+
+            The redshift nodes are not extended, so any part of the new
+            distribution falling outside of them is discarded.
+
+        Args:
+            cosmo (:class:`~pyccl.cosmology.Cosmology`): the cosmology
+                the tracer was built with.
+            delta_z (:obj:`float`): redshift shift :math:`\Delta z`.
+            stretch (:obj:`float`): stretch :math:`s`. Must be positive.
+            norm_tol (:obj:`float`): a warning is issued if the integral
+                of :math:`N'(z)` over the redshift nodes differs from
+                :math:`s` times that of :math:`N(z)` by more than this
+                fraction (e.g. if part of it is shifted past the nodes).
+        """
+        if getattr(self, "_nz_orig", None) is None:
+            raise ValueError("This tracer does not store the redshift "
+                             "distribution it was built with.")
+        if stretch <= 0:
+            raise ValueError("stretch must be positive.")
+
+        z, n, z_mean, norm = self._nz_orig
+        if not norm > 0:
+            raise ValueError("The redshift distribution of this tracer does "
+                             "not have a positive integral, so its mean "
+                             "redshift is not defined.")
+        n_new = np.interp(z_mean + (z - z_mean - delta_z) / stretch,
+                          z, n, left=0, right=0)
+        # Shifting leaves the integral unchanged and stretching multiplies
+        # it by `stretch`, unless part of N(z) leaves the redshift nodes.
+        norm_new = simpson(n_new, x=z)
+        if not norm_new > 0:
+            raise ValueError(
+                f"The shifted redshift distribution lies outside of the "
+                f"redshift range of the tracer [{z[0]}, {z[-1]}].")
+        lost = 1 - norm_new / (stretch * norm)
+        if np.fabs(lost) > norm_tol:
+            warnings.warn(
+                f"The integral of the shifted redshift distribution differs "
+                f"by {lost:.2%} from that of the original one, e.g. because "
+                f"part of it falls outside of the redshift range of the "
+                f"tracer [{z[0]}, {z[-1]}] and is discarded.",
+                category=CCLWarning, importance='high')
+
+        kernels = {}
+        for index, (kind, factor) in enumerate(self._nz_kernels):
+            if kind not in kernels:
+                if kind == "density":
+                    kernels[kind] = get_density_kernel(cosmo, dndz=(z, n_new))
+                else:
+                    kernels[kind] = get_lensing_kernel(
+                        cosmo, dndz=(z, n_new), **self._nz_kernel_kwargs)
+            chi, w = kernels[kind]
+            w = factor * w
+            status = 0
+            status = lib.cl_tracer_set_kernel(self._trc[index], chi, w,
+                                              status)
+            check(status, cosmo=cosmo)
+            self.avg_weighted_a[index] = _get_avg_weighted_a(cosmo, chi, w)
+
+        self._dndz = interp1d(z, n_new, bounds_error=False, fill_value=0)
+        # Cached FKEM integrals depend on the kernels.
+        self._fkem_cache.discard(self._fkem_id)
+
+    def _store_nz(self, z, n, kernels, **kernel_kwargs):
+        # Keep what's needed to recompute the radial kernels for a shifted
+        # or stretched N(z). `kernels` holds the kind of kernel ("density"
+        # or "lensing") and its prefactor for each contribution.
+        with UnlockInstance(self, mutate=False):
+            self._dndz = interp1d(z, n, bounds_error=False, fill_value=0)
+            norm = simpson(n, x=z)
+            z_mean = simpson(z*n, x=z)/norm if norm > 0 else np.nan
+            self._nz_orig = (z, n, z_mean, norm)
+            self._nz_kernels = kernels
+            self._nz_kernel_kwargs = kernel_kwargs
+
+
+class TracerStack(CCLObject):
+    """A stack of :class:`Tracer` objects describing the same observable
+    for several realisations of its redshift distribution (e.g. samples of
+    the photo-z uncertainty). Stacks are returned by
+    :func:`NumberCountsTracer` and :func:`WeakLensingTracer` when given a
+    2D array of redshift distributions, in which case the radial kernels
+    of all the tracers are computed in a single call on a shared grid.
+    The inputs of the transfer functions (bias, growth rate, intrinsic
+    alignment amplitude) are also evaluated once, but each member builds
+    its own transfer function splines.
+
+    Stacks can be passed to :func:`~pyccl.cells.angular_cl`, which then
+    returns the power spectra of all realisations at once. Two stacks are
+    paired realisation by realisation, while a stack and a :class:`Tracer`
+    are paired by crossing every member of the stack with that tracer.
+
+    Args:
+        tracers (:obj:`list`): list of :class:`Tracer` objects.
+    """
+
+    def __init__(self, tracers):
+        self._tracers = list(tracers)
+        if not self._tracers:
+            raise ValueError("A TracerStack must contain at least one "
+                             "tracer.")
+        if not all(isinstance(t, Tracer) for t in self._tracers):
+            raise TypeError("TracerStack members must be Tracer objects.")
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return False
+        return self._tracers == other._tracers
+
+    def __hash__(self):
+        return hash(tuple(self._tracers))
+
+    def __len__(self):
+        return len(self._tracers)
+
+    def __iter__(self):
+        return iter(self._tracers)
+
+    def __getitem__(self, index):
+        return self._tracers[index]
+
+
+def _stack_kernels(kernel, n_real):
+    # Split a kernel computed for a stack of N(z)s into one kernel per
+    # realisation, sharing the same distances.
+    if kernel is None:
+        return [None] * n_real
+    chi, w = kernel
+    return [(chi, w_r) for w_r in w]
+
 
 def NumberCountsTracer(cosmo, *, dndz, bias=None, mag_bias=None,
                        has_rsd, n_samples=256):
@@ -846,7 +1191,9 @@ def NumberCountsTracer(cosmo, *, dndz, bias=None, mag_bias=None,
         cosmo (:class:`~pyccl.cosmology.Cosmology`): Cosmology object.
         dndz (:obj:`tuple`): A tuple of arrays ``(z, N(z))``
             giving the redshift distribution of the objects. The units are
-            arbitrary; ``N(z)`` will be normalized to unity.
+            arbitrary; ``N(z)`` will be normalized to unity. If ``N(z)`` is
+            a 2D array of shape ``(n_real, n_z)``, a :class:`TracerStack`
+            with one tracer per distribution is returned.
         bias (:obj:`tuple`): A tuple of arrays ``(z, b(z))``
             giving the galaxy bias. If ``None``, this tracer won't include
             a term proportional to the matter density contrast.
@@ -861,55 +1208,74 @@ def NumberCountsTracer(cosmo, *, dndz, bias=None, mag_bias=None,
             in radial distance. The kernel is quite smooth, so usually O(100)
             samples is enough.
     """
-    tracer = NzTracer()
-
     # we need the distance functions at the C layer
     cosmo.compute_distances()
 
     z_n, n = _check_array_params(dndz, 'dndz')
-    with UnlockInstance(tracer, mutate=False):
-        tracer._dndz = interp1d(z_n, n, bounds_error=False, fill_value=0)
 
     if (bias is None) and (not has_rsd) and (mag_bias is None):
         raise ValueError("Number counts tracers must have a non-zero bias, "
                          "RSDs, or a magnification bias contribution.")
 
     kernel_d = None
+    if (bias is not None) or has_rsd:
+        kernel_d = get_density_kernel(cosmo, dndz=dndz)
+
+    t_bias = None
     if bias is not None:  # Has density term
-        # Kernel
-        if kernel_d is None:
-            kernel_d = get_density_kernel(cosmo, dndz=dndz)
-        # Transfer
         z_b, b = _check_array_params(bias, 'bias')
         # Reverse order for increasing a
-        t_a = (1./(1+z_b[::-1]), b[::-1])
-        tracer.add_tracer(cosmo, kernel=kernel_d, transfer_a=t_a)
+        t_bias = (1./(1+z_b[::-1]), b[::-1])
 
+    t_rsd = None
     if has_rsd:  # Has RSDs
-        # Kernel
-        if kernel_d is None:
-            kernel_d = get_density_kernel(cosmo, dndz=dndz)
         # Transfer (growth rate)
-        z_b, _ = _check_array_params(dndz, 'dndz')
-        a_s = 1./(1+z_b[::-1])
-        t_a = (a_s, -cosmo.growth_rate(a_s))
-        tracer.add_tracer(cosmo, kernel=kernel_d,
-                          transfer_a=t_a, der_bessel=2)
+        a_s = 1./(1+z_n[::-1])
+        t_rsd = (a_s, -cosmo.growth_rate(a_s))
+
+    kernel_m = None
     if mag_bias is not None:  # Has magnification bias
-        # Kernel
         chi, w = get_lensing_kernel(cosmo, dndz=dndz, mag_bias=mag_bias,
                                     n_chi=n_samples)
         # Multiply by -2 for magnification
         kernel_m = (chi, -2 * w)
+
+    if n.ndim == 2:
+        return TracerStack([
+            _number_counts_tracer(cosmo, z_n, n_r, kernel_d_r, kernel_m_r,
+                                  t_bias, t_rsd, mag_bias, n_samples)
+            for n_r, kernel_d_r, kernel_m_r in zip(
+                n, _stack_kernels(kernel_d, len(n)),
+                _stack_kernels(kernel_m, len(n)))])
+    return _number_counts_tracer(cosmo, z_n, n, kernel_d, kernel_m,
+                                 t_bias, t_rsd, mag_bias, n_samples)
+
+
+def _number_counts_tracer(cosmo, z_n, n, kernel_d, kernel_m, t_bias, t_rsd,
+                          mag_bias, n_samples):
+    # Assemble a number counts tracer from its precomputed kernels and
+    # transfer functions.
+    tracer = NzTracer()
+    kernels = []
+
+    if t_bias is not None:
+        tracer.add_tracer(cosmo, kernel=kernel_d, transfer_a=t_bias)
+        kernels.append(("density", 1))
+    if t_rsd is not None:
+        tracer.add_tracer(cosmo, kernel=kernel_d,
+                          transfer_a=t_rsd, der_bessel=2)
+        kernels.append(("density", 1))
+    if kernel_m is not None:
+        kernels.append(("lensing", -2))
         if (cosmo['sigma_0'] == 0):
             # GR case
             tracer.add_tracer(cosmo, kernel=kernel_m,
                               der_bessel=-1, der_angles=1)
         else:
             # MG case
-            z_b, _ = _check_array_params(dndz, 'dndz')
-            tracer._MG_add_tracer(cosmo, kernel_m, z_b,
+            tracer._MG_add_tracer(cosmo, kernel_m, z_n,
                                   der_bessel=-1, der_angles=1)
+    tracer._store_nz(z_n, n, kernels, mag_bias=mag_bias, n_chi=n_samples)
     return tracer
 
 
@@ -924,7 +1290,9 @@ def WeakLensingTracer(cosmo, *, dndz, has_shear=True, ia_bias=None,
         cosmo (:class:`~pyccl.cosmology.Cosmology`): Cosmology object.
         dndz (:obj:`tuple`): A tuple of arrays ``(z, N(z))``
             giving the redshift distribution of the objects. The units are
-            arbitrary; ``N(z)`` will be normalized to unity.
+            arbitrary; ``N(z)`` will be normalized to unity. If ``N(z)`` is
+            a 2D array of shape ``(n_real, n_z)``, a :class:`TracerStack`
+            with one tracer per distribution is returned.
         has_shear (:obj:`bool`): set to ``False`` if you want to omit the
             lensing shear contribution from this tracer.
         ia_bias (:obj:`tuple`): A tuple of arrays
@@ -940,30 +1308,20 @@ def WeakLensingTracer(cosmo, *, dndz, has_shear=True, ia_bias=None,
             The kernel is quite smooth, so usually O(100) samples
             is enough.
     """
-    tracer = NzTracer()
-
     # we need the distance functions at the C layer
     cosmo.compute_distances()
 
     z_n, n = _check_array_params(dndz, 'dndz')
-    with UnlockInstance(tracer, mutate=False):
-        tracer._dndz = interp1d(z_n, n, bounds_error=False, fill_value=0)
 
+    if (not has_shear) and (ia_bias is None):
+        raise ValueError("Weak lensing tracers with no shear must "
+                         "have a non-zero intrinsic alignment amplitude.")
+
+    kernel_l = None
     if has_shear:
         kernel_l = get_lensing_kernel(cosmo, dndz=dndz, n_chi=n_samples)
-        if (cosmo['sigma_0'] == 0):
-            # GR case
-            tracer.add_tracer(cosmo, kernel=kernel_l,
-                              der_bessel=-1, der_angles=2)
-        else:
-            # MG case
-            tracer._MG_add_tracer(cosmo, kernel_l, z_n,
-                                  der_bessel=-1, der_angles=2)
-    else:
-        if ia_bias is None:
-            raise ValueError("Weak lensing tracers with no shear must "
-                             "have a non-zero intrinsic alignment amplitude.")
 
+    kernel_i = t_ia = None
     if ia_bias is not None:  # Has intrinsic alignments
         z_a, tmp_a = _check_array_params(ia_bias, 'ia_bias')
         # Kernel
@@ -982,9 +1340,40 @@ def WeakLensingTracer(cosmo, *, dndz, has_shear=True, ia_bias=None,
             # already applied to the power spectrum.
             a = tmp_a
         # Reverse order for increasing a
-        t_a = (1./(1+z_a[::-1]), a[::-1])
-        tracer.add_tracer(cosmo, kernel=kernel_i, transfer_a=t_a,
+        t_ia = (1./(1+z_a[::-1]), a[::-1])
+
+    if n.ndim == 2:
+        return TracerStack([
+            _weak_lensing_tracer(cosmo, z_n, n_r, kernel_l_r, kernel_i_r,
+                                 t_ia, n_samples)
+            for n_r, kernel_l_r, kernel_i_r in zip(
+                n, _stack_kernels(kernel_l, len(n)),
+                _stack_kernels(kernel_i, len(n)))])
+    return _weak_lensing_tracer(cosmo, z_n, n, kernel_l, kernel_i, t_ia,
+                                n_samples)
+
+
+def _weak_lensing_tracer(cosmo, z_n, n, kernel_l, kernel_i, t_ia, n_samples):
+    # Assemble a weak lensing tracer from its precomputed kernels and
+    # intrinsic alignment transfer function.
+    tracer = NzTracer()
+    kernels = []
+
+    if kernel_l is not None:
+        kernels.append(("lensing", 1))
+        if (cosmo['sigma_0'] == 0):
+            # GR case
+            tracer.add_tracer(cosmo, kernel=kernel_l,
+                              der_bessel=-1, der_angles=2)
+        else:
+            # MG case
+            tracer._MG_add_tracer(cosmo, kernel_l, z_n,
+                                  der_bessel=-1, der_angles=2)
+    if kernel_i is not None:
+        tracer.add_tracer(cosmo, kernel=kernel_i, transfer_a=t_ia,
                           der_bessel=-1, der_angles=2)
+        kernels.append(("density", 1))
+    tracer._store_nz(z_n, n, kernels, n_chi=n_samples)
     return tracer
 
 
@@ -5,6 +5,7 @@
 
 #include <gsl/gsl_errno.h>
 #include <gsl/gsl_integration.h>
+#include <gsl/gsl_blas.h>
 
 #include "ccl.h"
 
@@ -262,6 +263,159 @@ static void integ_cls_limber_qag_quad(ccl_cosmology *cosmo,
     *status = gslstatus;
 }
 
+// Distinct tracer collections in trc, stored in trc_u, and the index in
+// trc_u of each element of trc. Returns the number of distinct collections.
+static int unique_tracer_collections(int n, ccl_cl_tracer_collection_t **trc,
+                                     ccl_cl_tracer_collection_t **trc_u,
+                                     int *ind) {
+  int i, iu, n_u = 0;
+  for(i=0; i<n; i++) {
+    for(iu=0; iu<n_u; iu++) {
+      if(trc_u[iu] == trc[i])
+        break;
+    }
+    if(iu == n_u)
+      trc_u[n_u++] = trc[i];
+    ind[i] = iu;
+  }
+  return n_u;
+}
+
+// Limber integrals for many pairs of tracers at a single multipole, as
+// weighted dot products on a common k grid (Simpson's rule in log k).
+// The radial transfers of the distinct collections on each side of the
+// pairs are tabulated once, and the power spectrum once per wavenumber.
+// If the pairs cover a large fraction of all combinations of distinct
+// collections, the integrals follow from a single n1 x n2 matrix product.
+// Otherwise, they are computed pair by pair.
+static void integ_cls_limber_matrix(ccl_cosmology *cosmo, double l,
+                                    int n_pairs,
+                                    ccl_cl_tracer_collection_t **trc1,
+                                    ccl_cl_tracer_collection_t **trc2,
+                                    ccl_f2d_t *psp, double *result,
+                                    int *status) {
+  int ip, ik, iu, ju;
+  double lkmin = 1E15, lkmax = -1E15;
+  for(ip=0; ip<n_pairs; ip++) {
+    double lkmin_p, lkmax_p;
+    get_k_interval(cosmo, trc1[ip], trc2[ip], l, &lkmin_p, &lkmax_p);
+    lkmin = fmin(lkmin, lkmin_p);
+    lkmax = fmax(lkmax, lkmax_p);
+  }
+
+  // Simpson's rule needs an odd number of points.
+  int nk = (int)(fmax((lkmax - lkmin) / cosmo->spline_params.DLOGK_INTEGRATION + 0.5,
+		      1))+1;
+  if(nk % 2 == 0)
+    nk++;
+
+  // Distinct tracer collections on each side, and their indices for
+  // each pair.
+  int n1 = 0, n2 = 0, use_matrix = 0;
+  int *i1 = NULL, *i2 = NULL, *i12 = NULL, *i21 = NULL;
+  ccl_cl_tracer_collection_t **trc_u1 = NULL, **trc_u2 = NULL;
+  double *lk_arr = NULL, *dw1_arr = NULL, *d2_arr = NULL, *m_arr = NULL;
+  i1 = malloc(4 * n_pairs * sizeof(int));
+  trc_u1 = malloc(2 * n_pairs * sizeof(ccl_cl_tracer_collection_t *));
+  if((i1 == NULL) || (trc_u1 == NULL))
+    *status = CCL_ERROR_MEMORY;
+
+  if(*status == 0) {
+    i2 = i1 + n_pairs;
+    i12 = i2 + n_pairs;
+    i21 = i12 + n_pairs;
+    trc_u2 = trc_u1 + n_pairs;
+    n1 = unique_tracer_collections(n_pairs, trc1, trc_u1, i1);
+    n2 = unique_tracer_collections(n_pairs, trc2, trc_u2, i2);
+    // Collections on both sides are only tabulated once.
+    for(iu=0; iu<n1; iu++)
+      i12[iu] = -1;
+    for(ju=0; ju<n2; ju++) {
+      i21[ju] = -1;
+      for(iu=0; iu<n1; iu++) {
+        if(trc_u1[iu] == trc_u2[ju]) {
+          i12[iu] = ju;
+          i21[ju] = iu;
+          break;
+        }
+      }
+    }
+    use_matrix = 2 * n_pairs >= n1 * n2;
+
+    lk_arr = ccl_linear_spacing(lkmin, lkmax, nk);
+    if(lk_arr == NULL)
+      *status = CCL_ERROR_LOGSPACE;
+  }
+
+  if(*status == 0) {
+    dw1_arr = malloc(n1 * nk * sizeof(double));
+    d2_arr = malloc(n2 * nk * sizeof(double));
+    if(use_matrix)
+      m_arr = malloc(n1 * n2 * sizeof(double));
+    if((dw1_arr == NULL) || (d2_arr == NULL) ||
+       (use_matrix && (m_arr == NULL)))
+      *status = CCL_ERROR_MEMORY;
+  }
+
+  if(*status == 0) {
+    double dlk = (lkmax - lkmin) / (nk - 1);
+    for(ik=0; ik<nk; ik++) {
+      double lk = lk_arr[ik];
+      double k = exp(lk);
+      double chi = (l+0.5)/k;
+      double a = ccl_scale_factor_of_chi(cosmo, chi, status);
+      double pk = ccl_f2d_t_eval(psp, lk, a, cosmo, status);
+      double w = ((ik == 0) || (ik == nk-1)) ? 1 : ((ik % 2) ? 4 : 2);
+      w *= dlk * k * pk / 3;
+
+      for(iu=0; iu<n1; iu++) {
+        double d = transfer_limber_wrap(l, lk, k, chi, a, trc_u1[iu],
+                                        cosmo, psp, 0, status);
+        dw1_arr[iu*nk+ik] = d*w;
+        if(i12[iu] >= 0)
+          d2_arr[i12[iu]*nk+ik] = d;
+      }
+      for(ju=0; ju<n2; ju++) {
+        if(i21[ju] < 0)
+          d2_arr[ju*nk+ik] = transfer_limber_wrap(l, lk, k, chi, a,
+                                                  trc_u2[ju], cosmo, psp,
+                                                  0, status);
+      }
+      if(*status)
+        break;
+    }
+  }
+
+  if((*status == 0) && use_matrix) {
+    gsl_matrix_view dw1_mat = gsl_matrix_view_array(dw1_arr, n1, nk);
+    gsl_matrix_view d2_mat = gsl_matrix_view_array(d2_arr, n2, nk);
+    gsl_matrix_view m_mat = gsl_matrix_view_array(m_arr, n1, n2);
+    *status = gsl_blas_dgemm(CblasNoTrans, CblasTrans, 1.0,
+                             &dw1_mat.matrix, &d2_mat.matrix,
+                             0.0, &m_mat.matrix);
+    if(*status == 0) {
+      for(ip=0; ip<n_pairs; ip++)
+        result[ip] = m_arr[i1[ip]*n2 + i2[ip]];
+    }
+  }
+  else if(*status == 0) {
+    for(ip=0; ip<n_pairs; ip++) {
+      double *dw1 = &(dw1_arr[i1[ip]*nk]);
+      double *d2 = &(d2_arr[i2[ip]*nk]);
+      result[ip] = 0;
+      for(ik=0; ik<nk; ik++)
+        result[ip] += dw1[ik]*d2[ik];
+    }
+  }
+
+  free(m_arr);
+  free(d2_arr);
+  free(dw1_arr);
+  free(lk_arr);
+  free(trc_u1);
+  free(i1);
+}
+
 void ccl_angular_cls_limber(ccl_cosmology *cosmo,
 			    ccl_cl_tracer_collection_t *trc1,
 			    ccl_cl_tracer_collection_t *trc2,
@@ -333,6 +487,10 @@ void ccl_angular_cls_limber(ccl_cosmology *cosmo,
 	  integ_cls_limber_spline(cosmo, &ipar, lkmin, lkmax,
 				  &result, &local_status);
 	}
+	else if(integration_method == ccl_integration_matrix) {
+	  integ_cls_limber_matrix(cosmo, l, 1, &trc1, &trc2, psp,
+				  &result, &local_status);
+	}
 	else
 	  local_status = CCL_ERROR_NOT_IMPLEMENTED;
 
@@ -362,6 +520,265 @@ void ccl_angular_cls_limber(ccl_cosmology *cosmo,
   }
 }
 
+// Limber integrals for many pairs of tracers at a single multipole, using
+// a common k grid covering the supports of all tracers. The power spectrum
+// and the scale factors are evaluated once per wavenumber, and the radial
+// transfers once per distinct tracer collection.
+static void integ_cls_limber_spline_multi(ccl_cosmology *cosmo, double l,
+                                          int n_pairs,
+                                          ccl_cl_tracer_collection_t **trc1,
+                                          ccl_cl_tracer_collection_t **trc2,
+                                          ccl_f2d_t *psp, double *result,
+                                          int *status) {
+  int ip, ik;
+  double lkmin = 1E15, lkmax = -1E15;
+  for(ip=0; ip<n_pairs; ip++) {
+    double lkmin_p, lkmax_p;
+    get_k_interval(cosmo, trc1[ip], trc2[ip], l, &lkmin_p, &lkmax_p);
+    lkmin = fmin(lkmin, lkmin_p);
+    lkmax = fmax(lkmax, lkmax_p);
+  }
+
+  int nk = (int)(fmax((lkmax - lkmin) / cosmo->spline_params.DLOGK_INTEGRATION + 0.5,
+		      1))+1;
+  double *lk_arr = NULL;
+  double *fk_data = NULL;
+  double **fk_arr = NULL;
+  lk_arr = ccl_linear_spacing(lkmin, lkmax, nk);
+  if(lk_arr == NULL)
+    *status = CCL_ERROR_LOGSPACE;
+
+  if(*status == 0) {
+    fk_data = malloc(n_pairs * nk * sizeof(double));
+    fk_arr = malloc(n_pairs * sizeof(double *));
+    if((fk_data == NULL) || (fk_arr == NULL))
+      *status = CCL_ERROR_MEMORY;
+  }
+
+  if(*status == 0) {
+    for(ip=0; ip<n_pairs; ip++)
+      fk_arr[ip] = fk_data + ip*nk;
+
+    for(ik=0; ik<nk; ik++) {
+      double lk = lk_arr[ik];
+      double k = exp(lk);
+      double chi = (l+0.5)/k;
+      double a = ccl_scale_factor_of_chi(cosmo, chi, status);
+      double pk = ccl_f2d_t_eval(psp, lk, a, cosmo, status);
+      double d1 = 0, d2 = 0;
+
+      for(ip=0; ip<n_pairs; ip++) {
+        // Reuse the transfers of the previous pair when the collections
+        // are the same (e.g. a stack crossed with a single tracer).
+        if((ip == 0) || (trc1[ip] != trc1[ip-1]))
+          d1 = transfer_limber_wrap(l, lk, k, chi, a, trc1[ip],
+                                    cosmo, psp, 0, status);
+        if(trc2[ip] == trc1[ip])
+          d2 = d1;
+        else if((ip == 0) || (trc2[ip] != trc2[ip-1]))
+          d2 = transfer_limber_wrap(l, lk, k, chi, a, trc2[ip],
+                                    cosmo, psp, 0, status);
+        fk_arr[ip][ik] = k*pk*d1*d2;
+      }
+      if(*status)
+        break;
+    }
+  }
+
+  if(*status == 0) {
+    ccl_integ_spline(n_pairs, nk, lk_arr, fk_arr,
+                     1, -1, result, gsl_interp_akima,
+                     status);
+  }
+  free(fk_arr);
+  free(fk_data);
+  free(lk_arr);
+}
+
+void ccl_angular_cls_limber_multi(ccl_cosmology *cosmo,
+				  int n_pairs,
+				  ccl_cl_tracer_collection_t **trc1,
+				  ccl_cl_tracer_collection_t **trc2,
+				  ccl_f2d_t *psp,
+				  int nl_out, double *l_out, double *cl_out,
+				  ccl_integration_t integration_method,
+				  int *status) {
+  int ip;
+
+  // make sure to init core things for safety
+  if (!cosmo->computed_distances) {
+    *status = CCL_ERROR_DISTANCES_INIT;
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_cls.c: ccl_angular_cls_limber_multi(): distance splines have not been precomputed!");
+    return;
+  }
+
+  if(integration_method == ccl_integration_qag_quad) {
+    // Adaptive integrals can't share their evaluation points.
+    for(ip=0; ip<n_pairs; ip++) {
+      ccl_angular_cls_limber(cosmo, trc1[ip], trc2[ip], psp,
+                             nl_out, l_out, cl_out+ip*nl_out,
+                             integration_method, status);
+      if(*status)
+        return;
+    }
+    return;
+  }
+  else if((integration_method != ccl_integration_spline) &&
+          (integration_method != ccl_integration_matrix)) {
+    *status = CCL_ERROR_NOT_IMPLEMENTED;
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_cls.c: ccl_angular_cls_limber_multi(): unknown integration method\n");
+    return;
+  }
+
+  #pragma omp parallel shared(cosmo, n_pairs, trc1, trc2, l_out, cl_out, \
+                              nl_out, status, psp, integration_method) \
+                       default(none)
+  {
+    int lind, ipair;
+    int local_status = *status;
+    double *result = malloc(n_pairs * sizeof(double));
+    if(result == NULL)
+      local_status = CCL_ERROR_MEMORY;
+
+    #pragma omp for schedule(dynamic)
+    for (lind=0; lind < nl_out; ++lind) {
+      if (local_status == 0) {
+        double l = l_out[lind];
+        if(integration_method == ccl_integration_matrix)
+          integ_cls_limber_matrix(cosmo, l, n_pairs, trc1, trc2, psp,
+                                  result, &local_status);
+        else
+          integ_cls_limber_spline_multi(cosmo, l, n_pairs, trc1, trc2, psp,
+                                        result, &local_status);
+        for(ipair=0; ipair < n_pairs; ipair++) {
+          if (local_status == 0)
+            cl_out[ipair*nl_out+lind] = result[ipair] / (l+0.5);
+          else
+            cl_out[ipair*nl_out+lind] = NAN;
+        }
+        if (local_status) {
+          ccl_raise_gsl_warning(local_status, "ccl_cls.c: ccl_angular_cls_limber_multi():");
+          local_status = CCL_ERROR_INTEG;
+        }
+      }
+    }
+
+    free(result);
+
+    if (local_status) {
+      #pragma omp atomic write
+      *status = local_status;
+    }
+  }
+
+  if (*status) {
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_cls.c: ccl_angular_cls_limber_multi(); integration error\n");
+  }
+}
+
+// Single-tracer collections holding copies of all the tracers in trc
+// with amplitudes z^p, p=0,...,n_coeffs-1. The copies share the kernel and
+// transfer splines of the original tracers, and must not be freed with
+// ccl_cl_tracer_t_free.
+static ccl_cl_tracer_collection_t *get_monomial_collections(
+  ccl_cl_tracer_collection_t *trc, int n_coeffs,
+  ccl_cl_tracer_t **trs, ccl_cl_tracer_t ***ptrs, int *status) {
+  int n = trc->n_tracers * n_coeffs;
+  ccl_cl_tracer_collection_t *clts = NULL;
+
+  *trs = malloc(n * sizeof(ccl_cl_tracer_t));
+  *ptrs = malloc(n * sizeof(ccl_cl_tracer_t *));
+  clts = malloc(n * sizeof(ccl_cl_tracer_collection_t));
+  if ((*trs == NULL) || (*ptrs == NULL) || (clts == NULL)) {
+    *status = CCL_ERROR_MEMORY;
+    return clts;
+  }
+
+  for (int itr=0; itr < trc->n_tracers; itr++) {
+    for (int ip=0; ip < n_coeffs; ip++) {
+      int ii = itr*n_coeffs + ip;
+      (*trs)[ii] = *(trc->ts[itr]);
+      (*trs)[ii].n_amplitude = ip+1;
+      for (int iq=0; iq <= ip; iq++)
+        (*trs)[ii].amplitude[iq] = (iq == ip) ? 1 : 0;
+      (*ptrs)[ii] = &((*trs)[ii]);
+      clts[ii].n_tracers = 1;
+      clts[ii].ts = &((*ptrs)[ii]);
+    }
+  }
+  return clts;
+}
+
+void ccl_angular_cls_limber_templates(ccl_cosmology *cosmo,
+				      ccl_cl_tracer_collection_t *trc1,
+				      ccl_cl_tracer_collection_t *trc2,
+				      int n_coeffs,
+				      ccl_f2d_t *psp,
+				      int nl_out, double *l_out, double *cl_out,
+				      ccl_integration_t integration_method,
+				      int *status) {
+  ccl_cl_tracer_t *trs1 = NULL, *trs2 = NULL;
+  ccl_cl_tracer_t **ptrs1 = NULL, **ptrs2 = NULL;
+  ccl_cl_tracer_collection_t *clts1 = NULL, *clts2 = NULL;
+  ccl_cl_tracer_collection_t **pairs1 = NULL, **pairs2 = NULL;
+  int n1 = trc1->n_tracers * n_coeffs;
+  int n2 = trc2->n_tracers * n_coeffs;
+
+  if ((n_coeffs < 1) || (n_coeffs > CCL_MAX_TRACER_AMPLITUDE_COEFFS)) {
+    *status = CCL_ERROR_INCONSISTENT;
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_cls.c: ccl_angular_cls_limber_templates(): "
+      "n_coeffs must be between 1 and %d\n", CCL_MAX_TRACER_AMPLITUDE_COEFFS);
+    return;
+  }
+  if ((n1 == 0) || (n2 == 0))
+    return;
+
+  clts1 = get_monomial_collections(trc1, n_coeffs, &trs1, &ptrs1, status);
+  if (*status == 0)
+    clts2 = get_monomial_collections(trc2, n_coeffs, &trs2, &ptrs2, status);
+
+  if (*status == 0) {
+    pairs1 = malloc(n1 * n2 * sizeof(ccl_cl_tracer_collection_t *));
+    pairs2 = malloc(n1 * n2 * sizeof(ccl_cl_tracer_collection_t *));
+    if ((pairs1 == NULL) || (pairs2 == NULL))
+      *status = CCL_ERROR_MEMORY;
+  }
+
+  if (*status == 0) {
+    for (int i1=0; i1 < n1; i1++) {
+      for (int i2=0; i2 < n2; i2++) {
+        pairs1[i1*n2+i2] = &(clts1[i1]);
+        pairs2[i1*n2+i2] = &(clts2[i2]);
+      }
+    }
+    ccl_angular_cls_limber_multi(cosmo, n1*n2, pairs1, pairs2, psp,
+                                 nl_out, l_out, cl_out,
+                                 integration_method, status);
+  }
+  else {
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_cls.c: ccl_angular_cls_limber_templates(): out of memory\n");
+  }
+
+  free(pairs1);
+  free(pairs2);
+  free(clts1);
+  free(clts2);
+  free(ptrs1);
+  free(ptrs2);
+  free(trs1);
+  free(trs2);
+}
+
 void ccl_angular_cls_nonlimber(ccl_cosmology *cosmo,
                                ccl_cl_tracer_collection_t *trc1,
                                ccl_cl_tracer_collection_t *trc2,
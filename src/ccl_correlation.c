@@ -38,127 +38,203 @@ static int taper_cl(int n_ell,double *ell,double *cl, double *ell_limits)
   return 0;
 }
 
+/*--------ROUTINE: corr_i_bessel ------
+TASK: Order of the Bessel function associated with a correlation type
+ */
+static int corr_i_bessel(int corr_type)
+{
+  switch(corr_type) {
+    case CCL_CORR_GL:
+      return 2;
+    case CCL_CORR_LM:
+      return 4;
+    default:
+      return 0;
+  }
+}
+
+/*--------ROUTINE: corr_bin_average ------
+TASK: Average a correlation function over angular bins, weighting by solid
+      angle, by integrating its spline. Outside the sampled angles the
+      correlation function is held constant, as done when interpolating it.
+INPUT: number of samples, angles (in radians), correlation function at those
+       angles, number of bins, n_bins+1 bin edges (in degrees), output array.
+ */
+static int corr_bin_average(int n,double *th_arr,double *wth_arr,
+                            int n_bins,double *theta_edges,double *wth_out)
+{
+  int i,status=0;
+  double *y=malloc(n*sizeof(double));
+  gsl_spline *spl=gsl_spline_alloc(gsl_interp_akima,n);
+  gsl_interp_accel *ia=gsl_interp_accel_alloc();
+
+  if((y==NULL) || (spl==NULL) || (ia==NULL))
+    status=CCL_ERROR_MEMORY;
+
+  if(status==0) {
+    for(i=0;i<n;i++)
+      y[i]=sin(th_arr[i])*wth_arr[i];
+    if(gsl_spline_init(spl,th_arr,y,n))
+      status=CCL_ERROR_SPLINE;
+  }
+
+  for(i=0;i<n_bins;i++) {
+    if(status)
+      break;
+    double th_lo=theta_edges[i]*M_PI/180.;
+    double th_hi=theta_edges[i+1]*M_PI/180.;
+    double th_lo_in=fmax(th_lo,th_arr[0]);
+    double th_hi_in=fmin(th_hi,th_arr[n-1]);
+    double integ=0;
+    if(th_lo<th_arr[0])
+      integ+=wth_arr[0]*(cos(th_lo)-cos(fmin(th_hi,th_arr[0])));
+    if(th_hi>th_arr[n-1])
+      integ+=wth_arr[n-1]*(cos(fmax(th_lo,th_arr[n-1]))-cos(th_hi));
+    if(th_lo_in<th_hi_in) {
+      double integ_in=0;
+      if(gsl_spline_eval_integ_e(spl,th_lo_in,th_hi_in,ia,&integ_in))
+        status=CCL_ERROR_SPLINE_EV;
+      integ+=integ_in;
+    }
+    wth_out[i]=integ/(cos(th_lo)-cos(th_hi));
+  }
+
+  free(y);
+  gsl_spline_free(spl);
+  gsl_interp_accel_free(ia);
+  return status;
+}
+
 /*--------ROUTINE: ccl_tracer_corr_fftlog ------
-TASK: For a given tracer, get the correlation function
-      Following function takes a function to calculate angular cl as well.
-      By default above function will call it using ccl_angular_cl
-INPUT: type of tracer, number of theta values to evaluate = NL, theta vector
+TASK: For a set of power spectra, get the correlation functions.
+      Spectra with the same Bessel order are transformed together,
+      sharing the same FFTLog set-up.
+INPUT: number of ell values, ell vector, number of spectra, n_cl*n_ell C_ell
+       array, correlation type of each spectrum, number of theta values,
+       theta vector, n_cl*n_out output array, key for tapering, limits of
+       tapering, key for binning. If binned, theta holds the n_theta bin
+       edges and the n_out=n_theta-1 bin averages are returned. Otherwise,
+       n_out=n_theta.
  */
 static void ccl_tracer_corr_fftlog(ccl_cosmology *cosmo,
-                                   int n_ell,double *ell,double *cls,
+                                   int n_ell,double *ell,
+                                   int n_cl,double *cls,int *corr_types,
                                    int n_theta,double *theta,double *wtheta,
-                                   int corr_type,int do_taper_cl,double *taper_cl_limits,
-                                   int *status) {
-  int i;
-  double *l_arr,*cl_arr,*th_arr,*wth_arr;
-
-  l_arr=ccl_log_spacing(cosmo->spline_params.ELL_MIN_CORR,cosmo->spline_params.ELL_MAX_CORR,cosmo->spline_params.N_ELL_CORR);
-  if(l_arr==NULL) {
-    *status=CCL_ERROR_LINSPACE;
-    ccl_cosmology_set_status_message(cosmo, "ccl_correlation.c: ccl_tracer_corr_fftlog(): ran out of memory\n");
-    return;
-  }
-  cl_arr=malloc(cosmo->spline_params.N_ELL_CORR*sizeof(double));
-  if(cl_arr==NULL) {
-    free(l_arr);
+                                   int do_taper_cl,double *taper_cl_limits,
+                                   int binned,int *status) {
+  int i,ic,ib,ng;
+  int N=cosmo->spline_params.N_ELL_CORR;
+  int n_out=binned ? n_theta-1 : n_theta;
+  int i_bessels[3]={0,2,4};
+  int *ic_group=NULL;
+  double *l_arr=NULL,*cl_arr=NULL,*th_arr=NULL,*wth_arr=NULL;
+  double **cl_group=NULL,**wth_group=NULL;
+
+  l_arr=ccl_log_spacing(cosmo->spline_params.ELL_MIN_CORR,cosmo->spline_params.ELL_MAX_CORR,N);
+  cl_arr=malloc(n_cl*N*sizeof(double));
+  th_arr=malloc(N*sizeof(double));
+  wth_arr=malloc(n_cl*N*sizeof(double));
+  cl_group=malloc(n_cl*sizeof(double *));
+  wth_group=malloc(n_cl*sizeof(double *));
+  ic_group=malloc(n_cl*sizeof(int));
+  if((l_arr==NULL) || (cl_arr==NULL) || (th_arr==NULL) || (wth_arr==NULL) ||
+     (cl_group==NULL) || (wth_group==NULL) || (ic_group==NULL)) {
     *status=CCL_ERROR_MEMORY;
     ccl_cosmology_set_status_message(cosmo, "ccl_correlation.c: ccl_tracer_corr_fftlog(): ran out of memory\n");
-    return;
   }
 
-  //Interpolate input Cl into array needed for FFTLog
-  ccl_f1d_t *cl_spl=ccl_f1d_t_new(n_ell,ell,cls,cls[0],0,
-				  ccl_f1d_extrap_const,
-				  ccl_f1d_extrap_logx_logy,
-				  status);
-  if (*status) {
-    free(l_arr);
-    free(cl_arr);
-    ccl_cosmology_set_status_message(cosmo,
-                                     "ccl_correlation.c: ccl_tracer_corr_fftlog(): "
-                                     "failed to create spline\n");
-    if (cl_spl) ccl_f1d_t_free(cl_spl);
-    return;
-  }
+  //Interpolate input Cls into arrays needed for FFTLog
+  for(ic=0;ic<n_cl;ic++) {
+    if(*status)
+      break;
+    double *cl=&(cls[ic*n_ell]);
+    double *cl_out=&(cl_arr[ic*N]);
+    ccl_f1d_t *cl_spl=ccl_f1d_t_new(n_ell,ell,cl,cl[0],0,
+                                    ccl_f1d_extrap_const,
+                                    ccl_f1d_extrap_logx_logy,
+                                    status);
+    if((cl_spl==NULL) || (*status)) {
+      if(*status==0)
+        *status=CCL_ERROR_MEMORY;
+      ccl_cosmology_set_status_message(cosmo,
+                                       "ccl_correlation.c: ccl_tracer_corr_fftlog(): "
+                                       "failed to create spline\n");
+      if (cl_spl) ccl_f1d_t_free(cl_spl);
+      break;
+    }
 
-  if(cl_spl==NULL) {
-    free(l_arr);
-    free(cl_arr);
-    *status=CCL_ERROR_MEMORY;
-    ccl_cosmology_set_status_message(cosmo,
-				     "ccl_correlation.c: ccl_tracer_corr_fftlog(): "
-				     "ran out of memory\n");
-    return;
+    for(i=0;i<N;i++)
+      cl_out[i]=ccl_f1d_t_eval(cl_spl,l_arr[i]);
+    ccl_f1d_t_free(cl_spl);
+
+    if (do_taper_cl)
+      taper_cl(N,l_arr,cl_out,taper_cl_limits);
   }
 
-  for(i=0;i<cosmo->spline_params.N_ELL_CORR;i++)
-    cl_arr[i]=ccl_f1d_t_eval(cl_spl,l_arr[i]);
-  ccl_f1d_t_free(cl_spl);
+  for(ib=0;ib<3;ib++) {
+    if(*status)
+      break;
+
+    // Group all spectra with the same Bessel order
+    ng=0;
+    for(ic=0;ic<n_cl;ic++) {
+      if(corr_i_bessel(corr_types[ic])==i_bessels[ib]) {
+        cl_group[ng]=&(cl_arr[ic*N]);
+        wth_group[ng]=&(wth_arr[ic*N]);
+        ic_group[ng]=ic;
+        ng++;
+      }
+    }
+    if(ng==0)
+      continue;
 
-  if (do_taper_cl)
-    taper_cl(cosmo->spline_params.N_ELL_CORR,l_arr,cl_arr,taper_cl_limits);
+    for(i=0;i<N;i++)
+      th_arr[i]=0;
+    //Although set here to 0, theta is modified by FFTlog to obtain the correlation at ~1/l
 
-  th_arr=malloc(sizeof(double)*cosmo->spline_params.N_ELL_CORR);
-  if(th_arr==NULL) {
-    free(l_arr);
-    free(cl_arr);
-    *status=CCL_ERROR_MEMORY;
-    ccl_cosmology_set_status_message(cosmo,
-                                     "ccl_correlation.c: ccl_tracer_corr_fftlog(): "
-                                     "ran out of memory\n");
-    return;
-  }
-  wth_arr=(double *)malloc(sizeof(double)*cosmo->spline_params.N_ELL_CORR);
-  if(wth_arr==NULL) {
-    free(l_arr);
-    free(cl_arr);
-    free(th_arr);
-    *status=CCL_ERROR_MEMORY;
-    ccl_cosmology_set_status_message(cosmo,
-                                     "ccl_correlation.c: ccl_tracer_corr_fftlog(): "
-                                     "ran out of memory\n");
-    return;
-  }
+    ccl_fftlog_ComputeXi2D(i_bessels[ib],0,
+                           ng,N,l_arr,cl_group,
+                           th_arr,wth_group,status);
 
-  for(i=0;i<cosmo->spline_params.N_ELL_CORR;i++)
-    th_arr[i]=0;
-  //Although set here to 0, theta is modified by FFTlog to obtain the correlation at ~1/l
-
-  int i_bessel=0;
-  if(corr_type==CCL_CORR_GG) i_bessel=0;
-  if(corr_type==CCL_CORR_GL) i_bessel=2;
-  if(corr_type==CCL_CORR_LP) i_bessel=0;
-  if(corr_type==CCL_CORR_LM) i_bessel=4;
-  ccl_fftlog_ComputeXi2D(i_bessel,0,
-			 1, cosmo->spline_params.N_ELL_CORR,l_arr,&cl_arr,
-			 th_arr,&wth_arr, status);
-
-  // Interpolate to output values of theta
-  ccl_f1d_t *wth_spl=ccl_f1d_t_new(cosmo->spline_params.N_ELL_CORR,th_arr,
-				   wth_arr,wth_arr[0],0,
-				   ccl_f1d_extrap_const,
-				   ccl_f1d_extrap_const, status);
-  if (wth_spl == NULL) {
-    free(l_arr);
-    free(cl_arr);
-    free(th_arr);
-    free(wth_arr);
-    *status = CCL_ERROR_MEMORY;
-    ccl_cosmology_set_status_message(cosmo,
-                                     "ccl_correlation.c: ccl_tracer_corr_fftlog(): "
-                                     "ran out of memory\n");
-    return;
+    // Interpolate to output values of theta
+    for(i=0;i<ng;i++) {
+      if(*status)
+        break;
+      double *wth_out=&(wtheta[ic_group[i]*n_out]);
+      if(binned) {
+        *status=corr_bin_average(N,th_arr,wth_group[i],
+                                 n_out,theta,wth_out);
+        if(*status) {
+          ccl_cosmology_set_status_message(cosmo,
+                                           "ccl_correlation.c: ccl_tracer_corr_fftlog(): "
+                                           "failed to average over angular bins\n");
+        }
+        continue;
+      }
+      ccl_f1d_t *wth_spl=ccl_f1d_t_new(N,th_arr,
+                                       wth_group[i],wth_group[i][0],0,
+                                       ccl_f1d_extrap_const,
+                                       ccl_f1d_extrap_const, status);
+      if (wth_spl == NULL) {
+        *status = CCL_ERROR_MEMORY;
+        ccl_cosmology_set_status_message(cosmo,
+                                         "ccl_correlation.c: ccl_tracer_corr_fftlog(): "
+                                         "ran out of memory\n");
+        break;
+      }
+      for(int j=0;j<n_theta;j++)
+        wth_out[j]=ccl_f1d_t_eval(wth_spl,theta[j]*M_PI/180.);
+      ccl_f1d_t_free(wth_spl);
+    }
   }
-  for(i=0;i<n_theta;i++)
-    wtheta[i]=ccl_f1d_t_eval(wth_spl,theta[i]*M_PI/180.);
-  ccl_f1d_t_free(wth_spl);
 
   free(l_arr);
   free(cl_arr);
   free(th_arr);
   free(wth_arr);
-
-  return;
+  free(cl_group);
+  free(wth_group);
+  free(ic_group);
 }
 
 typedef struct {
@@ -292,82 +368,114 @@ static void ccl_compute_legendre_polynomial(int corr_type,double theta,int ell_m
   }
 }
 
-/*--------ROUTINE: ccl_tracer_corr_legendre ------
-TASK: Compute correlation function via Legendre polynomials
-INPUT: cosmology, number of theta bins, theta array, tracer 1, tracer 2, i_bessel, boolean
-       for tapering, vector of tapering limits, correlation vector, angular_cl function.
+/*--------ROUTINE: corr_legendre_cls ------
+TASK: Resample a set of power spectra at all integer multipoles up to ell_max
+INPUT: cosmology, number of ell values, ell vector, number of spectra,
+       n_cl*n_ell C_ell array, maximum multipole, boolean for tapering,
+       vector of tapering limits. Returns a n_cl*(ell_max+1) array.
  */
-static void ccl_tracer_corr_legendre(ccl_cosmology *cosmo,
-                                     int n_ell,double *ell,double *cls,
-                                     int n_theta,double *theta,double *wtheta,
-                                     int corr_type,int do_taper_cl,double *taper_cl_limits,
-                                     int *status) {
-  int i;
-  double *l_arr = NULL, *cl_arr = NULL, *Pl_theta = NULL;
+static double *corr_legendre_cls(ccl_cosmology *cosmo,
+                                 int n_ell,double *ell,
+                                 int n_cl,double *cls,int ell_max,
+                                 int do_taper_cl,double *taper_cl_limits,
+                                 int *status) {
+  int i, ic;
+  double *l_arr = NULL, *cl_arr = NULL;
   ccl_f1d_t *cl_spl;
 
-  if(corr_type==CCL_CORR_LM || corr_type==CCL_CORR_LP){
-    *status=CCL_ERROR_NOT_IMPLEMENTED;
+  l_arr=malloc((ell_max+1)*sizeof(double));
+  cl_arr=malloc(n_cl*(ell_max+1)*sizeof(double));
+  if((l_arr==NULL) || (cl_arr==NULL)) {
+    *status=CCL_ERROR_MEMORY;
     ccl_cosmology_set_status_message(cosmo,
-                                     "ccl_correlation.c: ccl_tracer_corr_legendre(): "
-                                     "CCL does not support full-sky xi+- calcuations.\nhttps://arxiv.org/abs/1702.05301 indicates flat-sky to be sufficient.\n");
+                                     "ccl_correlation.c: corr_legendre_cls(): "
+                                     "ran out of memory\n");
   }
 
   if(*status==0) {
-    l_arr=malloc(((int)(cosmo->spline_params.ELL_MAX_CORR)+1)*sizeof(double));
-    if(l_arr==NULL) {
-      *status=CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(cosmo,
-                                       "ccl_correlation.c: ccl_tracer_corr_legendre(): "
-                                       "ran out of memory\n");
-    }
+    for(i=0;i<=ell_max;i++)
+      l_arr[i]=(double)i;
   }
 
-  if(*status==0) {
-    cl_arr=malloc(((int)(cosmo->spline_params.ELL_MAX_CORR)+1)*sizeof(double));
-    if(cl_arr==NULL) {
-      *status=CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(cosmo,
-                                       "ccl_correlation.c: ccl_tracer_corr_legendre(): "
-                                       "ran out of memory\n");
-    }
-  }
+  for(ic=0;ic<n_cl;ic++) {
+    if(*status)
+      break;
+    double *cl=&(cls[ic*n_ell]);
+    double *cl_out=&(cl_arr[ic*(ell_max+1)]);
 
-  if(*status==0) {
     //Interpolate input Cl into
-    cl_spl=ccl_f1d_t_new(n_ell,ell,cls,cls[0],0,
+    cl_spl=ccl_f1d_t_new(n_ell,ell,cl,cl[0],0,
 			 ccl_f1d_extrap_const,
 			 ccl_f1d_extrap_logx_logy, status);
     if(cl_spl==NULL) {
       *status=CCL_ERROR_MEMORY;
       ccl_cosmology_set_status_message(cosmo,
-                                       "ccl_correlation.c: ccl_tracer_corr_legendre(): "
+                                       "ccl_correlation.c: corr_legendre_cls(): "
                                        "ran out of memory\n");
+      break;
     }
-  }
 
-  if(*status==0) {
-    for(i=0;i<=(int)(cosmo->spline_params.ELL_MAX_CORR);i++) {
-      double l=(double)i;
-      l_arr[i]=l;
-      cl_arr[i]=ccl_f1d_t_eval(cl_spl,l);
-    }
+    for(i=0;i<=ell_max;i++)
+      cl_out[i]=ccl_f1d_t_eval(cl_spl,l_arr[i]);
     ccl_f1d_t_free(cl_spl);
 
     if (do_taper_cl)
-      *status=taper_cl((int)(cosmo->spline_params.ELL_MAX_CORR)+1,l_arr,cl_arr,taper_cl_limits);
+      *status=taper_cl(ell_max+1,l_arr,cl_out,taper_cl_limits);
+  }
+
+  free(l_arr);
+  if(*status) {
+    free(cl_arr);
+    return NULL;
   }
+  return cl_arr;
+}
 
-  int local_status, i_L;
+/*--------ROUTINE: ccl_tracer_corr_legendre ------
+TASK: Compute correlation functions via Legendre polynomials for a set of
+      power spectra. The polynomials are computed once per angle and
+      correlation type, and shared by all spectra.
+INPUT: cosmology, number of ell values, ell vector, number of spectra,
+       n_cl*n_ell C_ell array, correlation type of each spectrum,
+       number of theta bins, theta array, n_cl*n_theta output array, boolean
+       for tapering, vector of tapering limits.
+ */
+static void ccl_tracer_corr_legendre(ccl_cosmology *cosmo,
+                                     int n_ell,double *ell,
+                                     int n_cl,double *cls,int *corr_types,
+                                     int n_theta,double *theta,double *wtheta,
+                                     int do_taper_cl,double *taper_cl_limits,
+                                     int *status) {
+  int ic;
+  int ell_max = (int)(cosmo->spline_params.ELL_MAX_CORR);
+  int corr_types_lgndre[2] = {CCL_CORR_GG, CCL_CORR_GL};
+  double *cl_arr = NULL, *Pl_theta = NULL;
+
+  for(ic=0;ic<n_cl;ic++) {
+    if(corr_types[ic]==CCL_CORR_LM || corr_types[ic]==CCL_CORR_LP){
+      *status=CCL_ERROR_NOT_IMPLEMENTED;
+      ccl_cosmology_set_status_message(cosmo,
+                                       "ccl_correlation.c: ccl_tracer_corr_legendre(): "
+                                       "CCL does not support full-sky xi+- calcuations.\nhttps://arxiv.org/abs/1702.05301 indicates flat-sky to be sufficient.\n");
+      break;
+    }
+  }
+
+  if(*status==0)
+    cl_arr=corr_legendre_cls(cosmo,n_ell,ell,n_cl,cls,ell_max,
+                             do_taper_cl,taper_cl_limits,status);
+
+  int local_status, i_L, it;
 #pragma omp parallel default(none) \
-                     shared(cosmo, theta, cl_arr, wtheta, n_theta, status, corr_type) \
-                     private(Pl_theta, i, i_L, local_status)
+                     shared(theta, cl_arr, wtheta, n_theta, n_cl, status, \
+                            corr_types, corr_types_lgndre, ell_max) \
+                     private(Pl_theta, ic, i_L, it, local_status)
   {
     Pl_theta = NULL;
     local_status = *status;
 
     if (local_status == 0) {
-      Pl_theta = malloc(sizeof(double)*((int)(cosmo->spline_params.ELL_MAX_CORR)+1));
+      Pl_theta = malloc(sizeof(double)*(ell_max+1));
       if (Pl_theta == NULL) {
         local_status = CCL_ERROR_MEMORY;
       }
@@ -376,11 +484,23 @@ static void ccl_tracer_corr_legendre(ccl_cosmology *cosmo,
     #pragma omp for schedule(dynamic)
     for (int i=0; i < n_theta; i++) {
       if (local_status == 0) {
-        wtheta[i] = 0;
-        ccl_compute_legendre_polynomial(corr_type, theta[i], (int)(cosmo->spline_params.ELL_MAX_CORR), Pl_theta);
-        for (i_L=1; i_L < (int)(cosmo->spline_params.ELL_MAX_CORR); i_L+=1)
-          wtheta[i] += cl_arr[i_L]*Pl_theta[i_L];
-        wtheta[i] /= (M_PI*4);
+        for (it=0; it < 2; it++) {
+          int computed = 0;
+          for (ic=0; ic < n_cl; ic++) {
+            if (corr_types[ic] != corr_types_lgndre[it])
+              continue;
+            if (!computed) {
+              ccl_compute_legendre_polynomial(corr_types_lgndre[it], theta[i],
+                                              ell_max, Pl_theta);
+              computed = 1;
+            }
+            double *cl = &(cl_arr[ic*(ell_max+1)]);
+            double wth = 0;
+            for (i_L=1; i_L < ell_max; i_L+=1)
+              wth += cl[i_L]*Pl_theta[i_L];
+            wtheta[ic*n_theta+i] = wth/(M_PI*4);
+          }
+        }
       }
     }
 
@@ -391,7 +511,216 @@ static void ccl_tracer_corr_legendre(ccl_cosmology *cosmo,
 
     free(Pl_theta);
   }
-  free(l_arr);
+  free(cl_arr);
+}
+
+/*--------ROUTINE: ccl_correlation_legendre_table ------
+TASK: Tabulate the kernels of the Legendre sum for a set of angles.
+INPUT: correlation type, number of theta values, theta vector (in degrees),
+       maximum multipole, n_theta*(ell_max+1) output array.
+ */
+void ccl_correlation_legendre_table(int corr_type,
+                                    int n_theta,double *theta,
+                                    int ell_max,double *table,
+                                    int *status) {
+  if(corr_type!=CCL_CORR_GG && corr_type!=CCL_CORR_GL) {
+    *status=CCL_ERROR_NOT_IMPLEMENTED;
+    return;
+  }
+
+#pragma omp parallel for default(none) schedule(dynamic) \
+                         shared(corr_type, n_theta, theta, ell_max, table)
+  for (int i=0; i < n_theta; i++) {
+    double *Pl_theta = &(table[i*(ell_max+1)]);
+    ccl_compute_legendre_polynomial(corr_type, theta[i], ell_max, Pl_theta);
+    // Only multipoles 1 <= l < ell_max enter the sum
+    Pl_theta[0] = 0;
+    Pl_theta[ell_max] = 0;
+    for (int i_L=1; i_L < ell_max; i_L++)
+      Pl_theta[i_L] /= (M_PI*4);
+  }
+}
+
+/*--------ROUTINE: ccl_correlation_legendre_table_binned ------
+TASK: Tabulate the kernels of the Legendre sum averaged over angular bins.
+      The averages (weighted by solid angle) are computed analytically from
+      the integrals of P_l and P^2_l over cos(theta).
+INPUT: correlation type, number of bins, n_bins+1 bin edges (in degrees),
+       maximum multipole, n_bins*(ell_max+1) output array.
+ */
+void ccl_correlation_legendre_table_binned(int corr_type,
+                                           int n_bins,double *theta_edges,
+                                           int ell_max,double *table,
+                                           int *status) {
+  if(corr_type!=CCL_CORR_GG && corr_type!=CCL_CORR_GL) {
+    *status=CCL_ERROR_NOT_IMPLEMENTED;
+    return;
+  }
+
+  int local_status;
+#pragma omp parallel default(none) \
+                     shared(corr_type, n_bins, theta_edges, ell_max, table, \
+                            status) \
+                     private(local_status)
+  {
+    double *Pl_lo, *Pl_hi;
+    local_status = 0;
+
+    Pl_lo = malloc((ell_max+2)*sizeof(double));
+    Pl_hi = malloc((ell_max+2)*sizeof(double));
+    if ((Pl_lo == NULL) || (Pl_hi == NULL))
+      local_status = CCL_ERROR_MEMORY;
+
+    #pragma omp for schedule(dynamic)
+    for (int i=0; i < n_bins; i++) {
+      if (local_status == 0) {
+        double *K = &(table[i*(ell_max+1)]);
+        // x_lo > x_hi, since x = cos(theta)
+        double x_lo = cos(theta_edges[i]*M_PI/180);
+        double x_hi = cos(theta_edges[i+1]*M_PI/180);
+        double dx = x_lo - x_hi;
+        gsl_sf_legendre_Pl_array(ell_max+1, x_lo, Pl_lo);
+        gsl_sf_legendre_Pl_array(ell_max+1, x_hi, Pl_hi);
+
+        // Only multipoles 1 <= l < ell_max enter the sum
+        K[0] = 0;
+        K[ell_max] = 0;
+        for (int j=1; j < ell_max; j++) {
+          if (corr_type == CCL_CORR_GG) {
+            // (2l+1) int dx P_l = P_{l+1} - P_{l-1}
+            K[j] = (Pl_lo[j+1]-Pl_lo[j-1]) - (Pl_hi[j+1]-Pl_hi[j-1]);
+          }
+          else if (j < 2) {
+            K[j] = 0;
+          }
+          else {
+            // int dx P^2_l (e.g. arXiv:2012.08568, Eq. 65)
+            double c = 2./(2*j+1.);
+            double I_lo = (j+c)*Pl_lo[j-1] + (2-j)*x_lo*Pl_lo[j] - c*Pl_lo[j+1];
+            double I_hi = (j+c)*Pl_hi[j-1] + (2-j)*x_hi*Pl_hi[j] - c*Pl_hi[j+1];
+            K[j] = (I_lo-I_hi)*(2*j+1.)/((j+0.)*(j+1.));
+          }
+          K[j] /= (dx*M_PI*4);
+        }
+      }
+    }
+
+    if (local_status) {
+      #pragma omp atomic write
+      *status = local_status;
+    }
+
+    free(Pl_lo);
+    free(Pl_hi);
+  }
+}
+
+/*--------ROUTINE: ccl_correlation_tabulated ------
+TASK: Compute correlation functions for a set of power spectra from
+      tabulated kernels, as a matrix product.
+INPUT: cosmology, number of ell values, ell vector, number of spectra,
+       n_cl*n_ell C_ell array, number of theta values, maximum multipole,
+       n_theta*(ell_max+1) kernel table, n_cl*n_theta output array,
+       boolean for tapering, vector of tapering limits.
+ */
+void ccl_correlation_tabulated(ccl_cosmology *cosmo,
+                               int n_ell,double *ell,
+                               int n_cl,double *cls,
+                               int n_theta,int ell_max,double *table,
+                               double *wtheta,
+                               int do_taper_cl,double *taper_cl_limits,
+                               int *status) {
+  double *cl_arr=corr_legendre_cls(cosmo,n_ell,ell,n_cl,cls,ell_max,
+                                   do_taper_cl,taper_cl_limits,status);
+  if(*status)
+    return;
+
+#pragma omp parallel for default(none) schedule(static) collapse(2) \
+                         shared(n_cl, n_theta, ell_max, table, cl_arr, wtheta)
+  for (int ic=0; ic < n_cl; ic++) {
+    for (int i=0; i < n_theta; i++) {
+      double *cl = &(cl_arr[ic*(ell_max+1)]);
+      double *Pl_theta = &(table[i*(ell_max+1)]);
+      double wth = 0;
+      for (int i_L=0; i_L <= ell_max; i_L++)
+        wth += cl[i_L]*Pl_theta[i_L];
+      wtheta[ic*n_theta+i] = wth;
+    }
+  }
+  free(cl_arr);
+}
+
+/*--------ROUTINE: ccl_tracer_corr_legendre_binned ------
+TASK: Compute bin-averaged correlation functions via Legendre polynomials
+      for a set of power spectra, using analytical bin-averaged kernels.
+INPUT: cosmology, number of ell values, ell vector, number of spectra,
+       n_cl*n_ell C_ell array, correlation type of each spectrum, number of
+       bins, n_bins+1 bin edges, n_cl*n_bins output array, boolean for
+       tapering, vector of tapering limits.
+ */
+static void ccl_tracer_corr_legendre_binned(ccl_cosmology *cosmo,
+                                            int n_ell,double *ell,
+                                            int n_cl,double *cls,int *corr_types,
+                                            int n_bins,double *theta_edges,
+                                            double *wtheta,
+                                            int do_taper_cl,double *taper_cl_limits,
+                                            int *status) {
+  int ic, it;
+  int ell_max = (int)(cosmo->spline_params.ELL_MAX_CORR);
+  int corr_types_lgndre[2] = {CCL_CORR_GG, CCL_CORR_GL};
+  double *cl_arr = NULL, *table = NULL;
+
+  for(ic=0;ic<n_cl;ic++) {
+    if(corr_types[ic]==CCL_CORR_LM || corr_types[ic]==CCL_CORR_LP){
+      *status=CCL_ERROR_NOT_IMPLEMENTED;
+      ccl_cosmology_set_status_message(cosmo,
+                                       "ccl_correlation.c: ccl_tracer_corr_legendre_binned(): "
+                                       "CCL does not support full-sky xi+- calcuations.\nhttps://arxiv.org/abs/1702.05301 indicates flat-sky to be sufficient.\n");
+      return;
+    }
+  }
+
+  cl_arr=corr_legendre_cls(cosmo,n_ell,ell,n_cl,cls,ell_max,
+                           do_taper_cl,taper_cl_limits,status);
+  if(*status)
+    return;
+
+  table=malloc(n_bins*(ell_max+1)*sizeof(double));
+  if(table==NULL) {
+    *status=CCL_ERROR_MEMORY;
+    ccl_cosmology_set_status_message(cosmo,
+                                     "ccl_correlation.c: ccl_tracer_corr_legendre_binned(): "
+                                     "ran out of memory\n");
+  }
+
+  for(it=0;it<2;it++) {
+    int computed=0;
+    for(ic=0;ic<n_cl;ic++) {
+      if(*status)
+        break;
+      if(corr_types[ic]!=corr_types_lgndre[it])
+        continue;
+      if(!computed) {
+        ccl_correlation_legendre_table_binned(corr_types_lgndre[it],n_bins,
+                                              theta_edges,ell_max,table,status);
+        computed=1;
+      }
+      double *cl=&(cl_arr[ic*(ell_max+1)]);
+      double *wth=&(wtheta[ic*n_bins]);
+
+      #pragma omp parallel for default(none) schedule(static) \
+                               shared(n_bins, ell_max, table, cl, wth)
+      for(int i=0;i<n_bins;i++) {
+        double *K=&(table[i*(ell_max+1)]);
+        double w=0;
+        for(int i_L=0;i_L<=ell_max;i_L++)
+          w+=cl[i_L]*K[i_L];
+        wth[i]=w;
+      }
+    }
+  }
+
+  free(table);
   free(cl_arr);
 }
 
@@ -408,23 +737,102 @@ void ccl_correlation(ccl_cosmology *cosmo,
                      int n_theta,double *theta,double *wtheta,
                      int corr_type,int do_taper_cl,double *taper_cl_limits,int flag_method,
                      int *status) {
+  ccl_correlation_multi(cosmo,n_ell,ell,1,cls,&corr_type,n_theta,theta,wtheta,
+                        do_taper_cl,taper_cl_limits,flag_method,status);
+}
+
+/*--------ROUTINE: ccl_correlation_multi ------
+TASK: Compute the correlation functions of several power spectra sampled
+      at the same multipoles, sharing the transform set-up between them.
+INPUT: cosmology, number of ell values, ell vector, number of spectra,
+       n_cl*n_ell C_ell array, correlation type of each spectrum, number
+       of theta values, theta vector, n_cl*n_theta output array,
+       key for tapering, limits of tapering, method.
+ */
+void ccl_correlation_multi(ccl_cosmology *cosmo,
+                           int n_ell,double *ell,
+                           int n_cl,double *cls,int *corr_types,
+                           int n_theta,double *theta,double *wtheta,
+                           int do_taper_cl,double *taper_cl_limits,int flag_method,
+                           int *status) {
+  int ic;
+
+  for(ic=0;ic<n_cl;ic++) {
+    if((corr_types[ic]!=CCL_CORR_GG) && (corr_types[ic]!=CCL_CORR_GL) &&
+       (corr_types[ic]!=CCL_CORR_LP) && (corr_types[ic]!=CCL_CORR_LM)) {
+      *status=CCL_ERROR_INCONSISTENT;
+      ccl_cosmology_set_status_message(cosmo, "ccl_correlation.c: ccl_correlation_multi(): Unknown correlation type\n");
+      return;
+    }
+  }
+
   switch(flag_method) {
   case CCL_CORR_FFTLOG :
-    ccl_tracer_corr_fftlog(cosmo,n_ell,ell,cls,n_theta,theta,wtheta,corr_type,
-                           do_taper_cl,taper_cl_limits,status);
+    ccl_tracer_corr_fftlog(cosmo,n_ell,ell,n_cl,cls,corr_types,n_theta,theta,wtheta,
+                           do_taper_cl,taper_cl_limits,0,status);
     break;
   case CCL_CORR_LGNDRE :
-    ccl_tracer_corr_legendre(cosmo,n_ell,ell,cls,n_theta,theta,wtheta,corr_type,
+    ccl_tracer_corr_legendre(cosmo,n_ell,ell,n_cl,cls,corr_types,n_theta,theta,wtheta,
                              do_taper_cl,taper_cl_limits,status);
     break;
   case CCL_CORR_BESSEL :
-    ccl_tracer_corr_bessel(cosmo,n_ell,ell,cls,n_theta,theta,wtheta,corr_type,status);
+    for(ic=0;ic<n_cl;ic++) {
+      if(*status)
+        break;
+      ccl_tracer_corr_bessel(cosmo,n_ell,ell,&(cls[ic*n_ell]),
+                             n_theta,theta,&(wtheta[ic*n_theta]),
+                             corr_types[ic],status);
+    }
     break;
   default :
     *status=CCL_ERROR_INCONSISTENT;
-    ccl_cosmology_set_status_message(cosmo, "ccl_correlation.c: ccl_correlation(): Unknown algorithm\n");
+    ccl_cosmology_set_status_message(cosmo, "ccl_correlation.c: ccl_correlation_multi(): Unknown algorithm\n");
   }
+}
 
+/*--------ROUTINE: ccl_correlation_multi_binned ------
+TASK: Compute the correlation functions of several power spectra sampled
+      at the same multipoles, averaged over angular bins.
+INPUT: cosmology, number of ell values, ell vector, number of spectra,
+       n_cl*n_ell C_ell array, correlation type of each spectrum, number
+       of bins, n_bins+1 bin edges, n_cl*n_bins output array,
+       key for tapering, limits of tapering, method.
+ */
+void ccl_correlation_multi_binned(ccl_cosmology *cosmo,
+                                  int n_ell,double *ell,
+                                  int n_cl,double *cls,int *corr_types,
+                                  int n_bins,double *theta_edges,double *wtheta,
+                                  int do_taper_cl,double *taper_cl_limits,int flag_method,
+                                  int *status) {
+  int ic;
+
+  for(ic=0;ic<n_cl;ic++) {
+    if((corr_types[ic]!=CCL_CORR_GG) && (corr_types[ic]!=CCL_CORR_GL) &&
+       (corr_types[ic]!=CCL_CORR_LP) && (corr_types[ic]!=CCL_CORR_LM)) {
+      *status=CCL_ERROR_INCONSISTENT;
+      ccl_cosmology_set_status_message(cosmo, "ccl_correlation.c: ccl_correlation_multi_binned(): Unknown correlation type\n");
+      return;
+    }
+  }
+
+  switch(flag_method) {
+  case CCL_CORR_FFTLOG :
+    ccl_tracer_corr_fftlog(cosmo,n_ell,ell,n_cl,cls,corr_types,n_bins+1,theta_edges,wtheta,
+                           do_taper_cl,taper_cl_limits,1,status);
+    break;
+  case CCL_CORR_LGNDRE :
+    ccl_tracer_corr_legendre_binned(cosmo,n_ell,ell,n_cl,cls,corr_types,n_bins,theta_edges,
+                                    wtheta,do_taper_cl,taper_cl_limits,status);
+    break;
+  case CCL_CORR_BESSEL :
+    *status=CCL_ERROR_NOT_IMPLEMENTED;
+    ccl_cosmology_set_status_message(cosmo, "ccl_correlation.c: ccl_correlation_multi_binned(): "
+                                     "bin-averaged correlation functions are not implemented for this method\n");
+    break;
+  default :
+    *status=CCL_ERROR_INCONSISTENT;
+    ccl_cosmology_set_status_message(cosmo, "ccl_correlation.c: ccl_correlation_multi_binned(): Unknown algorithm\n");
+  }
 }
 
 /*--------ROUTINE: ccl_correlation_3d ------
@@ -517,6 +925,87 @@ void ccl_correlation_3d(ccl_cosmology *cosmo,
   return;
 }
 
+/*--------ROUTINE: ccl_correlation_multipoles_multi ------
+TASK: Calculate the Hankel transforms of the power spectrum
+        xi_l(r) = 1/(2*pi^2) \int dk k^2 P(k,a) j_l(kr)
+      for several scale factors and orders l. The power spectrum is sampled
+      once for all scale factors, and all scale factors are transformed in a
+      single FFTLog call for each l.
+
+INPUT:  cosmology, power spectrum, number of scale factors, scale factors,
+        number of orders, orders, number of r values, r values
+
+Result will be in array xi, with shape (n_a, n_l, n_r)
+ */
+void ccl_correlation_multipoles_multi(ccl_cosmology *cosmo, ccl_f2d_t *psp,
+                                      int n_a, double *a,
+                                      int n_l, int *ls,
+                                      int n_r, double *r, double *xi,
+                                      int *status) {
+  int i, ia, il, N_ARR;
+  double *k_arr = NULL, *pk_arr = NULL, *r_arr = NULL, *xi_arr = NULL;
+  double **pk_ptrs = NULL, **xi_ptrs = NULL;
+
+  N_ARR = (int)(cosmo->spline_params.N_K_3DCOR * log10(cosmo->spline_params.K_MAX / cosmo->spline_params.K_MIN));
+
+  k_arr = ccl_log_spacing(cosmo->spline_params.K_MIN, cosmo->spline_params.K_MAX, N_ARR);
+  pk_arr = malloc(n_a * N_ARR * sizeof(double));
+  r_arr = malloc(N_ARR * sizeof(double));
+  xi_arr = malloc(n_a * N_ARR * sizeof(double));
+  pk_ptrs = malloc(n_a * sizeof(double *));
+  xi_ptrs = malloc(n_a * sizeof(double *));
+  if ((k_arr == NULL) || (pk_arr == NULL) || (r_arr == NULL) ||
+      (xi_arr == NULL) || (pk_ptrs == NULL) || (xi_ptrs == NULL)) {
+    *status = CCL_ERROR_MEMORY;
+    ccl_cosmology_set_status_message(cosmo,
+           "ccl_correlation.c: ccl_correlation_multipoles_multi(): ran out of memory\n");
+  }
+
+  if (*status == 0) {
+    for (ia = 0; ia < n_a; ia++) {
+      pk_ptrs[ia] = &(pk_arr[ia * N_ARR]);
+      xi_ptrs[ia] = &(xi_arr[ia * N_ARR]);
+      for (i = 0; i < N_ARR; i++)
+        pk_ptrs[ia][i] = ccl_f2d_t_eval(psp, log(k_arr[i]), a[ia], cosmo, status);
+    }
+  }
+
+  for (il = 0; il < n_l; il++) {
+    if (*status)
+      break;
+
+    for (i = 0; i < N_ARR; i++)
+      r_arr[i] = 0;
+    ccl_fftlog_ComputeXi3D(ls[il], 0, n_a, N_ARR, k_arr, pk_ptrs, r_arr, xi_ptrs, status);
+
+    // Interpolate to output values of r
+    for (ia = 0; ia < n_a; ia++) {
+      if (*status)
+        break;
+      ccl_f1d_t *xi_spl = ccl_f1d_t_new(N_ARR, r_arr, xi_ptrs[ia], xi_ptrs[ia][0], 0,
+                                        ccl_f1d_extrap_const,
+                                        ccl_f1d_extrap_const, status);
+      if (xi_spl == NULL) {
+        *status = CCL_ERROR_MEMORY;
+        ccl_cosmology_set_status_message(cosmo,
+               "ccl_correlation.c: ccl_correlation_multipoles_multi(): ran out of memory\n");
+        break;
+      }
+      double *xi_out = &(xi[(ia * n_l + il) * n_r]);
+      for (i = 0; i < n_r; i++)
+        xi_out[i] = ccl_f1d_t_eval(xi_spl, r[i]);
+      ccl_f1d_t_free(xi_spl);
+    }
+  }
+
+  free(k_arr);
+  free(pk_arr);
+  free(r_arr);
+  free(xi_arr);
+  free(pk_ptrs);
+  free(xi_ptrs);
+}
+
 /*--------ROUTINE: ccl_correlation_multipole ------
 TASK: Calculate multipole of the redshift space correlation function. Do so using FFTLog.
 
@@ -8,6 +8,158 @@
 
 #include "ccl.h"
 
+// Index i of the interval [xa[i], xa[i+1]] containing x, or -1 if x is
+// outside of the range of xa.
+static int bicubic_find(int n, double *xa, double x)
+{
+  int lo = 0, hi = n-1;
+  if ((x < xa[0]) || (x > xa[n-1]))
+    return -1;
+  while (hi - lo > 1) {
+    int mid = (lo + hi) / 2;
+    if (xa[mid] > x)
+      hi = mid;
+    else
+      lo = mid;
+  }
+  return lo;
+}
+
+// Cubic Hermite basis functions at t in [0, 1], weighting f(0), f(1),
+// f'(0) and f'(1), or their derivatives of order nderiv (up to 2).
+static void hermite_basis(double t, int nderiv, double *h)
+{
+  double t2 = t*t;
+  if (nderiv == 0) {
+    h[0] = 1 - t2*(3 - 2*t);
+    h[1] = t2*(3 - 2*t);
+    h[2] = t*(1 - t)*(1 - t);
+    h[3] = t2*(t - 1);
+  }
+  else if (nderiv == 1) {
+    h[0] = 6*t*(t - 1);
+    h[1] = 6*t*(1 - t);
+    h[2] = 1 - t*(4 - 3*t);
+    h[3] = t*(3*t - 2);
+  }
+  else {
+    h[0] = 12*t - 6;
+    h[1] = 6 - 12*t;
+    h[2] = 6*t - 4;
+    h[3] = 6*t - 2;
+  }
+}
+
+int ccl_bicubic_eval_e(ccl_bicubic_t *bc, double x, double y,
+                       int nderiv_x, int nderiv_y, double *f)
+{
+  int jx, jy;
+  int n = bc->nx*bc->ny;
+  int ix = bicubic_find(bc->nx, bc->x, x);
+  int iy = bicubic_find(bc->ny, bc->y, y);
+  if ((ix < 0) || (iy < 0)) {
+    *f = NAN;
+    return CCL_ERROR_SPLINE_EV;
+  }
+
+  // The bicubic interpolant within each cell is the product of the
+  // Hermite interpolants matching f, df/dx, df/dy and d2f/dxdy at its
+  // corners, as in GSL's bicubic interpolation.
+  double dx = bc->x[ix+1] - bc->x[ix];
+  double dy = bc->y[iy+1] - bc->y[iy];
+  double hx[4], hy[4];
+  hermite_basis((x - bc->x[ix])/dx, nderiv_x, hx);
+  hermite_basis((y - bc->y[iy])/dy, nderiv_y, hy);
+  hx[2] *= dx;
+  hx[3] *= dx;
+  hy[2] *= dy;
+  hy[3] *= dy;
+
+  double sum = 0;
+  for (jy=0; jy<2; jy++) {
+    for (jx=0; jx<2; jx++) {
+      int i = ix + jx + bc->nx*(iy + jy);
+      sum += (hx[jx]*hy[jy]*bc->z[i] +
+              hx[2+jx]*hy[jy]*bc->dz[i] +
+              hx[jx]*hy[2+jy]*bc->dz[n+i] +
+              hx[2+jx]*hy[2+jy]*bc->dz[2*n+i]);
+    }
+  }
+  *f = sum / (pow(dx, nderiv_x) * pow(dy, nderiv_y));
+  return 0;
+}
+
+// Derivatives at the nodes of the natural cubic spline through the n
+// values f[i*stride], stored in df[i*stride]. `buf` must hold n values.
+static int spline_node_derivs(gsl_spline *spl, int n, double *x,
+                              double *f, int stride, double *df,
+                              double *buf)
+{
+  int i, spstatus;
+  for (i=0; i<n; i++)
+    buf[i] = f[i*stride];
+  spstatus = gsl_spline_init(spl, x, buf, n);
+  for (i=0; i<n; i++) {
+    if (spstatus)
+      break;
+    spstatus = gsl_spline_eval_deriv_e(spl, x[i], NULL, &(df[i*stride]));
+  }
+  return spstatus;
+}
+
+void ccl_bicubic_derivs(int nx, double *x, int ny, double *y,
+                        double *z, double *dz, int *status)
+{
+  int ix, iy, spstatus = 0;
+  int n = nx*ny;
+  double *zx = dz, *zy = dz+n, *zxy = dz+2*n;
+
+  if ((nx < 3) || (ny < 3)) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return;
+  }
+
+  gsl_spline *spl_x = gsl_spline_alloc(gsl_interp_cspline, nx);
+  gsl_spline *spl_y = gsl_spline_alloc(gsl_interp_cspline, ny);
+  double *buf = malloc((nx > ny ? nx : ny)*sizeof(double));
+  if ((spl_x == NULL) || (spl_y == NULL) || (buf == NULL))
+    *status = CCL_ERROR_MEMORY;
+
+  // Same as GSL's bicubic interpolation: df/dx along x, df/dy along y,
+  // and d2f/dxdy from df/dy along x.
+  if (*status == 0) {
+    for (iy=0; iy<ny; iy++)
+      spstatus |= spline_node_derivs(spl_x, nx, x, &(z[iy*nx]), 1,
+                                     &(zx[iy*nx]), buf);
+    for (ix=0; ix<nx; ix++)
+      spstatus |= spline_node_derivs(spl_y, ny, y, &(z[ix]), nx,
+                                     &(zy[ix]), buf);
+    for (iy=0; iy<ny; iy++)
+      spstatus |= spline_node_derivs(spl_x, nx, x, &(zy[iy*nx]), 1,
+                                     &(zxy[iy*nx]), buf);
+    if (spstatus)
+      *status = CCL_ERROR_SPLINE;
+  }
+
+  gsl_spline_free(spl_x);
+  gsl_spline_free(spl_y);
+  free(buf);
+}
+
+// Value of the tabulated function of a non-factorizable ccl_f2d_t, or of
+// its first or second derivative with respect to log(k).
+static int f2d_fka_eval_e(ccl_f2d_t *f2d, double lk, double a,
+                          int nderiv, double *f)
+{
+  if (f2d->fka_ext != NULL)
+    return ccl_bicubic_eval_e(f2d->fka_ext, lk, a, nderiv, 0, f);
+  if (nderiv == 0)
+    return gsl_spline2d_eval_e(f2d->fka, lk, a, NULL, NULL, f);
+  if (nderiv == 1)
+    return gsl_spline2d_eval_deriv_x_e(f2d->fka, lk, a, NULL, NULL, f);
+  return gsl_spline2d_eval_deriv_xx_e(f2d->fka, lk, a, NULL, NULL, f);
+}
+
 ccl_f2d_t *ccl_f2d_t_copy(ccl_f2d_t *f2d_o, int *status)
 {
   int s2dstatus=0;
@@ -29,6 +181,13 @@ ccl_f2d_t *ccl_f2d_t_copy(ccl_f2d_t *f2d_o, int *status)
     f2d->is_log = f2d_o->is_log;
     f2d->growth_factor_0 = f2d_o->growth_factor_0;
     f2d->growth_exponent = f2d_o->growth_exponent;
+    f2d->fka_base = f2d_o->fka_base;
+    f2d->fka_boost = f2d_o->fka_boost;
+    f2d->expr_op = f2d_o->expr_op;
+    f2d->fka_x = f2d_o->fka_x;
+    f2d->fka_y = f2d_o->fka_y;
+    f2d->expr_c = f2d_o->expr_c;
+    f2d->fka_ext = NULL;
 
     if(f2d_o->fk != NULL) {
       f2d->fk = gsl_spline_alloc(gsl_interp_cspline,
@@ -86,6 +245,17 @@ ccl_f2d_t *ccl_f2d_t_copy(ccl_f2d_t *f2d_o, int *status)
       f2d->fka = NULL;
   }
 
+  if(*status==0) {
+    // The external arrays are shared with the original structure.
+    if(f2d_o->fka_ext != NULL) {
+      f2d->fka_ext = malloc(sizeof(ccl_bicubic_t));
+      if(f2d->fka_ext == NULL)
+        *status = CCL_ERROR_MEMORY;
+      else
+        *(f2d->fka_ext) = *(f2d_o->fka_ext);
+    }
+  }
+
   return f2d;
 }
   
@@ -122,6 +292,13 @@ ccl_f2d_t *ccl_f2d_t_new(int na,double *a_arr,
     f2d->fka = NULL;
     f2d->fk = NULL;
     f2d->fa = NULL;
+    f2d->fka_base = NULL;
+    f2d->fka_boost = NULL;
+    f2d->expr_op = ccl_f2d_expr_none;
+    f2d->fka_x = NULL;
+    f2d->fka_y = NULL;
+    f2d->expr_c = 0;
+    f2d->fka_ext = NULL;
 
     if (!(f2d->is_k_constant)) { //If it's not constant
       f2d->lkmin = lk_arr[0];
@@ -200,7 +377,365 @@ ccl_f2d_t *ccl_f2d_t_new(int na,double *a_arr,
   return f2d;
 }
 
+ccl_f2d_t *ccl_f2d_t_new_external(int na,double *a_arr,
+                                  int nk,double *lk_arr,
+                                  double *fka_arr,
+                                  double *dfka_arr,
+                                  int extrap_order_lok,
+                                  int extrap_order_hik,
+                                  ccl_f2d_extrap_growth_t extrap_linear_growth,
+                                  int is_fka_log,
+                                  double growth_factor_0,
+                                  int growth_exponent,
+                                  int *status)
+{
+  if ((a_arr == NULL) || (lk_arr == NULL) || (fka_arr == NULL) ||
+      (dfka_arr == NULL) || (na < 2) || (nk < 2) ||
+      (extrap_order_lok > 2) || (extrap_order_lok < 0) ||
+      (extrap_order_hik > 2) || (extrap_order_hik < 0) ||
+      ((extrap_linear_growth != ccl_f2d_cclgrowth) &&
+       (extrap_linear_growth != ccl_f2d_constantgrowth) &&
+       (extrap_linear_growth != ccl_f2d_no_extrapol))) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return NULL;
+  }
+
+  ccl_f2d_t *f2d = malloc(sizeof(ccl_f2d_t));
+  ccl_bicubic_t *bc = malloc(sizeof(ccl_bicubic_t));
+  if ((f2d == NULL) || (bc == NULL)) {
+    free(f2d);
+    free(bc);
+    *status = CCL_ERROR_MEMORY;
+    return NULL;
+  }
+
+  bc->nx = nk;
+  bc->ny = na;
+  bc->x = lk_arr;
+  bc->y = a_arr;
+  bc->z = fka_arr;
+  bc->dz = dfka_arr;
+
+  f2d->lkmin = lk_arr[0];
+  f2d->lkmax = lk_arr[nk-1];
+  f2d->amin = a_arr[0];
+  f2d->amax = a_arr[na-1];
+  f2d->is_factorizable = 0;
+  f2d->is_k_constant = 0;
+  f2d->is_a_constant = 0;
+  f2d->extrap_order_lok = extrap_order_lok;
+  f2d->extrap_order_hik = extrap_order_hik;
+  f2d->extrap_linear_growth = extrap_linear_growth;
+  f2d->is_log = is_fka_log;
+  f2d->growth_factor_0 = growth_factor_0;
+  f2d->growth_exponent = growth_exponent;
+  f2d->fk = NULL;
+  f2d->fa = NULL;
+  f2d->fka = NULL;
+  f2d->fka_base = NULL;
+  f2d->fka_boost = NULL;
+  f2d->expr_op = ccl_f2d_expr_none;
+  f2d->fka_x = NULL;
+  f2d->fka_y = NULL;
+  f2d->expr_c = 0;
+  f2d->fka_ext = bc;
+
+  return f2d;
+}
+
+ccl_f2d_t *ccl_f2d_t_new_boosted(ccl_f2d_t *fka_base,
+                                 ccl_f2d_t *fka_boost,
+                                 int *status)
+{
+  if ((fka_base == NULL) || (fka_boost == NULL)) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return NULL;
+  }
+
+  ccl_f2d_t *f2d = malloc(sizeof(ccl_f2d_t));
+  if (f2d == NULL) {
+    *status = CCL_ERROR_MEMORY;
+    return NULL;
+  }
+
+  f2d->lkmin = fka_base->lkmin;
+  f2d->lkmax = fka_base->lkmax;
+  f2d->amin = fka_base->amin;
+  f2d->amax = fka_base->amax;
+  f2d->is_factorizable = 0;
+  f2d->is_k_constant = fka_base->is_k_constant && fka_boost->is_k_constant;
+  f2d->is_a_constant = fka_base->is_a_constant;
+  f2d->extrap_order_lok = fka_base->extrap_order_lok;
+  f2d->extrap_order_hik = fka_base->extrap_order_hik;
+  f2d->extrap_linear_growth = fka_base->extrap_linear_growth;
+  f2d->is_log = fka_base->is_log;
+  f2d->growth_factor_0 = fka_base->growth_factor_0;
+  f2d->growth_exponent = fka_base->growth_exponent;
+  f2d->fk = NULL;
+  f2d->fa = NULL;
+  f2d->fka = NULL;
+  f2d->fka_base = fka_base;
+  f2d->fka_boost = fka_boost;
+  f2d->expr_op = ccl_f2d_expr_none;
+  f2d->fka_x = NULL;
+  f2d->fka_y = NULL;
+  f2d->expr_c = 0;
+  f2d->fka_ext = NULL;
+
+  return f2d;
+}
+
+ccl_f2d_t *ccl_f2d_t_new_expr(ccl_f2d_expr_t expr_op,
+                              ccl_f2d_t *fka_x,
+                              ccl_f2d_t *fka_y,
+                              double c,
+                              int *status)
+{
+  if ((fka_x == NULL) ||
+      ((expr_op != ccl_f2d_expr_add) && (expr_op != ccl_f2d_expr_mul) &&
+       (expr_op != ccl_f2d_expr_pow)) ||
+      ((expr_op == ccl_f2d_expr_pow) && (fka_y != NULL))) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return NULL;
+  }
+
+  ccl_f2d_t *f2d = malloc(sizeof(ccl_f2d_t));
+  if (f2d == NULL) {
+    *status = CCL_ERROR_MEMORY;
+    return NULL;
+  }
+
+  f2d->lkmin = fka_x->lkmin;
+  f2d->lkmax = fka_x->lkmax;
+  f2d->amin = fka_x->amin;
+  f2d->amax = fka_x->amax;
+  f2d->is_factorizable = 0;
+  f2d->is_k_constant = fka_x->is_k_constant &&
+    ((fka_y == NULL) || fka_y->is_k_constant);
+  f2d->is_a_constant = fka_x->is_a_constant;
+  f2d->extrap_order_lok = fka_x->extrap_order_lok;
+  f2d->extrap_order_hik = fka_x->extrap_order_hik;
+  f2d->extrap_linear_growth = ccl_f2d_cclgrowth;
+  f2d->is_log = 0;
+  f2d->growth_factor_0 = 0;
+  f2d->growth_exponent = 2;
+  f2d->fk = NULL;
+  f2d->fa = NULL;
+  f2d->fka = NULL;
+  f2d->fka_base = NULL;
+  f2d->fka_boost = NULL;
+  f2d->expr_op = expr_op;
+  f2d->fka_x = fka_x;
+  f2d->fka_y = fka_y;
+  f2d->expr_c = c;
+  f2d->fka_ext = NULL;
+
+  return f2d;
+}
+
+// Scale factor, within the interpolation range of `f2d`, closest to `a`.
+static double f2d_clamp_a(ccl_f2d_t *f2d, double a)
+{
+  if (f2d->is_a_constant)
+    return a;
+  if (a < f2d->amin)
+    return f2d->amin;
+  if (a > f2d->amax)
+    return f2d->amax;
+  return a;
+}
+
+// Growth extrapolation factor of an expression node for scale factors
+// below its interpolation range. Returns 1 within the range.
+static double f2d_expr_growth(ccl_f2d_t *f2d, double a, double *a_ev,
+                              void *cosmo, int *status)
+{
+  *a_ev = a;
+  if (f2d->is_a_constant)
+    return 1;
+  if ((a < f2d->amin) || (a > f2d->amax)) {
+    if (f2d->extrap_linear_growth == ccl_f2d_no_extrapol) {
+      *status = CCL_ERROR_SPLINE_EV;
+      return NAN;
+    }
+  }
+  *a_ev = f2d_clamp_a(f2d, a);
+  if (a >= f2d->amin)
+    return 1;
+
+  double gz;
+  if (f2d->extrap_linear_growth == ccl_f2d_cclgrowth) { // Use CCL's growth function
+    ccl_cosmology *csm = (ccl_cosmology *)cosmo;
+    if (!csm->computed_growth) {
+      *status = CCL_ERROR_GROWTH_INIT;
+      ccl_cosmology_set_status_message(
+        csm,
+        "ccl_f2d.c: ccl_f2d_t_eval(): growth factor splines have not been precomputed!");
+      return NAN;
+    }
+    gz = (
+      ccl_growth_factor(csm, a, status) /
+      ccl_growth_factor(csm, *a_ev, status));
+  }
+  else // Use constant growth factor
+    gz = f2d->growth_factor_0;
+
+  return pow(gz, f2d->growth_exponent);
+}
+
+static double f2d_expr_eval(ccl_f2d_t *f2d, double lk, double a,
+                            void *cosmo, int *status)
+{
+  double a_ev;
+  double gz = f2d_expr_growth(f2d, a, &a_ev, cosmo, status);
+  if (*status)
+    return NAN;
+
+  double fx = ccl_f2d_t_eval(f2d->fka_x, lk, f2d_clamp_a(f2d->fka_x, a_ev),
+                             cosmo, status);
+  double fy = f2d->expr_c;
+  if (f2d->fka_y != NULL)
+    fy = ccl_f2d_t_eval(f2d->fka_y, lk, f2d_clamp_a(f2d->fka_y, a_ev),
+                        cosmo, status);
+  if (*status)
+    return NAN;
+
+  double fka;
+  if (f2d->expr_op == ccl_f2d_expr_add)
+    fka = fx + fy;
+  else if (f2d->expr_op == ccl_f2d_expr_mul)
+    fka = fx * fy;
+  else
+    fka = pow(fx, fy);
+
+  return fka * gz;
+}
+
+static double f2d_expr_dlogf_dlk_eval(ccl_f2d_t *f2d, double lk, double a,
+                                      void *cosmo, int *status)
+{
+  // The growth extrapolation in a does not depend on k.
+  double a_ev;
+  f2d_expr_growth(f2d, a, &a_ev, cosmo, status);
+  if (*status)
+    return NAN;
+
+  double ax = f2d_clamp_a(f2d->fka_x, a_ev);
+  double dx = ccl_f2d_t_dlogf_dlk_eval(f2d->fka_x, lk, ax, cosmo, status);
+  if (f2d->expr_op == ccl_f2d_expr_pow)
+    return f2d->expr_c * dx;
+
+  double dy = 0;
+  double ay = a_ev;
+  if (f2d->fka_y != NULL) {
+    ay = f2d_clamp_a(f2d->fka_y, a_ev);
+    dy = ccl_f2d_t_dlogf_dlk_eval(f2d->fka_y, lk, ay, cosmo, status);
+  }
+  if (*status)
+    return NAN;
+  if (f2d->expr_op == ccl_f2d_expr_mul)
+    return dx + dy;
+
+  // d log(x+y) / d log k = (x dlog x + y dlog y) / (x+y)
+  double fx = ccl_f2d_t_eval(f2d->fka_x, lk, ax, cosmo, status);
+  double fy = f2d->expr_c;
+  if (f2d->fka_y != NULL)
+    fy = ccl_f2d_t_eval(f2d->fka_y, lk, ay, cosmo, status);
+  if (*status)
+    return NAN;
+  if (fx + fy == 0)
+    return 0;
+  return (fx * dx + fy * dy) / (fx + fy);
+}
+
+// Scale factors at which the base and the boost of a boosted
+// ccl_f2d_t should be evaluated. Returns 1 if `a` lies above the
+// interpolation range in a (i.e. growth extrapolation is needed).
+static int f2d_boosted_a_ev(ccl_f2d_t *f2d, double a,
+                            double *a_base, double *a_boost, int *status)
+{
+  int is_hiz = 0;
+  *a_base = a;
+  if (!(f2d->is_a_constant)) {
+    if ((a < f2d->amin) || (a > f2d->amax)) {
+      if (f2d->extrap_linear_growth == ccl_f2d_no_extrapol) {
+        *status = CCL_ERROR_SPLINE_EV;
+        return 0;
+      }
+      is_hiz = a < f2d->amin;
+      *a_base = is_hiz ? f2d->amin : f2d->amax;
+    }
+  }
+
+  *a_boost = *a_base;
+  if (!(f2d->fka_boost->is_a_constant)) {
+    if (*a_boost < f2d->fka_boost->amin)
+      *a_boost = f2d->fka_boost->amin;
+    else if (*a_boost > f2d->fka_boost->amax)
+      *a_boost = f2d->fka_boost->amax;
+  }
+
+  return is_hiz;
+}
+
+static double f2d_boosted_eval(ccl_f2d_t *f2d, double lk, double a,
+                               void *cosmo, int *status)
+{
+  double a_base, a_boost;
+  int is_hiz = f2d_boosted_a_ev(f2d, a, &a_base, &a_boost, status);
+  if (*status)
+    return NAN;
+
+  double fka = ccl_f2d_t_eval(f2d->fka_base, lk, a_base, cosmo, status);
+  fka *= ccl_f2d_t_eval(f2d->fka_boost, lk, a_boost, cosmo, status);
+  if (*status)
+    return NAN;
+
+  // Extrapolate in a if needed
+  if (is_hiz) {
+    double gz;
+    if (f2d->extrap_linear_growth == ccl_f2d_cclgrowth) { // Use CCL's growth function
+      ccl_cosmology *csm = (ccl_cosmology *)cosmo;
+      if (!csm->computed_growth) {
+        *status = CCL_ERROR_GROWTH_INIT;
+        ccl_cosmology_set_status_message(
+          csm,
+          "ccl_f2d.c: ccl_f2d_t_eval(): growth factor splines have not been precomputed!");
+        return NAN;
+      }
+      gz = (
+        ccl_growth_factor(csm, a, status) /
+        ccl_growth_factor(csm, a_base, status));
+    }
+    else // Use constant growth factor
+      gz = f2d->growth_factor_0;
+
+    fka *= pow(gz, f2d->growth_exponent);
+  }
+
+  return fka;
+}
+
+static double f2d_boosted_dlogf_dlk_eval(ccl_f2d_t *f2d, double lk, double a,
+                                         void *cosmo, int *status)
+{
+  // The growth extrapolation in a does not depend on k, so the
+  // logarithmic derivative is just the sum of those of both factors.
+  double a_base, a_boost;
+  f2d_boosted_a_ev(f2d, a, &a_base, &a_boost, status);
+  if (*status)
+    return NAN;
+
+  return (ccl_f2d_t_dlogf_dlk_eval(f2d->fka_base, lk, a_base, cosmo, status) +
+          ccl_f2d_t_dlogf_dlk_eval(f2d->fka_boost, lk, a_boost, cosmo, status));
+}
+
 double ccl_f2d_t_eval(ccl_f2d_t *f2d,double lk,double a,void *cosmo, int *status) {
+  if (f2d->fka_boost != NULL)
+    return f2d_boosted_eval(f2d, lk, a, cosmo, status);
+  if (f2d->fka_x != NULL)
+    return f2d_expr_eval(f2d, lk, a, cosmo, status);
+
   int is_hiz, is_loz;
   double a_ev = a;
   if (f2d->is_a_constant) {
@@ -269,14 +804,14 @@ double ccl_f2d_t_eval(ccl_f2d_t *f2d,double lk,double a,void *cosmo, int *status
         fka_pre = fk*fa;
   }
   else {
-    if (f2d->fka == NULL) {
+    if ((f2d->fka == NULL) && (f2d->fka_ext == NULL)) {
       if (f2d->is_log)
         fka_pre = 0;
       else
         fka_pre = 1;
     }
     else
-      spstatus = gsl_spline2d_eval_e(f2d->fka, lk_ev, a_ev, NULL, NULL, &fka_pre);
+      spstatus = f2d_fka_eval_e(f2d, lk_ev, a_ev, 0, &fka_pre);
   }
 
   if (spstatus) {
@@ -293,7 +828,7 @@ double ccl_f2d_t_eval(ccl_f2d_t *f2d,double lk,double a,void *cosmo, int *status
       if (f2d->is_factorizable)
         spstatus = gsl_spline_eval_deriv_e(f2d->fk, lk_ev, NULL, &pd);
       else
-        spstatus = gsl_spline2d_eval_deriv_x_e(f2d->fka, lk_ev, a_ev, NULL, NULL, &pd);
+        spstatus = f2d_fka_eval_e(f2d, lk_ev, a_ev, 1, &pd);
       if (spstatus) {
         *status = CCL_ERROR_SPLINE_EV;
         return NAN;
@@ -303,7 +838,7 @@ double ccl_f2d_t_eval(ccl_f2d_t *f2d,double lk,double a,void *cosmo, int *status
         if (f2d->is_factorizable)
           spstatus = gsl_spline_eval_deriv2_e(f2d->fk, lk_ev, NULL, &pd);
         else
-          spstatus = gsl_spline2d_eval_deriv_xx_e(f2d->fka, lk_ev, a_ev, NULL, NULL, &pd);
+          spstatus = f2d_fka_eval_e(f2d, lk_ev, a_ev, 2, &pd);
         if (spstatus) {
           *status=CCL_ERROR_SPLINE_EV;
           return NAN;
@@ -320,7 +855,7 @@ double ccl_f2d_t_eval(ccl_f2d_t *f2d,double lk,double a,void *cosmo, int *status
       if (f2d->is_factorizable)
         spstatus = gsl_spline_eval_deriv_e(f2d->fk, lk_ev, NULL, &pd);
       else
-        spstatus = gsl_spline2d_eval_deriv_x_e(f2d->fka, lk_ev, a_ev, NULL, NULL, &pd);
+        spstatus = f2d_fka_eval_e(f2d, lk_ev, a_ev, 1, &pd);
       if (spstatus) {
         *status = CCL_ERROR_SPLINE_EV;
         return NAN;
@@ -331,7 +866,7 @@ double ccl_f2d_t_eval(ccl_f2d_t *f2d,double lk,double a,void *cosmo, int *status
         if (f2d->is_factorizable)
           spstatus = gsl_spline_eval_deriv2_e(f2d->fk, lk_ev, NULL, &pd);
         else
-          spstatus = gsl_spline2d_eval_deriv_xx_e(f2d->fka, lk_ev, a_ev, NULL, NULL, &pd);
+          spstatus = f2d_fka_eval_e(f2d, lk_ev, a_ev, 2, &pd);
         if (spstatus) {
           *status = CCL_ERROR_SPLINE_EV;
           return NAN;
@@ -377,6 +912,11 @@ double ccl_f2d_t_dlogf_dlk_eval(ccl_f2d_t *f2d,double lk,double a,void *cosmo, i
 
   if (f2d->is_k_constant)
     return 0;
+
+  if (f2d->fka_boost != NULL)
+    return f2d_boosted_dlogf_dlk_eval(f2d, lk, a, cosmo, status);
+  if (f2d->fka_x != NULL)
+    return f2d_expr_dlogf_dlk_eval(f2d, lk, a, cosmo, status);
  
   double inv_pk0 = 1.;
   // Get Pk if needed
@@ -449,14 +989,14 @@ double ccl_f2d_t_dlogf_dlk_eval(ccl_f2d_t *f2d,double lk,double a,void *cosmo, i
         fka_pre = fk*fa;
   }
   else {
-    if (f2d->fka == NULL) {
+    if ((f2d->fka == NULL) && (f2d->fka_ext == NULL)) {
       if (f2d->is_log)
         fka_pre = 0;
       else
         fka_pre = 1;
     }
     else
-      spstatus = gsl_spline2d_eval_deriv_x_e(f2d->fka, lk_ev, a_ev, NULL, NULL, &fka_pre);
+      spstatus = f2d_fka_eval_e(f2d, lk_ev, a_ev, 1, &fka_pre);
   }
 
   if (spstatus) {
@@ -473,7 +1013,7 @@ double ccl_f2d_t_dlogf_dlk_eval(ccl_f2d_t *f2d,double lk,double a,void *cosmo, i
       if (f2d->is_factorizable)
         spstatus = gsl_spline_eval_deriv2_e(f2d->fk, lk_ev, NULL, &pd);
       else
-        spstatus = gsl_spline2d_eval_deriv_xx_e(f2d->fka, lk_ev, a_ev, NULL, NULL, &pd);
+        spstatus = f2d_fka_eval_e(f2d, lk_ev, a_ev, 2, &pd);
       if (spstatus) {
         *status = CCL_ERROR_SPLINE_EV;
         return NAN;
@@ -489,7 +1029,7 @@ double ccl_f2d_t_dlogf_dlk_eval(ccl_f2d_t *f2d,double lk,double a,void *cosmo, i
       if (f2d->is_factorizable)
         spstatus = gsl_spline_eval_deriv2_e(f2d->fk, lk_ev, NULL, &pd);
       else
-        spstatus = gsl_spline2d_eval_deriv_xx_e(f2d->fka, lk_ev, a_ev, NULL, NULL, &pd);
+        spstatus = f2d_fka_eval_e(f2d, lk_ev, a_ev, 2, &pd);
       if (spstatus) {
         *status = CCL_ERROR_SPLINE_EV;
         return NAN;
@@ -540,6 +1080,8 @@ void ccl_f2d_t_free(ccl_f2d_t *f2d)
       gsl_spline_free(f2d->fk);
     if(f2d->fa != NULL)
       gsl_spline_free(f2d->fa);
+    if(f2d->fka_ext != NULL)
+      free(f2d->fka_ext);
     free(f2d);
   }
 }
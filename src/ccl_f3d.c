@@ -83,6 +83,45 @@ int ccl_find_a_index(ccl_a_finder *finda, double a)
   return ia_0;
 }
 
+static void f3d_splines_free(gsl_spline **splines, int n)
+{
+  if(splines != NULL) {
+    int i;
+    for(i=0; i<n; i++) {
+      if(splines[i] != NULL)
+        gsl_spline_free(splines[i]);
+    }
+    free(splines);
+  }
+}
+
+static gsl_spline **f3d_splines_copy(gsl_spline **splines_o, int n, int *status)
+{
+  int i;
+  if(*status)
+    return NULL;
+
+  gsl_spline **splines = calloc(n, sizeof(gsl_spline *));
+  if(splines == NULL) {
+    *status = CCL_ERROR_MEMORY;
+    return NULL;
+  }
+
+  for(i=0; i<n; i++) {
+    size_t size = splines_o[i]->size;
+    splines[i] = gsl_spline_alloc(gsl_interp_cspline, size);
+    if(splines[i] == NULL) {
+      *status = CCL_ERROR_MEMORY;
+      break;
+    }
+    if(gsl_spline_init(splines[i], splines_o[i]->x, splines_o[i]->y, size)) {
+      *status = CCL_ERROR_SPLINE;
+      break;
+    }
+  }
+  return splines;
+}
+
 ccl_f3d_t *ccl_f3d_t_copy(ccl_f3d_t *f3d_o, int *status)
 {
   int ia, s2dstatus=0;
@@ -123,6 +162,17 @@ ccl_f3d_t *ccl_f3d_t_copy(ccl_f3d_t *f3d_o, int *status)
       f3d->fka_2 = NULL;
   }
 
+  if(*status==0) {
+    f3d->rank = f3d_o->rank;
+    f3d->tkka_u = NULL;
+    f3d->tkka_v = NULL;
+    f3d->tkka_ext = NULL;
+    if(f3d_o->rank > 0) {
+      f3d->tkka_u = f3d_splines_copy(f3d_o->tkka_u, f3d->na*f3d->rank, status);
+      f3d->tkka_v = f3d_splines_copy(f3d_o->tkka_v, f3d->na*f3d->rank, status);
+    }
+  }
+
   if(*status==0) {
     if(f3d_o->tkka != NULL) {
       f3d->tkka = malloc(f3d->na*sizeof(gsl_spline2d));
@@ -155,6 +205,17 @@ ccl_f3d_t *ccl_f3d_t_copy(ccl_f3d_t *f3d_o, int *status)
       f3d->tkka = NULL;
   }
 
+  if(*status==0) {
+    // The external arrays are shared with the original structure.
+    if(f3d_o->tkka_ext != NULL) {
+      f3d->tkka_ext = malloc(f3d->na*sizeof(ccl_bicubic_t));
+      if(f3d->tkka_ext == NULL)
+        *status = CCL_ERROR_MEMORY;
+      else
+        memcpy(f3d->tkka_ext, f3d_o->tkka_ext, f3d->na*sizeof(ccl_bicubic_t));
+    }
+  }
+
   return f3d;
 }
   
@@ -189,6 +250,10 @@ ccl_f3d_t *ccl_f3d_t_new(int na,double *a_arr,
     f3d->fka_1 = NULL;
     f3d->fka_2 = NULL;
     f3d->tkka = NULL;
+    f3d->rank = 0;
+    f3d->tkka_u = NULL;
+    f3d->tkka_v = NULL;
+    f3d->tkka_ext = NULL;
 
     f3d->lkmin = lk_arr[0];
     f3d->lkmax = lk_arr[nk-1];
@@ -270,6 +335,248 @@ ccl_f3d_t *ccl_f3d_t_new(int na,double *a_arr,
   return f3d;
 }
 
+ccl_f3d_t *ccl_f3d_t_new_lowrank(int na,double *a_arr,
+                                 int nk,double *lk_arr,
+                                 int rank,
+                                 double *u_arr,
+                                 double *v_arr,
+                                 int extrap_order_lok,
+                                 int extrap_order_hik,
+                                 ccl_f2d_extrap_growth_t extrap_linear_growth,
+                                 int is_tkka_log,
+                                 double growth_factor_0,
+                                 int growth_exponent,
+                                 int *status) {
+  int ia, ir;
+  ccl_f3d_t *f3d = malloc(sizeof(ccl_f3d_t));
+  if (f3d == NULL)
+    *status = CCL_ERROR_MEMORY;
+
+  if (*status == 0) {
+    f3d->is_product = 0;
+    f3d->extrap_order_lok = extrap_order_lok;
+    f3d->extrap_order_hik = extrap_order_hik;
+    f3d->extrap_linear_growth = extrap_linear_growth;
+    f3d->is_log = is_tkka_log;
+    f3d->growth_factor_0 = growth_factor_0;
+    f3d->growth_exponent = growth_exponent;
+    f3d->fka_1 = NULL;
+    f3d->fka_2 = NULL;
+    f3d->tkka = NULL;
+    f3d->rank = 0;
+    f3d->tkka_u = NULL;
+    f3d->tkka_v = NULL;
+    f3d->tkka_ext = NULL;
+
+    f3d->lkmin = lk_arr[0];
+    f3d->lkmax = lk_arr[nk-1];
+    f3d->na = na;
+    f3d->a_arr = malloc(na*sizeof(double));
+    if(f3d->a_arr == NULL)
+      *status = CCL_ERROR_MEMORY;
+  }
+
+  if (*status == 0)
+    memcpy(f3d->a_arr, a_arr, na*sizeof(double));
+
+  if ((extrap_order_lok > 1) || (extrap_order_lok < 0) ||
+      (extrap_order_hik > 1) || (extrap_order_hik < 0))
+    *status = CCL_ERROR_INCONSISTENT;
+
+  if ((extrap_linear_growth != ccl_f2d_cclgrowth) &&
+      (extrap_linear_growth != ccl_f2d_constantgrowth) &&
+      (extrap_linear_growth != ccl_f2d_no_extrapol))
+    *status = CCL_ERROR_INCONSISTENT;
+
+  if ((rank <= 0) || (nk < 3) || (u_arr == NULL) || (v_arr == NULL))
+    *status = CCL_ERROR_INCONSISTENT;
+
+  if (*status)
+    return f3d;
+
+  f3d->rank = rank;
+  f3d->tkka_u = calloc(na*rank, sizeof(gsl_spline *));
+  f3d->tkka_v = calloc(na*rank, sizeof(gsl_spline *));
+  if ((f3d->tkka_u == NULL) || (f3d->tkka_v == NULL)) {
+    *status = CCL_ERROR_MEMORY;
+    return f3d;
+  }
+
+  for(ia=0; ia<na; ia++) {
+    for(ir=0; ir<rank; ir++) {
+      int i = ir+rank*ia;
+      f3d->tkka_u[i] = gsl_spline_alloc(gsl_interp_cspline, nk);
+      f3d->tkka_v[i] = gsl_spline_alloc(gsl_interp_cspline, nk);
+      if ((f3d->tkka_u[i] == NULL) || (f3d->tkka_v[i] == NULL)) {
+        *status = CCL_ERROR_MEMORY;
+        return f3d;
+      }
+      if (gsl_spline_init(f3d->tkka_u[i], lk_arr, &(u_arr[i*nk]), nk) ||
+          gsl_spline_init(f3d->tkka_v[i], lk_arr, &(v_arr[i*nk]), nk)) {
+        *status = CCL_ERROR_SPLINE;
+        return f3d;
+      }
+    }
+  }
+
+  return f3d;
+}
+
+ccl_f3d_t *ccl_f3d_t_new_external(int na,double *a_arr,
+                                  int nk,double *lk_arr,
+                                  double *tkka_arr,
+                                  double *dtkka_arr,
+                                  double *fka1_arr,
+                                  double *dfka1_arr,
+                                  double *fka2_arr,
+                                  double *dfka2_arr,
+                                  int is_product,
+                                  int extrap_order_lok,
+                                  int extrap_order_hik,
+                                  ccl_f2d_extrap_growth_t extrap_linear_growth,
+                                  int is_tkka_log,
+                                  double growth_factor_0,
+                                  int growth_exponent,
+                                  int *status) {
+  int ia;
+  ccl_f3d_t *f3d = malloc(sizeof(ccl_f3d_t));
+  if (f3d == NULL)
+    *status = CCL_ERROR_MEMORY;
+
+  if (*status == 0) {
+    f3d->is_product = is_product;
+    f3d->extrap_order_lok = extrap_order_lok;
+    f3d->extrap_order_hik = extrap_order_hik;
+    f3d->extrap_linear_growth = extrap_linear_growth;
+    f3d->is_log = is_tkka_log;
+    f3d->growth_factor_0 = growth_factor_0;
+    f3d->growth_exponent = growth_exponent;
+    f3d->fka_1 = NULL;
+    f3d->fka_2 = NULL;
+    f3d->tkka = NULL;
+    f3d->rank = 0;
+    f3d->tkka_u = NULL;
+    f3d->tkka_v = NULL;
+    f3d->tkka_ext = NULL;
+
+    f3d->lkmin = lk_arr[0];
+    f3d->lkmax = lk_arr[nk-1];
+    f3d->na = na;
+    f3d->a_arr = malloc(na*sizeof(double));
+    if(f3d->a_arr == NULL)
+      *status = CCL_ERROR_MEMORY;
+  }
+
+  if (*status == 0)
+    memcpy(f3d->a_arr, a_arr, na*sizeof(double));
+
+  if ((extrap_order_lok > 1) || (extrap_order_lok < 0) ||
+      (extrap_order_hik > 1) || (extrap_order_hik < 0))
+    *status = CCL_ERROR_INCONSISTENT;
+
+  if ((extrap_linear_growth != ccl_f2d_cclgrowth) &&
+      (extrap_linear_growth != ccl_f2d_constantgrowth) &&
+      (extrap_linear_growth != ccl_f2d_no_extrapol))
+    *status = CCL_ERROR_INCONSISTENT;
+
+  if (is_product) {
+    if ((fka1_arr == NULL) || (dfka1_arr == NULL) ||
+        (fka2_arr == NULL) || (dfka2_arr == NULL))
+      *status = CCL_ERROR_INCONSISTENT;
+  }
+  else {
+    if ((tkka_arr == NULL) || (dtkka_arr == NULL) || (nk < 2))
+      *status = CCL_ERROR_INCONSISTENT;
+  }
+
+  if (*status)
+    return f3d;
+
+  if (is_product) {
+    f3d->fka_1 = ccl_f2d_t_new_external(na, a_arr, nk, lk_arr,
+                                        fka1_arr, dfka1_arr,
+                                        extrap_order_lok, extrap_order_hik,
+                                        extrap_linear_growth, is_tkka_log,
+                                        growth_factor_0, growth_exponent/2,
+                                        status);
+    f3d->fka_2 = ccl_f2d_t_new_external(na, a_arr, nk, lk_arr,
+                                        fka2_arr, dfka2_arr,
+                                        extrap_order_lok, extrap_order_hik,
+                                        extrap_linear_growth, is_tkka_log,
+                                        growth_factor_0, growth_exponent/2,
+                                        status);
+  }
+  else {
+    f3d->tkka_ext = malloc(na*sizeof(ccl_bicubic_t));
+    if (f3d->tkka_ext == NULL) {
+      *status = CCL_ERROR_MEMORY;
+      return f3d;
+    }
+    for(ia=0; ia<na; ia++) {
+      f3d->tkka_ext[ia].nx = nk;
+      f3d->tkka_ext[ia].ny = nk;
+      f3d->tkka_ext[ia].x = lk_arr;
+      f3d->tkka_ext[ia].y = lk_arr;
+      f3d->tkka_ext[ia].z = &(tkka_arr[ia*nk*nk]);
+      f3d->tkka_ext[ia].dz = &(dtkka_arr[3*ia*nk*nk]);
+    }
+  }
+
+  return f3d;
+}
+
+// Evaluate the function held at the ia-th scale factor, and its
+// derivatives with respect to lk1 and lk2 if needed.
+static int f3d_eval_node(ccl_f3d_t *f3d, int ia, double lk1, double lk2,
+                         int deriv_k1, int deriv_k2,
+                         double *tkka, double *dtkka1, double *dtkka2)
+{
+  int spstatus = 0;
+
+  if (f3d->rank > 0) {
+    int ir;
+    *tkka = 0;
+    *dtkka1 = 0;
+    *dtkka2 = 0;
+    for(ir=0; ir<f3d->rank; ir++) {
+      double u, v, du, dv;
+      gsl_spline *spl_u = f3d->tkka_u[ir+f3d->rank*ia];
+      gsl_spline *spl_v = f3d->tkka_v[ir+f3d->rank*ia];
+      spstatus |= gsl_spline_eval_e(spl_u, lk1, NULL, &u);
+      spstatus |= gsl_spline_eval_e(spl_v, lk2, NULL, &v);
+      *tkka += u*v;
+      if(deriv_k1) {
+        spstatus |= gsl_spline_eval_deriv_e(spl_u, lk1, NULL, &du);
+        *dtkka1 += du*v;
+      }
+      if(deriv_k2) {
+        spstatus |= gsl_spline_eval_deriv_e(spl_v, lk2, NULL, &dv);
+        *dtkka2 += u*dv;
+      }
+    }
+  }
+  else if (f3d->tkka_ext != NULL) {
+    ccl_bicubic_t *bc = &(f3d->tkka_ext[ia]);
+    spstatus |= ccl_bicubic_eval_e(bc, lk1, lk2, 0, 0, tkka);
+    if(deriv_k1)
+      spstatus |= ccl_bicubic_eval_e(bc, lk1, lk2, 1, 0, dtkka1);
+    if(deriv_k2)
+      spstatus |= ccl_bicubic_eval_e(bc, lk1, lk2, 0, 1, dtkka2);
+  }
+  else {
+    spstatus |= gsl_spline2d_eval_e(f3d->tkka[ia], lk1, lk2,
+                                    NULL, NULL, tkka);
+    if(deriv_k1)
+      spstatus |= gsl_spline2d_eval_deriv_x_e(f3d->tkka[ia], lk1, lk2,
+                                              NULL, NULL, dtkka1);
+    if(deriv_k2)
+      spstatus |= gsl_spline2d_eval_deriv_y_e(f3d->tkka[ia], lk1, lk2,
+                                              NULL, NULL, dtkka2);
+  }
+
+  return spstatus;
+}
+
 double ccl_f3d_t_eval(ccl_f3d_t *f3d,double lk1,double lk2,double a,ccl_a_finder *finda,
                       void *cosmo, int *status) {
   double tkka_post;
@@ -323,34 +630,21 @@ double ccl_f3d_t_eval(ccl_f3d_t *f3d,double lk1,double lk2,double a,ccl_a_finder
     if(*status == 0) {
       int spstatus = 0;
       double tkka, dtkka1, dtkka2;
-      spstatus |= gsl_spline2d_eval_e(f3d->tkka[ia], lk1_ev, lk2_ev,
-                                      NULL, NULL, &tkka);
-      if(extrap_k1)
-        spstatus |= gsl_spline2d_eval_deriv_x_e(f3d->tkka[ia], lk1_ev, lk2_ev,
-                                                NULL, NULL, &dtkka1);
-      if(extrap_k2)
-        spstatus |= gsl_spline2d_eval_deriv_y_e(f3d->tkka[ia], lk1_ev, lk2_ev,
-                                                NULL, NULL, &dtkka2);
+      spstatus |= f3d_eval_node(f3d, ia, lk1_ev, lk2_ev,
+                                extrap_k1, extrap_k2,
+                                &tkka, &dtkka1, &dtkka2);
       if(ia < f3d->na-1) {
         double tkka_p1, dtkka1_p1, dtkka2_p1;
         double h = (a_ev-f3d->a_arr[ia])/(f3d->a_arr[ia+1]-f3d->a_arr[ia]);
 
-        spstatus |= gsl_spline2d_eval_e(f3d->tkka[ia+1], lk1_ev, lk2_ev,
-                                        NULL, NULL, &tkka_p1);
-        if(!spstatus)
+        spstatus |= f3d_eval_node(f3d, ia+1, lk1_ev, lk2_ev,
+                                  extrap_k1, extrap_k2,
+                                  &tkka_p1, &dtkka1_p1, &dtkka2_p1);
+        if(!spstatus) {
           tkka = tkka*(1-h) + tkka_p1*h;
-
-        if(extrap_k1) {
-          spstatus |= gsl_spline2d_eval_deriv_x_e(f3d->tkka[ia+1], lk1_ev, lk2_ev,
-                                                  NULL, NULL, &dtkka1_p1);
-          if(!spstatus)
+          if(extrap_k1)
             dtkka1 = dtkka1*(1-h) + dtkka1_p1*h;
-        }
-
-        if(extrap_k2) {
-          spstatus |= gsl_spline2d_eval_deriv_y_e(f3d->tkka[ia+1], lk1_ev, lk2_ev,
-                                                  NULL, NULL, &dtkka2_p1);
-          if(!spstatus)
+          if(extrap_k2)
             dtkka2 = dtkka2*(1-h) + dtkka2_p1*h;
         }
       }
@@ -410,6 +704,12 @@ void ccl_f3d_t_free(ccl_f3d_t *f3d)
         gsl_spline2d_free(f3d->tkka[ia]);
       free(f3d->tkka);
     }
+    if(f3d->rank > 0) {
+      f3d_splines_free(f3d->tkka_u, f3d->na*f3d->rank);
+      f3d_splines_free(f3d->tkka_v, f3d->na*f3d->rank);
+    }
+    if(f3d->tkka_ext != NULL)
+      free(f3d->tkka_ext);
     if(f3d->na > 0)
       free(f3d->a_arr);
     free(f3d);
@@ -36,6 +36,7 @@ struct hf_model_match_data {
   double chi_drag;
   double a;
   ccl_cosmology *cosmo;
+  ccl_cosmology *cosmo_w0eff;
   int *status;
 };
 
@@ -68,20 +69,24 @@ static ccl_cosmology *create_w0eff_cosmo(double w0eff, ccl_cosmology *cosmo, int
     return ccl_cosmology_create(params_w0eff, cosmo->config);
 }
 
+static void free_w0eff_cosmo(ccl_cosmology *cosmo_w0eff) {
+  if (cosmo_w0eff != NULL) {
+    ccl_parameters_free(&(cosmo_w0eff->params));
+    ccl_cosmology_free(cosmo_w0eff);
+  }
+}
+
 static double w0eff_func(double w0eff, void *p) {
   // function used to compare the distance to the CMB in a test cosmology to
   // to the value in the original cosmology
   // returns chi_eff - chi
   struct hf_model_match_data *hfd = (struct hf_model_match_data*)p;
-  ccl_cosmology *cosmo_w0eff = NULL;
+  ccl_cosmology *cosmo_w0eff = hfd->cosmo_w0eff;
   double chi_drag_w0eff, tmp, zdrag_w0eff;
 
-  // make the equivalent cosmology
-  cosmo_w0eff = create_w0eff_cosmo(w0eff, hfd->cosmo, hfd->status);
-  if (cosmo_w0eff == NULL) {
-    *(hfd->status) = CCL_ERROR_MEMORY;
-    return NAN;
-  }
+  // make the equivalent cosmology. w0 does not enter any other
+  // parameter, so we just update it in the test cosmology.
+  cosmo_w0eff->params.w0 = w0eff;
 
   // get the comoving distance to zdrag
   zdrag_w0eff = zdrag_eh(&(cosmo_w0eff->params));
@@ -93,8 +98,6 @@ static double w0eff_func(double w0eff, void *p) {
     return NAN;
   }
 
-  ccl_parameters_free(&(cosmo_w0eff->params));
-  ccl_cosmology_free(cosmo_w0eff);
   return chi_drag_w0eff - hfd->chi_drag;
 }
 
@@ -114,6 +117,7 @@ static double get_w0eff(double a, struct hf_model_match_data data) {
   data.chi_drag = ccl_comoving_radial_distance(data.cosmo, 1.0 / (1.0 + zdrag_eh(&(data.cosmo->params))), data.status);
   data.chi_drag -= ccl_comoving_radial_distance(data.cosmo, a, data.status);
   if(*(data.status) != 0) {
+    #pragma omp critical(ccl_halofit_status)
     ccl_cosmology_set_status_message(
       data.cosmo,
       "ccl_halofit.c: get_w0eff(): "
@@ -184,17 +188,59 @@ struct hf_int_data {
   double a;
   ccl_cosmology *cosmo;
   ccl_f2d_t *plin;
+  gsl_spline *plin_a;
+  gsl_interp_accel *acc;
   int *status;
   gsl_integration_cquad_workspace *workspace;
 };
 
+// Returns a 1D spline in log(k) holding the linear power spectrum
+// (or its logarithm) at the ia-th node in scale factor of its bicubic
+// interpolator. Since GSL's bicubic interpolator uses the derivatives of
+// cubic splines along each row, this reproduces the 2D interpolation
+// exactly on that node, at the cost of a 1D spline evaluation.
+// Returns NULL if plin is not sampled on a 2D grid.
+static gsl_spline *hf_plin_slice(ccl_f2d_t *plin, int ia) {
+  gsl_spline *spl;
+  size_t nk;
+
+  if ((plin->fka == NULL) || (plin->fka_boost != NULL))
+    return NULL;
+
+  nk = plin->fka->interp_object.xsize;
+  spl = gsl_spline_alloc(gsl_interp_cspline, nk);
+  if (spl == NULL)
+    return NULL;
+
+  if (gsl_spline_init(spl, plin->fka->xarr,
+                      plin->fka->zarr + ia*nk, nk)) {
+    gsl_spline_free(spl);
+    return NULL;
+  }
+  return spl;
+}
+
+static double hf_plin_eval(struct hf_int_data *hfd, double lnk) {
+  double pk;
+
+  // Use the 2D interpolator if extrapolating in k
+  if ((hfd->plin_a == NULL) ||
+      (lnk < hfd->plin->lkmin) || (lnk > hfd->plin->lkmax))
+    return ccl_f2d_t_eval(hfd->plin, lnk, hfd->a, hfd->cosmo, hfd->status);
+
+  pk = gsl_spline_eval(hfd->plin_a, lnk, hfd->acc);
+  if (hfd->plin->is_log)
+    pk = exp(pk);
+  return pk;
+}
+
 static double gauss_norm_int_func(double lnk, void *p) {
   struct hf_int_data *hfd = (struct hf_int_data*)p;
   double k = exp(lnk);
   double k2 = k*k;
 
   return (
-    ccl_f2d_t_eval(hfd->plin, lnk, hfd->a, hfd->cosmo, hfd->status) *
+    hf_plin_eval(hfd, lnk) *
     k*k2/2.0/M_PI/M_PI *
     exp(-k2 * (hfd->r2)));
 }
@@ -205,7 +251,7 @@ static double onederiv_gauss_norm_int_func(double lnk, void *p) {
   double k2 = k*k;
 
   return (
-    ccl_f2d_t_eval(hfd->plin, lnk, hfd->a, hfd->cosmo, hfd->status) *
+    hf_plin_eval(hfd, lnk) *
     k*k2/2.0/M_PI/M_PI *
     exp(-k2 * (hfd->r2)) *
     (-k2 * 2.0 * (hfd->r)));
@@ -217,7 +263,7 @@ static double twoderiv_gauss_norm_int_func(double lnk, void *p) {
   double k2 = k*k;
 
   return (
-    ccl_f2d_t_eval(hfd->plin, lnk, hfd->a, hfd->cosmo, hfd->status) *
+    hf_plin_eval(hfd, lnk) *
     k*k2/2.0/M_PI/M_PI *
     exp(-k2 * (hfd->r2)) *
     (-2.0*k2 + 4.0*k2*k2 * (hfd->r2)));
@@ -314,6 +360,180 @@ static double get_rsigma(double a, struct hf_int_data data) {
   return rsigma;
 }
 
+// Computes the effective w0, OmegaM and OmegaDE at scale factor a.
+// cosmo_w0eff must be a cosmology with the same parameters as cosmo
+// but wa = 0, and is only used if cosmo has wa != 0.
+static void hf_node_w0eff(ccl_cosmology *cosmo, ccl_cosmology *cosmo_w0eff,
+                          double a, double *weff, double *omeff,
+                          double *deeff, int *status) {
+  struct hf_model_match_data data_w0eff;
+  ccl_cosmology *cosmo_use = cosmo;
+
+  *weff = cosmo->params.w0;
+  if (cosmo->params.wa != 0) {
+    data_w0eff.cosmo = cosmo;
+    data_w0eff.cosmo_w0eff = cosmo_w0eff;
+    data_w0eff.status = status;
+    *weff = get_w0eff(a, data_w0eff);
+    if (*status != 0) {
+      *status = CCL_ERROR_ROOT;
+      #pragma omp critical(ccl_halofit_status)
+      ccl_cosmology_set_status_message(
+        cosmo,
+        "ccl_halofit.c: ccl_halofit_struct_new(): "
+        "could not solve for effective value of w0 for w0-wa cosmology\n");
+      return;
+    }
+
+    // now get omeff and deff
+    cosmo_w0eff->params.w0 = *weff;
+    cosmo_use = cosmo_w0eff;
+  }
+
+  *omeff = ccl_omega_x(cosmo_use, a, ccl_species_m_label, status) +
+    ccl_omega_x(cosmo_use, a, ccl_species_nu_label, status);
+  *deeff = ccl_omega_x(cosmo_use, a, ccl_species_l_label, status);
+  if (*status != 0) {
+    #pragma omp critical(ccl_halofit_status)
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_halofit.c: ccl_halofit_struct_new(): "
+      "could not compute OmegaM and OmegaDE for cosmology\n");
+  }
+}
+
+// Computes the non-linear scale, sigma2(R), n_eff and C at
+// scale factor a.
+static void hf_node_scales(struct hf_int_data data, double a,
+                           double lnkmin, double lnkmax,
+                           double *rsigma_out, double *sigma2_out,
+                           double *neff_out, double *C_out) {
+  double rsigma, sigma2, dsigma2drsigma, result;
+  int gsl_status;
+  gsl_function F;
+  ccl_cosmology *cosmo = data.cosmo;
+  int *status = data.status;
+
+  data.a = a;
+
+  // find the nonlinear scale
+  rsigma = get_rsigma(a, data);
+  if ((*status != 0) || (rsigma <= 0)) {
+    *status = CCL_ERROR_ROOT;
+    #pragma omp critical(ccl_halofit_status)
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_halofit.c: ccl_halofit_struct_new(): "
+      "could not solve for non-linear scale for halofit at scale factor %f\n", a);
+    return;
+  }
+
+  // now compute sigma2(R)
+  // this should be close to 1 OFC, but better to use the exact value
+  sigma2 = rsigma_func(rsigma, &data) + 1;
+  if (*status != 0) {
+    #pragma omp critical(ccl_halofit_status)
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_halofit.c: ccl_halofit_struct_new(): could not eval "
+      "points for sigma2(R) spline\n");
+    return;
+  }
+
+  // now compute the effective spectral index
+  data.r = rsigma;
+  data.r2 = rsigma * rsigma;
+  F.function = &onederiv_gauss_norm_int_func;
+  F.params = &data;
+  gsl_status = gsl_integration_cquad(
+    &F,
+    lnkmin,
+    fmax(lnkmax, log(30/rsigma)),
+    0.0, cosmo->gsl_params.INTEGRATION_SIGMAR_EPSREL,
+    data.workspace, &result, NULL, NULL);
+
+  if (gsl_status != GSL_SUCCESS) {
+    *status = CCL_ERROR_INTEG;
+    ccl_raise_gsl_warning(
+      gsl_status,
+      "ccl_power.c: ccl_halofit_struct_new(): could not eval "
+      "points for n_eff spline\n");
+    #pragma omp critical(ccl_halofit_status)
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_halofit.c: ccl_halofit_struct_new(): could not eval "
+      "points for n_eff spline\n");
+    return;
+  }
+
+  // this is n_eff but expressed in terms of linear derivs
+  // see eqn A5 of Takahashi et al.
+  dsigma2drsigma = result;
+  *neff_out = -rsigma / sigma2 * dsigma2drsigma - 3.0;
+
+  // now compute the curvature C
+  F.function = &twoderiv_gauss_norm_int_func;
+  gsl_status = gsl_integration_cquad(
+    &F,
+    lnkmin,
+    fmax(lnkmax, log(30/rsigma)),
+    0.0, cosmo->gsl_params.INTEGRATION_SIGMAR_EPSREL,
+    data.workspace, &result, NULL, NULL);
+
+  if (gsl_status != GSL_SUCCESS) {
+    *status = CCL_ERROR_INTEG;
+    ccl_raise_gsl_warning(
+      gsl_status,
+      "ccl_power.c: ccl_halofit_struct_new(): could not eval "
+      "points for C spline\n");
+    #pragma omp critical(ccl_halofit_status)
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_halofit.c: ccl_halofit_struct_new(): could not eval "
+      "points for C spline\n");
+    return;
+  }
+
+  // this is C but expressed in terms of linear derivs
+  // see eqn A5 of Takahashi et al.
+  *C_out = (
+    -1.0 * (
+      result * rsigma * rsigma / sigma2 +
+      dsigma2drsigma * rsigma / sigma2 -
+      dsigma2drsigma * dsigma2drsigma * rsigma * rsigma / sigma2 / sigma2));
+  *rsigma_out = rsigma;
+  *sigma2_out = sigma2;
+}
+
+static gsl_spline *hf_spline_new(ccl_cosmology *cosmo, int n_a,
+                                 double *a_vec, double *vals,
+                                 const char *name, int *status) {
+  gsl_spline *spl = NULL;
+
+  if (*status == 0) {
+    spl = gsl_spline_alloc(gsl_interp_akima, n_a);
+    if (spl == NULL) {
+      *status = CCL_ERROR_MEMORY;
+      ccl_cosmology_set_status_message(
+        cosmo,
+        "ccl_halofit.c: ccl_halofit_struct_new(): "
+        "memory could not be allocated for %s spline\n", name);
+    }
+  }
+
+  if (*status == 0) {
+    if (gsl_spline_init(spl, a_vec, vals, n_a) != GSL_SUCCESS) {
+      *status = CCL_ERROR_SPLINE;
+      ccl_cosmology_set_status_message(
+        cosmo,
+        "ccl_halofit.c: ccl_halofit_struct_new(): could not build %s spline\n",
+        name);
+    }
+  }
+
+  return spl;
+}
+
 /*
  * Allocate a new struct for storing halofit data
  * @param cosmo Cosmological data
@@ -321,21 +541,11 @@ static double get_rsigma(double a, struct hf_int_data data) {
  */
 halofit_struct* ccl_halofit_struct_new(ccl_cosmology *cosmo,
                                        ccl_f2d_t *plin, int *status) {
-  size_t n_a;
-  int i, gsl_status;
+  int n_a = 0;
   double lnkmin, lnkmax;
   double *a_vec = NULL;
   double *vals = NULL;
-  double *vals_om = NULL;
-  double *vals_de = NULL;
   halofit_struct *hf = NULL;
-  struct hf_int_data data;
-  gsl_function F;
-  gsl_integration_cquad_workspace *workspace = NULL;
-  double result;
-  double sigma2, rsigma, dsigma2drsigma;
-  struct hf_model_match_data data_w0eff;
-  ccl_cosmology *cosmo_w0eff = NULL;
 
   // compute spline point locations and integral bounds
   // note that the spline point locations in `a` determine a radius by
@@ -380,19 +590,10 @@ halofit_struct* ccl_halofit_struct_new(ccl_cosmology *cosmo,
     }
   }
 
+  // Results for all scale factor nodes, stored contiguously as
+  // weff, omeff, deeff, rsigma, sigma2, n_eff and C.
   if (*status == 0) {
-    workspace = gsl_integration_cquad_workspace_alloc(cosmo->gsl_params.N_ITERATION);
-    if (workspace == NULL) {
-      *status = CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): "
-        "memory could not be allocated for cquad workspace\n");
-    }
-  }
-
-  if (*status == 0) {
-    vals = (double*)malloc(sizeof(double) * n_a);
+    vals = (double*)malloc(sizeof(double) * 7 * n_a);
     if (vals == NULL) {
       *status = CCL_ERROR_MEMORY;
       ccl_cosmology_set_status_message(
@@ -402,368 +603,99 @@ halofit_struct* ccl_halofit_struct_new(ccl_cosmology *cosmo,
     }
   }
 
+  ///////////////////////////////////////////////////////
+  // Each scale factor node is independent, so we solve them in
+  // parallel. If wa != 0, we need to find an equivalent cosmology with
+  // wa = 0 at each node. Each thread holds its own copy of this
+  // cosmology, integration workspace and accelerator. Status messages
+  // set by the threads are serialised by the ccl_halofit_status
+  // critical sections.
   if (*status == 0) {
-    vals_om = (double*)malloc(sizeof(double) * n_a);
-    if (vals_om == NULL) {
-      *status = CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): "
-        "memory could not be allocated for OmegaM results vector\n");
-    }
-  }
-
-  if (*status == 0) {
-    vals_de = (double*)malloc(sizeof(double) * n_a);
-    if (vals_de == NULL) {
-      *status = CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): "
-        "memory could not be allocated for OmegaDE results vector\n");
-    }
-  }
-
-  ////////////////////////////////////////////////////////
-  // if wa != 0, then we need to find an equivalent
-  // cosmology with wa = 0
-  data_w0eff.cosmo = cosmo;
-  data_w0eff.status = status;
-
-  if (*status == 0) {
-    if (cosmo->params.wa != 0) {
-      for(i=0; i<n_a; ++i) {
-        vals[i] = get_w0eff(a_vec[i], data_w0eff);
-        if (*status != 0) {
-          *status = CCL_ERROR_ROOT;
-          ccl_cosmology_set_status_message(
-            cosmo,
-            "ccl_halofit.c: ccl_halofit_struct_new(): "
-            "could not solve for effective value of w0 for w0-wa cosmology\n");
-          break;
-        }
+    double *vals_w = vals;
+    double *vals_om = vals + n_a;
+    double *vals_de = vals + 2*n_a;
+    double *vals_rs = vals + 3*n_a;
+    double *vals_s2 = vals + 4*n_a;
+    double *vals_neff = vals + 5*n_a;
+    double *vals_C = vals + 6*n_a;
+
+    #pragma omp parallel default(none) \
+                         shared(cosmo, plin, n_a, a_vec, lnkmin, lnkmax, \
+                                vals_w, vals_om, vals_de, vals_rs, \
+                                vals_s2, vals_neff, vals_C, status)
+    {
+      int i;
+      int local_status = 0;
+      struct hf_int_data data;
+      ccl_cosmology *cosmo_w0eff = NULL;
+
+      data.status = &local_status;
+      data.cosmo = cosmo;
+      data.plin = plin;
+      data.plin_a = NULL;
+      data.acc = gsl_interp_accel_alloc();
+      data.workspace = gsl_integration_cquad_workspace_alloc(
+        cosmo->gsl_params.N_ITERATION);
+      if ((data.acc == NULL) || (data.workspace == NULL)) {
+        local_status = CCL_ERROR_MEMORY;
+        #pragma omp critical(ccl_halofit_status)
+        ccl_cosmology_set_status_message(
+          cosmo,
+          "ccl_halofit.c: ccl_halofit_struct_new(): "
+          "memory could not be allocated for cquad workspace\n");
+      }
 
-        // now get omeff and deff
-        cosmo_w0eff = create_w0eff_cosmo(vals[i], cosmo, status);
+      if ((local_status == 0) && (cosmo->params.wa != 0)) {
+        cosmo_w0eff = create_w0eff_cosmo(cosmo->params.w0, cosmo,
+                                         &local_status);
         if (cosmo_w0eff == NULL) {
-          *status = CCL_ERROR_MEMORY;
+          local_status = CCL_ERROR_MEMORY;
+          #pragma omp critical(ccl_halofit_status)
           ccl_cosmology_set_status_message(
             cosmo,
             "ccl_halofit.c: ccl_halofit_struct_new(): "
             "could not allocat memory for effective w0 for w0-wa cosmology\n");
-          break;
-        }
-
-        vals_om[i] = ccl_omega_x(cosmo_w0eff, a_vec[i], ccl_species_m_label, status) +
-          ccl_omega_x(cosmo_w0eff, a_vec[i], ccl_species_nu_label, status);
-        vals_de[i] = ccl_omega_x(cosmo_w0eff, a_vec[i], ccl_species_l_label, status);
-
-        ccl_parameters_free(&(cosmo_w0eff->params));
-        ccl_cosmology_free(cosmo_w0eff);
-        cosmo_w0eff = NULL;
-
-        if (*status != 0) {
-          ccl_cosmology_set_status_message(
-            cosmo,
-            "ccl_halofit.c: ccl_halofit_struct_new(): "
-            "could not compute OmegaM and OmegaDE for cosmology\n");
-          break;
         }
       }
-    } else {
-      for(i=0; i<n_a; ++i) {
-        vals[i] = cosmo->params.w0;
-        vals_om[i] = ccl_omega_x(cosmo, a_vec[i], ccl_species_m_label, status) +
-          ccl_omega_x(cosmo, a_vec[i], ccl_species_nu_label, status);
-        vals_de[i] = ccl_omega_x(cosmo, a_vec[i], ccl_species_l_label, status);
-        if (*status != 0) {
-          ccl_cosmology_set_status_message(
-            cosmo,
-            "ccl_halofit.c: ccl_halofit_struct_new(): "
-            "could not compute OmegaM and OmegaDE for cosmology\n");
-          break;
-        }
-      }
-    }
-  }
-
-  // spline the weff values
-  if (*status == 0) {
-    hf->weff = gsl_spline_alloc(gsl_interp_akima, n_a);
-    if (hf->weff == NULL) {
-      *status = CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): "
-        "memory could not be allocated for weff spline\n");
-    }
-  }
 
-  if (*status == 0) {
-    gsl_status = gsl_spline_init(hf->weff, a_vec, vals, n_a);
-    if (gsl_status != GSL_SUCCESS) {
-      *status = CCL_ERROR_SPLINE;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): could not build weff spline\n");
-    }
-  }
-
-  // spline the omeff values
-  if (*status == 0) {
-    hf->omeff = gsl_spline_alloc(gsl_interp_akima, n_a);
-    if (hf->omeff == NULL) {
-      *status = CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): "
-        "memory could not be allocated for omeff spline\n");
-    }
-  }
-
-  if (*status == 0) {
-    gsl_status = gsl_spline_init(hf->omeff, a_vec, vals_om, n_a);
-    if (gsl_status != GSL_SUCCESS) {
-      *status = CCL_ERROR_SPLINE;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): could not build omeff spline\n");
-    }
-  }
-
-  // spline the deeff values
-  if (*status == 0) {
-    hf->deeff = gsl_spline_alloc(gsl_interp_akima, n_a);
-    if (hf->deeff == NULL) {
-      *status = CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): "
-        "memory could not be allocated for deeff spline\n");
-    }
-  }
-
-  if (*status == 0) {
-    gsl_status = gsl_spline_init(hf->deeff, a_vec, vals_de, n_a);
-    if (gsl_status != GSL_SUCCESS) {
-      *status = CCL_ERROR_SPLINE;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): could not build deeff spline\n");
-    }
-  }
-
-  ///////////////////////////////////////////////////////
-  // find the nonlinear scale at each scale factor
-  if (*status == 0) {
-    // setup for integrations
-    data.status = status;
-    data.cosmo = cosmo;
-    data.plin = plin;
-    data.workspace = workspace;
-
-    for (i=0; i<n_a; ++i) {
-      vals[i] = get_rsigma(a_vec[i], data);
-      if ((*status != 0) || (vals[i] <= 0)) {
-        *status = CCL_ERROR_ROOT;
-        ccl_cosmology_set_status_message(
-          cosmo,
-          "ccl_halofit.c: ccl_halofit_struct_new(): "
-          "could not solve for non-linear scale for halofit at scale factor %f\n", a_vec[i]);
-        break;
-      }
-    }
-  }
-
-  // spline the non-linear scales
-  if (*status == 0) {
-    hf->rsigma = gsl_spline_alloc(gsl_interp_akima, n_a);
-    if (hf->rsigma == NULL) {
-      *status = CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): "
-        "memory could not be allocated for Rsigma spline\n");
-    }
-  }
-
-  if (*status == 0) {
-    gsl_status = gsl_spline_init(hf->rsigma, a_vec, vals, n_a);
-    if (gsl_status != GSL_SUCCESS) {
-      *status = CCL_ERROR_SPLINE;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): could not build Rsigma spline\n");
-    }
-  }
-
-  ///////////////////////////////////////////////////////
-  // now compute sigma2(R) at each spline point
-  // and spline that
-  // this should be close to 1 OFC, but better to use the exact value
-  if (*status == 0) {
-    for (i=0; i<n_a; ++i) {
-      data.a = a_vec[i];
-      vals[i] = rsigma_func(gsl_spline_eval(hf->rsigma, a_vec[i], NULL), &data) + 1;
-      if (*status != 0) {
-        ccl_cosmology_set_status_message(
-          cosmo,
-          "ccl_halofit.c: ccl_halofit_struct_new(): could not eval "
-          "points for sigma2(R) spline\n");
-        break;
-      }
-    }
-  }
-
-  if (*status == 0) {
-    hf->sigma2 = gsl_spline_alloc(gsl_interp_akima, n_a);
-    if (hf->sigma2 == NULL) {
-      *status = CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): "
-        "memory could not be allocated for sigma2(R) spline\n");
-    }
-  }
-
-  if (*status == 0) {
-    gsl_status = gsl_spline_init(hf->sigma2, a_vec, vals, n_a);
-    if (gsl_status != GSL_SUCCESS) {
-      *status = CCL_ERROR_SPLINE;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): could not build sigma2(R) spline\n");
-    }
-  }
-
-  ///////////////////////////////////////////////////////
-  // now compute the effective spectral index
-  if (*status == 0) {
-    F.function = &onederiv_gauss_norm_int_func;
-    F.params = &data;
-
-    for (i=0; i<n_a; ++i) {
-      rsigma = gsl_spline_eval(hf->rsigma, a_vec[i], NULL);
-      sigma2 = gsl_spline_eval(hf->sigma2, a_vec[i], NULL);
-
-      data.a = a_vec[i];
-      data.r = rsigma;
-      data.r2 = rsigma * rsigma;
-
-      gsl_status = gsl_integration_cquad(
-        &F,
-        lnkmin,
-        fmax(lnkmax, log(30/rsigma)),
-        0.0, cosmo->gsl_params.INTEGRATION_SIGMAR_EPSREL,
-        workspace, &result, NULL, NULL);
-
-      if (gsl_status != GSL_SUCCESS) {
-        *status = CCL_ERROR_INTEG;
-        ccl_raise_gsl_warning(
-          gsl_status,
-          "ccl_power.c: ccl_halofit_struct_new(): could not eval "
-          "points for n_eff spline\n");
-        ccl_cosmology_set_status_message(
-          cosmo,
-          "ccl_halofit.c: ccl_halofit_struct_new(): could not eval "
-          "points for n_eff spline\n");
-        break;
-      }
-
-      // this is n_eff but expressed in terms of linear derivs
-      // see eqn A5 of Takahashi et al.
-      vals[i] = -rsigma / sigma2 * result - 3.0;
-    }
-  }
-
-  if (*status == 0) {
-    hf->n_eff = gsl_spline_alloc(gsl_interp_akima, n_a);
-    if (hf->n_eff == NULL) {
-      *status = CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): "
-        "memory could not be allocated for n_eff spline\n");
-    }
-  }
+      #pragma omp for schedule(dynamic)
+      for (i=0; i<n_a; ++i) {
+        if (local_status == 0)
+          hf_node_w0eff(cosmo, cosmo_w0eff, a_vec[i],
+                        &(vals_w[i]), &(vals_om[i]), &(vals_de[i]),
+                        &local_status);
+
+        if (local_status == 0) {
+          data.plin_a = hf_plin_slice(plin, i);
+          hf_node_scales(data, a_vec[i], lnkmin, lnkmax,
+                         &(vals_rs[i]), &(vals_s2[i]),
+                         &(vals_neff[i]), &(vals_C[i]));
+          if (data.plin_a != NULL)
+            gsl_spline_free(data.plin_a);
+          data.plin_a = NULL;
+        }
+      } //end omp for
 
-  if (*status == 0) {
-    gsl_status = gsl_spline_init(hf->n_eff, a_vec, vals, n_a);
-    if (gsl_status != GSL_SUCCESS) {
-      *status = CCL_ERROR_SPLINE;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): could not build n_eff spline\n");
-    }
-  }
+      gsl_interp_accel_free(data.acc);
+      gsl_integration_cquad_workspace_free(data.workspace);
+      free_w0eff_cosmo(cosmo_w0eff);
 
-  ///////////////////////////////////////////////////////
-  // now compute the curvature C
-  if (*status == 0) {
-    F.function = &twoderiv_gauss_norm_int_func;
-    F.params = &data;
-
-    for (i=0; i<n_a; ++i) {
-      rsigma = gsl_spline_eval(hf->rsigma, a_vec[i], NULL);
-      sigma2 = gsl_spline_eval(hf->sigma2, a_vec[i], NULL);
-
-      // we need to solve for the deriv we need from n_eff here
-      dsigma2drsigma = gsl_spline_eval(hf->n_eff, a_vec[i], NULL);
-      dsigma2drsigma = (dsigma2drsigma + 3.0) / (-rsigma / sigma2);
-
-      data.a = a_vec[i];
-      data.r = rsigma;
-      data.r2 = rsigma * rsigma;
-
-      gsl_status = gsl_integration_cquad(
-        &F,
-        lnkmin,
-        fmax(lnkmax, log(30/rsigma)),
-        0.0, cosmo->gsl_params.INTEGRATION_SIGMAR_EPSREL,
-        workspace, &result, NULL, NULL);
-
-      if (gsl_status != GSL_SUCCESS) {
-        *status = CCL_ERROR_INTEG;
-        ccl_raise_gsl_warning(
-          gsl_status,
-          "ccl_power.c: ccl_halofit_struct_new(): could not eval "
-          "points for C spline\n");
-        ccl_cosmology_set_status_message(
-          cosmo,
-          "ccl_halofit.c: ccl_halofit_struct_new(): could not eval "
-          "points for C spline\n");
-        break;
+      if (local_status) {
+        #pragma omp atomic write
+        *status = local_status;
       }
-
-      // this is C but expressed in terms of linear derivs
-      // see eqn A5 of Takahashi et al.
-      vals[i] = (
-        -1.0 * (
-          result * rsigma * rsigma / sigma2 +
-          dsigma2drsigma * rsigma / sigma2 -
-          dsigma2drsigma * dsigma2drsigma * rsigma * rsigma / sigma2 / sigma2));
-    }
+    } //end omp parallel
   }
 
+  // spline everything
   if (*status == 0) {
-    hf->C = gsl_spline_alloc(gsl_interp_akima, n_a);
-    if (hf->C == NULL) {
-      *status = CCL_ERROR_MEMORY;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): "
-        "memory could not be allocated for C spline\n");
-    }
-  }
-
-  if (*status == 0) {
-    gsl_status = gsl_spline_init(hf->C, a_vec, vals, n_a);
-    if (gsl_status != GSL_SUCCESS) {
-      *status = CCL_ERROR_SPLINE;
-      ccl_cosmology_set_status_message(
-        cosmo,
-        "ccl_halofit.c: ccl_halofit_struct_new(): could not build C spline\n");
-    }
+    hf->weff = hf_spline_new(cosmo, n_a, a_vec, vals, "weff", status);
+    hf->omeff = hf_spline_new(cosmo, n_a, a_vec, vals + n_a, "omeff", status);
+    hf->deeff = hf_spline_new(cosmo, n_a, a_vec, vals + 2*n_a, "deeff", status);
+    hf->rsigma = hf_spline_new(cosmo, n_a, a_vec, vals + 3*n_a, "Rsigma", status);
+    hf->sigma2 = hf_spline_new(cosmo, n_a, a_vec, vals + 4*n_a, "sigma2(R)", status);
+    hf->n_eff = hf_spline_new(cosmo, n_a, a_vec, vals + 5*n_a, "n_eff", status);
+    hf->C = hf_spline_new(cosmo, n_a, a_vec, vals + 6*n_a, "C", status);
   }
 
   // free stuff on the way out
@@ -773,14 +705,7 @@ halofit_struct* ccl_halofit_struct_new(ccl_cosmology *cosmo,
     ccl_halofit_struct_free(hf);
     hf = NULL;
   }
-  gsl_integration_cquad_workspace_free(workspace);
   free(vals);
-  free(vals_om);
-  free(vals_de);
-  if (cosmo_w0eff != NULL) {
-    ccl_parameters_free(&(cosmo_w0eff->params));
-    ccl_cosmology_free(cosmo_w0eff);
-  }
 
   return hf;
 }
@@ -159,6 +159,33 @@ void ccl_get_number_counts_kernel(ccl_cosmology *cosmo,
   ccl_f1d_t_free(nz_f);
 }
 
+void ccl_get_number_counts_kernel_multi(ccl_cosmology *cosmo,
+                                        int nz, double *z_arr,
+                                        int n_real, double *nz_arr,
+                                        int normalize_nz,
+                                        double *pchi_arr, int *status) {
+  // All kernels share the same redshift (and therefore distance) nodes.
+  #pragma omp parallel default(none) \
+                       shared(cosmo, nz, z_arr, n_real, nz_arr, \
+                              normalize_nz, pchi_arr, status)
+  {
+    int local_status = *status;
+
+    #pragma omp for schedule(dynamic)
+    for(int ir=0; ir < n_real; ir++) {
+      if(local_status == 0)
+        ccl_get_number_counts_kernel(cosmo, nz, z_arr, nz_arr+ir*nz,
+                                     normalize_nz, pchi_arr+ir*nz,
+                                     &local_status);
+    }
+
+    if(local_status) {
+      #pragma omp atomic write
+      *status = local_status;
+    }
+  }
+}
+
 //3 H0^2 Omega_M / 2
 static double get_lensing_prefactor(ccl_cosmology *cosmo,int *status) {
   double hub = cosmo->params.h/ccl_constants.CLIGHT_HMPC;
@@ -453,6 +480,147 @@ static void integrate_lensing_kernel_spline(ccl_cosmology *cosmo,
   free(qz_array);
 }
 
+// cosn(x) = cos(x), x or cosh(x) for closed, flat and open cosmologies,
+// such that sinn(x-y) = sinn(x)*cosn(y) - cosn(x)*sinn(y).
+static double lensing_cosn(ccl_cosmology *cosmo, double chi) {
+  switch(cosmo->params.k_sign) {
+  case -1:
+    return cosh(cosmo->params.sqrtk * chi);
+  case 1:
+    return cos(cosmo->params.sqrtk * chi);
+  default:
+    return 1.;
+  }
+}
+
+// Computes the lensing kernel integral from cumulative integrals:
+// 3 * H0^2 * Omega_M / 2 / a *
+// Integral[ p(z) * (1-5s(z)/2) * chi_end * (chi(z)-chi_end)/chi(z) ,
+//          {z',z_end,z_max} ]
+// Since sinn(chi-chi_end)/sinn(chi) = cosn(chi_end) - sinn(chi_end)*cosn(chi)/sinn(chi),
+// the integral is cosn(chi_end)*F0(z_end) - sinn(chi_end)*F1(z_end), where F0 and F1
+// are the integrals of p*q and p*q*cosn(chi)/sinn(chi) above z_end. These are
+// accumulated once over the n(z) nodes, so the cost is O(nz + nchi*log(nz)).
+static void integrate_lensing_kernel_cumulative(ccl_cosmology *cosmo,
+                                                int nz, double* z_arr, double* nz_arr, double nz_norm,
+                                                ccl_f1d_t* sz_f,
+                                                int nchi, double* chi_arr, double* wL_arr,
+                                                int* status) {
+  double *f0 = malloc(nz*sizeof(double));
+  double *f1 = malloc(nz*sizeof(double));
+  double *cum0 = malloc(nz*sizeof(double));
+  double *cum1 = malloc(nz*sizeof(double));
+  gsl_spline *spl0 = gsl_spline_alloc(gsl_interp_akima, nz);
+  gsl_spline *spl1 = gsl_spline_alloc(gsl_interp_akima, nz);
+  if((f0 == NULL) || (f1 == NULL) || (cum0 == NULL) || (cum1 == NULL) ||
+     (spl0 == NULL) || (spl1 == NULL)) {
+    *status = CCL_ERROR_MEMORY;
+    ccl_cosmology_set_status_message(
+      cosmo,
+      "ccl_tracers.c: integrate_lensing_kernel_cumulative(): error allocating memory\n");
+  }
+
+  if(*status == 0) {
+    // Fill integrands
+    for(int i=0; i<nz; i++) {
+      double a = 1./(1+z_arr[i]);
+      double chi = ccl_comoving_radial_distance(cosmo, a, status);
+      double qz = 1.0;
+      if(sz_f != NULL)
+        qz = 1-2.5*ccl_f1d_t_eval(sz_f, z_arr[i]);
+      f0[i] = nz_arr[i]*qz;
+      // The second term vanishes at chi_end = 0, so its integrand
+      // is irrelevant there.
+      if(chi > 0)
+        f1[i] = f0[i]*lensing_cosn(cosmo, chi)/ccl_sinn(cosmo, chi, status);
+      else
+        f1[i] = 0;
+    }
+  }
+
+  if(*status == 0) {
+    if(gsl_spline_init(spl0, z_arr, f0, nz) || gsl_spline_init(spl1, z_arr, f1, nz)) {
+      *status = CCL_ERROR_SPLINE;
+      ccl_cosmology_set_status_message(
+        cosmo,
+        "ccl_tracers.c: integrate_lensing_kernel_cumulative(): error initializing spline\n");
+    }
+  }
+
+  if(*status == 0) {
+    // Cumulative integrals from each node to z_max
+    gsl_interp_accel *ia = gsl_interp_accel_alloc();
+    cum0[nz-1] = 0;
+    cum1[nz-1] = 0;
+    for(int i=nz-2; i>=0; i--) {
+      cum0[i] = cum0[i+1] + gsl_spline_eval_integ(spl0, z_arr[i], z_arr[i+1], ia);
+      cum1[i] = cum1[i+1] + gsl_spline_eval_integ(spl1, z_arr[i], z_arr[i+1], ia);
+    }
+    gsl_interp_accel_free(ia);
+  }
+
+  if(*status == 0) {
+    #pragma omp parallel default(none) \
+                        shared(cosmo, nz, z_arr, nz_norm, spl0, spl1, \
+                               cum0, cum1, nchi, chi_arr, wL_arr, status)
+    {
+      int local_status = *status;
+      double lens_prefac = get_lensing_prefactor(cosmo, &local_status);
+      gsl_interp_accel *ia = gsl_interp_accel_alloc();
+      if(ia == NULL)
+        local_status = CCL_ERROR_MEMORY;
+
+      #pragma omp for
+      for(int ichi=0; ichi<nchi; ichi++) {
+        if(local_status) {
+          wL_arr[ichi] = NAN;
+          continue;
+        }
+        double chi_end = chi_arr[ichi];
+        double a = ccl_scale_factor_of_chi(cosmo, chi_end, &local_status);
+        double z_end = 1./a-1;
+        double F0, F1;
+
+        if(z_end >= z_arr[nz-1]) {
+          wL_arr[ichi] = 0;
+          continue;
+        }
+        else if(z_end <= z_arr[0]) {
+          F0 = cum0[0];
+          F1 = cum1[0];
+        }
+        else {
+          size_t i = gsl_interp_accel_find(ia, z_arr, nz, z_end);
+          F0 = cum0[i+1] + gsl_spline_eval_integ(spl0, z_end, z_arr[i+1], ia);
+          F1 = cum1[i+1] + gsl_spline_eval_integ(spl1, z_end, z_arr[i+1], ia);
+        }
+
+        double result = lensing_cosn(cosmo, chi_end)*F0 -
+          ccl_sinn(cosmo, chi_end, &local_status)*F1;
+        wL_arr[ichi] = result * lens_prefac * nz_norm * chi_end / a;
+      }
+
+      gsl_interp_accel_free(ia);
+      if(local_status) {
+        #pragma omp atomic write
+        *status = CCL_ERROR_INTEG;
+      }
+    } //end omp parallel
+    if(*status) {
+      ccl_cosmology_set_status_message(
+        cosmo,
+        "ccl_tracers.c: integrate_lensing_kernel_cumulative(): error in computing lensing kernel.\n");
+    }
+  }
+
+  free(f0);
+  free(f1);
+  free(cum0);
+  free(cum1);
+  gsl_spline_free(spl0);
+  gsl_spline_free(spl1);
+}
+
 //Returns number of divisions on which
 //the lensing kernel should be calculated
 int ccl_get_nchi_lensing_kernel(int nz, double *z_arr, int *status) {
@@ -527,7 +695,11 @@ void ccl_get_lensing_mag_kernel(ccl_cosmology *cosmo,
   }
 
   if(*status == 0) {
-    if(cosmo->gsl_params.LENSING_KERNEL_SPLINE_INTEGRATION) {
+    if(cosmo->gsl_params.LENSING_KERNEL_CUMULATIVE_INTEGRATION) {
+      integrate_lensing_kernel_cumulative(cosmo,
+                                          nz, z_arr, nz_arr, i_nz_norm,
+                                          sz_f, nchi, chi_arr, wL_arr, status);
+    } else if(cosmo->gsl_params.LENSING_KERNEL_SPLINE_INTEGRATION) {
       integrate_lensing_kernel_spline(cosmo,
                                       nz, z_arr, nz_arr, i_nz_norm,
                                       sz_f, nchi, chi_arr, wL_arr, status);
@@ -549,6 +721,39 @@ void ccl_get_lensing_mag_kernel(ccl_cosmology *cosmo,
   ccl_f1d_t_free(sz_f);
 }
 
+void ccl_get_lensing_mag_kernel_multi(ccl_cosmology *cosmo,
+                                      int nz, double *z_arr,
+                                      int n_real, double *nz_arr,
+                                      int normalize_nz, double z_max,
+                                      int nz_s, double *zs_arr, double *sz_arr,
+                                      int nchi, double *chi_arr, double *wL_arr,
+                                      int *status) {
+  // All kernels are sampled on the same distances, so the output for
+  // realisation ir is simply the ir-th block of nchi values.
+  #pragma omp parallel default(none) \
+                       shared(cosmo, nz, z_arr, n_real, nz_arr, \
+                              normalize_nz, z_max, nz_s, zs_arr, sz_arr, \
+                              nchi, chi_arr, wL_arr, status)
+  {
+    int local_status = *status;
+
+    #pragma omp for schedule(dynamic)
+    for(int ir=0; ir < n_real; ir++) {
+      if(local_status == 0)
+        ccl_get_lensing_mag_kernel(cosmo, nz, z_arr, nz_arr+ir*nz,
+                                   normalize_nz, z_max,
+                                   nz_s, zs_arr, sz_arr,
+                                   nchi, chi_arr, wL_arr+ir*nchi,
+                                   &local_status);
+    }
+
+    if(local_status) {
+      #pragma omp atomic write
+      *status = local_status;
+    }
+  }
+}
+
 // Returns kernel for CMB lensing
 // 3H0^2Om/2 * chi * (chi_s - chi) / chi_s / a
 void ccl_get_kappa_kernel(ccl_cosmology *cosmo, double chi_source,
@@ -566,6 +771,43 @@ void ccl_get_kappa_kernel(ccl_cosmology *cosmo, double chi_source,
   }
 }
 
+// Find the edges of the range of distances over which a radial kernel
+// is relevant (see CCL_FRAC_RELEVANT).
+static void set_kernel_edges(ccl_cl_tracer_t *tr,
+                             int n_w, double *chi_w, double *w_w) {
+  int ichi;
+  double w_max = fabs(w_w[0]);
+
+  // Find maximum of radial kernel
+  for (ichi=0; ichi < n_w; ichi++) {
+    if (fabs(w_w[ichi]) >= w_max)
+      w_max = fabs(w_w[ichi]);
+  }
+
+  // Multiply by fraction
+  w_max *= CCL_FRAC_RELEVANT;
+
+  // Initialize as the original edges in case we don't find an interval
+  tr->chi_min = chi_w[0];
+  tr->chi_max = chi_w[n_w-1];
+
+  // Find minimum
+  for (ichi=0; ichi < n_w-1; ichi++) {
+    if (fabs(w_w[ichi+1]) >= w_max) {
+      tr->chi_min = chi_w[ichi];
+      break;
+    }
+  }
+
+  // Find maximum
+  for (ichi=n_w-1; ichi >= 1; ichi--) {
+    if (fabs(w_w[ichi-1]) >= w_max) {
+      tr->chi_max = chi_w[ichi];
+      break;
+    }
+  }
+}
+
 ccl_cl_tracer_t *ccl_cl_tracer_t_new(ccl_cosmology *cosmo,
                                      int der_bessel,
                                      int der_angles,
@@ -610,6 +852,7 @@ ccl_cl_tracer_t *ccl_cl_tracer_t_new(ccl_cosmology *cosmo,
     tr->transfer = NULL; // Initialize these to NULL
     tr->chi_min = 0;
     tr->chi_max = 1E15;
+    tr->n_amplitude = 0;
   }
 
   if (*status == 0) {
@@ -630,39 +873,8 @@ ccl_cl_tracer_t *ccl_cl_tracer_t_new(ccl_cosmology *cosmo,
       tr->chi_min = 0;
       tr->chi_max = ccl_comoving_radial_distance(cosmo, cosmo->spline_params.A_SPLINE_MIN, status);
     }
-    else {
-      int ichi;
-      double w_max = fabs(w_w[0]);
-
-      // Find maximum of radial kernel
-      for (ichi=0; ichi < n_w; ichi++) {
-        if (fabs(w_w[ichi]) >= w_max)
-          w_max = fabs(w_w[ichi]);
-      }
-
-      // Multiply by fraction
-      w_max *= CCL_FRAC_RELEVANT;
-
-      // Initialize as the original edges in case we don't find an interval
-      tr->chi_min = chi_w[0];
-      tr->chi_max = chi_w[n_w-1];
-
-      // Find minimum
-      for (ichi=0; ichi < n_w-1; ichi++) {
-        if (fabs(w_w[ichi+1]) >= w_max) {
-          tr->chi_min = chi_w[ichi];
-          break;
-        }
-      }
-
-      // Find maximum
-      for (ichi=n_w-1; ichi >= 1; ichi--) {
-        if (fabs(w_w[ichi-1]) >= w_max) {
-          tr->chi_max = chi_w[ichi];
-          break;
-        }
-      }
-    }
+    else
+      set_kernel_edges(tr, n_w, chi_w, w_w);
   }
 
   if (*status == 0) {
@@ -690,6 +902,30 @@ ccl_cl_tracer_t *ccl_cl_tracer_t_new(ccl_cosmology *cosmo,
   return tr;
 }
 
+void ccl_cl_tracer_t_set_kernel(ccl_cl_tracer_t *tr,
+                                int n_w, double *chi_w, double *w_w,
+                                int *status) {
+  ccl_f1d_t *kernel = NULL;
+
+  if ((n_w < 2) || (chi_w == NULL) || (w_w == NULL)) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return;
+  }
+
+  kernel = ccl_f1d_t_new(n_w,chi_w,w_w,0,0,
+                         ccl_f1d_extrap_const,
+                         ccl_f1d_extrap_const, status);
+  if (kernel == NULL) {
+    *status = CCL_ERROR_MEMORY;
+    return;
+  }
+
+  // Only replace the old kernel once the new one is ready.
+  ccl_f1d_t_free(tr->kernel);
+  tr->kernel = kernel;
+  set_kernel_edges(tr, n_w, chi_w, w_w);
+}
+
 void ccl_cl_tracer_t_free(ccl_cl_tracer_t *tr) {
   if (tr != NULL) {
     if (tr->transfer != NULL)
@@ -739,11 +975,36 @@ double ccl_cl_tracer_t_get_kernel(ccl_cl_tracer_t *tr, double chi, int *status)
 double ccl_cl_tracer_t_get_transfer(ccl_cl_tracer_t *tr,
                                     double lk, double a, int *status) {
   if (tr != NULL) {
+    double amp = ccl_cl_tracer_t_get_amplitude(tr, a);
     if (tr->transfer != NULL)
-      return ccl_f2d_t_eval(tr->transfer, lk, a, NULL, status);
+      return amp * ccl_f2d_t_eval(tr->transfer, lk, a, NULL, status);
     else
-      return 1;
+      return amp;
   }
   else
     return 1;
 }
+
+void ccl_cl_tracer_t_set_amplitude(ccl_cl_tracer_t *tr,
+                                   int n_coeffs, double *coeffs,
+                                   int *status) {
+  if ((n_coeffs < 0) || (n_coeffs > CCL_MAX_TRACER_AMPLITUDE_COEFFS)) {
+    *status = CCL_ERROR_INCONSISTENT;
+    return;
+  }
+  for (int i=0; i < n_coeffs; i++)
+    tr->amplitude[i] = coeffs[i];
+  tr->n_amplitude = n_coeffs;
+}
+
+double ccl_cl_tracer_t_get_amplitude(ccl_cl_tracer_t *tr, double a) {
+  if ((tr == NULL) || (tr->n_amplitude == 0))
+    return 1;
+
+  // Horner's rule in z
+  double z = 1./a-1;
+  double amp = 0;
+  for (int i=tr->n_amplitude-1; i >= 0; i--)
+    amp = amp*z + tr->amplitude[i];
+  return amp;
+}